@@ -3,9 +3,10 @@
 """
 
 import sys
+import json
 import argparse
+from pathlib import Path
 from src import __version__, __author__, __repo__
-from src.app import PyBuildTUI
 from src.utils import resize_terminal, load_config
 
 
@@ -16,6 +17,78 @@ def show_version():
     print(f"GitHub: {__repo__}")
 
 
+def _non_negative_int(value: str) -> int:
+    """argparse 类型：非负整数"""
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"不能为负数: {value}")
+    return number
+
+
+def run_generate(args) -> int:
+    """无界面批量生成脚本，汇总结果以 JSON 输出到 stdout"""
+    from src.utils import generate_projects, read_manifest
+
+    projects = [Path(p).resolve() for p in args.projects]
+    if args.manifest:
+        try:
+            projects.extend(read_manifest(Path(args.manifest)))
+        except OSError as e:
+            print(f"读取项目清单失败: {e}", file=sys.stderr)
+            return 2
+    if not projects:
+        print("未指定任何项目（使用 --manifest 或直接传入项目目录）", file=sys.stderr)
+        return 2
+
+    installer = {"auto": None, "always": True, "never": False}[args.installer]
+    results = generate_projects(
+        projects, jobs=args.jobs, installer=installer, dry_run=args.dry_run
+    )
+    failed = [r for r in results if not r["ok"]]
+
+    # 每个项目一行进度信息输出到 stderr（dry-run 时附带 diff）
+    for result in results:
+        if not result["ok"]:
+            status = f"FAILED[{result['stage']}]"
+        else:
+            status = "changed" if result["changed"] else "unchanged"
+        print(f"{status:<20} {result['project']}: {result['message']}", file=sys.stderr)
+
+    if args.quiet:
+        return 1 if failed else 0
+
+    summary = {
+        "total": len(results),
+        "succeeded": len(results) - len(failed),
+        "failed": len(failed),
+        "changed": sum(1 for r in results if r.get("changed")),
+        "dry_run": args.dry_run,
+        "results": results,
+    }
+    if args.format == "jsonl":
+        for result in results:
+            print(json.dumps(result, ensure_ascii=False))
+    else:
+        print(json.dumps(summary, ensure_ascii=False, indent=2))
+    return 1 if failed else 0
+
+
+def run_bench_config(args) -> int:
+    """运行构建配置读写基准"""
+    from src.utils.config_bench import format_config_benchmark, run_config_benchmark
+
+    result = run_config_benchmark(
+        data_entries=args.data_entries,
+        installer_keys=args.installer_keys,
+        runs=args.runs,
+    )
+    if args.format == "json":
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    else:
+        print(format_config_benchmark(result))
+    return 0
+
+
 def main():
     """主函数"""
     # 解析命令行参数
@@ -25,6 +98,64 @@ def main():
     parser.add_argument(
         "-V", "--version", action="store_true", help="显示版本和作者信息"
     )
+    subparsers = parser.add_subparsers(dest="command")
+
+    # generate 子命令：无界面批量生成
+    generate_parser = subparsers.add_parser(
+        "generate", help="根据各项目的 build_config.yaml 批量生成构建脚本（无界面）"
+    )
+    generate_parser.add_argument(
+        "projects", nargs="*", help="项目目录（可与 --manifest 同时使用）"
+    )
+    generate_parser.add_argument(
+        "-m", "--manifest", help="项目清单文件，每行一个项目目录，# 开头为注释"
+    )
+    generate_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=_non_negative_int,
+        default=0,
+        help="并行进程数，默认使用 CPU 核数",
+    )
+    generate_parser.add_argument(
+        "--installer",
+        choices=["auto", "always", "never"],
+        default="auto",
+        help="是否生成安装包脚本，auto 表示配置中有 installer_* 字段时生成",
+    )
+    generate_parser.add_argument(
+        "-n",
+        "--dry-run",
+        action="store_true",
+        help="不写入文件，只输出将要产生的 diff",
+    )
+    generate_parser.add_argument(
+        "--format",
+        choices=["json", "jsonl"],
+        default="json",
+        help="结果格式：json 为汇总对象，jsonl 为每个项目一行",
+    )
+    generate_parser.add_argument(
+        "-q",
+        "--quiet",
+        action="store_true",
+        help="不输出 JSON 结果，只通过退出码报告成败（供 ninja/make 调用）",
+    )
+
+    # bench-config 子命令：构建配置读写基准
+    bench_parser = subparsers.add_parser(
+        "bench-config", help="测量 build_config.yaml 的解析、加载和写出耗时"
+    )
+    bench_parser.add_argument(
+        "--data-entries", type=int, default=2000, help="add_data 条目数"
+    )
+    bench_parser.add_argument(
+        "--installer-keys", type=int, default=300, help="installer_* 字段数"
+    )
+    bench_parser.add_argument("--runs", type=int, default=20, help="每项运行次数")
+    bench_parser.add_argument(
+        "--format", choices=["text", "json"], default="text", help="输出格式"
+    )
 
     args = parser.parse_args()
 
@@ -33,6 +164,14 @@ def main():
         show_version()
         sys.exit(0)
 
+    if args.command == "generate":
+        sys.exit(run_generate(args))
+    if args.command == "bench-config":
+        sys.exit(run_bench_config(args))
+
+    # 界面依赖较重，只在启动 TUI 时导入
+    from src.app import PyBuildTUI
+
     # 加载配置
     config = load_config()
     cols, rows = config["terminal_min_cols"], config["terminal_min_rows"]
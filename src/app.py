@@ -2,7 +2,6 @@
 主应用类
 """
 
-import asyncio
 from pathlib import Path
 from typing import Literal
 from textual.app import App
@@ -10,7 +9,13 @@ from textual.binding import Binding
 from textual import events
 
 from src.screens.welcome_screen import WelcomeScreen
-from src.utils import load_config, save_config
+from src.utils import (
+    WriteBehind,
+    build_config_store,
+    get_config_path,
+    load_config,
+    save_config,
+)
 
 
 SeverityLevel = Literal["information", "warning", "error"]
@@ -26,6 +31,7 @@ class PyBuildTUI(App):
 
     # 通知配置
     NOTIFICATION_TIMEOUT = 1.5  # 通知显示时长（秒）
+    CONFIG_SAVE_DELAY = 0.5  # 配置延迟写入时间（秒）
 
     # Toast 通知样式：定位到右上角
     CSS = """
@@ -66,6 +72,8 @@ class PyBuildTUI(App):
         # 加载配置
         self.config = load_config()
         self.initial_theme = self.config["theme"]
+        # 配置延迟写入：连续切换主题时只写入最后一次
+        self.config_writer = WriteBehind(delay=self.CONFIG_SAVE_DELAY)
 
     def on_mount(self) -> None:
         """应用启动时调用"""
@@ -73,6 +81,11 @@ class PyBuildTUI(App):
         self.theme = self.initial_theme
         self.push_screen(WelcomeScreen())
 
+    def on_unmount(self) -> None:
+        """退出时写回尚未保存的应用配置和构建配置"""
+        self.config_writer.flush()
+        build_config_store.flush()
+
     def notify(
         self,
         message: str,
@@ -100,8 +113,11 @@ class PyBuildTUI(App):
             self.notify(f"已切换主题: {theme}", severity="information")
         except Exception:
             pass
-        # 异步保存配置，不阻塞 UI
-        asyncio.create_task(self._async_save_theme_to_config(theme))
+        # 延迟合并写入配置，不阻塞 UI
+        self.config["theme"] = theme
+        self.config_writer.schedule(
+            get_config_path(), lambda: save_config(dict(self.config))
+        )
 
     def on_key(self, event: events.Key) -> None:
         """全局按键处理：F1..F8 切换主题"""
@@ -113,13 +129,3 @@ class PyBuildTUI(App):
     def action_noop(self) -> None:
         """空动作：用于屏蔽默认 Ctrl+P 行为"""
         return
-
-    async def _async_save_theme_to_config(self, theme: str) -> None:
-        """异步将主题写入配置文件"""
-        try:
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(
-                None, lambda: save_config({**self.config, "theme": theme})
-            )
-        except Exception:
-            pass
@@ -14,6 +14,8 @@ from src.screens.installer_config_screen import InstallerConfigScreen
 from src.screens.installer_options_screen import InstallerOptionsScreen
 from src.screens.installer_generation_screen import InstallerGenerationScreen
 from src.screens.generation_screen import GenerationScreen
+from src.screens.analysis_screen import AnalysisScreen
+from src.screens.import_scan_screen import ImportScanScreen
 from src.screens.help_screen import HelpScreen
 
 __all__ = [
@@ -29,5 +31,7 @@ __all__ = [
     "InstallerOptionsScreen",
     "InstallerGenerationScreen",
     "GenerationScreen",
+    "AnalysisScreen",
+    "ImportScanScreen",
     "HelpScreen",
 ]
@@ -0,0 +1,435 @@
+"""
+构建分析屏幕
+体积分析：展示包体积、重复文件、共享库排名和排除建议
+启动测速：多次启动构建产物，统计冷/热启动耗时
+导入耗时：以 -X importtime 运行入口文件，展示最慢的导入和排除建议
+依赖可达性：从入口文件遍历导入图，找出已安装但不可达或只经由可选路径到达的包
+"""
+
+import asyncio
+import shlex
+from pathlib import Path
+from typing import Dict, Any, List
+from textual.app import ComposeResult
+from textual.screen import Screen
+from textual.containers import Container, Horizontal, VerticalScroll
+from textual.widgets import (
+    Static,
+    LoadingIndicator,
+    Button,
+    SelectionList,
+    Input,
+    TabbedContent,
+    TabPane,
+)
+from textual.binding import Binding
+from rich.markup import escape
+
+from src.utils.dist_analyzer import (
+    analyze_dist,
+    collect_project_imports,
+    find_dist_dir,
+    format_size,
+)
+from src.utils.exclude_recommender import recommend_excludes
+from src.utils.import_profiler import (
+    parse_importtime,
+    run_importtime,
+    summarize_imports,
+)
+from src.utils.script_generator import resolve_benchmark_variants
+from src.utils.startup_bench import LAUNCH_TIMEOUT, benchmark_variants
+
+
+class AnalysisScreen(Screen):
+    """构建分析屏幕，确认后返回选中的排除建议列表（体积分析与导入耗时合并）"""
+
+    CSS_PATH = Path(__file__).parent.parent / "style" / "analysis_screen.tcss"
+
+    BINDINGS = [
+        Binding("escape", "close", "关闭", show=False),
+    ]
+
+    def __init__(self, config: Dict[str, Any], project_dir: Path):
+        super().__init__()
+        self.config = config
+        self.project_dir = project_dir
+        self.report: Dict[str, Any] | None = None
+
+    def compose(self) -> ComposeResult:
+        """创建界面组件"""
+        with Container(id="analysis-container"):
+            yield Static("构建分析", id="analysis-title")
+            with TabbedContent(id="analysis-tabs"):
+                with TabPane("体积分析", id="size-tab"):
+                    yield LoadingIndicator()
+                    yield Static("正在分析构建输出...", id="analysis-status")
+                    with VerticalScroll(id="analysis-result"):
+                        yield Static("", id="analysis-report")
+                    yield SelectionList[str](id="suggestions-list")
+                with TabPane("启动测速", id="bench-tab"):
+                    with Horizontal(id="bench-options"):
+                        yield Input(
+                            str(self.config.get("bench_runs", 10)),
+                            placeholder="测试次数",
+                            type="integer",
+                            id="bench-runs-input",
+                        )
+                        yield Input(
+                            self.config.get("bench_args", ""),
+                            placeholder="冒烟参数，如 --version",
+                            id="bench-args-input",
+                        )
+                        yield Button(
+                            "开始测速", variant="primary", id="bench-btn", flat=True
+                        )
+                    yield Static(
+                        "冷启动每次使用全新临时目录（onefile 需重新解压），"
+                        "热启动共享临时目录并预热一次",
+                        id="bench-status",
+                    )
+                    with VerticalScroll(id="bench-result"):
+                        yield Static("", id="bench-report")
+                with TabPane("导入耗时", id="import-tab"):
+                    with Horizontal(id="import-options"):
+                        yield Static(
+                            "以非 __main__ 方式运行入口文件，只执行模块级导入",
+                            id="import-status",
+                        )
+                        yield Button(
+                            "开始分析", variant="primary", id="import-btn", flat=True
+                        )
+                    with VerticalScroll(id="import-result"):
+                        yield Static("", id="import-report")
+                    yield SelectionList[str](id="import-suggestions-list")
+                with TabPane("依赖可达性", id="reach-tab"):
+                    with Horizontal(id="reach-options"):
+                        yield Static(
+                            "解析项目和已安装包的导入图，统计入口不可达的包",
+                            id="reach-status",
+                        )
+                        yield Button(
+                            "开始分析", variant="primary", id="reach-btn", flat=True
+                        )
+                    with VerticalScroll(id="reach-result"):
+                        yield Static("", id="reach-report")
+                    yield SelectionList[str](id="reach-suggestions-list")
+            with Horizontal(id="button-container"):
+                yield Button("返回", variant="warning", id="back-btn", flat=True)
+                yield Button("应用建议", variant="success", id="apply-btn", flat=True)
+
+    def on_mount(self) -> None:
+        """挂载时开始分析"""
+        self.query_one("#suggestions-list").display = False
+        self.query_one("#import-suggestions-list").display = False
+        self.query_one("#reach-suggestions-list").display = False
+        self.query_one("#apply-btn").display = False
+        self.run_worker(self._analyze(), group="size", exclusive=True)
+
+    def _run_analysis(self) -> Dict[str, Any] | None:
+        """定位输出目录并执行分析（在线程中运行）"""
+        tool = self.config.get("build_tool", "nuitka")
+        contents_dir = "."
+        if tool == "pyinstaller" and not self.config.get("onefile", True):
+            contents_dir = self.config.get("contents_directory", ".") or "."
+        dist_dir, package_root = find_dist_dir(
+            str(self.project_dir / self.config.get("output_dir", "build")),
+            self.config.get("project_name", "MyApp"),
+            self.config.get("entry_file", "main.py"),
+            tool,
+            contents_dir,
+        )
+        if not dist_dir:
+            return None
+        return analyze_dist(
+            dist_dir,
+            package_root,
+            collect_project_imports(str(self.project_dir)),
+            int(self.config.get("report_top_n", 10) or 10),
+        )
+
+    async def _analyze(self) -> None:
+        """异步执行分析"""
+        status = self.query_one("#analysis-status", Static)
+        try:
+            self.report = await asyncio.to_thread(self._run_analysis)
+        except Exception as e:
+            self.report = None
+            status.update(f"分析失败: {e}")
+            status.styles.color = "red"
+        else:
+            if self.report is None:
+                status.update("未找到构建输出目录，请先执行非单文件模式的构建")
+                status.styles.color = "yellow"
+            else:
+                self._show_report(self.report)
+        self.query_one(LoadingIndicator).display = False
+
+    def _show_report(self, report: Dict[str, Any]) -> None:
+        """展示分析结果"""
+        status = self.query_one("#analysis-status", Static)
+        status.update(
+            f"总大小 {format_size(report['total_size'])}，"
+            f"共 {report['file_count']} 个文件"
+        )
+        status.styles.color = "green"
+
+        total = report["total_size"] or 1
+        lines = ["[b]最大的包[/b]"]
+        for name, size, count in report["packages"]:
+            lines.append(
+                f"  {format_size(size):>10}  {size * 100 / total:5.1f}%  "
+                f"{escape(name)} ({count} 个文件)"
+            )
+        if report["shared_libs"]:
+            lines.append("\n[b]最大的共享库[/b]")
+            for path, size in report["shared_libs"]:
+                lines.append(f"  {format_size(size):>10}  {escape(path)}")
+        if report["duplicates"]:
+            wasted = sum(item["wasted"] for item in report["duplicates"])
+            lines.append(f"\n[b]重复文件[/b] (浪费 {format_size(wasted)})")
+            for item in report["duplicates"]:
+                lines.append(
+                    f"  {format_size(item['size']):>10}  x{len(item['paths'])}  "
+                    + escape(", ".join(item["paths"]))
+                )
+        if report["indirect"]:
+            lines.append(
+                "\n[b]未直接导入的大体积包[/b] "
+                "(可能被其他依赖导入，请先在“依赖可达性”中确认后再排除)"
+            )
+            for item in report["indirect"]:
+                lines.append(
+                    f"  {format_size(item['size']):>10}  {escape(item['module'])}"
+                )
+        self.query_one("#analysis-report", Static).update("\n".join(lines))
+
+        self._show_suggestions(
+            "#suggestions-list",
+            [
+                (
+                    f"{item['module']}  -{format_size(item['size'])}  {item['reason']}",
+                    item["module"],
+                    True,
+                )
+                for item in report["suggestions"]
+            ],
+        )
+
+    def _show_suggestions(self, list_id: str, options: List[tuple]) -> None:
+        """填充排除建议列表"""
+        if not options:
+            return
+        suggestions_list = self.query_one(list_id, SelectionList)
+        suggestions_list.clear_options()
+        suggestions_list.add_options(options)
+        key = (
+            "nofollow_imports"
+            if self.config.get("build_tool") == "nuitka"
+            else "exclude_modules"
+        )
+        suggestions_list.border_title = f"排除建议 ({key})"
+        suggestions_list.display = True
+        self.query_one("#apply-btn").display = True
+
+    def _format_bench_result(self, result: Dict[str, Any]) -> str:
+        """格式化单个变体的测速结果"""
+        label = f"[b]{escape(result['name'])}[/b] ({result['tool']} {result['mode']})"
+        if result.get("runtime_tmpdir"):
+            label += f" runtime_tmpdir={escape(result['runtime_tmpdir'])}"
+        if result.get("missing"):
+            return (
+                f"{label}\n  [yellow]未找到可执行文件: {escape(result['exe'])}[/yellow]"
+            )
+        lines = [label]
+        for kind, title in (("cold", "冷启动"), ("warm", "热启动")):
+            stats = result[kind]
+            lines.append(
+                f"  {title}  p50 {stats['p50'] * 1000:>7.0f}ms"
+                f"  p95 {stats['p95'] * 1000:>7.0f}ms"
+                f"  max {stats['max'] * 1000:>7.0f}ms"
+            )
+        if result["failures"]:
+            lines.append(f"  [red]{result['failures']} 次启动失败或超时[/red]")
+        return "\n".join(lines)
+
+    async def _benchmark(self) -> None:
+        """异步执行启动测速"""
+        status = self.query_one("#bench-status", Static)
+        report = self.query_one("#bench-report", Static)
+        button = self.query_one("#bench-btn", Button)
+        runs_value = self.query_one("#bench-runs-input", Input).value
+        runs = int(runs_value) if runs_value.isdigit() and int(runs_value) > 0 else 10
+        try:
+            args = shlex.split(self.query_one("#bench-args-input", Input).value)
+        except ValueError as e:
+            status.update(f"冒烟参数格式错误: {e}")
+            return
+
+        # 输出目录相对于项目目录
+        variants = [
+            {**variant, "output_dir": str(self.project_dir / variant["output_dir"])}
+            for variant in resolve_benchmark_variants(self.config)
+        ]
+        if not variants:
+            status.update("module/package 模式没有可执行文件，无法测速")
+            return
+
+        sections: List[str] = []
+
+        def on_progress(result: Dict[str, Any]) -> None:
+            sections.append(self._format_bench_result(result))
+            self.app.call_from_thread(report.update, "\n\n".join(sections))
+
+        button.disabled = True
+        status.update(f"正在测速：{len(variants)} 个变体，冷/热启动各 {runs} 次...")
+        try:
+            await asyncio.to_thread(
+                benchmark_variants, variants, args, runs, LAUNCH_TIMEOUT, on_progress
+            )
+            status.update("测速完成")
+        except Exception as e:
+            status.update(f"测速失败: {e}")
+        finally:
+            button.disabled = False
+
+    def _run_import_profile(self) -> Dict[str, Any]:
+        """运行入口文件并汇总导入耗时（在线程中运行）"""
+        output, timed_out = run_importtime(
+            self.project_dir, self.config.get("entry_file", "main.py")
+        )
+        summary = summarize_imports(
+            parse_importtime(output),
+            self.project_dir,
+            collect_project_imports(str(self.project_dir)),
+            int(self.config.get("report_top_n", 10) or 10),
+        )
+        summary["timed_out"] = timed_out
+        return summary
+
+    async def _profile_imports(self) -> None:
+        """异步执行导入耗时分析"""
+        status = self.query_one("#import-status", Static)
+        button = self.query_one("#import-btn", Button)
+        button.disabled = True
+        status.update("正在运行入口文件...")
+        try:
+            summary = await asyncio.to_thread(self._run_import_profile)
+        except Exception as e:
+            status.update(f"分析失败: {e}")
+            return
+        finally:
+            button.disabled = False
+
+        if not summary["module_count"]:
+            status.update("未采集到导入记录，请检查入口文件能否正常运行")
+            return
+        status.update(
+            f"共 {summary['module_count']} 个模块，导入总耗时 "
+            f"{summary['total_us'] / 1000:.0f}ms"
+            + ("（运行超时，已终止）" if summary["timed_out"] else "")
+        )
+
+        lines = ["[b]最慢的导入（含子模块）[/b]"]
+        for node in summary["slowest"]:
+            lines.append(
+                f"  {node['cumulative_us'] / 1000:>8.1f}ms  {escape(node['name'])}"
+            )
+        lines.append("\n[b]自身耗时最高的模块[/b]")
+        for node in summary["heaviest"]:
+            lines.append(f"  {node['self_us'] / 1000:>8.1f}ms  {escape(node['name'])}")
+        lines.append("\n[b]按顶层包汇总[/b]")
+        for top, self_us, count in summary["packages"]:
+            lines.append(f"  {self_us / 1000:>8.1f}ms  {escape(top)} ({count} 个模块)")
+        self.query_one("#import-report", Static).update("\n".join(lines))
+
+        # 间接导入的第三方包可能是硬依赖，默认不勾选
+        self._show_suggestions(
+            "#import-suggestions-list",
+            [
+                (
+                    f"{item['module']}  {item['self_us'] / 1000:.0f}ms  {item['reason']}",
+                    item["module"],
+                    item["recommended"],
+                )
+                for item in summary["suggestions"]
+            ],
+        )
+
+    async def _analyze_reachability(self) -> None:
+        """异步执行依赖可达性分析"""
+        status = self.query_one("#reach-status", Static)
+        button = self.query_one("#reach-btn", Button)
+        button.disabled = True
+        status.update("正在解析项目和已安装包（首次较慢，之后使用缓存）...")
+        try:
+            result = await asyncio.to_thread(
+                recommend_excludes, self.project_dir, self.config
+            )
+        except Exception as e:
+            status.update(f"分析失败: {e}")
+            return
+        finally:
+            button.disabled = False
+
+        stats = result["stats"]
+        suggestions = result["suggestions"]
+        total = sum(item["size"] for item in suggestions)
+        status.update(
+            f"Python {result['version']}，已安装 {result['installed']} 个包，"
+            f"入口必需 {len(result['reachable'])} 个，"
+            f"可排除候选 {len(suggestions)} 个（{format_size(total)}），"
+            f"耗时 {stats['seconds']:.1f}s"
+        )
+
+        lines = [f"[b]入口必需的第三方包[/b] ({len(result['reachable'])} 个)"]
+        lines.append("  " + escape(", ".join(result["reachable"]) or "无"))
+        lines.append("\n[b]排除候选（按磁盘占用排序）[/b]")
+        for item in suggestions:
+            lines.append(
+                f"  {format_size(item['size']):>10}  {escape(item['module'])}  "
+                f"{item['reason']}"
+            )
+            lines.append(f"  {'':>10}  [dim]{escape(' → '.join(item['chain']))}[/dim]")
+        self.query_one("#reach-report", Static).update("\n".join(lines))
+
+        self._show_suggestions(
+            "#reach-suggestions-list",
+            [
+                (
+                    f"{item['module']}  -{format_size(item['size'])}  {item['reason']}",
+                    item["module"],
+                    item["recommended"],
+                )
+                for item in suggestions
+            ],
+        )
+
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        """处理按钮点击"""
+        if event.button.id == "bench-btn":
+            self.run_worker(self._benchmark(), group="bench", exclusive=True)
+        elif event.button.id == "import-btn":
+            self.run_worker(self._profile_imports(), group="import", exclusive=True)
+        elif event.button.id == "reach-btn":
+            self.run_worker(self._analyze_reachability(), group="reach", exclusive=True)
+        elif event.button.id == "back-btn":
+            self.dismiss(None)
+        elif event.button.id == "apply-btn":
+            selected: List[str] = []
+            for list_id in (
+                "#suggestions-list",
+                "#import-suggestions-list",
+                "#reach-suggestions-list",
+            ):
+                suggestions_list = self.query_one(list_id, SelectionList)
+                selected.extend(
+                    module
+                    for module in suggestions_list.selected
+                    if module not in selected
+                )
+            self.dismiss(selected)
+
+    def action_close(self) -> None:
+        """关闭屏幕"""
+        self.dismiss(None)
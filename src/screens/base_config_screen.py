@@ -11,6 +11,7 @@ from textual.screen import Screen
 from textual.binding import Binding
 
 from src.utils import (
+    build_config_store,
     async_load_build_config,
     async_save_build_config,
     validate_build_config,
@@ -104,6 +105,8 @@ class BaseConfigScreen(Screen):
             self.app.notify(f"配置验证失败: {error_msg}", severity="error")
             return False
 
+        # 记录到共享缓存，其他屏幕加载时可直接使用（写回磁盘前标记为未保存）
+        build_config_store.update(self.project_dir, self.config)  # type: ignore[arg-type]
         return True
 
     async def _async_save_config(self) -> bool:
@@ -9,7 +9,7 @@ from textual.containers import Container, Vertical, Horizontal
 from textual.widgets import Static, Button, Input, Select, Label
 
 from src.screens.base_config_screen import BaseConfigScreen
-from src.utils import load_build_config
+from src.utils import build_config_store
 
 
 class CompileConfigScreen(BaseConfigScreen):
@@ -131,7 +131,7 @@ class CompileConfigScreen(BaseConfigScreen):
     def _save_config_from_ui(self) -> None:
         """从UI保存配置（只更新编译配置字段，保留打包选项）"""
         # 先加载现有配置，保留打包选项字段
-        existing_config = load_build_config(self.project_dir)  # type: ignore[arg-type]
+        existing_config = build_config_store.load(self.project_dir)  # type: ignore[arg-type]
 
         # 只更新编译配置相关的字段
         existing_config["project_name"] = self.query_one(
@@ -60,8 +60,10 @@ class GenerationScreen(Screen):
             # 显示生成动画至少 1.5 秒
             await asyncio.sleep(1.5)
 
-            # 生成脚本
-            success, message = generate_build_script(self.config, self.project_dir)
+            # 生成脚本（首次探测打包工具需要运行 --help，在线程中执行）
+            success, message = await asyncio.to_thread(
+                generate_build_script, self.config, self.project_dir
+            )
 
             self.success = success
             self.message = message
@@ -0,0 +1,149 @@
+"""
+导入扫描屏幕
+解析项目源码构建导入图，展示外部依赖和动态导入，
+确认后返回选中的选项建议，用于预填 include_packages / hidden_imports / nofollow_imports 等字段
+"""
+
+import asyncio
+from pathlib import Path
+from typing import Any, Dict, List
+from textual.app import ComposeResult
+from textual.screen import Screen
+from textual.containers import Container, Horizontal, VerticalScroll
+from textual.widgets import Static, LoadingIndicator, Button, SelectionList
+from textual.binding import Binding
+from rich.markup import escape
+
+from src.utils.import_scanner import scan_project, suggest_options
+
+
+class ImportScanScreen(Screen):
+    """导入扫描屏幕，确认后返回 {配置项: [模块名]}"""
+
+    CSS_PATH = Path(__file__).parent.parent / "style" / "import_scan_screen.tcss"
+
+    BINDINGS = [
+        Binding("escape", "close", "关闭", show=False),
+    ]
+
+    def __init__(self, config: Dict[str, Any], project_dir: Path):
+        super().__init__()
+        self.config = config
+        self.project_dir = project_dir
+        self.graph: Dict[str, Any] | None = None
+
+    def compose(self) -> ComposeResult:
+        """创建界面组件"""
+        with Container(id="scan-container"):
+            yield Static("导入扫描", id="scan-title")
+            yield LoadingIndicator()
+            yield Static("正在解析项目源码...", id="scan-status")
+            with VerticalScroll(id="scan-result"):
+                yield Static("", id="scan-report")
+            yield SelectionList[str](id="scan-suggestions-list")
+            with Horizontal(id="button-container"):
+                yield Button("返回", variant="warning", id="back-btn", flat=True)
+                yield Button("应用建议", variant="success", id="apply-btn", flat=True)
+
+    def on_mount(self) -> None:
+        """挂载时开始扫描"""
+        self.query_one("#scan-suggestions-list").display = False
+        self.query_one("#apply-btn").display = False
+        self.run_worker(self._scan(), exclusive=True)
+
+    async def _scan(self) -> None:
+        """异步扫描（解析在线程中进行，文件较多时使用进程池）"""
+        status = self.query_one("#scan-status", Static)
+        try:
+            self.graph = await asyncio.to_thread(
+                scan_project, self.project_dir, self.config
+            )
+        except Exception as e:
+            status.update(f"扫描失败: {e}")
+            status.styles.color = "red"
+        else:
+            self._show_report(self.graph)
+        self.query_one(LoadingIndicator).display = False
+
+    def _show_report(self, graph: Dict[str, Any]) -> None:
+        """展示导入图摘要"""
+        stats = graph["stats"]
+        status = self.query_one("#scan-status", Static)
+        status.update(
+            f"共 {len(graph['modules'])} 个模块，解析 {stats['parsed']} 个文件，"
+            f"{stats['cached']} 个来自缓存，耗时 {stats['seconds']:.2f}s"
+        )
+        status.styles.color = "green"
+
+        top_n = int(self.config.get("report_top_n", 10) or 10)
+        third_party = sorted(
+            (
+                (top, info)
+                for top, info in graph["external"].items()
+                if not info["stdlib"]
+            ),
+            key=lambda item: len(item[1]["importers"]),
+            reverse=True,
+        )
+        lines = [f"[b]第三方依赖[/b] ({len(third_party)} 个)"]
+        for top, info in third_party[:top_n]:
+            kinds = []
+            if info["required"]:
+                kinds.append("必需")
+            if info["dynamic"]:
+                kinds.append("动态")
+            if "optional" in info["guards"]:
+                kinds.append("可选")
+            if "typing" in info["guards"]:
+                kinds.append("类型")
+            lines.append(
+                f"  {escape(top):<24} {len(info['importers']):>4} 个模块导入  "
+                + "/".join(kinds)
+            )
+        if graph["dynamic"]:
+            lines.append(f"\n[b]动态导入[/b] ({len(graph['dynamic'])} 处)")
+            for item in graph["dynamic"][:top_n]:
+                lines.append(
+                    f"  {escape(item['target'])}  "
+                    f"({escape(item['importer'])}:{item['line']})"
+                )
+        if graph["errors"]:
+            lines.append(f"\n[b]解析失败[/b] ({len(graph['errors'])} 个文件)")
+            for path, error in list(graph["errors"].items())[:top_n]:
+                lines.append(f"  [red]{escape(path)}[/red]  {escape(error)}")
+        self.query_one("#scan-report", Static).update("\n".join(lines))
+
+        suggestions = suggest_options(graph, self.config.get("build_tool", "nuitka"))
+        if not suggestions:
+            return
+        suggestions_list = self.query_one("#scan-suggestions-list", SelectionList)
+        suggestions_list.clear_options()
+        suggestions_list.add_options(
+            [
+                (
+                    f"{item['option']}: {item['module']}  {item['reason']}",
+                    f"{item['option']}:{item['module']}",
+                    item["recommended"],
+                )
+                for item in suggestions
+            ]
+        )
+        suggestions_list.border_title = "选项建议"
+        suggestions_list.display = True
+        self.query_one("#apply-btn").display = True
+
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        """处理按钮点击"""
+        if event.button.id == "back-btn":
+            self.dismiss(None)
+        elif event.button.id == "apply-btn":
+            selected: Dict[str, List[str]] = {}
+            suggestions_list = self.query_one("#scan-suggestions-list", SelectionList)
+            for value in suggestions_list.selected:
+                option, module = value.split(":", 1)
+                selected.setdefault(option, []).append(module)
+            self.dismiss(selected)
+
+    def action_close(self) -> None:
+        """关闭屏幕"""
+        self.dismiss(None)
@@ -10,7 +10,7 @@ from textual.containers import Container, Vertical, Horizontal
 from textual.widgets import Static, Button, Input, Label, Select
 
 from src.screens.base_config_screen import BaseConfigScreen
-from src.utils import load_build_config
+from src.utils import build_config_store
 
 
 class InstallerConfigScreen(BaseConfigScreen):
@@ -138,7 +138,7 @@ class InstallerConfigScreen(BaseConfigScreen):
 
     def _save_config_from_ui(self) -> None:
         """从UI保存配置"""
-        existing_config = load_build_config(self.project_dir)  # type: ignore[arg-type]
+        existing_config = build_config_store.load(self.project_dir)  # type: ignore[arg-type]
 
         existing_config["installer_platform"] = self.query_one(
             "#platform-select", Select
@@ -21,7 +21,7 @@ from textual.widgets import (
 from textual.binding import Binding
 
 from src.utils import (
-    load_build_config,
+    build_config_store,
     async_load_build_config,
     async_save_build_config,
 )
@@ -352,7 +352,7 @@ class InstallerOptionsScreen(Screen):
 
     def _save_config_from_ui(self) -> None:
         """从UI保存配置"""
-        existing_config = load_build_config(self.project_dir)  # type: ignore[arg-type]
+        existing_config = build_config_store.load(self.project_dir)  # type: ignore[arg-type]
 
         # 基本选项
         existing_config["installer_desktop_icon"] = self.query_one(
@@ -419,6 +419,7 @@ class InstallerOptionsScreen(Screen):
     def _validate_and_save(self) -> bool:
         """验证配置"""
         self._save_config_from_ui()
+        build_config_store.update(self.project_dir, self.config)  # type: ignore[arg-type]
         return True
 
     async def _async_save_config(self) -> bool:
@@ -5,6 +5,7 @@
 
 import asyncio
 import platform
+import re
 from pathlib import Path
 from textual.app import ComposeResult
 from textual.containers import Container, Horizontal
@@ -13,11 +14,11 @@ from textual.widgets import (
     Button,
     Switch,
     Input,
-    Select,
 )
 
 from src.screens.base_config_screen import BaseConfigScreen
-from src.utils import load_build_config
+from src.utils import build_config_store
+from src.utils.option_registry import options_for_tool, widget_value
 from src.widgets import build_nuitka_options, build_pyinstaller_options
 
 
@@ -64,6 +65,8 @@ class PackageOptionsScreen(BaseConfigScreen):
             with Horizontal(id="button-container"):
                 yield Button("返回", variant="warning", id="back-btn", flat=True)
                 yield Button("保存配置", variant="primary", id="save-btn", flat=True)
+                yield Button("扫描导入", variant="default", id="scan-btn", flat=True)
+                yield Button("分析产物", variant="default", id="analyze-btn", flat=True)
                 yield Button(
                     "生成脚本", variant="success", id="generate-btn", flat=True
                 )
@@ -180,6 +183,11 @@ class PackageOptionsScreen(BaseConfigScreen):
             runtime_tmpdir_input = self.query_one("#runtime-tmpdir-input", Input)
             runtime_tmpdir_input.disabled = not is_onefile
 
+            # 附加入口文件（仅 .spec 模式）
+            use_spec_file = self.query_one("#use-spec-file-switch", Switch).value
+            extra_entry_input = self.query_one("#extra-entry-files-input", Input)
+            extra_entry_input.disabled = not use_spec_file
+
         except Exception:
             pass
 
@@ -208,188 +216,46 @@ class PackageOptionsScreen(BaseConfigScreen):
     def _save_config_from_ui(self) -> None:
         """从UI保存配置到内存（只更新打包选项字段，保留编译配置）"""
         # 先加载现有配置，保留编译配置字段
-        existing_config = load_build_config(self.project_dir)  # type: ignore[arg-type]
+        existing_config = build_config_store.load(self.project_dir)  # type: ignore[arg-type]
         build_tool = existing_config.get("build_tool", "nuitka")
 
+        # 按选项注册表读取当前构建工具界面中存在的组件
+        for option in options_for_tool(build_tool):
+            if not option["widget"]:
+                continue
+            widgets = self.query(f"#{option['widget']}")
+            if widgets:
+                existing_config[option["key"]] = widget_value(
+                    option, widgets.first().value
+                )
+
+        # 静默模式同时关闭进度显示
+        quiet_mode = existing_config["quiet_mode"]
+
         # Nuitka特有选项
         if build_tool == "nuitka":
-            # Nuitka 通用选项
-            existing_config["onefile"] = self.query_one("#onefile-switch", Switch).value
-            existing_config["show_console"] = self.query_one(
-                "#console-switch", Switch
-            ).value
-            # 静默模式配置
-            quiet_mode = self.query_one("#quiet-switch", Switch).value
-            existing_config["quiet_mode"] = quiet_mode
             existing_config["show_progress"] = not quiet_mode
-
-            # Nuitka 特有选项
-            existing_config["standalone"] = self.query_one(
-                "#standalone-switch", Switch
-            ).value
-            existing_config["remove_output"] = self.query_one(
-                "#remove-output-switch", Switch
-            ).value
-            # LTO 从下拉选择获取
-            lto_select = self.query_one("#lto-select", Select)
-            existing_config["lto"] = lto_select.value if lto_select.value else "no"
             # no_pyi_file 仅在 module/package 模式下更新，其他模式保留配置文件中的值
             mode = self.config.get("mode", "").strip().lower()
-            if mode in ("module", "package"):
-                existing_config["no_pyi_file"] = self.query_one(
-                    "#no-pyi-switch", Switch
-                ).value
-            else:
-                # 非有效模式时，保留配置文件中的值，不覆盖
+            if mode not in ("module", "package"):
                 existing_config["no_pyi_file"] = self.config.get("no_pyi_file", False)
-            existing_config["follow_imports"] = self.query_one(
-                "#follow-imports-switch", Switch
-            ).value
-            # 并行编译任务数（0或负数表示自动分配）
-            jobs_value = self.query_one("#jobs-input", Input).value
-            try:
-                existing_config["jobs"] = int(jobs_value) if jobs_value else 0
-            except ValueError:
-                existing_config["jobs"] = 0
-            # Python优化标志（开关转换为字符串）
-            python_opt = self.query_one("#python-flag-switch", Switch).value
-            existing_config["python_flag"] = "-O" if python_opt else ""
             # 插件支持 - 使用存储的插件列表
             existing_config["plugins"] = (
                 ",".join(self.selected_plugins) if self.selected_plugins else ""
             )
             # C编译器
             existing_config["compiler"] = self.selected_compiler
-            # 自动下载依赖工具
-            existing_config["assume_yes_for_downloads"] = self.query_one(
-                "#assume-yes-switch", Switch
-            ).value
-
-            # 数据导入选项
-            existing_config["include_packages"] = self.query_one(
-                "#nuitka-include-package-input", Input
-            ).value.strip()
-            existing_config["include_modules"] = self.query_one(
-                "#nuitka-include-module-input", Input
-            ).value.strip()
-            existing_config["nofollow_imports"] = self.query_one(
-                "#nuitka-nofollow-import-input", Input
-            ).value.strip()
-            existing_config["include_data_files"] = self.query_one(
-                "#nuitka-include-data-files-input", Input
-            ).value.strip()
-            existing_config["include_data_dirs"] = self.query_one(
-                "#nuitka-include-data-dir-input", Input
-            ).value.strip()
 
         # PyInstaller特有选项
         if build_tool == "pyinstaller":
-            # 静默模式配置
-            quiet_mode = self.query_one("#quiet-switch", Switch).value
-            existing_config["quiet_mode"] = quiet_mode
             existing_config["show_progressbar"] = not quiet_mode
 
-            # PyInstaller 特有选项
-            existing_config["onefile"] = self.query_one("#onefile-switch", Switch).value
-            existing_config["clean"] = self.query_one("#clean-switch", Switch).value
-            existing_config["noconfirm"] = self.query_one(
-                "#noconfirm-switch", Switch
-            ).value
-            existing_config["debug"] = self.query_one("#debug-switch", Switch).value
-
             # 内部目录名称（单文件模式下忽略）
-            if not existing_config["onefile"]:
-                contents_dir = self.query_one(
-                    "#contents-dir-input", Input
-                ).value.strip()
-                existing_config["contents_directory"] = (
-                    contents_dir if contents_dir else "."
-                )
-            else:
+            if existing_config["onefile"] or not existing_config["contents_directory"]:
                 existing_config["contents_directory"] = "."
 
-            # UAC 管理员权限
-            existing_config["uac_admin"] = self.query_one(
-                "#uac-admin-switch", Switch
-            ).value
-
-            # 隐藏导入
-            existing_config["hidden_imports"] = self.query_one(
-                "#hidden-imports-input", Input
-            ).value.strip()
-
-            # 排除模块
-            existing_config["exclude_modules"] = self.query_one(
-                "#exclude-modules-input", Input
-            ).value.strip()
-
-            # 收集子模块
-            existing_config["collect_submodules"] = self.query_one(
-                "#collect-submodules-input", Input
-            ).value.strip()
-
-            # 收集数据文件
-            existing_config["collect_data"] = self.query_one(
-                "#collect-data-input", Input
-            ).value.strip()
-
-            # 收集二进制文件
-            existing_config["collect_binaries"] = self.query_one(
-                "#collect-binaries-input", Input
-            ).value.strip()
-
-            # 收集所有
-            existing_config["collect_all"] = self.query_one(
-                "#collect-all-input", Input
-            ).value.strip()
-
-            # 添加数据文件
-            existing_config["add_data"] = self.query_one(
-                "#add-data-input", Input
-            ).value.strip()
-
-            # 添加二进制文件
-            existing_config["add_binary"] = self.query_one(
-                "#add-binary-input", Input
-            ).value.strip()
-
-            # 运行时临时目录
-            existing_config["runtime_tmpdir"] = self.query_one(
-                "#runtime-tmpdir-input", Input
-            ).value.strip()
-
-            # 目标架构
-            existing_config["target_architecture"] = self.query_one(
-                "#target-arch-input", Input
-            ).value.strip()
-
-            # 系统特性 - Windows
-            existing_config["win_version_file"] = self.query_one(
-                "#win-version-file-input", Input
-            ).value.strip()
-            existing_config["win_manifest"] = self.query_one(
-                "#win-manifest-input", Input
-            ).value.strip()
-
-            # 系统特性 - macOS
-            existing_config["osx_bundle_identifier"] = self.query_one(
-                "#osx-bundle-id-input", Input
-            ).value.strip()
-            existing_config["osx_entitlements_file"] = self.query_one(
-                "#osx-entitlements-input", Input
-            ).value.strip()
-            existing_config["codesign_identity"] = self.query_one(
-                "#codesign-identity-input", Input
-            ).value.strip()
-
-            # 启动画面图片（仅单文件模式时读取UI值）
-            if existing_config["onefile"]:
-                splash_image = self.query_one(
-                    "#splash-image-input", Input
-                ).value.strip()
-                existing_config["splash_image"] = splash_image
-            else:
-                # 非单文件模式时，保留配置文件中的值（不从被禁用的UI读取）
+            # 启动画面图片：非单文件模式时，保留配置文件中的值（不从被禁用的UI读取）
+            if not existing_config["onefile"]:
                 existing_config["splash_image"] = self.config.get("splash_image", "")
 
         # 保持列表字段
@@ -433,6 +299,14 @@ class PackageOptionsScreen(BaseConfigScreen):
             except Exception:
                 pass
 
+        # PyInstaller: 附加入口文件仅在 .spec 模式下可用
+        if event.switch.id == "use-spec-file-switch":
+            try:
+                extra_entry_input = self.query_one("#extra-entry-files-input", Input)
+                extra_entry_input.disabled = not event.value
+            except Exception:
+                pass
+
     def on_input_changed(self, event: Input.Changed) -> None:
         """处理输入框变化事件"""
         # 检查 collect_all 与其他收集选项的冲突（仅 PyInstaller）
@@ -448,8 +322,6 @@ class PackageOptionsScreen(BaseConfigScreen):
     def _check_collect_conflicts(self) -> None:
         """检查收集选项的冲突"""
         try:
-            import re
-
             # 解析输入值的辅助函数
             def parse_input(input_id: str) -> set:
                 return set(
@@ -500,6 +372,10 @@ class PackageOptionsScreen(BaseConfigScreen):
             asyncio.create_task(self.action_save_async())
         elif button_id == "generate-btn":
             self.run_worker(self._action_generate())
+        elif button_id == "analyze-btn":
+            self.run_worker(self._action_analyze())
+        elif button_id == "scan-btn":
+            self.run_worker(self._action_scan_imports())
         elif button_id == "plugins-button":
             self.run_worker(self._action_select_plugins())
         elif button_id == "compiler-button":
@@ -510,7 +386,7 @@ class PackageOptionsScreen(BaseConfigScreen):
             self._adjust_jobs(1)
 
     def _adjust_jobs(self, delta: int) -> None:
-        """调整编译线程数（0或负数表示自动分配）"""
+        """调整编译线程数（0或负数表示自动分配，auto-mem 从 0 开始调整）"""
         jobs_input = self.query_one("#jobs-input", Input)
         try:
             current_value = int(jobs_input.value) if jobs_input.value else 0
@@ -538,7 +414,7 @@ class PackageOptionsScreen(BaseConfigScreen):
 
         # 打开插件选择界面并等待结果
         result = await self.app.push_screen_wait(
-            PluginSelectorScreen(self.selected_plugins)
+            PluginSelectorScreen(self.selected_plugins, self.config, self.project_dir)
         )
 
         # 如果用户确认选择（不是取消），更新插件列表
@@ -600,3 +476,58 @@ class PackageOptionsScreen(BaseConfigScreen):
             self.app.notify("脚本生成成功！", severity="information")
         else:
             self.app.notify("脚本生成失败", severity="error")
+
+    async def _action_analyze(self) -> None:
+        """分析构建产物体积，并将选中的排除建议写入对应输入框"""
+        from src.screens.analysis_screen import AnalysisScreen
+
+        result = await self.app.push_screen_wait(
+            AnalysisScreen(self.config, self.project_dir)  # type: ignore[arg-type]
+        )
+        if not result:
+            return
+
+        input_id = (
+            "#nuitka-nofollow-import-input"
+            if self.config.get("build_tool") == "nuitka"
+            else "#exclude-modules-input"
+        )
+        added = self._append_to_input(input_id, result)
+        self.app.notify(
+            f"已添加 {added} 个排除建议，保存配置后生效", severity="information"
+        )
+
+    def _append_to_input(self, input_id: str, modules: list[str]) -> int:
+        """将模块追加到输入框（跳过已存在的），返回新增数量"""
+        target_input = self.query_one(input_id, Input)
+        current = [item for item in re.split(r"[,\s，]+", target_input.value) if item]
+        added = [module for module in modules if module not in current]
+        target_input.value = ", ".join(current + added)
+        return len(added)
+
+    async def _action_scan_imports(self) -> None:
+        """扫描项目导入图，并将选中的建议预填到对应输入框"""
+        from src.screens.import_scan_screen import ImportScanScreen
+
+        result = await self.app.push_screen_wait(
+            ImportScanScreen(self.config, self.project_dir)  # type: ignore[arg-type]
+        )
+        if not result:
+            return
+
+        # 配置项对应的输入框
+        input_ids = {
+            "include_packages": "#nuitka-include-package-input",
+            "include_modules": "#nuitka-include-module-input",
+            "nofollow_imports": "#nuitka-nofollow-import-input",
+            "hidden_imports": "#hidden-imports-input",
+            "exclude_modules": "#exclude-modules-input",
+        }
+        added = sum(
+            self._append_to_input(input_ids[option], modules)
+            for option, modules in result.items()
+            if option in input_ids
+        )
+        self.app.notify(
+            f"已预填 {added} 个导入建议，保存配置后生效", severity="information"
+        )
@@ -1,14 +1,19 @@
 """
 插件选择屏幕
-用于选择Nuitka编译插件
+用于选择Nuitka编译插件，打开时根据项目导入和已安装的包自动检测并预先勾选
 """
 
+import asyncio
 from pathlib import Path
+from typing import Any, Dict
 from textual.app import ComposeResult
 from textual.screen import Screen
 from textual.containers import Container, Horizontal
 from textual.widgets import Static, Button, SelectionList
 from textual.binding import Binding
+from rich.markup import escape
+
+from src.utils.plugin_detector import NUITKA_PLUGINS, detect_plugins
 
 
 class PluginSelectorScreen(Screen):
@@ -21,9 +26,16 @@ class PluginSelectorScreen(Screen):
         Binding("enter", "confirm", "确认"),
     ]
 
-    def __init__(self, selected_plugins: list[str] | None = None):
+    def __init__(
+        self,
+        selected_plugins: list[str] | None = None,
+        config: Dict[str, Any] | None = None,
+        project_dir: Path | None = None,
+    ):
         super().__init__()
         self.selected_plugins = selected_plugins or []
+        self.config = config or {}
+        self.project_dir = project_dir
 
     def compose(self) -> ComposeResult:
         """创建界面组件"""
@@ -33,26 +45,20 @@ class PluginSelectorScreen(Screen):
                 "选择需要启用的插件以确保第三方库的兼容性", id="plugin-description"
             )
 
-            # 常用插件列表
-            common_plugins = [
-                ("NumPy - 数值计算库", "numpy"),
-                ("PyTorch - 深度学习框架", "torch"),
-                ("TensorFlow - 深度学习框架", "tensorflow"),
-                ("Matplotlib - 数据可视化", "matplotlib"),
-                ("Tkinter - GUI工具包", "tk-inter"),
-                ("PySide6 - Qt6 GUI框架", "pyside6"),
-                ("PyQt5 - Qt5 GUI框架", "pyqt5"),
-                ("Multiprocessing - 多进程支持", "multiprocessing"),
-                ("Anti-bloat - 移除不必要依赖", "anti-bloat"),
-                ("Pandas - 数据分析库", "pandas"),
-                ("Pillow - 图像处理库", "pillow"),
-                ("SciPy - 科学计算库", "scipy"),
-            ]
-
+            # 检测完成前先显示插件目录，保留已选择的插件
             yield SelectionList[str](
                 *[
-                    (name, value, value in self.selected_plugins)
-                    for name, value in common_plugins
+                    (
+                        plugin["label"],
+                        plugin["name"],
+                        plugin["name"] in self.selected_plugins,
+                    )
+                    for plugin in NUITKA_PLUGINS
+                ],
+                *[
+                    (name, name, True)
+                    for name in self.selected_plugins
+                    if name not in {plugin["name"] for plugin in NUITKA_PLUGINS}
                 ],
                 id="plugins-list",
             )
@@ -62,6 +68,62 @@ class PluginSelectorScreen(Screen):
                 yield Button("取消", variant="warning", id="cancel-btn", flat=True)
                 yield Button("确认", variant="success", id="confirm-btn", flat=True)
 
+    def on_mount(self) -> None:
+        """挂载时开始检测"""
+        if self.project_dir is not None:
+            self.query_one("#plugin-description", Static).update(
+                "正在根据项目导入和已安装的包检测插件..."
+            )
+            self.run_worker(self._detect(), exclusive=True)
+
+    async def _detect(self) -> None:
+        """异步检测插件（导入扫描和环境查询在线程中进行，结果有缓存）"""
+        description = self.query_one("#plugin-description", Static)
+        try:
+            result = await asyncio.to_thread(
+                detect_plugins, self.project_dir, self.config
+            )
+        except Exception as e:
+            description.update(f"自动检测失败，请手动选择: {escape(str(e))}")
+            description.styles.color = "red"
+            return
+        self._show_detection(result)
+
+    def _show_detection(self, result: Dict[str, Any]) -> None:
+        """按检测结果重建插件列表，标签中显示原因"""
+        detected = result["plugins"]
+        options = []
+        known = set()
+        for plugin in NUITKA_PLUGINS:
+            name = plugin["name"]
+            known.add(name)
+            info = detected.get(name, {"enable": None, "reason": ""})
+            # 无法自动判断的插件保留用户原来的选择
+            if info["enable"] is None:
+                checked = name in self.selected_plugins
+            else:
+                checked = info["enable"]
+            label = plugin["label"]
+            if info["reason"]:
+                label += f"  [dim]{escape(info['reason'])}[/dim]"
+            options.append((label, name, checked))
+        options.extend(
+            (name, name, True) for name in self.selected_plugins if name not in known
+        )
+        # 检测到的插件排在前面
+        options.sort(key=lambda option: not option[2])
+
+        plugins_list = self.query_one("#plugins-list", SelectionList)
+        plugins_list.clear_options()
+        plugins_list.add_options(options)
+
+        enabled = sum(1 for option in options if option[2])
+        source = "缓存的环境信息" if result["cached"] else "目标环境"
+        self.query_one("#plugin-description", Static).update(
+            f"已预先勾选 {enabled} 个插件（基于项目导入和{source} "
+            f"{escape(result['python'])}）"
+        )
+
     def on_button_pressed(self, event: Button.Pressed) -> None:
         """处理按钮点击事件"""
         button_id = event.button.id
@@ -10,11 +10,16 @@ from src.utils.build_config import (
     async_load_build_config,
     async_save_build_config,
     validate_build_config,
+    resolve_build_targets,
     get_build_config_path,
+    build_config_store,
+    BuildConfigStore,
     DEFAULT_BUILD_CONFIG,
 )
+from src.utils.file_writer import WriteBehind, atomic_write_text
 from src.utils.script_generator import generate_build_script
 from src.utils.installer_generator import generate_installer_script
+from src.utils.batch_generator import generate_projects, read_manifest
 
 __all__ = [
     "resize_terminal",
@@ -27,8 +32,15 @@ __all__ = [
     "async_load_build_config",
     "async_save_build_config",
     "validate_build_config",
+    "resolve_build_targets",
     "get_build_config_path",
+    "build_config_store",
+    "BuildConfigStore",
     "DEFAULT_BUILD_CONFIG",
+    "WriteBehind",
+    "atomic_write_text",
     "generate_build_script",
     "generate_installer_script",
+    "generate_projects",
+    "read_manifest",
 ]
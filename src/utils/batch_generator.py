@@ -0,0 +1,155 @@
+"""
+批量生成模块
+无界面模式下为多个项目加载、验证配置并生成构建脚本，使用进程池并行处理
+"""
+
+import contextlib
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.utils.build_config import (
+    get_build_config_path,
+    load_build_config,
+    validate_build_config,
+)
+from src.utils.file_writer import UNCHANGED, describe_writes, write_scripts
+from src.utils.installer_generator import (
+    has_installer_config,
+    write_installer_script,
+)
+from src.utils.script_generator import check_tool_flags, render_build_scripts
+
+
+def read_manifest(manifest: Path) -> List[Path]:
+    """
+    读取项目清单
+    每行一个项目目录，忽略空行和 # 开头的注释，相对路径以清单所在目录为基准
+    """
+    base_dir = manifest.resolve().parent
+    projects = []
+    seen = set()
+    for line in manifest.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        path = Path(os.path.expanduser(line))
+        if not path.is_absolute():
+            path = base_dir / path
+        path = path.resolve()
+        if path not in seen:
+            seen.add(path)
+            projects.append(path)
+    return projects
+
+
+def generate_project(
+    project_dir: Path, installer: Optional[bool] = None, dry_run: bool = False
+) -> Dict[str, Any]:
+    """
+    为单个项目生成脚本
+
+    Args:
+        project_dir: 项目目录（必须包含 build_config.yaml）
+        installer: 是否生成安装包脚本，None 表示配置中有 installer_* 字段时生成
+        dry_run: 不写入文件，message 中附带 unified diff
+
+    Returns:
+        包含 project / ok / stage / message / files / seconds 的结果，
+        stage 为失败所在的阶段（load / validate / probe / build / installer），
+        files 为各构建脚本和安装包脚本的写入状态（created / updated / unchanged），
+        changed 表示其中是否有脚本发生变化
+    """
+    start = time.perf_counter()
+    result: Dict[str, Any] = {"project": str(project_dir), "ok": False}
+
+    def finish(stage: str, message: str, ok: bool = False) -> Dict[str, Any]:
+        result.update(
+            ok=ok,
+            stage=stage,
+            message=message,
+            seconds=round(time.perf_counter() - start, 3),
+        )
+        return result
+
+    # 各步骤的打印信息输出到 stderr，保持 stdout 上的汇总结果可解析
+    with contextlib.redirect_stdout(sys.stderr):
+        if not project_dir.is_dir():
+            return finish("load", "项目目录不存在")
+        if not get_build_config_path(project_dir).is_file():
+            return finish("load", "缺少 build_config.yaml")
+        # 配置损坏时报告失败，不能按默认配置覆盖该项目的构建脚本
+        try:
+            config = load_build_config(project_dir, strict=True)
+        except Exception as e:
+            return finish("load", f"读取 build_config.yaml 失败: {e}")
+        result["build_tool"] = config.get("build_tool", "")
+
+        valid, error = validate_build_config(config, project_dir)
+        if not valid:
+            return finish("validate", error)
+
+        try:
+            supported, error = check_tool_flags(config, project_dir)
+        except Exception as e:
+            return finish("probe", f"探测打包工具失败: {e}")
+        if not supported:
+            return finish("probe", error)
+
+        try:
+            scripts = render_build_scripts(config, project_dir)
+            writes = write_scripts(
+                scripts, project_dir, executable=True, dry_run=dry_run
+            )
+        except Exception as e:
+            return finish("build", f"生成脚本失败: {e}")
+        messages = [describe_writes(writes, dry_run)]
+
+        if installer if installer is not None else has_installer_config(config):
+            try:
+                installer_writes = write_installer_script(config, project_dir, dry_run)
+            except Exception as e:
+                return finish("installer", f"生成安装包脚本失败: {e}")
+            writes += installer_writes
+            messages.append(describe_writes(installer_writes, dry_run))
+        result["files"] = {w["name"]: w["status"] for w in writes}
+        result["changed"] = any(w["status"] != UNCHANGED for w in writes)
+
+    return finish("done", "\n".join(messages), ok=True)
+
+
+def generate_projects(
+    projects: List[Path],
+    jobs: int = 0,
+    installer: Optional[bool] = None,
+    dry_run: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    并行为多个项目生成脚本，结果顺序与 projects 一致
+
+    Args:
+        projects: 项目目录列表
+        jobs: 并行进程数，0 表示使用 CPU 核数（不能为负数）
+        installer / dry_run: 同 generate_project
+    """
+    if jobs < 0:
+        raise ValueError(f"并行进程数不能为负数: {jobs}")
+    if not projects:
+        return []
+    workers = min(jobs or os.cpu_count() or 1, len(projects))
+    if workers == 1:
+        return [generate_project(path, installer, dry_run) for path in projects]
+    count = len(projects)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(
+            executor.map(
+                generate_project,
+                projects,
+                [installer] * count,
+                [dry_run] * count,
+                chunksize=4,
+            )
+        )
@@ -4,73 +4,91 @@
 """
 
 import asyncio
+import copy
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 import platform
+import re
+import threading
 
 import yaml
 
-
-# 默认构建配置
-DEFAULT_BUILD_CONFIG = {
-    "project_name": "MyApp",
-    "version": "1.0.0",
-    "company_name": "",
-    "entry_file": "main.py",
-    "icon_file": "",
-    "build_tool": "pyinstaller",  # pyinstaller | nuitka
-    "output_dir": "dist",
-    # Nuitka 编译模式（推荐使用）
-    # 可选值: accelerated, standalone, onefile, app, app-dist, module, package
-    # 空字符串表示自动根据 standalone/onefile 组合决定
-    "mode": "",
-    # 向后兼容配置（仅在 mode 为空时生效）
-    "standalone": True,
-    "onefile": True,
-    "show_console": False,
-    "quiet_mode": False,
-    # Nuitka特有
-    "remove_output": True,
-    "show_progress": True,
-    "lto": "no",  # yes/no/auto - 链接时优化
-    "jobs": 0,  # 0或负数表示自动分配，正数表示指定线程数
-    "python_flag": "",  # 空字符串表示不使用，可选值: "-O", "no_asserts", "no_docstrings"
-    "compiler": "msvc",
-    "no_pyi_file": False,
-    "follow_imports": True,  # 跟随所有导入的模块
-    "assume_yes_for_downloads": False,  # 自动下载依赖工具
-    # Nuitka 数据导入选项
-    "include_packages": "",  # 包含的包
-    "include_modules": "",  # 包含的模块
-    "nofollow_imports": "",  # 不跟随的导入
-    "include_data_files": "",  # 数据文件
-    "include_data_dirs": "",  # 数据目录
-    # PyInstaller特有
-    "clean": True,
-    "noconfirm": False,
-    "debug": False,
-    "contents_directory": ".",
-    "uac_admin": False,
-    "hidden_imports": "",
-    "exclude_modules": "",
-    "add_data": "",
-    "add_binary": "",
-    "splash_image": "",
-    "collect_submodules": "",
-    "collect_data": "",
-    "collect_binaries": "",
-    "collect_all": "",
-    "runtime_tmpdir": "",
-    "target_architecture": "",
-    # 系统特性
-    "win_version_file": "",
-    "win_manifest": "",
-    "osx_bundle_identifier": "",
-    "osx_entitlements_file": "",
-    "codesign_identity": "",
-    "plugins": [],
-    "exclude_packages": [],
-}
+from src.utils.data_collector import translate_pattern
+from src.utils.file_writer import atomic_write_text, file_lock
+from src.utils.option_registry import (
+    BUILD_OPTIONS,
+    BUILD_OPTIONS_BY_KEY,
+    SAVE_SECTIONS,
+    coerce_option,
+    default_build_config,
+)
+
+
+# YAML 中以这些字符开头的值需要加引号（glob 和排除模式常以 * ! 开头）
+_YAML_SPECIAL_START = tuple("*!&%@`'\"[]{}|>#,?:-")
+
+
+def _yaml_text(value: Any) -> str:
+    """需要时为字符串值加单引号，避免被 YAML 解析为别名、标签等"""
+    text = str(value)
+    if text.startswith(_YAML_SPECIAL_START) or " #" in text or ": " in text:
+        return "'" + text.replace("'", "''") + "'"
+    return text
+
+
+# 安装包配置字段（由安装包界面维护，不在选项注册表中）
+INSTALLER_KEYS = [
+    ("installer_platform", "目标平台"),
+    ("installer_app_name", "应用名称"),
+    ("installer_version", "版本号"),
+    ("installer_publisher", "发布者"),
+    ("installer_exe_name", "可执行文件名"),
+    ("installer_source_dir", "源文件目录"),
+    ("installer_url", "应用网址"),
+    ("installer_output_dir", "输出目录"),
+    ("installer_icon", "图标文件"),
+    ("installer_install_dir", "安装目录"),
+    ("installer_license", "许可协议"),
+    ("installer_readme", "自述文件"),
+    ("installer_appid", "AppId"),
+    ("installer_privileges", "安装权限"),
+    ("installer_compression", "压缩方式"),
+    ("installer_path_scope", "PATH作用域"),
+    ("installer_custom_suffix", "安装包自定义后缀"),
+    ("installer_file_assoc", "关联文件类型"),
+    ("installer_extra_shortcuts", "额外快捷方式"),
+]
+
+INSTALLER_BOOL_KEYS = [
+    ("installer_desktop_icon", "桌面快捷方式"),
+    ("installer_start_menu", "开始菜单"),
+    ("installer_add_path", "添加到PATH"),
+    ("installer_run_after", "安装后运行"),
+    ("installer_uninstall_old", "更新时卸载旧版本"),
+]
+
+
+# 保存时由本程序管理的字段：不需要写出时从已有文件中移除，其余未知字段原样保留
+MANAGED_KEYS = frozenset(
+    [option["key"] for option in BUILD_OPTIONS]
+    + [key for key, _ in INSTALLER_KEYS + INSTALLER_BOOL_KEYS]
+)
+
+# 有 LibYAML 时使用 C 实现的解析器和生成器，否则回退到纯 Python 实现
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+# render_build_config 写出的分组标题，合并后分组为空时一并移除
+_SECTION_HEADERS = frozenset(
+    [f"# {title}\n" for _, title in SAVE_SECTIONS]
+    + ["# 插件\n", "# 排除的包\n", "# 构建矩阵\n", "# 构建对比\n", "# 安装包配置\n"]
+)
+
+_TOP_LEVEL_KEY = re.compile(r"^([A-Za-z_][\w-]*)\s*:(?:\s|$)")
+
+
+# 默认构建配置（由选项注册表生成，各字段说明见 option_registry.BUILD_OPTIONS）
+DEFAULT_BUILD_CONFIG = default_build_config()
 
 
 def get_build_config_path(project_dir: Path) -> Path:
@@ -78,48 +96,33 @@ def get_build_config_path(project_dir: Path) -> Path:
     return project_dir / "build_config.yaml"
 
 
-def load_build_config(project_dir: Path) -> Dict[str, Any]:
+def load_build_config(project_dir: Path, strict: bool = False) -> Dict[str, Any]:
     """
     从项目目录加载构建配置
-    如果文件不存在，返回默认配置
+    如果文件不存在，返回默认配置；读取或解析失败时打印错误并使用默认配置，
+    strict 为 True 时改为抛出异常（OSError / yaml.YAMLError / ValueError）
     """
-    config = DEFAULT_BUILD_CONFIG.copy()
+    config = default_build_config()
     path = get_build_config_path(project_dir)
 
     try:
         if path.exists():
             with path.open("r", encoding="utf-8") as f:
-                loaded = yaml.safe_load(f)
-                if loaded and isinstance(loaded, dict):
-                    # 合并加载的配置到默认配置
+                loaded = yaml.load(f, Loader=YAML_LOADER)
+                if loaded is not None and not isinstance(loaded, dict):
+                    raise ValueError("顶层必须是键值映射")
+                if loaded:
+                    # 合并加载的配置到默认配置，并按注册表转换类型
                     for key, value in loaded.items():
-                        if key in DEFAULT_BUILD_CONFIG:
-                            # 类型转换以匹配默认配置的类型
-                            default_value = DEFAULT_BUILD_CONFIG[key]
-                            if isinstance(default_value, bool) and not isinstance(
-                                value, bool
-                            ):
-                                config[key] = str(value).lower() in ["true", "yes", "1"]
-                            elif isinstance(default_value, int) and not isinstance(
-                                value, int
-                            ):
-                                try:
-                                    config[key] = int(value)
-                                except (ValueError, TypeError):
-                                    pass
-                            elif isinstance(default_value, list) and isinstance(
-                                value, str
-                            ):
-                                # 字符串转列表（逗号分隔）
-                                config[key] = [
-                                    v.strip() for v in value.split(",") if v.strip()
-                                ]
-                            else:
-                                config[key] = value
+                        option = BUILD_OPTIONS_BY_KEY.get(key)
+                        if option:
+                            config[key] = coerce_option(option, value)
                         else:
-                            # 不在默认配置中的字段（如 installer_* ），直接保存
+                            # 不在注册表中的字段（如 installer_* ），直接保存
                             config[key] = value
     except Exception as e:
+        if strict:
+            raise
         print(f"加载构建配置失败: {e}")
 
     # 根据操作系统设置默认编译器（如果未指定）
@@ -135,204 +138,284 @@ def load_build_config(project_dir: Path) -> Dict[str, Any]:
     return config
 
 
-def save_build_config(project_dir: Path, config: Dict[str, Any]) -> bool:
-    """
-    保存构建配置到项目目录
-    返回是否成功
-    """
-    try:
-        path = get_build_config_path(project_dir)
-
-        lines = []
-        lines.append("# build_config.yaml - 项目构建配置\n")
-        lines.append("\n")
-        lines.append("# 项目基本信息\n")
-        lines.append(f"project_name: {config['project_name']}\n")
-        lines.append(f"version: {config['version']}\n")
-        if config.get("company_name"):
-            lines.append(f"company_name: {config['company_name']}\n")
-        lines.append(f"entry_file: {config['entry_file']}\n")
-        if config.get("icon_file"):
-            lines.append(f"icon_file: {config['icon_file']}\n")
+def _option_line(option: Dict[str, Any], config: Dict[str, Any]) -> str:
+    """按选项的保存规则生成一行 YAML，不需要写出时返回空字符串"""
+    value = config.get(option["key"], option["default"])
+    if option["save"] == "truthy" and not value:
+        return ""
+    if option["save"] == "changed" and value == option["default"]:
+        return ""
+    if option["kind"] == "choice":
+        value = coerce_option(option, value)
+    if isinstance(value, bool):
+        text = str(value).lower()
+    elif option["quote"] == "always":
+        text = "'" + str(value).replace("'", "''") + "'"
+    elif option["quote"] == "auto":
+        text = _yaml_text(value)
+    else:
+        text = str(value)
+    if option["note"]:
+        text += f"  # {option['note']}"
+    return f"{option['key']}: {text}\n"
+
+
+def render_build_config(config: Dict[str, Any]) -> str:
+    """按标准格式生成 build_config.yaml 的内容"""
+    lines = []
+    lines.append("# build_config.yaml - 项目构建配置\n")
+    lines.append("\n")
+    build_tool = config.get("build_tool")
+    for section, title in SAVE_SECTIONS:
+        lines.append(f"# {title}\n")
+        for option in BUILD_OPTIONS:
+            if option["section"] != section or option["tool"] not in (
+                None,
+                build_tool,
+            ):
+                continue
+            line = _option_line(option, config)
+            if line:
+                lines.append(line)
         lines.append("\n")
 
-        lines.append("# 构建配置\n")
-        lines.append(f"build_tool: {config['build_tool']}\n")
-        lines.append(f"output_dir: {config['output_dir']}\n")
-        lines.append(f"quiet_mode: {str(config.get('quiet_mode', False)).lower()}\n")
-        lines.append("\n")
+    # 插件列表
+    plugins = config.get("plugins")
+    if plugins:
+        lines.append("# 插件\n")
+        # 如果plugins是字符串，转换为列表
+        if isinstance(plugins, str):
+            plugin_list = [p.strip() for p in plugins.split(",") if p.strip()]
+        else:
+            plugin_list = plugins
+
+        if plugin_list:
+            lines.append("plugins:\n")
+            for plugin in plugin_list:
+                lines.append(f"  - {plugin}\n")
+            lines.append("\n")
 
-        lines.append("# 打包选项\n")
-        lines.append(f"onefile: {str(config['onefile']).lower()}\n")
-        lines.append(f"show_console: {str(config['show_console']).lower()}\n")
+    # 排除包列表
+    if config.get("exclude_packages"):
+        lines.append("# 排除的包\n")
+        lines.append("exclude_packages:\n")
+        for pkg in config["exclude_packages"]:
+            lines.append(f"  - {pkg}\n")
+        lines.append("\n")
 
-        # Nuitka特有选项
-        if config.get("build_tool") == "nuitka":
-            lines.append(f"standalone: {str(config.get('standalone', True)).lower()}\n")
-            lines.append(
-                f"remove_output: {str(config.get('remove_output', True)).lower()}\n"
-            )
-            lines.append(
-                f"show_progress: {str(config.get('show_progress', True)).lower()}\n"
-            )
-            lto = config.get("lto", "no")
-            # 兼容旧的布尔值
-            if isinstance(lto, bool):
-                lto = "yes" if lto else "no"
-            lines.append(f"lto: {lto}  # yes/no/auto\n")
-            lines.append(f"jobs: {config.get('jobs', 0)}  # 0或负数=自动分配\n")
-            python_flag = config.get("python_flag", "")
-            if python_flag:
-                lines.append(f"python_flag: {python_flag}\n")
-            lines.append(f"compiler: {config.get('compiler', 'msvc')}\n")
-            lines.append(
-                f"no_pyi_file: {str(config.get('no_pyi_file', False)).lower()}\n"
-            )
-            lines.append(
-                f"follow_imports: {str(config.get('follow_imports', True)).lower()}\n"
+    # 多目标构建矩阵
+    targets = config.get("targets")
+    if targets and isinstance(targets, list):
+        lines.append("# 构建矩阵\n")
+        lines.append(
+            yaml.dump(
+                {"targets": targets},
+                Dumper=YAML_DUMPER,
+                allow_unicode=True,
+                sort_keys=False,
+                default_flow_style=False,
             )
-            lines.append(
-                f"assume_yes_for_downloads: {str(config.get('assume_yes_for_downloads', False)).lower()}\n"
-            )
-            # Nuitka 数据导入选项
-            if config.get("include_packages"):
-                lines.append(f"include_packages: {config.get('include_packages')}\n")
-            if config.get("include_modules"):
-                lines.append(f"include_modules: {config.get('include_modules')}\n")
-            if config.get("nofollow_imports"):
-                lines.append(f"nofollow_imports: {config.get('nofollow_imports')}\n")
-            if config.get("include_data_files"):
-                lines.append(
-                    f"include_data_files: {config.get('include_data_files')}\n"
-                )
-            if config.get("include_data_dirs"):
-                lines.append(f"include_data_dirs: {config.get('include_data_dirs')}\n")
-
-        # PyInstaller特有选项
-        if config.get("build_tool") == "pyinstaller":
-            lines.append(f"clean: {str(config.get('clean', True)).lower()}\n")
-            lines.append(f"noconfirm: {str(config.get('noconfirm', False)).lower()}\n")
-            lines.append(f"debug: {str(config.get('debug', False)).lower()}\n")
-            lines.append(
-                f"show_progressbar: {str(config.get('show_progressbar', True)).lower()}\n"
-            )
-            lines.append(
-                f"contents_directory: {config.get('contents_directory', '.')}\n"
+        )
+        if config.get("matrix_workers"):
+            lines.append(f"matrix_workers: {config['matrix_workers']}\n")
+        lines.append("\n")
+
+    # 构建配置对比
+    compare = config.get("compare")
+    if compare and isinstance(compare, list):
+        lines.append("# 构建对比\n")
+        lines.append(
+            yaml.dump(
+                {"compare": compare},
+                Dumper=YAML_DUMPER,
+                allow_unicode=True,
+                sort_keys=False,
+                default_flow_style=False,
             )
-            lines.append(f"uac_admin: {str(config.get('uac_admin', False)).lower()}\n")
-            if config.get("hidden_imports"):
-                lines.append(f"hidden_imports: {config.get('hidden_imports')}\n")
-            if config.get("exclude_modules"):
-                lines.append(f"exclude_modules: {config.get('exclude_modules')}\n")
-            if config.get("collect_submodules"):
-                lines.append(
-                    f"collect_submodules: {config.get('collect_submodules')}\n"
-                )
-            if config.get("collect_data"):
-                lines.append(f"collect_data: {config.get('collect_data')}\n")
-            if config.get("collect_binaries"):
-                lines.append(f"collect_binaries: {config.get('collect_binaries')}\n")
-            if config.get("collect_all"):
-                lines.append(f"collect_all: {config.get('collect_all')}\n")
-            if config.get("add_data"):
-                lines.append(f"add_data: {config.get('add_data')}\n")
-            if config.get("add_binary"):
-                lines.append(f"add_binary: {config.get('add_binary')}\n")
-            if config.get("splash_image"):
-                lines.append(f"splash_image: {config.get('splash_image')}\n")
-            if config.get("runtime_tmpdir"):
-                lines.append(f"runtime_tmpdir: {config.get('runtime_tmpdir')}\n")
-            if config.get("target_architecture"):
-                lines.append(
-                    f"target_architecture: {config.get('target_architecture')}\n"
-                )
-            if config.get("win_version_file"):
-                lines.append(f"win_version_file: {config.get('win_version_file')}\n")
-            if config.get("win_manifest"):
-                lines.append(f"win_manifest: {config.get('win_manifest')}\n")
-            if config.get("osx_bundle_identifier"):
-                lines.append(
-                    f"osx_bundle_identifier: {config.get('osx_bundle_identifier')}\n"
-                )
-            if config.get("osx_entitlements_file"):
-                lines.append(
-                    f"osx_entitlements_file: {config.get('osx_entitlements_file')}\n"
-                )
-            if config.get("codesign_identity"):
-                lines.append(f"codesign_identity: {config.get('codesign_identity')}\n")
+        )
+        if config.get("compare_benchmark"):
+            benchmark = str(config["compare_benchmark"]).replace("'", "''")
+            lines.append(f"compare_benchmark: '{benchmark}'\n")
+        lines.append(f"compare_runs: {config.get('compare_runs', 3)}\n")
+        lines.append("\n")
 
+    # 安装包配置
+    # 检查是否有安装包配置
+    has_installer_config = any(config.get(key) for key, _ in INSTALLER_KEYS)
+    has_installer_bool = any(key in config for key, _ in INSTALLER_BOOL_KEYS)
+
+    if has_installer_config or has_installer_bool:
+        lines.append("# 安装包配置\n")
+        for key, comment in INSTALLER_KEYS:
+            if config.get(key):
+                lines.append(f"{key}: {config[key]}\n")
+        for key, comment in INSTALLER_BOOL_KEYS:
+            if key in config:
+                lines.append(f"{key}: {str(config[key]).lower()}\n")
         lines.append("\n")
 
-        # 插件列表
-        plugins = config.get("plugins")
-        if plugins:
-            lines.append("# 插件\n")
-            # 如果plugins是字符串，转换为列表
-            if isinstance(plugins, str):
-                plugin_list = [p.strip() for p in plugins.split(",") if p.strip()]
-            else:
-                plugin_list = plugins
-
-            if plugin_list:
-                lines.append("plugins:\n")
-                for plugin in plugin_list:
-                    lines.append(f"  - {plugin}\n")
-                lines.append("\n")
-
-        # 排除包列表
-        if config.get("exclude_packages"):
-            lines.append("# 排除的包\n")
-            lines.append("exclude_packages:\n")
-            for pkg in config["exclude_packages"]:
-                lines.append(f"  - {pkg}\n")
-            lines.append("\n")
+    return "".join(lines)
 
-        # 安装包配置
-        installer_keys = [
-            ("installer_platform", "目标平台"),
-            ("installer_app_name", "应用名称"),
-            ("installer_version", "版本号"),
-            ("installer_publisher", "发布者"),
-            ("installer_exe_name", "可执行文件名"),
-            ("installer_source_dir", "源文件目录"),
-            ("installer_url", "应用网址"),
-            ("installer_output_dir", "输出目录"),
-            ("installer_icon", "图标文件"),
-            ("installer_install_dir", "安装目录"),
-            ("installer_license", "许可协议"),
-            ("installer_readme", "自述文件"),
-            ("installer_appid", "AppId"),
-            ("installer_privileges", "安装权限"),
-            ("installer_compression", "压缩方式"),
-            ("installer_path_scope", "PATH作用域"),
-            ("installer_custom_suffix", "安装包自定义后缀"),
-            ("installer_file_assoc", "关联文件类型"),
-            ("installer_extra_shortcuts", "额外快捷方式"),
-        ]
-
-        installer_bool_keys = [
-            ("installer_desktop_icon", "桌面快捷方式"),
-            ("installer_start_menu", "开始菜单"),
-            ("installer_add_path", "添加到PATH"),
-            ("installer_run_after", "安装后运行"),
-            ("installer_uninstall_old", "更新时卸载旧版本"),
-        ]
-
-        # 检查是否有安装包配置
-        has_installer_config = any(config.get(key) for key, _ in installer_keys)
-        has_installer_bool = any(key in config for key, _ in installer_bool_keys)
-
-        if has_installer_config or has_installer_bool:
-            lines.append("# 安装包配置\n")
-            for key, comment in installer_keys:
-                if config.get(key):
-                    lines.append(f"{key}: {config[key]}\n")
-            for key, comment in installer_bool_keys:
-                if key in config:
-                    lines.append(f"{key}: {str(config[key]).lower()}\n")
-            lines.append("\n")
 
-        path.write_text("".join(lines), encoding="utf-8")
+def _top_level_blocks(text: str) -> List[tuple]:
+    """
+    将 YAML 文本按顶层字段切分为块
+    返回 [(字段名或 None, 行列表)]，None 表示注释、空行等不属于任何字段的行
+    """
+    blocks: List[tuple] = []
+    pending: List[str] = []  # 字段后的空行，之后仍有缩进行时属于该字段
+    for line in text.splitlines(keepends=True):
+        match = _TOP_LEVEL_KEY.match(line)
+        if match:
+            if pending:
+                blocks.append((None, pending))
+                pending = []
+            blocks.append((match.group(1), [line]))
+        elif line[:1] in (" ", "\t", "-") and blocks and blocks[-1][0]:
+            blocks[-1][1].extend(pending)
+            pending = []
+            blocks[-1][1].append(line)
+        elif not line.strip() and blocks and blocks[-1][0]:
+            pending.append(line)
+        else:
+            if pending:
+                blocks.append((None, pending))
+                pending = []
+            blocks.append((None, [line]))
+    if pending:
+        blocks.append((None, pending))
+    return blocks
+
+
+def _inline_comment(line: str) -> str:
+    """返回单行字段的行尾注释（含前面的空白），没有时返回空字符串"""
+    quote = ""
+    for index, char in enumerate(line):
+        if quote:
+            if char == quote:
+                quote = ""
+        elif char in ("'", '"'):
+            quote = char
+        elif char == "#" and index and line[index - 1] in " \t":
+            start = index
+            while start and line[start - 1] in " \t":
+                start -= 1
+            return line[start:].rstrip("\r\n")
+    return ""
+
+
+def merge_build_config(existing: str, rendered: str) -> str:
+    """
+    将新生成的配置合并到已有文件中，保留用户的注释、字段顺序和未知字段
+
+    - 值未变化的字段保留原文（包括引号风格和行尾注释）
+    - 值变化的字段替换为新内容，单行字段保留原有的行尾注释
+    - 本程序管理但不再需要写出的字段被移除，未知字段原样保留
+    - 新增字段插入到标准格式中前一个字段之后
+    """
+    try:
+        old_data = yaml.load(existing, Loader=YAML_LOADER)
+        new_data = yaml.load(rendered, Loader=YAML_LOADER)
+    except yaml.YAMLError:
+        return rendered
+    if not isinstance(old_data, dict) or not isinstance(new_data, dict):
+        return rendered
+    if not existing.endswith("\n"):
+        existing += "\n"
+
+    # 标准格式中的字段块，以及每个字段前的注释和空行（新增整组字段时一并插入）
+    rendered_blocks = {}
+    rendered_order = []
+    gap: List[str] = []
+    for key, lines in _top_level_blocks(rendered):
+        if key is None:
+            gap.extend(lines)
+        else:
+            rendered_blocks[key] = (lines, gap)
+            rendered_order.append(key)
+            gap = []
+
+    merged: List[tuple] = []
+    seen = set()
+    for key, lines in _top_level_blocks(existing):
+        if key is None or (key not in rendered_blocks and key not in MANAGED_KEYS):
+            merged.append((key, lines))
+            continue
+        if key not in rendered_blocks or key in seen:
+            # 不再需要写出的字段，或重复的字段
+            continue
+        seen.add(key)
+        new_lines = rendered_blocks[key][0]
+        if key in old_data and old_data[key] == new_data.get(key):
+            merged.append((key, lines))
+            continue
+        comment = _inline_comment(lines[0]) if len(lines) == 1 else ""
+        if comment and len(new_lines) == 1 and not _inline_comment(new_lines[0]):
+            new_lines = [new_lines[0].rstrip("\n") + comment + "\n"]
+        merged.append((key, new_lines))
+
+    # 新增字段跟在标准格式中的前一个已有字段之后
+    inserts: Dict[Any, List[str]] = {}
+    anchor = None
+    for key in rendered_order:
+        if key in seen:
+            anchor = key
+            continue
+        lines, gap = rendered_blocks[key]
+        gap_comments = [line for line in gap if line.strip()]
+        if gap_comments and not any(line in existing for line in gap_comments):
+            lines = gap + lines
+        inserts.setdefault(anchor, []).extend(lines)
+
+    output: List[str] = []
+    head = inserts.pop(None, [])
+    for key, lines in merged:
+        if head and key in seen:
+            output.extend(head)
+            head = []
+        output.extend(lines)
+        output.extend(inserts.get(key, []) if key in seen else [])
+    output.extend(head)
+    return "".join(_drop_empty_sections(output))
+
+
+def _drop_empty_sections(lines: List[str]) -> List[str]:
+    """移除字段已全部删除的分组标题（及其后的一个空行）"""
+    result: List[str] = []
+    index = 0
+    while index < len(lines):
+        line = lines[index]
+        if line in _SECTION_HEADERS:
+            following = index + 1
+            while following < len(lines) and not lines[following].strip():
+                following += 1
+            if following == len(lines) or lines[following] in _SECTION_HEADERS:
+                index += (
+                    2 if index + 1 < len(lines) and not lines[index + 1].strip() else 1
+                )
+                continue
+        result.append(line)
+        index += 1
+    return result
+
+
+def save_build_config(project_dir: Path, config: Dict[str, Any]) -> bool:
+    """
+    保存构建配置到项目目录
+    已有文件时合并修改，保留用户的注释和字段顺序；内容未变化时不重写文件。
+    读取、合并与写入在文件锁内完成，写入为原子替换，中途崩溃不会留下截断的配置
+    返回是否成功
+    """
+    try:
+        path = get_build_config_path(project_dir)
+        rendered = render_build_config(config)
+        with file_lock(path):
+            existing = path.read_text(encoding="utf-8") if path.exists() else ""
+            text = (
+                merge_build_config(existing, rendered) if existing.strip() else rendered
+            )
+            if text != existing:
+                atomic_write_text(path, text)
         return True
 
     except Exception as e:
@@ -370,20 +453,186 @@ def validate_build_config(
         if not icon_path.exists():
             return False, f"图标文件不存在: {icon_file}"
 
-    # 检查构建工具
+    # 检查取值受限的选项（构建工具、LTO、构建图格式等）
     build_tool = config.get("build_tool", "")
-    if build_tool not in ["pyinstaller", "nuitka"]:
-        return False, "构建工具必须是 pyinstaller 或 nuitka"
+    for option in BUILD_OPTIONS:
+        if option["kind"] != "choice":
+            continue
+        value = coerce_option(option, config.get(option["key"], option["default"]))
+        if value not in option["choices"]:
+            names = [choice for choice in option["choices"] if choice]
+            return (
+                False,
+                f"{option['doc']}必须是 {'、'.join(names[:-1])} 或 {names[-1]}",
+            )
+
+    # 检查数据条目中的 glob / 排除模式
+    for key in ("add_data", "add_binary", "include_data_files", "include_data_dirs"):
+        for token in str(config.get(key, "") or "").split():
+            pattern = token.lstrip("!").split(";", 1)[0]
+            try:
+                translate_pattern(pattern)
+            except re.error as e:
+                return False, f"{key} 中的模式无效: {token} ({e})"
+
+    # 检查附加入口文件（仅 PyInstaller 的 .spec 模式）
+    if build_tool == "pyinstaller" and config.get("use_spec_file", False):
+        exe_names = {str(config.get("project_name"))}
+        for extra_entry in re.split(r"[,\s，]+", config.get("extra_entry_files", "")):
+            if not extra_entry:
+                continue
+            if not (project_dir / extra_entry).exists():
+                return False, f"附加入口文件不存在: {extra_entry}"
+            exe_name = Path(extra_entry).stem
+            if exe_name in exe_names:
+                return False, f"附加入口文件与其他可执行文件重名: {extra_entry}"
+            exe_names.add(exe_name)
+
+    # 检查构建矩阵和对比变体
+    for key in ("targets", "compare"):
+        targets = config.get(key) or []
+        if not isinstance(targets, list):
+            return False, f"{key} 必须是列表"
+        if key == "compare" and len(targets) == 1:
+            return False, "compare 至少需要两个变体"
+        names = set()
+        for index, target in enumerate(targets):
+            if not isinstance(target, dict) or not target.get("name"):
+                return False, f"{key} 第 {index + 1} 项缺少 name"
+            name = str(target["name"])
+            if name in names:
+                return False, f"{key} 中存在重复的目标名称: {name}"
+            names.add(name)
+            if target.get("build_tool", build_tool) not in ["pyinstaller", "nuitka"]:
+                return False, f"目标 {name} 的构建工具必须是 pyinstaller 或 nuitka"
+            target_entry = target.get("entry_file", entry_file)
+            if not (project_dir / target_entry).exists():
+                return False, f"目标 {name} 的入口文件不存在: {target_entry}"
 
     return True, ""
 
 
+def resolve_build_targets(
+    config: Dict[str, Any], key: str = "targets"
+) -> List[Dict[str, Any]]:
+    """
+    展开 targets 构建矩阵（key 为 "compare" 时展开对比变体）
+    每个目标在基础配置上覆盖自身字段，未指定 output_dir 时输出到 output_dir/name，
+    对比变体输出到 output_dir/compare/name
+    """
+    base = {
+        k: v
+        for k, v in config.items()
+        if k not in ("targets", "compare", "matrix_workers")
+    }
+    base_output = base.get("output_dir", "dist")
+    if key == "compare":
+        base_output = f"{base_output}/compare"
+    resolved = []
+    for target in config.get(key) or []:
+        if not isinstance(target, dict) or not target.get("name"):
+            continue
+        merged = {**base, **target}
+        merged["name"] = str(target["name"])
+        if "output_dir" not in target:
+            merged["output_dir"] = f"{base_output}/{merged['name']}"
+        resolved.append(merged)
+    return resolved
+
+
+class BuildConfigStore:
+    """
+    进程内共享的构建配置缓存（按项目目录）
+
+    各屏幕切换时都会加载配置，缓存命中时无需重新解析 YAML；
+    只有 build_config.yaml 的 mtime 或大小变化时才重新读取。
+    update() 只修改内存中的配置并标记为脏，flush() 统一写回磁盘，
+    未写回的修改优先于磁盘上的文件
+    """
+
+    def __init__(self) -> None:
+        # {项目目录: {"stat": (mtime_ns, size) 或 None, "config": 配置, "dirty": 是否未写回}}
+        self._entries: Dict[Path, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _stat(project_dir: Path) -> Optional[tuple]:
+        """配置文件的 (mtime_ns, size)，文件不存在时为 None"""
+        try:
+            st = get_build_config_path(project_dir).stat()
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def load(self, project_dir: Path) -> Dict[str, Any]:
+        """获取项目配置的副本，文件未变化时直接使用缓存"""
+        key = Path(project_dir).absolute()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry["dirty"]:
+                return copy.deepcopy(entry["config"])
+            stat = self._stat(key)
+            if not entry or entry["stat"] != stat:
+                entry = {"stat": stat, "config": load_build_config(key), "dirty": False}
+                self._entries[key] = entry
+            return copy.deepcopy(entry["config"])
+
+    def update(self, project_dir: Path, config: Dict[str, Any]) -> None:
+        """更新内存中的配置并标记为未写回"""
+        key = Path(project_dir).absolute()
+        with self._lock:
+            entry = self._entries.setdefault(key, {"stat": None})
+            entry["config"] = copy.deepcopy(config)
+            entry["dirty"] = True
+
+    def is_dirty(self, project_dir: Path) -> bool:
+        """项目配置是否有未写回的修改"""
+        entry = self._entries.get(Path(project_dir).absolute())
+        return bool(entry and entry["dirty"])
+
+    def flush(self, project_dir: Optional[Path] = None) -> bool:
+        """将未写回的配置写入磁盘（不指定项目时写回全部），返回是否全部成功"""
+        with self._lock:
+            if project_dir is None:
+                keys = list(self._entries)
+            else:
+                keys = [Path(project_dir).absolute()]
+            success = True
+            for key in keys:
+                entry = self._entries.get(key)
+                if not entry or not entry["dirty"]:
+                    continue
+                if save_build_config(key, entry["config"]):
+                    entry["stat"] = self._stat(key)
+                    entry["dirty"] = False
+                else:
+                    success = False
+            return success
+
+    def save(self, project_dir: Path, config: Dict[str, Any]) -> bool:
+        """更新配置并立即写回"""
+        self.update(project_dir, config)
+        return self.flush(project_dir)
+
+    def invalidate(self, project_dir: Optional[Path] = None) -> None:
+        """丢弃缓存（不指定项目时清空全部），未写回的修改一并丢弃"""
+        with self._lock:
+            if project_dir is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(Path(project_dir).absolute(), None)
+
+
+# 应用内共享的配置缓存
+build_config_store = BuildConfigStore()
+
+
 async def async_save_build_config(project_dir: Path, config: Dict[str, Any]) -> bool:
-    """异步保存构建配置到项目目录"""
+    """异步保存构建配置到项目目录（同时更新共享缓存）"""
     try:
         loop = asyncio.get_event_loop()
         success = await loop.run_in_executor(
-            None, lambda: save_build_config(project_dir, config)
+            None, lambda: build_config_store.save(project_dir, config)
         )
         return success
     except Exception:
@@ -391,12 +640,12 @@ async def async_save_build_config(project_dir: Path, config: Dict[str, Any]) ->
 
 
 async def async_load_build_config(project_dir: Path) -> Dict[str, Any]:
-    """异步加载项目构建配置"""
+    """异步加载项目构建配置（文件未变化时直接使用共享缓存）"""
     try:
         loop = asyncio.get_event_loop()
         config = await loop.run_in_executor(
-            None, lambda: load_build_config(project_dir)
+            None, lambda: build_config_store.load(project_dir)
         )
         return config
     except Exception:
-        return DEFAULT_BUILD_CONFIG.copy()
+        return default_build_config()
@@ -0,0 +1,305 @@
+"""
+构建依赖图生成模块
+为 ninja 或 make 生成构建图：每个节点是一个构建或打包步骤（重新生成脚本、构建各目标、
+编译安装包），并列出真实的输入文件，只重新执行过期的步骤，互不依赖的步骤可以并行
+"""
+
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from src.utils.build_config import resolve_build_targets
+from src.utils.data_collector import parse_data_entries, pattern_base
+from src.utils.dist_analyzer import SKIP_DIRS
+from src.utils.installer_generator import has_installer_config, installer_script_name
+from src.utils.spec_generator import spec_file_name
+
+# 支持的构建图格式及对应的文件名
+GRAPH_FILES = {"ninja": "pybuilder.ninja", "make": "pybuilder.mk"}
+# 本工具生成的脚本（切换构建工具后可能残留旧脚本），不属于项目源码
+GENERATED_SCRIPTS = (
+    "build_nuitka.py",
+    "build_pyinstaller.py",
+    "build_matrix.py",
+    "bench_startup.py",
+    "compare_builds.py",
+)
+# 步骤完成标记所在目录（构建产物是目录，用标记文件作为步骤的输出）
+STAMP_DIR = ".pybuilder/graph"
+
+# 执行命令并在成功后更新标记文件，不依赖 shell 语法，Windows 上同样可用
+_STEP_CODE = (
+    "import pathlib,subprocess,sys;"
+    "r=subprocess.call(sys.argv[2:]);"
+    "p=pathlib.Path(sys.argv[1]);"
+    "r or p.parent.mkdir(parents=True,exist_ok=True) or p.touch();"
+    "sys.exit(r)"
+)
+
+
+def graph_file_name(config: Dict[str, Any]) -> str:
+    """构建图文件名，未启用时返回空字符串"""
+    return GRAPH_FILES.get(str(config.get("build_graph", "") or "").lower(), "")
+
+
+def collect_input_paths(config: Dict[str, Any]) -> List[str]:
+    """收集构建依赖的非源码输入路径（数据文件、图标等）"""
+    paths: List[str] = []
+    for key in ("icon_file", "splash_image"):
+        if config.get(key):
+            paths.append(config[key])
+    if config.get("build_tool") == "pyinstaller" and config.get("use_spec_file"):
+        paths.append(spec_file_name(config))
+
+    data_keys = ("include_data_files", "include_data_dirs")
+    if config.get("build_tool") == "pyinstaller":
+        data_keys = ("add_data", "add_binary")
+    for key in data_keys:
+        entries, _excludes = parse_data_entries(config.get(key, ""))
+        for src, _dest in entries:
+            # glob 模式以不含通配符的目录前缀作为输入
+            src = pattern_base(src)
+            if src and src not in paths:
+                paths.append(src)
+    return paths
+
+
+def _expand_files(project_dir: Path, paths: List[str]) -> List[str]:
+    """将输入路径展开为文件列表（目录展开为其中的所有文件），返回相对路径"""
+    files: List[str] = []
+    for path in paths:
+        full = project_dir / path
+        if full.is_dir():
+            for root, dirs, names in os.walk(full):
+                dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS)
+                for name in sorted(names):
+                    files.append(Path(root, name).relative_to(project_dir).as_posix())
+        else:
+            # 不存在的文件也保留：缺少输入时 ninja/make 会直接报错
+            files.append(Path(path).as_posix())
+    return files
+
+
+def collect_source_files(
+    project_dir: Path,
+    skip_files: Tuple[str, ...] = (),
+    skip_dirs: Tuple[str, ...] = (),
+) -> List[str]:
+    """收集项目中的 .py 源文件（相对路径），跳过虚拟环境、构建输出和隐藏目录"""
+    skip_dirs = SKIP_DIRS | set(skip_dirs)
+    sources: List[str] = []
+    for root, dirs, names in os.walk(project_dir):
+        dirs[:] = sorted(
+            d for d in dirs if d not in skip_dirs and not d.startswith(".")
+        )
+        # 每个目录只计算一次相对路径前缀
+        rel_dir = os.path.relpath(root, project_dir).replace(os.sep, "/")
+        prefix = "" if rel_dir == "." else rel_dir + "/"
+        for name in sorted(names):
+            if not name.endswith(".py"):
+                continue
+            rel_path = prefix + name
+            if rel_path not in skip_files:
+                sources.append(rel_path)
+    return sources
+
+
+def _build_nodes(
+    config: Dict[str, Any], project_dir: Path, script_names: List[str]
+) -> List[Dict[str, Any]]:
+    """
+    计算构建图中的步骤节点
+    每个节点包含 name / stamp / inputs / command / description
+    """
+    # 生成的脚本和构建输出不属于项目源码
+    output_root = str(config.get("output_dir", "dist")).replace("\\", "/")
+    sources = collect_source_files(
+        project_dir,
+        GENERATED_SCRIPTS + tuple(script_names),
+        (output_root.split("/")[0],),
+    )
+
+    nodes: List[Dict[str, Any]] = []
+    targets = resolve_build_targets(config)
+    if targets:
+        for target in targets:
+            name = f"build-{_slug(target['name'])}"
+            nodes.append(
+                {
+                    "name": name,
+                    "stamp": f"{STAMP_DIR}/{name}.stamp",
+                    "inputs": ["build_matrix.py"]
+                    + sources
+                    + _expand_files(project_dir, collect_input_paths(target)),
+                    "command": ["$python", "build_matrix.py", "-t", target["name"]],
+                    "description": f"BUILD {target['name']}",
+                }
+            )
+    else:
+        build_script = f"build_{config.get('build_tool', 'nuitka')}.py"
+        name = f"build-{_slug(config.get('project_name', 'MyApp'))}"
+        nodes.append(
+            {
+                "name": name,
+                "stamp": f"{STAMP_DIR}/{name}.stamp",
+                "inputs": [build_script]
+                + sources
+                + _expand_files(project_dir, collect_input_paths(config)),
+                "command": ["$python", build_script],
+                "description": f"BUILD {config.get('project_name', 'MyApp')}",
+            }
+        )
+
+    # 安装包：依赖所有构建步骤
+    if has_installer_config(config):
+        iss_name = installer_script_name(config)
+        nodes.append(
+            {
+                "name": "installer",
+                "stamp": f"{STAMP_DIR}/installer.stamp",
+                "inputs": [iss_name] + [node["stamp"] for node in nodes],
+                "command": ["iscc", iss_name],
+                "description": f"ISCC {iss_name}",
+            }
+        )
+    return nodes
+
+
+def _slug(name: str) -> str:
+    """步骤名只保留字母、数字、点和连字符"""
+    return re.sub(r"[^\w.-]+", "_", str(name)).strip("_") or "target"
+
+
+def _command_args(command: List[str], python: str) -> str:
+    """拼接步骤命令参数，$python 替换为构建工具中的解释器变量"""
+    args = []
+    for arg in command:
+        if arg == "$python":
+            args.append(python)
+        else:
+            arg = arg.replace("$", "$$")
+            args.append(f'"{arg}"' if " " in arg else arg)
+    return " ".join(args)
+
+
+def _ninja_escape(path: str) -> str:
+    """转义 ninja 路径中的特殊字符"""
+    return path.replace("$", "$$").replace(" ", "$ ").replace(":", "$:")
+
+
+def _generate_ninja(
+    config: Dict[str, Any], nodes: List[Dict[str, Any]], generated: List[str]
+) -> str:
+    """生成 ninja 构建图"""
+    graph_file = GRAPH_FILES["ninja"]
+    lines = [
+        "# 由 PyBuilder-Generate 根据 build_config.yaml 生成，重新生成脚本时会被覆盖",
+        f"# 用法: ninja -f {graph_file} [-j N] [all | installer | 步骤名]",
+        "ninja_required_version = 1.3",
+        "",
+        "python = python",
+        "",
+        "# 配置变化时重新生成脚本；内容未变化的脚本不会重写，restat 跳过下游步骤",
+        "rule regen",
+        "  command = pybuilder-tui generate --quiet .",
+        "  description = REGEN $out",
+        "  generator = 1",
+        "  restat = 1",
+        "",
+        "rule step",
+        f'  command = $python -c "{_STEP_CODE}" $out $args',
+        "  description = $desc",
+        "",
+    ]
+    workers = int(config.get("matrix_workers", 0) or 0)
+    if workers > 0:
+        lines.extend(
+            ["# 同时运行的构建步骤数", "pool build_pool", f"  depth = {workers}", ""]
+        )
+
+    outputs = " ".join(_ninja_escape(name) for name in [graph_file] + generated)
+    lines.append(f"build {outputs}: regen build_config.yaml")
+    lines.append("")
+
+    for node in nodes:
+        inputs = " ".join(_ninja_escape(path) for path in node["inputs"])
+        lines.append(f"build {_ninja_escape(node['stamp'])}: step {inputs}")
+        lines.append(f"  args = {_command_args(node['command'], '$python')}")
+        lines.append(f"  desc = {node['description']}")
+        if workers > 0 and node["name"] != "installer":
+            lines.append("  pool = build_pool")
+        lines.append(f"build {node['name']}: phony {_ninja_escape(node['stamp'])}")
+        lines.append("")
+
+    builds = [_ninja_escape(n["stamp"]) for n in nodes if n["name"] != "installer"]
+    lines.append(f"build all: phony {' '.join(builds)}")
+    lines.append("default all")
+    lines.append("")
+    return "\n".join(lines)
+
+
+def _make_escape(path: str) -> str:
+    """转义 make 路径中的特殊字符"""
+    return path.replace("$", "$$").replace(" ", "\\ ").replace(":", "\\:")
+
+
+def _generate_make(nodes: List[Dict[str, Any]], generated: List[str]) -> str:
+    """生成 make 构建图"""
+    graph_file = GRAPH_FILES["make"]
+    regen_stamp = f"{STAMP_DIR}/regen.stamp"
+    builds = [n for n in nodes if n["name"] != "installer"]
+    phony = ["all"] + [n["name"] for n in nodes]
+    lines = [
+        "# 由 PyBuilder-Generate 根据 build_config.yaml 生成，重新生成脚本时会被覆盖",
+        f"# 用法: make -f {graph_file} [-j N] [all | installer | 步骤名]",
+        "",
+        "PYTHON ?= python",
+        f'STEP = $(PYTHON) -c "{_STEP_CODE}"',
+        "",
+        f".PHONY: {' '.join(phony)}",
+        f"all: {' '.join(_make_escape(n['stamp']) for n in builds)}",
+        "",
+        "# 配置变化时重新生成脚本",
+        f"{regen_stamp}: build_config.yaml",
+        "\t$(STEP) $@ pybuilder-tui generate --quiet .",
+        "",
+    ]
+    for node in nodes:
+        args = _command_args(node["command"], "$(PYTHON)")
+        lines.append(f"{node['name']}: {_make_escape(node['stamp'])}")
+        lines.append(
+            f"{_make_escape(node['stamp'])}: "
+            + " ".join(_make_escape(path) for path in node["inputs"])
+        )
+        lines.append(f"\t@echo {node['description']}")
+        lines.append(f"\t$(STEP) $@ {args}")
+        lines.append("")
+
+    # 生成的脚本由 regen 步骤产生；空命令使 make 重新检查修改时间，
+    # 内容未变化的脚本不会重写，下游步骤不会因此重新构建
+    lines.append(
+        " ".join(_make_escape(name) for name in generated) + f": {regen_stamp} ;"
+    )
+    lines.append("")
+    return "\n".join(lines)
+
+
+def generate_build_graph(
+    config: Dict[str, Any], project_dir: Path, script_names: List[str]
+) -> str:
+    """
+    生成构建依赖图
+
+    Args:
+        config: 构建配置（build_graph 为 ninja 或 make）
+        project_dir: 项目目录
+        script_names: 本次生成的构建脚本文件名
+    """
+    generated = [name for name in script_names if name not in GRAPH_FILES.values()]
+    if has_installer_config(config):
+        generated.append(installer_script_name(config))
+    nodes = _build_nodes(config, project_dir, generated)
+    if graph_file_name(config) == GRAPH_FILES["make"]:
+        return _generate_make(nodes, generated)
+    return _generate_ninja(config, nodes, generated)
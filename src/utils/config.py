@@ -2,9 +2,12 @@
 配置管理模块
 """
 
+import os
 import sys
 from pathlib import Path
 
+from src.utils.file_writer import atomic_write_text
+
 # 默认配置
 DEFAULT_CONFIG = {
     "theme": "textual-dark",
@@ -24,6 +27,20 @@ def get_config_path() -> Path:
     return base / "config.yaml"
 
 
+def get_cache_dir() -> Path:
+    """
+    获取用户级缓存目录（与项目无关、可在多个项目间共享的缓存）
+    Windows 为 %LOCALAPPDATA%，macOS 为 ~/Library/Caches，其他平台遵循 XDG_CACHE_HOME
+    """
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Caches"
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "pybuilder-tui"
+
+
 def load_config() -> dict:
     """加载配置，不存在则返回默认值"""
     config = DEFAULT_CONFIG.copy()
@@ -48,9 +65,9 @@ def load_config() -> dict:
 
 
 def save_config(config: dict) -> None:
-    """保存配置到文件"""
+    """保存配置到文件（原子替换）"""
     try:
         lines = [f"{k}: {v}\n" for k, v in config.items()]
-        get_config_path().write_text("".join(lines), encoding="utf-8")
+        atomic_write_text(get_config_path(), "".join(lines))
     except Exception:
         pass
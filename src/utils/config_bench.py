@@ -0,0 +1,122 @@
+"""
+构建配置读写基准
+生成包含大量 add_data 条目和数百个 installer_* 字段的配置，
+对比 LibYAML（C 实现）与纯 Python 解析器，并测量加载、标准写出和合并写出的耗时
+"""
+
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+import yaml
+
+from src.utils.build_config import (
+    default_build_config,
+    get_build_config_path,
+    load_build_config,
+    render_build_config,
+    save_build_config,
+)
+
+
+def make_bench_config(data_entries: int, installer_keys: int) -> Dict[str, Any]:
+    """生成基准用配置：add_data 含 data_entries 个条目，另有 installer_keys 个 installer_* 字段"""
+    config = default_build_config()
+    config["add_data"] = " ".join(
+        f"assets/group{i % 50}/file{i}.dat;assets/group{i % 50}"
+        for i in range(data_entries)
+    )
+    config["hidden_imports"] = " ".join(f"pkg{i}.module" for i in range(100))
+    config["exclude_packages"] = [f"unused{i}" for i in range(100)]
+    config["installer_app_name"] = "BenchApp"
+    for index in range(installer_keys):
+        config[f"installer_option_{index}"] = f"value {index}"
+    return config
+
+
+def _measure(func: Callable[[], Any], runs: int) -> Dict[str, float]:
+    """运行 runs 次，返回耗时的最小值和中位数（毫秒）"""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {"min_ms": min(samples), "median_ms": statistics.median(samples)}
+
+
+def run_config_benchmark(
+    data_entries: int = 2000, installer_keys: int = 300, runs: int = 20
+) -> Dict[str, Any]:
+    """
+    运行配置读写基准
+
+    Returns:
+        包含 libyaml（是否可用）、bytes（配置文件大小）和 results
+        {项目: {min_ms, median_ms}} 的结果
+    """
+    config = make_bench_config(data_entries, installer_keys)
+    results: Dict[str, Dict[str, float]] = {}
+
+    with tempfile.TemporaryDirectory() as temp:
+        project_dir = Path(temp)
+        path = get_build_config_path(project_dir)
+        # 未知的 installer_* 字段不在标准格式中，先写出标准内容再追加，合并写出时原样保留
+        text = render_build_config(config)
+        text += "".join(
+            f"{key}: {value}\n"
+            for key, value in config.items()
+            if key.startswith("installer_option_")
+        )
+        path.write_text(text, encoding="utf-8")
+
+        results["parse (SafeLoader)"] = _measure(
+            lambda: yaml.load(text, Loader=yaml.SafeLoader), runs
+        )
+        if yaml.__with_libyaml__:
+            results["parse (CSafeLoader)"] = _measure(
+                lambda: yaml.load(text, Loader=yaml.CSafeLoader), runs
+            )
+        results["load_build_config"] = _measure(
+            lambda: load_build_config(project_dir), runs
+        )
+        results["render_build_config"] = _measure(
+            lambda: render_build_config(config), runs
+        )
+        # 内容未变化：合并后与原文相同，不重写文件
+        results["save (unchanged)"] = _measure(
+            lambda: save_build_config(project_dir, config), runs
+        )
+        changed = dict(config)
+        counter = iter(range(runs))
+
+        def save_changed() -> None:
+            changed["version"] = f"2.0.{next(counter)}"
+            save_build_config(project_dir, changed)
+
+        results["save (one field changed)"] = _measure(save_changed, runs)
+
+    return {
+        "libyaml": bool(yaml.__with_libyaml__),
+        "bytes": len(text.encode("utf-8")),
+        "data_entries": data_entries,
+        "installer_keys": installer_keys,
+        "runs": runs,
+        "results": results,
+    }
+
+
+def format_config_benchmark(result: Dict[str, Any]) -> str:
+    """格式化基准结果"""
+    lines = [
+        f"配置大小: {result['bytes'] / 1024:.1f} KB "
+        f"(add_data {result['data_entries']} 项, installer_* {result['installer_keys']} 项, "
+        f"每项运行 {result['runs']} 次)",
+        f"LibYAML: {'可用' if result['libyaml'] else '不可用（使用纯 Python 解析器）'}",
+        "",
+        f"{'项目':<28}{'最小(ms)':>10}{'中位数(ms)':>9}",
+    ]
+    for name, timing in result["results"].items():
+        lines.append(f"{name:<30}{timing['min_ms']:>12.2f}{timing['median_ms']:>12.2f}")
+    return "\n".join(lines)
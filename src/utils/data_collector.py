@@ -0,0 +1,442 @@
+"""
+数据文件收集模块
+展开 add_data / include_data_files 等条目中的 glob 与排除模式（如 assets/**/*.png !**/*.psd），
+按内容哈希查找重复文件，把收集到的文件以硬链接暂存到 .pybuilder/data 并写出清单，
+打包工具只接收暂存目录中的文件
+
+本模块仅依赖标准库：生成的构建脚本会嵌入本模块中收集所需的函数，
+生成脚本和构建依赖图时也调用同一套函数
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+from typing import Any, Dict, List, Optional, Tuple
+
+# 暂存目录，每组数据的暂存目录和清单按条目内容命名，不同目标互不覆盖
+DATA_STAGE_DIR = os.path.join(".pybuilder", "data")
+# 默认排除的文件和目录（不含 / 的模式匹配任意层级的名称）
+DEFAULT_EXCLUDES = (
+    "__pycache__",
+    ".git",
+    ".svn",
+    ".hg",
+    ".venv",
+    ".pybuilder",
+    ".DS_Store",
+    "Thumbs.db",
+)
+# glob 通配字符
+GLOB_CHARS = frozenset("*?[")
+# 计算内容哈希时的读取块大小
+HASH_CHUNK_SIZE = 1024 * 1024
+# 各打包工具的数据选项：{组名: [(配置项, 目标是否为文件路径)]}，同组暂存到同一目录
+DATA_KEYS = {
+    "nuitka": {"data": [("include_data_files", True), ("include_data_dirs", False)]},
+    "pyinstaller": {"data": [("add_data", False)], "binary": [("add_binary", False)]},
+}
+
+
+def is_pattern(text: str) -> bool:
+    """路径中是否包含 glob 通配符"""
+    return any(char in GLOB_CHARS for char in text)
+
+
+def parse_data_entries(text: str) -> Tuple[List[Tuple[str, str]], List[str]]:
+    """
+    解析空格分隔的数据条目，返回 ([(src, dest)], [排除模式])
+    以 ! 开头的条目为排除模式，未指定 dest 时放到输出根目录
+    """
+    entries: List[Tuple[str, str]] = []
+    excludes: List[str] = []
+    for token in str(text or "").split():
+        token = token.replace("\\", "/")
+        if token.startswith("./"):
+            token = token[2:]
+        if token.startswith("!"):
+            if token[1:]:
+                excludes.append(token[1:])
+            continue
+        src, _, dest = token.partition(";")
+        entries.append((src, dest or "."))
+    return entries, excludes
+
+
+def uses_data_patterns(texts: List[str]) -> bool:
+    """条目中是否使用了 glob 或排除模式"""
+    for text in texts:
+        for token in str(text or "").split():
+            if token.startswith("!") or is_pattern(token.partition(";")[0]):
+                return True
+    return False
+
+
+def data_specs(config: Dict[str, Any]) -> Dict[str, List[Tuple[str, bool]]]:
+    """按构建工具取出非空的数据选项，返回 {组名: [(条目文本, 目标是否为文件路径)]}"""
+    tool = "nuitka" if config.get("build_tool") == "nuitka" else "pyinstaller"
+    groups = {}
+    for group, keys in DATA_KEYS[tool].items():
+        specs = [
+            (str(config[key]), is_file) for key, is_file in keys if config.get(key)
+        ]
+        if specs:
+            groups[group] = specs
+    return groups
+
+
+def uses_data_collector(config: Dict[str, Any]) -> bool:
+    """是否需要在构建前收集数据文件（使用了 glob / 排除模式或开启了去重）"""
+    groups = data_specs(config)
+    if not groups:
+        return False
+    texts = [text for specs in groups.values() for text, _ in specs]
+    return bool(config.get("data_dedupe", False)) or uses_data_patterns(texts)
+
+
+def pattern_base(src: str) -> str:
+    """glob 模式中不含通配符的目录前缀（遍历起点），不含通配符时原样返回"""
+    parts = src.replace("\\", "/").split("/")
+    fixed: List[str] = []
+    for part in parts:
+        if is_pattern(part):
+            return "/".join(fixed) or "."
+        fixed.append(part)
+    return src
+
+
+def translate_pattern(pattern: str) -> "re.Pattern[str]":
+    """
+    将 glob 模式转换为匹配 / 分隔相对路径的正则：
+    ** 匹配任意层目录，* 和 ? 不跨越目录，[...] 为字符集
+    """
+    pattern = pattern.replace("\\", "/")
+    if pattern.startswith("./"):
+        pattern = pattern[2:]
+    result = []
+    i, n = 0, len(pattern)
+    while i < n:
+        char = pattern[i]
+        if pattern.startswith("**/", i):
+            result.append("(?:.*/)?")
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            result.append(".*")
+            i += 2
+            continue
+        if char == "*":
+            result.append("[^/]*")
+        elif char == "?":
+            result.append("[^/]")
+        elif char == "[":
+            end = pattern.find(
+                "]", i + 2 if pattern[i + 1 : i + 2] in ("!", "]") else i + 1
+            )
+            if end < 0:
+                result.append(re.escape(char))
+            else:
+                body = pattern[i + 1 : end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                result.append(f"[{body.replace('/', '')}]")
+                i = end
+        else:
+            result.append(re.escape(char))
+        i += 1
+    return re.compile("".join(result) + r"\Z")
+
+
+def _exclude_matchers(excludes: List[str]) -> List[Tuple[bool, "re.Pattern[str]"]]:
+    """
+    排除模式：不含 / 的模式匹配任意层级的文件名或目录名，否则匹配相对项目根目录的路径，
+    以 / 开头的模式只匹配项目根目录下的路径（如 /build）
+    """
+    return [
+        ("/" not in pattern, translate_pattern(pattern.lstrip("/")))
+        for pattern in excludes
+    ]
+
+
+def _is_excluded(rel_path: str, matchers: List[Tuple[bool, "re.Pattern[str]"]]) -> bool:
+    """路径是否被排除"""
+    name = rel_path.rsplit("/", 1)[-1]
+    for name_only, regex in matchers:
+        if regex.match(name if name_only else rel_path):
+            return True
+    return False
+
+
+def iter_files(base: str, matchers: List[Tuple[bool, "re.Pattern[str]"]]):
+    """
+    使用 os.scandir 遍历目录，产出 (相对项目根目录的路径, 相对 base 的路径, 大小)
+    被排除的目录整体跳过，不跟随目录符号链接
+    """
+    base = base.replace("\\", "/").rstrip("/") or "."
+    stack = [(base, "")]
+    while stack:
+        directory, rel_dir = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                items = sorted(entries, key=lambda entry: entry.name)
+        except OSError:
+            continue
+        subdirs = []
+        for entry in items:
+            rel = f"{rel_dir}{entry.name}"
+            path = f"{directory}/{entry.name}" if directory != "." else entry.name
+            if _is_excluded(path, matchers):
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append((path, rel + "/"))
+                elif entry.is_file():
+                    yield path, rel, entry.stat().st_size
+            except OSError:
+                continue
+        stack.extend(reversed(subdirs))
+
+
+def _join_dest(dest: str, rel: str) -> str:
+    """拼接目标路径，. 表示输出根目录"""
+    dest = dest.replace("\\", "/").strip("/")
+    if dest in ("", "."):
+        return rel
+    return f"{dest}/{rel}"
+
+
+def _expand_entry(
+    src: str,
+    dest: str,
+    dest_is_file: bool,
+    matchers: List[Tuple[bool, "re.Pattern[str]"]],
+):
+    """展开单个条目，产出 (源文件, 目标相对路径, 大小)"""
+    if is_pattern(src):
+        base = pattern_base(src)
+        regex = translate_pattern(src)
+        for path, rel, size in iter_files(base, matchers):
+            if regex.match(path):
+                yield path, _join_dest(dest, rel), size
+    elif os.path.isdir(src):
+        for path, rel, size in iter_files(src, matchers):
+            yield path, _join_dest(dest, rel), size
+    elif os.path.isfile(src) and not _is_excluded(src, matchers):
+        name = os.path.basename(src)
+        # Nuitka 的 --include-data-files 目标是文件路径，以 / 结尾时表示目录
+        if dest_is_file and not dest.endswith("/") and dest not in ("", "."):
+            target = dest.strip("/")
+        else:
+            target = _join_dest(dest, name)
+        yield src, target, os.path.getsize(src)
+
+
+def _file_digest(path: str) -> str:
+    """文件内容哈希"""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def stage_name(group: str, specs: List[Tuple[str, bool]], dedupe: bool) -> str:
+    """按条目内容计算暂存目录名，条目相同的目标共用同一暂存目录"""
+    key = json.dumps([group, [list(spec) for spec in specs], bool(dedupe)])
+    return f"{group}-{hashlib.sha1(key.encode('utf-8')).hexdigest()[:10]}"
+
+
+def collect_files(
+    specs: List[Tuple[str, bool]],
+    dedupe: bool = False,
+    excludes: Tuple[str, ...] = (),
+) -> Dict[str, Any]:
+    """
+    展开并去重数据条目
+
+    Args:
+        specs: [(条目文本, 目标是否为文件路径)]，同一组内的排除模式作用于所有条目
+        dedupe: 为 True 时内容重复的文件改为链接到第一个文件的内容（目标路径全部保留），否则只统计
+        excludes: 额外的排除模式（如构建输出目录）
+
+    Returns:
+        包含 files [(src, dest, size)] / duplicates [(src, dest, 保留的 dest, size)] /
+        total_bytes / duplicate_bytes / missing 的结果
+    """
+    entries = []
+    patterns = list(DEFAULT_EXCLUDES) + list(excludes)
+    for text, dest_is_file in specs:
+        parsed, spec_excludes = parse_data_entries(text)
+        entries.extend((src, dest, dest_is_file) for src, dest in parsed)
+        patterns.extend(spec_excludes)
+    matchers = _exclude_matchers(patterns)
+
+    files: List[Tuple[str, str, int]] = []
+    seen_dest = set()
+    missing = []
+    for src, dest, dest_is_file in entries:
+        found = False
+        for path, target, size in _expand_entry(src, dest, dest_is_file, matchers):
+            found = True
+            # 多个条目匹配到同一目标路径时保留第一个
+            if target not in seen_dest:
+                seen_dest.add(target)
+                files.append((path, target, size))
+        if not found:
+            missing.append(src)
+
+    # 只对大小相同的文件计算哈希
+    by_size: Dict[int, List[int]] = {}
+    for index, (_path, _target, size) in enumerate(files):
+        by_size.setdefault(size, []).append(index)
+    duplicates = []
+    for size, indexes in by_size.items():
+        if len(indexes) < 2 or size == 0:
+            continue
+        first_by_digest: Dict[str, int] = {}
+        for index in indexes:
+            try:
+                digest = _file_digest(files[index][0])
+            except OSError:
+                continue
+            if digest in first_by_digest:
+                kept = files[first_by_digest[digest]]
+                duplicates.append((files[index][0], files[index][1], kept[1], size))
+                if dedupe:
+                    # 程序可能按原路径读取，目标路径必须保留，只让暂存文件共用同一份内容
+                    files[index] = (kept[0], files[index][1], size)
+            else:
+                first_by_digest[digest] = index
+
+    return {
+        "files": files,
+        "duplicates": sorted(duplicates, key=lambda item: item[1]),
+        "dedupe": bool(dedupe),
+        "file_count": len(files),
+        "total_bytes": sum(size for _path, _target, size in files),
+        "duplicate_bytes": sum(item[3] for item in duplicates),
+        "missing": missing,
+    }
+
+
+def _link_or_copy(src: str, dest: str) -> None:
+    """硬链接到暂存目录，跨设备或不支持时复制"""
+    os.makedirs(os.path.dirname(dest) or ".", exist_ok=True)
+    try:
+        os.link(src, dest)
+    except FileExistsError:
+        if not os.path.samefile(src, dest):
+            os.remove(dest)
+            shutil.copy2(src, dest)
+    except OSError:
+        shutil.copy2(src, dest)
+
+
+def _sync_stage(stage_dir: str, files: List[Tuple[str, str, int]]) -> None:
+    """将暂存目录同步为收集到的文件集合，未变化的文件不重新链接"""
+    wanted = {
+        os.path.normpath(os.path.join(stage_dir, target)): path
+        for path, target, _ in files
+    }
+    if os.path.isdir(stage_dir):
+        for root, dirs, names in os.walk(stage_dir, topdown=False):
+            for name in names:
+                staged = os.path.normpath(os.path.join(root, name))
+                if staged not in wanted:
+                    os.remove(staged)
+            for name in dirs:
+                try:
+                    os.rmdir(os.path.join(root, name))
+                except OSError:
+                    pass
+    for staged, path in wanted.items():
+        if os.path.exists(staged):
+            try:
+                same = os.path.samefile(path, staged)
+            except OSError:
+                same = False
+            if same:
+                continue
+            stat, staged_stat = os.stat(path), os.stat(staged)
+            if (stat.st_size, stat.st_mtime_ns) == (
+                staged_stat.st_size,
+                staged_stat.st_mtime_ns,
+            ):
+                continue
+            os.remove(staged)
+        _link_or_copy(path, staged)
+
+
+def _stage_toc(
+    stage_dir: str, files: List[Tuple[str, str, int]]
+) -> List[Tuple[str, str, str]]:
+    """
+    打包工具参数：按目标路径的第一级拆分，子目录整体作为一个目录条目，
+    根目录下的文件逐个传入，返回 [(暂存路径, 目标路径, dir/file)]
+    """
+    toc = []
+    seen = set()
+    for _path, target, _size in files:
+        first, sep, _rest = target.partition("/")
+        if first in seen:
+            continue
+        seen.add(first)
+        toc.append(
+            (f"{stage_dir}/{first}".replace("\\", "/"), first, "dir" if sep else "file")
+        )
+    return sorted(toc, key=lambda item: item[1])
+
+
+def collect_data_files(
+    group: str,
+    specs: List[Tuple[str, bool]],
+    dedupe: bool = False,
+    excludes: Tuple[str, ...] = (),
+    stage_root: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    收集一组数据文件，暂存到 stage_root/<组名-哈希> 并写出同名 .json 清单
+    （参数含义同 collect_files）
+
+    Returns:
+        collect_files 的结果，附加 stage / manifest / toc
+    """
+    stage_root = stage_root or DATA_STAGE_DIR
+    stage_dir = os.path.join(stage_root, stage_name(group, specs, dedupe)).replace(
+        "\\", "/"
+    )
+    result = collect_files(specs, dedupe, excludes)
+    _sync_stage(stage_dir, result["files"])
+    result["stage"] = stage_dir
+    result["manifest"] = stage_dir + ".json"
+    result["toc"] = _stage_toc(stage_dir, result["files"])
+    os.makedirs(stage_root, exist_ok=True)
+    with open(result["manifest"], "w", encoding="utf-8") as file:
+        json.dump(result, file, ensure_ascii=False, indent=2)
+    return result
+
+
+def format_bytes(size: float) -> str:
+    """字节数转为可读字符串"""
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.1f} {unit}" if unit != "B" else f"{int(size)} B"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def format_data_summary(result: Dict[str, Any]) -> str:
+    """清单摘要"""
+    text = f"{result['file_count']} files, {format_bytes(result['total_bytes'])}"
+    if result["duplicates"]:
+        action = (
+            "linked to one copy"
+            if result["dedupe"]
+            else "found (enable data_dedupe to link)"
+        )
+        text += (
+            f"; {len(result['duplicates'])} duplicates "
+            f"{format_bytes(result['duplicate_bytes'])} {action}"
+        )
+    return text
@@ -0,0 +1,298 @@
+"""
+产物体积分析模块
+遍历构建输出目录，统计各顶层包体积、重复文件和最大的共享库，并给出排除建议
+
+本模块仅依赖标准库：生成的构建脚本会嵌入本模块中报告所需的函数用于构建后分析，
+TUI 中的分析界面也调用同一套函数
+"""
+
+import ast
+import hashlib
+import os
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+# 共享库后缀
+SHARED_LIB_SUFFIXES = (".so", ".pyd", ".dll", ".dylib")
+# 小于该大小的文件不参与重复检测（字节）
+DUPLICATE_MIN_SIZE = 4096
+# 小于该大小的包不给出排除建议（字节）
+SUGGEST_MIN_SIZE = 512 * 1024
+# 通常不需要打包的标准库模块
+UNNEEDED_STDLIB = (
+    "tkinter",
+    "unittest",
+    "test",
+    "pydoc_data",
+    "lib2to3",
+    "idlelib",
+    "turtledemo",
+    "ensurepip",
+    "distutils",
+)
+# 随某个模块一同打包的附属目录，归并到该模块统计
+_PACKAGE_ALIASES = {
+    "_tkinter": "tkinter",
+    "_tcl_data": "tkinter",
+    "_tk_data": "tkinter",
+    "tcl": "tkinter",
+    "tk": "tkinter",
+}
+# 扫描项目源码时跳过的目录
+SKIP_DIRS = {
+    "__pycache__",
+    "venv",
+    ".venv",
+    "env",
+    "build",
+    "dist",
+    "node_modules",
+    "site-packages",
+}
+
+
+def format_size(size: float) -> str:
+    """格式化字节数"""
+    for unit in ("B", "KB", "MB"):
+        if abs(size) < 1024:
+            return f"{size:.1f} {unit}" if unit != "B" else f"{int(size)} B"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def find_dist_dir(
+    output_dir: str,
+    project_name: str,
+    entry_file: str,
+    tool: str,
+    contents_directory: str = ".",
+) -> Tuple[Optional[str], Optional[str]]:
+    """定位构建输出目录
+
+    Returns:
+        (dist_dir, package_root)：输出目录和用于按包分组的根目录，
+        onefile 等没有输出目录的情况返回 (None, None)
+    """
+    if tool == "nuitka":
+        entry_stem = os.path.splitext(os.path.basename(entry_file))[0]
+        candidates = [f"{project_name}.dist", f"{entry_stem}.dist"]
+    else:
+        candidates = [project_name]
+
+    for name in candidates:
+        dist_dir = os.path.join(output_dir, name)
+        if not os.path.isdir(dist_dir):
+            continue
+        package_root = dist_dir
+        if contents_directory and contents_directory != ".":
+            inner = os.path.join(dist_dir, contents_directory)
+            if os.path.isdir(inner):
+                package_root = inner
+        elif tool == "pyinstaller" and os.path.isdir(
+            os.path.join(dist_dir, "_internal")
+        ):
+            # PyInstaller 6 默认的内部目录
+            package_root = os.path.join(dist_dir, "_internal")
+        return dist_dir, package_root
+    return None, None
+
+
+def scan_dist(root: str) -> List[Tuple[str, int]]:
+    """使用 os.scandir 遍历目录，返回 (相对路径, 字节数) 列表"""
+    files: List[Tuple[str, int]] = []
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            rel_path = os.path.relpath(entry.path, root)
+                            files.append((rel_path, entry.stat().st_size))
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return files
+
+
+def _top_level_name(rel_path: str) -> str:
+    """根据相对路径推断所属的顶层包名"""
+    parts = rel_path.replace("\\", "/").split("/")
+    name = parts[0]
+    if len(parts) == 1:
+        if not name.lower().endswith(SHARED_LIB_SUFFIXES) and ".so." not in name:
+            # 顶层普通文件（可执行文件、base_library.zip 等）不属于任何包
+            return "<launcher>"
+        # 扩展模块：去掉后缀，如 _ssl.cpython-312-x86_64-linux-gnu.so -> _ssl
+        name = name.split(".")[0] or name
+    elif name.endswith((".libs", ".dylibs")):
+        # numpy.libs 等 auditwheel 生成的依赖库目录
+        name = name.rsplit(".", 1)[0]
+    elif name.endswith((".dist-info", ".egg-info")):
+        name = name.split("-")[0]
+    return _PACKAGE_ALIASES.get(name, name)
+
+
+def _file_digest(path: str) -> str:
+    """计算文件内容哈希"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def find_duplicates(root: str, files: List[Tuple[str, int]]) -> List[Dict[str, Any]]:
+    """查找内容相同的文件：先按大小分组，只对大小相同的文件计算哈希"""
+    by_size: Dict[int, List[str]] = {}
+    for rel_path, size in files:
+        if size >= DUPLICATE_MIN_SIZE:
+            by_size.setdefault(size, []).append(rel_path)
+
+    duplicates = []
+    for size, paths in by_size.items():
+        if len(paths) < 2:
+            continue
+        by_digest: Dict[str, List[str]] = {}
+        for rel_path in paths:
+            try:
+                digest = _file_digest(os.path.join(root, rel_path))
+            except OSError:
+                continue
+            by_digest.setdefault(digest, []).append(rel_path)
+        for same in by_digest.values():
+            if len(same) > 1:
+                duplicates.append(
+                    {
+                        "size": size,
+                        "paths": sorted(same),
+                        "wasted": size * (len(same) - 1),
+                    }
+                )
+    duplicates.sort(key=lambda item: item["wasted"], reverse=True)
+    return duplicates
+
+
+def collect_project_imports(project_dir: str) -> set:
+    """收集项目源码中直接导入的顶层模块名"""
+    imports = set()
+    stack = [project_dir]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in SKIP_DIRS and not entry.name.startswith(
+                            "."
+                        ):
+                            stack.append(entry.path)
+                        continue
+                    if not entry.name.endswith(".py"):
+                        continue
+                    try:
+                        with open(entry.path, "rb") as f:
+                            tree = ast.parse(f.read(), filename=entry.path)
+                    except (OSError, SyntaxError, ValueError):
+                        continue
+                    for node in ast.walk(tree):
+                        if isinstance(node, ast.Import):
+                            for alias in node.names:
+                                imports.add(alias.name.split(".")[0])
+                        elif (
+                            isinstance(node, ast.ImportFrom)
+                            and node.module
+                            and not node.level
+                        ):
+                            imports.add(node.module.split(".")[0])
+        except OSError:
+            continue
+    return imports
+
+
+def analyze_dist(
+    dist_dir: str,
+    package_root: Optional[str] = None,
+    project_imports: Optional[set] = None,
+    top_n: int = 10,
+) -> Dict[str, Any]:
+    """分析构建输出目录
+
+    Args:
+        dist_dir: 构建输出目录
+        package_root: 按包分组的根目录（PyInstaller 的内部目录），默认与 dist_dir 相同
+        project_imports: 项目直接导入的顶层模块，用于判断哪些包可以排除
+        top_n: 各排行榜显示的条目数
+
+    Returns:
+        包含 total_size / file_count / packages / duplicates / shared_libs /
+        suggestions / indirect 的分析结果。suggestions 只包含可以直接排除的模块；
+        项目未直接导入的大体积包列在 indirect 中仅供参考——它们可能被其他依赖导入，
+        排除后运行时会失败，需要经依赖可达性分析确认
+    """
+    package_root = package_root or dist_dir
+    files = scan_dist(dist_dir)
+    prefix = os.path.relpath(package_root, dist_dir)
+    prefix = "" if prefix == "." else prefix.replace("\\", "/") + "/"
+
+    packages: Dict[str, List[int]] = {}
+    shared_libs = []
+    for rel_path, size in files:
+        normalized = rel_path.replace("\\", "/")
+        if prefix and normalized.startswith(prefix):
+            name = _top_level_name(normalized[len(prefix) :])
+        elif prefix:
+            # 内部目录之外的文件（可执行文件本身）
+            name = "<launcher>"
+        else:
+            name = _top_level_name(normalized)
+        stat = packages.setdefault(name, [0, 0])
+        stat[0] += size
+        stat[1] += 1
+        base_name = os.path.basename(normalized).lower()
+        if base_name.endswith(SHARED_LIB_SUFFIXES) or ".so." in base_name:
+            shared_libs.append((normalized, size))
+
+    package_list = sorted(
+        ((name, size, count) for name, (size, count) in packages.items()),
+        key=lambda item: item[1],
+        reverse=True,
+    )
+    shared_libs.sort(key=lambda item: item[1], reverse=True)
+
+    # 排除建议只包含常见的冗余标准库；项目未直接导入的大体积包只作为参考信息
+    suggestions = []
+    indirect = []
+    stdlib_names = getattr(sys, "stdlib_module_names", frozenset())
+    if project_imports is not None:
+        for name, size, _count in package_list:
+            if name in project_imports or name.startswith(("<", "_")):
+                continue
+            if name in UNNEEDED_STDLIB:
+                reason = "通常无需打包的标准库"
+            elif name in stdlib_names or name.startswith(("lib", "python")):
+                # 其余标准库和共享库依赖由解释器本身需要，不建议排除
+                continue
+            elif size >= SUGGEST_MIN_SIZE:
+                indirect.append(
+                    {"module": name, "size": size, "reason": "项目未直接导入"}
+                )
+                continue
+            else:
+                continue
+            suggestions.append({"module": name, "size": size, "reason": reason})
+
+    return {
+        "dist_dir": dist_dir,
+        "total_size": sum(size for _path, size in files),
+        "file_count": len(files),
+        "packages": package_list[:top_n],
+        "duplicates": find_duplicates(dist_dir, files)[:top_n],
+        "shared_libs": shared_libs[:top_n],
+        "suggestions": suggestions[:top_n],
+        "indirect": indirect[:top_n],
+    }
@@ -0,0 +1,397 @@
+"""
+依赖可达性分析模块
+从入口文件出发遍历项目和已安装第三方包的导入图，找出已安装、会被打包工具跟随导入，
+但从入口文件不可达或只能经由可选代码路径（try/except ImportError、TYPE_CHECKING、
+第三方包函数体中的延迟导入）到达的包，并按磁盘占用排序给出排除建议
+"""
+
+import json
+import os
+import subprocess
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from src.utils.python_env import find_project_python
+from src.utils.import_scanner import (
+    GUARD_LAZY,
+    GUARD_OPTIONAL,
+    GUARD_TYPING,
+    build_import_graph,
+    load_parse_cache,
+    module_name,
+    parse_files_cached,
+    resolve_module,
+    save_parse_cache,
+    scan_project,
+)
+
+# 第三方包解析缓存（按绝对路径、修改时间和大小缓存，与项目缓存分开保存）
+SITE_CACHE_FILE = ".pybuilder/site_import_cache.json"
+# 已安装包查询结果缓存（按解释器路径保存，site-packages 目录变化时失效）
+ENV_CACHE_FILE = ".pybuilder/env_cache.json"
+# 查询已安装包的超时（秒）
+PROBE_TIMEOUT = 60
+# 小于该大小的包不给出排除建议（字节）
+RECOMMEND_MIN_SIZE = 256 * 1024
+# 第三方包中不属于运行时代码的目录
+_SKIP_PACKAGE_DIRS = {"__pycache__", "tests", "test", "testing", "benchmarks"}
+
+# 在目标解释器中运行：按顶层导入名汇总已安装发行包的磁盘占用（优先使用 RECORD 中的大小）
+_PROBE_CODE = r"""
+import json, os, sys
+try:
+    from importlib import metadata
+except ImportError:
+    metadata = None
+packages = {}
+site_dirs = set()
+for dist in (metadata.distributions() if metadata else []):
+    name = dist.metadata["Name"] or ""
+    site_dirs.add(str(dist.locate_file("")))
+    for f in dist.files or []:
+        parts = f.parts
+        if not parts or parts[0] in ("..", "__pycache__") or parts[0].endswith(
+            (".dist-info", ".egg-info", ".data", ".pth")
+        ):
+            continue
+        top = parts[0]
+        if len(parts) == 1:
+            top = top.split(".")[0]
+        elif top.endswith((".libs", ".dylibs")):
+            top = top.rsplit(".", 1)[0]
+        if not top.isidentifier():
+            continue
+        size = f.size
+        if size is None:
+            try:
+                size = os.path.getsize(str(f.locate()))
+            except OSError:
+                size = 0
+        info = packages.setdefault(top, {"dist": name, "size": 0, "path": ""})
+        info["size"] += int(size)
+        if not info["path"]:
+            if len(parts) > 1 and parts[0] == top:
+                info["path"] = str(dist.locate_file(top))
+            elif len(parts) == 1 and parts[0] == top + ".py":
+                info["path"] = str(dist.locate_file(parts[0]))
+print(json.dumps({
+    "python": sys.executable,
+    "version": "%d.%d.%d" % sys.version_info[:3],
+    "metadata": metadata is not None,
+    "stdlib": sorted(set(getattr(sys, "stdlib_module_names", ())) | set(sys.builtin_module_names)),
+    "packages": packages,
+    "site_dirs": sorted(site_dirs),
+}))
+"""
+
+# 各类建议的说明，按可放心排除的程度排序
+_KIND_REASONS = {
+    "unreachable": "入口不可达（只被其他模块导入）",
+    GUARD_TYPING: "只在 TYPE_CHECKING 中导入",
+    GUARD_OPTIONAL: "只经由 try/except ImportError 可选导入",
+    GUARD_LAZY: "只经由第三方包函数体中的延迟导入",
+}
+
+
+def probe_environment(python: str, timeout: float = PROBE_TIMEOUT) -> Dict[str, Any]:
+    """
+    查询目标解释器中已安装的包
+
+    Returns:
+        包含 python / version / stdlib / packages / site_dirs 的结果，
+        packages 为 {顶层导入名: {dist, size, path}}
+    """
+    result = subprocess.run(
+        [python, "-c", _PROBE_CODE],
+        stdin=subprocess.DEVNULL,
+        capture_output=True,
+        timeout=timeout,
+    )
+    if result.returncode != 0:
+        message = result.stderr.decode("utf-8", errors="replace").strip()
+        raise RuntimeError(message.splitlines()[-1] if message else "查询已安装包失败")
+    return json.loads(result.stdout.decode("utf-8"))
+
+
+def _site_fingerprint(site_dirs: List[str]) -> Dict[str, int]:
+    """site-packages 目录的修改时间，安装或卸载包时会变化"""
+    fingerprint = {}
+    for site_dir in site_dirs:
+        try:
+            fingerprint[site_dir] = os.stat(site_dir).st_mtime_ns
+        except OSError:
+            fingerprint[site_dir] = 0
+    return fingerprint
+
+
+def load_environment(project_dir: Path, python: Optional[str] = None) -> Dict[str, Any]:
+    """
+    查询已安装的包，结果按解释器缓存在 .pybuilder/env_cache.json，
+    site-packages 目录没有变化时直接复用（返回结果中 cached 为 True）
+
+    Args:
+        project_dir: 项目目录
+        python: 目标解释器，默认使用项目虚拟环境中的解释器
+    """
+    python = python or find_project_python(project_dir)
+    cache_path = project_dir / ENV_CACHE_FILE
+    try:
+        cache = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        cache = {}
+    if not isinstance(cache, dict):
+        cache = {}
+
+    entry = cache.get(python)
+    if isinstance(entry, dict) and "env" in entry:
+        if entry.get("fingerprint") == _site_fingerprint(entry["env"]["site_dirs"]):
+            return {**entry["env"], "cached": True}
+
+    env = probe_environment(python)
+    cache[python] = {"fingerprint": _site_fingerprint(env["site_dirs"]), "env": env}
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(json.dumps(cache, ensure_ascii=False), encoding="utf-8")
+    except OSError:
+        pass
+    return {**env, "cached": False}
+
+
+def _package_files(top: str, path: str) -> Dict[str, str]:
+    """列出已安装包中的 .py 文件，返回 {相对 site-packages 的路径: 绝对路径}"""
+    if not path:
+        return {}
+    if os.path.isfile(path):
+        return {os.path.basename(path): path} if path.endswith(".py") else {}
+    site_dir = os.path.dirname(path)
+    files: Dict[str, str] = {}
+    for root, dirs, names in os.walk(path):
+        dirs[:] = sorted(d for d in dirs if d not in _SKIP_PACKAGE_DIRS)
+        rel_dir = os.path.relpath(root, site_dir).replace(os.sep, "/")
+        for name in sorted(names):
+            if name.endswith(".py") and not name.startswith("test_"):
+                files[f"{rel_dir}/{name}"] = os.path.join(root, name)
+    return files
+
+
+def _imported_tops(parsed: Dict[str, Any]) -> Set[str]:
+    """解析结果中所有绝对导入的顶层包名"""
+    tops = set()
+    for info in parsed.values():
+        for record in info["records"]:
+            if not record["level"] and record["module"]:
+                tops.add(record["module"].split(".")[0])
+    return tops
+
+
+def scan_site_packages(
+    project_dir: Path,
+    packages: Dict[str, Dict[str, Any]],
+    start: Set[str],
+    jobs: int = 0,
+) -> Tuple[Dict[str, Any], int]:
+    """
+    从 start 中的顶层包出发，逐层解析被导入的已安装包，构建第三方包导入图
+
+    Returns:
+        (build_import_graph 的结果（函数体中的导入视为非必需）, 重新解析的文件数)
+    """
+    cache_path = project_dir / SITE_CACHE_FILE
+    cache = load_parse_cache(cache_path)
+    # 缓存键使用绝对路径，不同虚拟环境之间互不干扰
+    entries: Dict[str, Dict[str, Any]] = {}
+    parsed: Dict[str, Dict[str, Any]] = {}
+    parsed_count = 0
+    seen: Set[str] = set()
+    pending = {top for top in start if top in packages}
+    while pending:
+        seen |= pending
+        files: Dict[str, str] = {}
+        for top in sorted(pending):
+            files.update(_package_files(top, packages[top]["path"]))
+        batch, count = parse_files_cached(
+            {path: path for path in files.values()}, cache, jobs
+        )
+        parsed_count += count
+        entries.update(batch)
+        by_rel = {rel: batch[path] for rel, path in files.items() if path in batch}
+        parsed.update(by_rel)
+        pending = {
+            top for top in _imported_tops(by_rel) if top in packages and top not in seen
+        }
+
+    if parsed_count or len(cache) != len(entries):
+        save_parse_cache(cache_path, entries)
+    return build_import_graph(parsed, [""], lazy_guard=True), parsed_count
+
+
+def _walk(
+    graphs: List[Dict[str, Any]],
+    start: List[str],
+    follow_guarded: bool,
+) -> Dict[str, Tuple[str, str]]:
+    """
+    在项目和第三方包的合并导入图中遍历
+
+    Args:
+        graphs: 按优先级排列的导入图（项目优先，与 sys.path 顺序一致）
+        start: 起始模块
+        follow_guarded: 是否经过非必需导入
+
+    Returns:
+        {可达模块: (上一个模块, 该边的上下文)}，外部未解析的模块以顶层名记录
+    """
+
+    def lookup(name: str) -> str:
+        for graph in graphs:
+            resolved = resolve_module(name, graph["modules"])
+            if resolved:
+                return resolved
+        return ""
+
+    def node_of(name: str) -> Optional[Dict[str, Any]]:
+        for graph in graphs:
+            if name in graph["modules"]:
+                return graph["modules"][name]
+        return None
+
+    parents: Dict[str, Tuple[str, str]] = {name: ("", "") for name in start}
+    queue = deque(start)
+    while queue:
+        current = queue.popleft()
+        node = node_of(current)
+        if node is None:
+            continue
+        for target in node["imports"] + node["external"]:
+            guard = node["guarded"].get(target, "")
+            if guard and not follow_guarded:
+                continue
+            resolved = lookup(target)
+            # 导入子模块时会先执行各级父包
+            parts = (resolved or target.split(".")[0]).split(".")
+            for end in range(1, len(parts) + 1):
+                name = ".".join(parts[:end])
+                if name not in parents and (end == len(parts) or lookup(name)):
+                    parents[name] = (current, guard)
+                    queue.append(name)
+    return parents
+
+
+def _chain(parents: Dict[str, Tuple[str, str]], name: str) -> Tuple[List[str], str]:
+    """回溯导入链，返回 (从入口到 name 的模块列表, 链上第一个非必需导入的上下文)"""
+    chain = [name]
+    guard = ""
+    while parents.get(chain[-1], ("", ""))[0]:
+        parent, edge_guard = parents[chain[-1]]
+        if edge_guard:
+            guard = edge_guard
+        chain.append(parent)
+    chain.reverse()
+    return chain, guard
+
+
+def recommend_excludes(
+    project_dir: Path,
+    config: Dict[str, Any],
+    python: Optional[str] = None,
+    jobs: int = 0,
+) -> Dict[str, Any]:
+    """
+    分析入口文件的导入可达性并给出排除建议
+
+    Args:
+        project_dir: 项目目录
+        config: 构建配置（使用 entry_file / output_dir 及现有排除选项）
+        python: 目标解释器，默认使用项目虚拟环境中的解释器
+        jobs: 解析进程数，0 表示使用 CPU 核数
+
+    Returns:
+        包含 python / installed / reachable / suggestions / stats 的结果，
+        suggestions 按可节省的磁盘占用降序排列，每项包含
+        module / dist / size / kind / reason / chain / recommended
+    """
+    start_time = time.perf_counter()
+    env = load_environment(project_dir, python)
+    packages: Dict[str, Dict[str, Any]] = env["packages"]
+    stdlib = set(env["stdlib"])
+
+    project = scan_project(project_dir, config, jobs)
+    entry_file = str(config.get("entry_file", "main.py")).replace("\\", "/")
+    entry, _ = module_name(entry_file, project["roots"])
+    if entry not in project["modules"]:
+        raise ValueError(f"入口文件不存在或无法解析: {entry_file}")
+
+    # 项目中导入的所有已安装包都需要解析，才能区分可达与不可达
+    start = {
+        top
+        for top in project["external"]
+        if top in packages and top not in project["modules"]
+    }
+    site, site_parsed = scan_site_packages(project_dir, packages, start, jobs)
+    graphs = [project, site]
+
+    strict = _walk(graphs, [entry], follow_guarded=False)
+    loose = _walk(graphs, [entry], follow_guarded=True)
+    strict_tops = {name.split(".")[0] for name in strict}
+    loose_tops = {name.split(".")[0] for name in loose}
+
+    # 已经排除的包不再重复建议
+    nuitka = config.get("build_tool", "nuitka") == "nuitka"
+    existing = set()
+    for key in (
+        "exclude_packages",
+        "nofollow_imports" if nuitka else "exclude_modules",
+    ):
+        value = config.get(key) or ""
+        if isinstance(value, list):
+            value = " ".join(str(item) for item in value)
+        existing.update(value.replace("，", " ").replace(",", " ").split())
+
+    suggestions: List[Dict[str, Any]] = []
+    for top, info in packages.items():
+        if top in stdlib or top in project["modules"] or top in existing:
+            continue
+        if top in strict_tops:
+            continue
+        if top in loose_tops:
+            first = min(
+                (name for name in loose if name.split(".")[0] == top),
+                key=lambda name: len(_chain(loose, name)[0]),
+            )
+            chain, kind = _chain(loose, first)
+        elif top in project["external"]:
+            kind = "unreachable"
+            chain = project["external"][top]["importers"][:3]
+        else:
+            # 项目和可达的第三方包都没有导入，打包工具不会跟随，无需排除
+            continue
+        suggestions.append(
+            {
+                "module": top,
+                "dist": info["dist"],
+                "size": info["size"],
+                "kind": kind,
+                "reason": _KIND_REASONS[kind],
+                "chain": chain,
+                # 延迟导入的函数可能在运行时被调用，需要人工确认
+                "recommended": kind != GUARD_LAZY
+                and info["size"] >= RECOMMEND_MIN_SIZE,
+            }
+        )
+    suggestions.sort(key=lambda item: item["size"], reverse=True)
+
+    return {
+        "python": env["python"],
+        "version": env["version"],
+        "installed": len(packages),
+        "reachable": sorted(top for top in strict_tops if top in packages),
+        "suggestions": suggestions,
+        "stats": {
+            "project_files": project["stats"]["files"],
+            "site_files": len(site["modules"]),
+            "parsed": project["stats"]["parsed"] + site_parsed,
+            "seconds": round(time.perf_counter() - start_time, 3),
+        },
+    }
@@ -0,0 +1,354 @@
+"""
+脚本与配置写入模块
+内容未变化时跳过写入，避免修改时间变化导致下游 make/ninja 重复构建；
+dry-run 模式下只返回将要产生的 unified diff。
+所有写入都先写临时文件、fsync 后再原子替换，中途崩溃不会留下截断的文件；
+同一文件的并发写入（包括其他进程）按文件加锁串行执行，WriteBehind 将短时间内的多次写入合并为一次
+"""
+
+import difflib
+import hashlib
+import os
+import platform
+import secrets
+import stat
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# 写入状态
+CREATED = "created"
+UPDATED = "updated"
+UNCHANGED = "unchanged"
+
+_STATUS_LABELS = {CREATED: "新建", UPDATED: "已更新", UNCHANGED: "未变化"}
+
+
+_FILE_LOCKS: Dict[str, "_FileLock"] = {}
+_FILE_LOCKS_GUARD = threading.Lock()
+
+
+def _lock_os_file(fd: int) -> None:
+    """对锁文件加排他锁（阻塞直到获得）"""
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        return
+    # msvcrt.locking 的 LK_LOCK 重试 10 次后抛出 OSError，继续等待
+    while True:
+        try:
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+            return
+        except OSError:
+            continue
+
+
+def _unlock_os_file(fd: int) -> None:
+    """释放锁文件上的排他锁"""
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+def _remove_lock_file(path: Optional[Path]) -> None:
+    """删除锁文件，失败时忽略"""
+    if path is None:
+        return
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+class _FileLock:
+    """
+    同一文件的写入锁：进程内可重入锁加上锁文件上的操作系统锁，
+    多个线程和多个进程（如同时打开同一项目的两个 TUI）对同一文件的读-改-写都会串行执行。
+    锁文件放在用户缓存目录的 locks 下，不在项目中留下额外文件，释放时删除；
+    缓存目录不可写时只在进程内加锁
+    """
+
+    def __init__(self, key: str) -> None:
+        self.key = key
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._fd: Optional[int] = None
+        self._path: Optional[Path] = None
+
+    def _lock_path(self) -> Path:
+        # 延迟导入：config 模块依赖本模块
+        from src.utils.config import get_cache_dir
+
+        digest = hashlib.sha256(self.key.encode("utf-8")).hexdigest()[:32]
+        return get_cache_dir() / "locks" / f"{digest}.lock"
+
+    def _acquire_os_lock(self, lock_path: Path) -> Optional[int]:
+        """打开并锁定锁文件，返回文件描述符，锁文件无法创建时返回 None"""
+        while True:
+            try:
+                lock_path.parent.mkdir(parents=True, exist_ok=True)
+                fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o666)
+            except OSError:
+                return None
+            try:
+                _lock_os_file(fd)
+                # 等待期间上一个持有者可能已删除锁文件，锁住的不是路径上的当前文件时重新打开
+                if fcntl is None or os.path.samestat(os.fstat(fd), os.stat(lock_path)):
+                    return fd
+            except FileNotFoundError:
+                pass
+            except BaseException:
+                os.close(fd)
+                raise
+            os.close(fd)
+
+    def __enter__(self) -> "_FileLock":
+        self._lock.acquire()
+        if self._depth == 0:
+            try:
+                self._path = self._lock_path()
+                self._fd = self._acquire_os_lock(self._path)
+            except BaseException:
+                self._lock.release()
+                raise
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._depth -= 1
+        if self._depth == 0 and self._fd is not None:
+            try:
+                # POSIX 在持有锁时删除，等待者加锁后发现文件已不在路径上会重新打开；
+                # Windows 无法删除已打开的文件，关闭后再删除（其他进程仍打开时删除失败，保留给它使用）
+                if fcntl is not None:
+                    _remove_lock_file(self._path)
+                _unlock_os_file(self._fd)
+            finally:
+                os.close(self._fd)
+                self._fd = None
+                if fcntl is None:
+                    _remove_lock_file(self._path)
+        self._lock.release()
+
+
+def file_lock(path: Path) -> _FileLock:
+    """返回文件对应的写入锁（with file_lock(path): ...），用于串行化对同一文件的读-改-写"""
+    key = os.path.normcase(os.path.abspath(path))
+    with _FILE_LOCKS_GUARD:
+        lock = _FILE_LOCKS.get(key)
+        if lock is None:
+            lock = _FILE_LOCKS[key] = _FileLock(key)
+        return lock
+
+
+def _create_temp_file(path: Path) -> Tuple[int, str]:
+    """
+    在目标文件所在目录创建临时文件，返回 (文件描述符, 路径)
+    以 0o666 创建，新文件权限由操作系统按当前 umask 决定，与直接写入时一致
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    while True:
+        temp_name = str(path.parent / f".{path.name}.{secrets.token_hex(6)}.tmp")
+        try:
+            return os.open(temp_name, flags, 0o666), temp_name
+        except FileExistsError:
+            continue
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """
+    原子写入文件：写入同目录下的临时文件并 fsync，再用 os.replace 替换目标文件
+    保留已有文件的权限，替换后尽量 fsync 所在目录使重命名落盘
+    """
+    path = Path(path)
+    with file_lock(path):
+        try:
+            mode: Optional[int] = stat.S_IMODE(path.stat().st_mode)
+        except FileNotFoundError:
+            mode = None
+        fd, temp_name = _create_temp_file(path)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            if mode is not None:
+                os.chmod(temp_name, mode)
+            os.replace(temp_name, path)
+        except BaseException:
+            try:
+                os.unlink(temp_name)
+            except OSError:
+                pass
+            raise
+
+        # Windows 不支持打开目录进行 fsync
+        if platform.system() != "Windows":
+            try:
+                dir_fd = os.open(path.parent, os.O_RDONLY)
+            except OSError:
+                return
+            try:
+                os.fsync(dir_fd)
+            except OSError:
+                pass
+            finally:
+                os.close(dir_fd)
+
+
+def atomic_write_text(path: Path, text: str, encoding: str = "utf-8") -> None:
+    """原子写入文本文件"""
+    atomic_write_bytes(path, text.encode(encoding))
+
+
+class WriteBehind:
+    """
+    延迟合并写入：同一目标在 delay 秒内多次调度时只执行最后一次，
+    连续操作（如快速切换主题）只产生一次写入；退出前调用 flush() 立即写出
+    """
+
+    def __init__(self, delay: float = 0.5) -> None:
+        self.delay = delay
+        self._pending: Dict[Any, Callable[[], Any]] = {}
+        self._timers: Dict[Any, threading.Timer] = {}
+        self._lock = threading.Lock()
+        # 保证定时器线程中正在执行的写入与 flush 不会交错
+        self._write_lock = threading.Lock()
+
+    def schedule(self, key: Any, write: Callable[[], Any]) -> None:
+        """调度写入，覆盖同一 key 尚未执行的写入并重新计时"""
+        with self._lock:
+            self._pending[key] = write
+            timer = self._timers.pop(key, None)
+            if timer:
+                timer.cancel()
+            timer = threading.Timer(self.delay, self.flush, args=(key,))
+            timer.daemon = True
+            self._timers[key] = timer
+            timer.start()
+
+    def pending(self) -> List[Any]:
+        """尚未执行的写入目标"""
+        with self._lock:
+            return list(self._pending)
+
+    def flush(self, key: Optional[Any] = None) -> None:
+        """立即执行尚未执行的写入（不指定 key 时执行全部）"""
+        with self._lock:
+            keys = list(self._pending) if key is None else [key]
+            writes = []
+            for item in keys:
+                timer = self._timers.pop(item, None)
+                if timer:
+                    timer.cancel()
+                if item in self._pending:
+                    writes.append(self._pending.pop(item))
+        with self._write_lock:
+            for write in writes:
+                try:
+                    write()
+                except Exception as e:
+                    print(f"写入失败: {e}")
+
+
+def _digest(data: bytes) -> str:
+    """计算内容哈希"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def write_if_changed(
+    path: Path, content: str, executable: bool = False, dry_run: bool = False
+) -> Dict[str, Any]:
+    """
+    内容与现有文件不同时才写入
+
+    Args:
+        path: 目标文件
+        content: 文件内容
+        executable: 是否需要可执行权限（Windows 上忽略）
+        dry_run: 只计算差异，不写入
+
+    Returns:
+        包含 name / status / diff 的结果，status 为 created / updated / unchanged，
+        diff 仅在 dry_run 时填充
+    """
+    data = content.encode("utf-8")
+    try:
+        old_data = path.read_bytes()
+    except FileNotFoundError:
+        old_data = None
+
+    if old_data is None:
+        status = CREATED
+    elif _digest(old_data) == _digest(data):
+        status = UNCHANGED
+    else:
+        status = UPDATED
+
+    result = {"name": path.name, "status": status, "diff": ""}
+    if dry_run:
+        if status != UNCHANGED:
+            old_lines = (
+                old_data.decode("utf-8", errors="replace").splitlines(keepends=True)
+                if old_data is not None
+                else []
+            )
+            result["diff"] = "".join(
+                difflib.unified_diff(
+                    old_lines,
+                    content.splitlines(keepends=True),
+                    fromfile=f"a/{path.name}" if old_data is not None else "/dev/null",
+                    tofile=f"b/{path.name}",
+                )
+            )
+        return result
+
+    if status != UNCHANGED:
+        atomic_write_bytes(path, data)
+
+    # 只在缺少可执行权限时 chmod，chmod 本身也会更新 ctime
+    if executable and platform.system() != "Windows":
+        mode = path.stat().st_mode
+        if not mode & stat.S_IEXEC:
+            path.chmod(mode | stat.S_IEXEC)
+    return result
+
+
+def write_scripts(
+    scripts: Dict[str, str],
+    project_dir: Path,
+    executable: bool = False,
+    dry_run: bool = False,
+) -> List[Dict[str, Any]]:
+    """批量写入脚本，返回每个文件的 write_if_changed 结果（可执行权限只设置给 .py 脚本）"""
+    return [
+        write_if_changed(
+            project_dir / name, content, executable and name.endswith(".py"), dry_run
+        )
+        for name, content in scripts.items()
+    ]
+
+
+def describe_writes(results: List[Dict[str, Any]], dry_run: bool = False) -> str:
+    """
+    生成写入结果说明
+    普通模式为 "脚本已生成: a.py, b.py（未变化）"，dry-run 模式附带 diff
+    """
+    if not dry_run:
+        names = [
+            r["name"] if r["status"] != UNCHANGED else f"{r['name']}（未变化）"
+            for r in results
+        ]
+        return f"脚本已生成: {', '.join(names)}"
+
+    names = [f"{r['name']}（{_STATUS_LABELS[r['status']]}）" for r in results]
+    lines = [f"[dry-run] 脚本未写入: {', '.join(names)}"]
+    lines.extend(r["diff"].rstrip("\n") for r in results if r["diff"])
+    return "\n".join(lines)
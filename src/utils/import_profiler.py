@@ -0,0 +1,180 @@
+"""
+导入耗时分析模块
+在子进程中以 python -X importtime 运行入口文件，解析导入树并给出排除建议
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.utils.dist_analyzer import UNNEEDED_STDLIB
+from src.utils.python_env import find_project_python
+
+# 入口文件运行超时（秒），GUI 主循环等无法自行退出的程序到时终止
+IMPORTTIME_TIMEOUT = 20
+# 间接导入耗时低于该值（微秒）的包不给出排除建议
+SUGGEST_MIN_US = 20_000
+
+# 以非 __main__ 名称运行入口文件：模块级导入照常执行，
+# if __name__ == "__main__" 中的主循环不会启动
+_BOOTSTRAP = (
+    "import os, runpy, sys; "
+    "entry = os.path.abspath(sys.argv[1]); "
+    "sys.argv = sys.argv[1:]; "
+    "sys.path.insert(0, os.path.dirname(entry)); "
+    "runpy.run_path(entry, run_name='__pybuilder_importtime__')"
+)
+
+
+def run_importtime(
+    project_dir: Path,
+    entry_file: str,
+    python: Optional[str] = None,
+    timeout: float = IMPORTTIME_TIMEOUT,
+) -> Tuple[str, bool]:
+    """运行入口文件并收集 -X importtime 输出
+
+    Returns:
+        (importtime 输出, 是否超时)
+    """
+    env = dict(os.environ)
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+    env.pop("PYTHONPROFILEIMPORTTIME", None)
+    interpreter = python or find_project_python(project_dir)
+    process = subprocess.Popen(
+        [interpreter, "-X", "importtime", "-c", _BOOTSTRAP, entry_file],
+        cwd=project_dir,
+        env=env,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+    )
+    try:
+        _, stderr = process.communicate(timeout=timeout)
+        timed_out = False
+    except subprocess.TimeoutExpired:
+        # 超时前输出的导入记录仍然有效
+        process.kill()
+        _, stderr = process.communicate()
+        timed_out = True
+    return stderr.decode("utf-8", errors="replace"), timed_out
+
+
+def parse_importtime(output: str) -> List[Dict[str, Any]]:
+    """解析 importtime 输出为导入树
+
+    每行格式为 "import time: self | cumulative | <缩进>模块名"，子模块先于父模块输出，
+    缩进每两个空格表示一层嵌套
+
+    Returns:
+        顶层导入节点列表，节点包含 name / self_us / cumulative_us / children
+    """
+    pending: Dict[int, List[Dict[str, Any]]] = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3:
+            continue
+        try:
+            self_us = int(fields[0])
+            cumulative_us = int(fields[1])
+        except ValueError:
+            # 表头行
+            continue
+        name_field = fields[2][1:] if fields[2].startswith(" ") else fields[2]
+        depth = (len(name_field) - len(name_field.lstrip(" "))) // 2
+        node = {
+            "name": name_field.strip(),
+            "self_us": self_us,
+            "cumulative_us": cumulative_us,
+            "children": pending.pop(depth + 1, []),
+        }
+        pending.setdefault(depth, []).append(node)
+    return pending.get(0, [])
+
+
+def _walk(nodes: List[Dict[str, Any]]):
+    """遍历导入树所有节点，返回 (节点, 父节点)"""
+    stack = [(node, None) for node in nodes]
+    while stack:
+        node, parent = stack.pop()
+        yield node, parent
+        stack.extend((child, node) for child in node["children"])
+
+
+def summarize_imports(
+    roots: List[Dict[str, Any]],
+    project_dir: Path,
+    project_imports: set,
+    top_n: int = 10,
+) -> Dict[str, Any]:
+    """汇总导入耗时
+
+    Args:
+        roots: parse_importtime 返回的顶层节点
+        project_dir: 项目目录，用于识别项目自身模块
+        project_imports: 项目源码直接导入的顶层模块
+        top_n: 各排行榜显示的条目数
+
+    Returns:
+        包含 total_us / slowest / heaviest / packages / suggestions 的结果，
+        suggestions 中 recommended 为 False 的条目需要人工确认
+    """
+    nodes = []
+    packages: Dict[str, List[int]] = {}
+    # 每个顶层包由哪些其他顶层包导入
+    importers: Dict[str, set] = {}
+    for node, parent in _walk(roots):
+        nodes.append(node)
+        top = node["name"].split(".")[0]
+        stat = packages.setdefault(top, [0, 0])
+        stat[0] += node["self_us"]
+        stat[1] += 1
+        parent_top = parent["name"].split(".")[0] if parent else ""
+        if parent_top and parent_top != top:
+            importers.setdefault(top, set()).add(parent_top)
+
+    stdlib_names = getattr(sys, "stdlib_module_names", frozenset())
+    suggestions = []
+    for top, (self_us, _count) in sorted(
+        packages.items(), key=lambda item: item[1][0], reverse=True
+    ):
+        if top in project_imports or top.startswith("_"):
+            continue
+        # 项目自身的模块和包
+        if (project_dir / top).is_dir() or (project_dir / f"{top}.py").is_file():
+            continue
+        if top in UNNEEDED_STDLIB:
+            reason = "通常无需打包的标准库"
+        elif top in stdlib_names or self_us < SUGGEST_MIN_US:
+            continue
+        else:
+            # 由其他依赖导入的包可能是硬依赖，只作为候选，需要确认运行时用不到
+            via = ", ".join(sorted(importers.get(top, ()))) or "解释器"
+            reason = f"项目未直接导入，启动时由 {via} 导入"
+        suggestions.append(
+            {
+                "module": top,
+                "self_us": self_us,
+                "reason": reason,
+                "recommended": top in UNNEEDED_STDLIB,
+            }
+        )
+
+    return {
+        "total_us": sum(node["cumulative_us"] for node in roots),
+        "module_count": len(nodes),
+        "slowest": sorted(nodes, key=lambda n: n["cumulative_us"], reverse=True)[
+            :top_n
+        ],
+        "heaviest": sorted(nodes, key=lambda n: n["self_us"], reverse=True)[:top_n],
+        "packages": sorted(
+            ((top, self_us, count) for top, (self_us, count) in packages.items()),
+            key=lambda item: item[1],
+            reverse=True,
+        )[:top_n],
+        "suggestions": suggestions[:top_n],
+    }
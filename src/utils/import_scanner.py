@@ -0,0 +1,546 @@
+"""
+导入扫描模块
+使用 ast 并行解析项目中的所有 .py 文件，提取静态导入以及
+importlib.import_module("字面量") / __import__("字面量") 动态导入，构建项目导入图，
+并据此给出 include_packages / hidden_imports / nofollow_imports 等选项的建议
+
+解析结果按 (路径, 修改时间, 大小) 缓存在 .pybuilder/import_cache.json，
+重新扫描时只解析发生变化的文件
+"""
+
+import ast
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.utils.build_graph import GENERATED_SCRIPTS, collect_source_files
+
+# 解析结果缓存文件（相对项目目录）
+CACHE_FILE = ".pybuilder/import_cache.json"
+# 缓存格式版本，解析规则变化时递增使旧缓存失效
+CACHE_VERSION = 2
+# 待解析文件少于该数量时直接在当前进程解析（进程池启动开销更大）
+PARALLEL_MIN_FILES = 64
+
+# 导入所在的上下文：try/except ImportError 中的可选依赖、if TYPE_CHECKING 中的类型导入、
+# 函数体中的延迟导入（只在函数被调用时执行）
+GUARD_OPTIONAL = "optional"
+GUARD_TYPING = "typing"
+GUARD_LAZY = "lazy"
+
+# 动态导入函数
+_DYNAMIC_FUNCS = {"import_module", "__import__"}
+# 不含动态导入时只需遍历语句块，跳过表达式可大幅减少遍历的节点数
+_BLOCK_FIELDS = ("body", "orelse", "finalbody", "handlers", "cases")
+# 捕获这些异常的 try 块视为可选导入
+_IMPORT_ERRORS = {"ImportError", "ModuleNotFoundError", "Exception", "BaseException"}
+
+
+def _catches_import_error(node: Optional[ast.expr]) -> bool:
+    """except 子句是否会捕获 ImportError（裸 except 也算）"""
+    if node is None:
+        return True
+    if isinstance(node, ast.Tuple):
+        return any(_catches_import_error(item) for item in node.elts)
+    if isinstance(node, ast.Attribute):
+        return node.attr in _IMPORT_ERRORS
+    return isinstance(node, ast.Name) and node.id in _IMPORT_ERRORS
+
+
+def _is_type_checking(node: ast.expr) -> bool:
+    """判断 if 条件是否为 TYPE_CHECKING / typing.TYPE_CHECKING"""
+    if isinstance(node, ast.Attribute):
+        return node.attr == "TYPE_CHECKING"
+    return isinstance(node, ast.Name) and node.id == "TYPE_CHECKING"
+
+
+class _ImportVisitor(ast.NodeVisitor):
+    """收集导入记录，记录所在的 try / TYPE_CHECKING / 函数体上下文（取最内层）"""
+
+    def __init__(self, find_dynamic: bool = True) -> None:
+        self.records: List[Dict[str, Any]] = []
+        self._guards: List[str] = []
+        self._find_dynamic = find_dynamic
+
+    def generic_visit(self, node: ast.AST) -> None:
+        if self._find_dynamic:
+            super().generic_visit(node)
+            return
+        for field in _BLOCK_FIELDS:
+            children = getattr(node, field, None)
+            if isinstance(children, list):
+                for child in children:
+                    self.visit(child)
+
+    def _add(
+        self,
+        module: str,
+        names: List[str],
+        level: int,
+        line: int,
+        dynamic: bool = False,
+    ) -> None:
+        self.records.append(
+            {
+                "module": module,
+                "names": names,
+                "level": level,
+                "line": line,
+                "dynamic": dynamic,
+                "guard": self._guards[-1] if self._guards else "",
+            }
+        )
+
+    def _visit_guarded(self, nodes: List[ast.AST], guard: str) -> None:
+        self._guards.append(guard)
+        for node in nodes:
+            self.visit(node)
+        self._guards.pop()
+
+    def visit_Import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            self._add(alias.name, [], 0, node.lineno)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        names = [alias.name for alias in node.names if alias.name != "*"]
+        self._add(node.module or "", names, node.level, node.lineno)
+
+    def visit_Try(self, node: ast.Try) -> None:
+        if not any(_catches_import_error(h.type) for h in node.handlers):
+            self.generic_visit(node)
+            return
+        # try 体和 except 中的备选导入都是可选依赖
+        self._visit_guarded(node.body, GUARD_OPTIONAL)
+        self._visit_guarded(node.handlers, GUARD_OPTIONAL)
+        for stmt in node.orelse + node.finalbody:
+            self.visit(stmt)
+
+    visit_TryStar = visit_Try
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        # 装饰器和默认值在定义时执行，函数体延迟到调用时
+        for expr in node.decorator_list + node.args.defaults + node.args.kw_defaults:
+            if expr is not None:
+                self.visit(expr)
+        self._visit_guarded(node.body, GUARD_LAZY)
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_If(self, node: ast.If) -> None:
+        if not _is_type_checking(node.test):
+            self.generic_visit(node)
+            return
+        self._visit_guarded(node.body, GUARD_TYPING)
+        for stmt in node.orelse:
+            self.visit(stmt)
+
+    def visit_Call(self, node: ast.Call) -> None:
+        func = node.func
+        name = func.attr if isinstance(func, ast.Attribute) else getattr(func, "id", "")
+        if name in _DYNAMIC_FUNCS and node.args:
+            target = node.args[0]
+            if isinstance(target, ast.Constant) and isinstance(target.value, str):
+                self._add_dynamic(node, target.value)
+        self.generic_visit(node)
+
+    def _add_dynamic(self, node: ast.Call, target: str) -> None:
+        """记录动态导入，import_module(".x", "pkg") 形式的相对导入按 package 参数解析"""
+        level = len(target) - len(target.lstrip("."))
+        module = target[level:]
+        if not level:
+            self._add(module, [], 0, node.lineno, dynamic=True)
+            return
+        package: Any = node.args[1] if len(node.args) > 1 else None
+        for keyword in node.keywords:
+            if keyword.arg == "package":
+                package = keyword.value
+        if isinstance(package, ast.Constant) and isinstance(package.value, str):
+            # 以字面量包名为基准，转换为绝对导入
+            parts = package.value.split(".")
+            if level - 1 < len(parts):
+                base = ".".join(parts[: len(parts) - (level - 1)])
+                full = f"{base}.{module}" if module else base
+                self._add(full, [], 0, node.lineno, dynamic=True)
+        elif isinstance(package, ast.Name) and package.id == "__package__":
+            # 相对当前模块所在的包
+            self._add(module, [], level, node.lineno, dynamic=True)
+
+
+def scan_file(path: str) -> Dict[str, Any]:
+    """解析单个文件，返回 {"records": 导入记录列表, "error": 错误信息}"""
+    try:
+        with open(path, "rb") as f:
+            source = f.read()
+        tree = ast.parse(source, filename=path)
+    except (OSError, SyntaxError, ValueError) as e:
+        return {"records": [], "error": f"{type(e).__name__}: {e}"}
+    visitor = _ImportVisitor(b"import_module" in source or b"__import__" in source)
+    visitor.visit(tree)
+    return {"records": visitor.records, "error": ""}
+
+
+def load_parse_cache(cache_path: Path) -> Dict[str, Any]:
+    """读取解析缓存，格式不匹配时返回空缓存"""
+    try:
+        data = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+        return {}
+    files = data.get("files")
+    return files if isinstance(files, dict) else {}
+
+
+def save_parse_cache(cache_path: Path, files: Dict[str, Any]) -> None:
+    """保存解析缓存（写入失败不影响扫描结果）"""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(
+            json.dumps(
+                {"version": CACHE_VERSION, "files": dict(sorted(files.items()))},
+                ensure_ascii=False,
+            ),
+            encoding="utf-8",
+        )
+    except OSError:
+        pass
+
+
+def _parse_files(paths: List[str], jobs: int) -> List[Dict[str, Any]]:
+    """解析文件列表，文件较多时使用进程池"""
+    workers = min(jobs or os.cpu_count() or 1, len(paths))
+    if workers <= 1 or len(paths) < PARALLEL_MIN_FILES:
+        return [scan_file(path) for path in paths]
+    chunksize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(scan_file, paths, chunksize=chunksize))
+
+
+def parse_files_cached(
+    files: Dict[str, str], cache: Dict[str, Any], jobs: int = 0
+) -> Tuple[Dict[str, Dict[str, Any]], int]:
+    """
+    解析文件，修改时间和大小与缓存一致的文件直接复用缓存结果
+
+    Args:
+        files: {缓存键: 文件路径}
+        cache: load_parse_cache 读取的缓存
+        jobs: 解析进程数，0 表示使用 CPU 核数
+
+    Returns:
+        ({缓存键: 解析结果}, 重新解析的文件数)
+    """
+    parsed: Dict[str, Dict[str, Any]] = {}
+    stale: List[str] = []
+    stats: Dict[str, Tuple[int, int]] = {}
+    for key, path in files.items():
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        stats[key] = (st.st_mtime_ns, st.st_size)
+        entry = cache.get(key)
+        if entry and (entry.get("mtime"), entry.get("size")) == stats[key]:
+            parsed[key] = entry
+        else:
+            stale.append(key)
+
+    if stale:
+        results = _parse_files([files[key] for key in stale], jobs)
+        for key, result in zip(stale, results):
+            mtime, size = stats[key]
+            parsed[key] = {"mtime": mtime, "size": size, **result}
+    return parsed, len(stale)
+
+
+def _source_roots(project_dir: Path, entry_file: str) -> List[str]:
+    """
+    模块搜索根目录（相对项目目录，最长的在前）
+    项目目录、入口文件所在目录，以及 src 布局中的 src 目录
+    """
+    roots = {""}
+    entry_dir = Path(entry_file.replace("\\", "/")).parent.as_posix()
+    if entry_dir not in ("", "."):
+        roots.add(entry_dir)
+    src_dir = project_dir / "src"
+    if src_dir.is_dir() and not (src_dir / "__init__.py").exists():
+        roots.add("src")
+    return sorted(roots, key=len, reverse=True)
+
+
+def module_name(rel_path: str, roots: List[str]) -> Tuple[str, bool]:
+    """根据相对路径计算模块名，返回 (模块名, 是否为包)"""
+    for root in roots:
+        if not root:
+            rel = rel_path
+        elif rel_path.startswith(root + "/"):
+            rel = rel_path[len(root) + 1 :]
+        else:
+            continue
+        parts = rel[: -len(".py")].split("/")
+        is_package = parts[-1] == "__init__"
+        if is_package:
+            parts = parts[:-1]
+        if parts:
+            return ".".join(parts), is_package
+    return "", False
+
+
+def _resolve_relative(current: str, is_package: bool, module: str, level: int) -> str:
+    """将相对导入转换为绝对模块名，超出顶层包时返回空字符串"""
+    parts = current.split(".") if is_package else current.split(".")[:-1]
+    if level - 1 > len(parts) or (level - 1 == len(parts) and not module):
+        return ""
+    base = parts[: len(parts) - (level - 1)]
+    return ".".join(base + ([module] if module else []))
+
+
+def resolve_module(name: str, modules: Dict[str, Any]) -> str:
+    """返回 name 对应的已知模块（最长匹配前缀），不属于 modules 时返回空字符串"""
+    parts = name.split(".")
+    for end in range(len(parts), 0, -1):
+        candidate = ".".join(parts[:end])
+        if candidate in modules:
+            return candidate
+    return ""
+
+
+def _with_parents(name: str, modules: Dict[str, Any]) -> List[str]:
+    """导入子模块时会先执行各级父包的 __init__.py"""
+    parts = name.split(".")
+    names = [".".join(parts[:end]) for end in range(1, len(parts))]
+    return [parent for parent in names if parent in modules] + [name]
+
+
+def _merge_guards(guards: set) -> str:
+    """同一模块多处非必需导入时的上下文：全部在 TYPE_CHECKING 中才算类型导入，其次为可选依赖"""
+    if guards == {GUARD_TYPING}:
+        return GUARD_TYPING
+    return GUARD_OPTIONAL if GUARD_OPTIONAL in guards else GUARD_LAZY
+
+
+def build_import_graph(
+    parsed: Dict[str, Dict[str, Any]], roots: List[str], lazy_guard: bool = False
+) -> Dict[str, Any]:
+    """
+    根据各文件的导入记录构建导入图
+
+    Args:
+        parsed: {相对路径: scan_file 结果}
+        roots: 模块搜索根目录
+        lazy_guard: 是否把函数体中的导入视为非必需（分析第三方包时使用；
+            项目自身的函数通常都会被调用，默认视为必需）
+
+    Returns:
+        包含 modules / external / dynamic / unresolved / errors 的导入图：
+        modules 为项目模块及其导入的项目模块、外部模块，
+        guarded 为该模块中只在 try / TYPE_CHECKING（/ 函数体）中导入的模块；
+        external 按顶层包汇总导入者、是否存在必需导入、所在上下文；
+        dynamic 为所有动态导入（importer / target / internal / line）
+    """
+    modules: Dict[str, Dict[str, Any]] = {}
+    for rel_path in parsed:
+        name, is_package = module_name(rel_path, roots)
+        # 同名模块（多个根目录）只保留第一个
+        if name and name not in modules:
+            modules[name] = {
+                "file": rel_path,
+                "package": is_package,
+                "imports": set(),
+                "external": set(),
+                "guarded": {},
+            }
+
+    external: Dict[str, Dict[str, Any]] = {}
+    dynamic: List[Dict[str, Any]] = []
+    unresolved: List[Dict[str, Any]] = []
+    errors = {rel: info["error"] for rel, info in parsed.items() if info["error"]}
+    stdlib = set(getattr(sys, "stdlib_module_names", ())) | set(
+        sys.builtin_module_names
+    )
+
+    for current, node in modules.items():
+        # 每个被导入模块出现时所在的上下文，空字符串表示必需导入
+        edge_guards: Dict[str, set] = node["guarded"]
+        for record in parsed[node["file"]]["records"]:
+            guard = record["guard"]
+            if guard == GUARD_LAZY and not lazy_guard:
+                guard = ""
+            target = record["module"]
+            if record["level"]:
+                target = _resolve_relative(
+                    current, node["package"], target, record["level"]
+                )
+                if not target:
+                    unresolved.append({"module": current, "line": record["line"]})
+                    continue
+            if not target:
+                continue
+
+            # from X import a：a 是项目子模块时导入的是 X.a
+            candidates = [target]
+            for imported in record["names"]:
+                if f"{target}.{imported}" in modules:
+                    candidates.append(f"{target}.{imported}")
+
+            internal = resolve_module(target, modules)
+            if record["dynamic"]:
+                dynamic.append(
+                    {
+                        "importer": current,
+                        "target": target,
+                        "internal": bool(internal),
+                        "line": record["line"],
+                    }
+                )
+            if internal:
+                for candidate in candidates:
+                    resolved = resolve_module(candidate, modules)
+                    for name in _with_parents(resolved, modules):
+                        node["imports"].add(name)
+                        edge_guards.setdefault(name, set()).add(guard)
+                continue
+
+            node["external"].add(target)
+            edge_guards.setdefault(target, set()).add(guard)
+            top = target.split(".")[0]
+            info = external.setdefault(
+                top,
+                {
+                    "importers": set(),
+                    "names": set(),
+                    "required": False,
+                    "dynamic": False,
+                    "guards": set(),
+                    "stdlib": top in stdlib,
+                },
+            )
+            info["importers"].add(current)
+            info["names"].add(target)
+            if record["dynamic"]:
+                info["dynamic"] = True
+            if guard:
+                info["guards"].add(guard)
+            elif not record["dynamic"]:
+                info["required"] = True
+
+    for current, node in modules.items():
+        node["guarded"] = {
+            name: _merge_guards(guards)
+            for name, guards in sorted(node["guarded"].items())
+            if "" not in guards and name != current
+        }
+        node["imports"].discard(current)
+        node["imports"] = sorted(node["imports"])
+        node["external"] = sorted(node["external"])
+    for info in external.values():
+        for key in ("importers", "names", "guards"):
+            info[key] = sorted(info[key])
+
+    return {
+        "modules": modules,
+        "external": external,
+        "dynamic": dynamic,
+        "unresolved": unresolved,
+        "errors": errors,
+    }
+
+
+def scan_project(
+    project_dir: Path, config: Dict[str, Any], jobs: int = 0, use_cache: bool = True
+) -> Dict[str, Any]:
+    """
+    扫描项目中的所有 .py 文件并构建导入图
+
+    Args:
+        project_dir: 项目目录
+        config: 构建配置（使用 entry_file / output_dir）
+        jobs: 解析进程数，0 表示使用 CPU 核数
+        use_cache: 是否使用并更新解析缓存
+
+    Returns:
+        build_import_graph 的结果，另附 roots（模块搜索根目录）和
+        stats（files / parsed / cached / seconds）
+    """
+    start = time.perf_counter()
+    output_root = str(config.get("output_dir", "build")).replace("\\", "/")
+    rel_paths = collect_source_files(
+        project_dir, GENERATED_SCRIPTS, (output_root.split("/")[0],)
+    )
+
+    cache_path = project_dir / CACHE_FILE
+    cache = load_parse_cache(cache_path) if use_cache else {}
+    parsed, stale = parse_files_cached(
+        {rel: str(project_dir / rel) for rel in rel_paths}, cache, jobs
+    )
+    # 缓存只保留现存的文件；内容没有变化时不重写
+    if use_cache and (stale or len(cache) != len(parsed)):
+        save_parse_cache(cache_path, parsed)
+
+    roots = _source_roots(project_dir, config.get("entry_file", "main.py"))
+    graph = build_import_graph({rel: parsed[rel] for rel in sorted(parsed)}, roots)
+    graph["roots"] = roots
+    graph["stats"] = {
+        "files": len(parsed),
+        "parsed": stale,
+        "cached": len(parsed) - stale,
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+    return graph
+
+
+def suggest_options(graph: Dict[str, Any], build_tool: str) -> List[Dict[str, Any]]:
+    """
+    根据导入图给出打包选项建议
+
+    - 动态导入的模块打包工具无法静态分析：PyInstaller 写入 hidden_imports，
+      Nuitka 中项目包写入 include_packages、其余写入 include_modules
+    - 只在 TYPE_CHECKING 或 try/except ImportError 中导入的第三方包不是必需依赖：
+      Nuitka 写入 nofollow_imports，PyInstaller 写入 exclude_modules
+
+    Returns:
+        建议列表，每项包含 option（配置项）/ module / reason / recommended，
+        可选依赖可能在运行时被使用，recommended 为 False
+    """
+    nuitka = build_tool == "nuitka"
+    suggestions: List[Dict[str, Any]] = []
+    seen = set()
+
+    def add(option: str, module: str, reason: str, recommended: bool = True) -> None:
+        if (option, module) not in seen:
+            seen.add((option, module))
+            suggestions.append(
+                {
+                    "option": option,
+                    "module": module,
+                    "reason": reason,
+                    "recommended": recommended,
+                }
+            )
+
+    modules = graph["modules"]
+    for item in graph["dynamic"]:
+        target = item["target"]
+        if item["internal"]:
+            target = resolve_module(target, modules)
+        reason = f"{item['importer']} 第 {item['line']} 行动态导入"
+        if not nuitka:
+            add("hidden_imports", target, reason)
+        elif item["internal"] and modules[target]["package"]:
+            add("include_packages", target, reason)
+        else:
+            add("include_modules", target, reason)
+
+    nofollow = "nofollow_imports" if nuitka else "exclude_modules"
+    for top, info in sorted(graph["external"].items()):
+        if info["stdlib"] or info["required"] or info["dynamic"]:
+            continue
+        if info["guards"] == [GUARD_TYPING]:
+            add(nofollow, top, "只在 TYPE_CHECKING 中导入")
+        else:
+            add(nofollow, top, "只在 try/except ImportError 中导入（可选依赖）", False)
+    return suggestions
@@ -8,6 +8,8 @@ import uuid
 from pathlib import Path
 from typing import Dict, Any, List
 
+from src.utils.file_writer import describe_writes, write_scripts
+
 # 预编译正则表达式
 _SPLIT_PATTERN = re.compile(r"[,\s，]+")
 
@@ -17,6 +19,17 @@ def _split_items(text: str) -> List[str]:
     return [s.strip() for s in _SPLIT_PATTERN.split(text) if s.strip()]
 
 
+def has_installer_config(config: Dict[str, Any]) -> bool:
+    """配置中是否包含安装包设置（installer_* 字段只在配置过安装包后写入）"""
+    return any(key.startswith("installer_") and value for key, value in config.items())
+
+
+def installer_script_name(config: Dict[str, Any]) -> str:
+    """安装包脚本文件名"""
+    app_name = config.get("installer_app_name", config.get("project_name", "MyApp"))
+    return f"{app_name}_setup.iss"
+
+
 def generate_inno_setup_script(config: Dict[str, Any], project_dir: Path) -> str:
     """生成 Inno Setup 脚本 (.iss)"""
     lines = []
@@ -413,36 +426,49 @@ def generate_inno_setup_script(config: Dict[str, Any], project_dir: Path) -> str
     return "\n".join(lines)
 
 
-def generate_installer_script(
-    config: Dict[str, Any], project_dir: Path
-) -> tuple[bool, str]:
+def write_installer_script(
+    config: Dict[str, Any], project_dir: Path, dry_run: bool = False
+) -> List[Dict[str, Any]]:
     """
-    生成安装包脚本
-    返回 (是否成功, 消息)
+    生成并写入安装包脚本，没有 AppId 时生成新的 AppId 并保存到构建配置
+    dry_run 为 True 时不写入文件，也不保存新生成的 AppId
+    返回 write_scripts 的写入结果
     """
-    try:
-        # 处理 AppId：如果没有则生成（不带花括号存储）
-        app_id = config.get("installer_appid", "").strip().strip("{}")
-        if not app_id:
-            app_id = str(uuid.uuid4()).upper()
-            config["installer_appid"] = app_id
-            # 立即保存 AppId 到配置文件
-            from src.utils import save_build_config
+    # 处理 AppId：如果没有则生成（不带花括号存储）
+    app_id = config.get("installer_appid", "").strip().strip("{}")
+    if not app_id:
+        app_id = str(uuid.uuid4()).upper()
+        config["installer_appid"] = app_id
+        # 立即保存 AppId 到配置文件
+        if not dry_run:
+            from src.utils import build_config_store
 
-            save_build_config(project_dir, config)
+            build_config_store.save(project_dir, config)
 
-        # 目前只支持 Inno Setup
-        script_content = generate_inno_setup_script(config, project_dir)
+    # 目前只支持 Inno Setup
+    script_content = generate_inno_setup_script(config, project_dir)
+    return write_scripts(
+        {installer_script_name(config): script_content}, project_dir, dry_run=dry_run
+    )
 
-        app_name = config.get("installer_app_name", config.get("project_name", "MyApp"))
-        script_name = f"{app_name}_setup.iss"
 
-        # 保存脚本
-        script_path = project_dir / script_name
-        script_path.write_text(script_content, encoding="utf-8")
+def generate_installer_script(
+    config: Dict[str, Any], project_dir: Path, dry_run: bool = False
+) -> tuple[bool, str]:
+    """
+    生成安装包脚本，内容未变化时不重新写入
+    dry_run 为 True 时不写入文件（也不保存新生成的 AppId），消息中附带 unified diff
+    返回 (是否成功, 消息)
+    """
+    try:
+        results = write_installer_script(config, project_dir, dry_run)
+        if dry_run:
+            return True, describe_writes(results, dry_run)
 
+        app_id = config["installer_appid"].strip().strip("{}")
+        script_name = installer_script_name(config)
         # 生成使用说明
-        usage_msg = f"""脚本已生成: {script_name}
+        usage_msg = f"""{describe_writes(results)}
 
 AppId: {app_id}
 (已保存到 build_config.yaml，后续版本请保持一致)
@@ -0,0 +1,741 @@
+"""
+构建选项注册表
+每个构建选项只在这里声明一次：配置键、类型、默认值、所属构建工具、保存规则、
+命令行参数模板、界面组件和平台限制。默认配置、配置加载时的类型转换、
+build_config.yaml 的写出、选项界面的创建与读取以及生成脚本中的简单参数都由它驱动，
+新增选项时通常只需在 BUILD_OPTIONS 中加一项（特殊的组合逻辑仍在各层单独处理）
+
+选项字段说明：
+    key: 配置键
+    default: 默认值
+    doc: 简短说明（用于生成脚本中的注释和校验提示）
+    kind: bool / int / str / list / items / jobs / choice
+        items 为空格或逗号分隔的字符串，jobs 为整数或 "auto-mem"，
+        choice 的取值限定在 choices 中（兼容旧的布尔值 True/False -> yes/no）
+    tool: 所属构建工具，None 表示通用
+    section: 写入 build_config.yaml 的分组，None 表示不自动写出（由调用方单独处理）
+    save: always 总是写出 / truthy 有值时写出 / changed 与默认值不同时写出
+    quote: auto 按需加引号 / always 总是使用单引号
+    note: 写出时附加的行尾注释
+    flag: 命令行参数模板，bool 选项为参数本身，其余用 {} 表示值（items 按项展开）
+    platform: 参数仅在该平台添加（windows / macos）
+    widget: 界面组件 id，label / placeholder 为界面文字，
+        on_value 表示开关打开时对应的字符串值
+"""
+
+from typing import Any, Dict, List, Optional
+
+# 写出 build_config.yaml 时的分组顺序和标题
+SAVE_SECTIONS = [
+    ("project", "项目基本信息"),
+    ("build", "构建配置"),
+    ("package", "打包选项"),
+]
+
+# 平台限制 -> (生成脚本中的条件变量, 显示名)
+PLATFORM_GUARDS = {
+    "windows": ("is_windows", "Windows"),
+    "macos": ("is_macos", "macOS"),
+}
+
+_KINDS = {bool: "bool", int: "int", list: "list"}
+
+
+def _option(key: str, default: Any, doc: str, **fields: Any) -> Dict[str, Any]:
+    """创建选项描述，未指定 kind 时根据默认值推断"""
+    option = {
+        "key": key,
+        "default": default,
+        "doc": doc,
+        "kind": _KINDS.get(type(default), "str"),
+        "tool": None,
+        "section": None,
+        "save": "truthy",
+        "quote": None,
+        "note": None,
+        "flag": None,
+        "platform": None,
+        "widget": None,
+    }
+    option.update(fields)
+    return option
+
+
+_ITEMS_LABEL = " (支持空格、中英文逗号分隔):"
+_DATA_PLACEHOLDER = "格式: src;dest 多个用空格"
+
+BUILD_OPTIONS: List[Dict[str, Any]] = [
+    # 项目基本信息
+    _option("project_name", "MyApp", "项目名称", section="project", save="always"),
+    _option("version", "1.0.0", "版本号", section="project", save="always"),
+    _option("company_name", "", "公司名称", section="project"),
+    _option("entry_file", "main.py", "入口文件", section="project", save="always"),
+    _option("icon_file", "", "图标文件", section="project"),
+    # 构建配置
+    _option(
+        "build_tool",
+        "pyinstaller",
+        "构建工具",
+        kind="choice",
+        choices={"pyinstaller": "PyInstaller", "nuitka": "Nuitka"},
+        section="build",
+        save="always",
+    ),
+    _option("output_dir", "dist", "输出目录", section="build", save="always"),
+    _option(
+        "quiet_mode",
+        False,
+        "静默输出",
+        section="build",
+        save="always",
+        widget="quiet-switch",
+        label="静默输出 (仅进度条)",
+    ),
+    _option(
+        "build_cache",
+        False,
+        "构建缓存（输入未变化时直接恢复上次输出）",
+        section="build",
+        save="always",
+        widget="build-cache-switch",
+        label="构建缓存 (输入未变时跳过构建)",
+    ),
+    _option(
+        "build_cache_dir",
+        "",
+        "构建缓存目录，空字符串表示使用 .pybuilder/cache",
+        section="build",
+    ),
+    _option(
+        "size_analysis",
+        False,
+        "构建后分析产物体积并给出排除建议",
+        section="build",
+        save="always",
+        widget="size-analysis-switch",
+        label="体积分析 (构建后给出排除建议)",
+    ),
+    _option(
+        "report_top_n", 10, "分析报告排名显示的条目数", section="build", save="changed"
+    ),
+    _option(
+        "startup_benchmark",
+        False,
+        "生成 bench_startup.py 启动耗时测试脚本",
+        section="build",
+        save="always",
+        widget="startup-benchmark-switch",
+        label="启动测速 (生成 bench_startup.py)",
+    ),
+    _option("bench_runs", 10, "冷/热启动各测试次数", section="build", save="changed"),
+    # 参数可能以 - 开头或包含冒号，使用单引号字符串
+    _option(
+        "bench_args",
+        "",
+        "启动测试时传给可执行文件的冒烟参数，如 --version",
+        section="build",
+        quote="always",
+    ),
+    _option(
+        "build_graph",
+        "",
+        "构建依赖图",
+        kind="choice",
+        choices={"": "不生成", "ninja": "ninja", "make": "make"},
+        section="build",
+    ),
+    _option(
+        "data_dedupe",
+        False,
+        "数据文件按内容哈希去重（数据条目支持 glob 与 ! 排除模式）",
+        section="build",
+        save="always",
+        widget="data-dedupe-switch",
+        label="数据去重 (按内容哈希，支持 glob 与 !排除)",
+    ),
+    _option(
+        "tool_probe",
+        True,
+        "生成脚本前探测打包工具版本，检查参数是否受支持",
+        section="build",
+        save="changed",
+    ),
+    # 打包选项（通用）
+    _option(
+        "onefile",
+        True,
+        "单文件模式（仅在 mode 为空时生效）",
+        section="package",
+        save="always",
+        widget="onefile-switch",
+        label="单文件模式 (启动需解压)",
+    ),
+    _option(
+        "show_console",
+        False,
+        "显示终端窗口",
+        section="package",
+        save="always",
+        widget="console-switch",
+        label="显示终端窗口 (Windows)",
+    ),
+    # Nuitka 特有
+    _option(
+        "standalone",
+        True,
+        "独立打包（仅在 mode 为空时生效）",
+        tool="nuitka",
+        section="package",
+        save="always",
+        widget="standalone-switch",
+        label="独立打包 (Standalone)",
+    ),
+    # 可选值: accelerated, standalone, onefile, app, app-dist, module, package
+    # 空字符串表示自动根据 standalone/onefile 组合决定
+    _option("mode", "", "Nuitka 编译模式", tool="nuitka", section="package"),
+    _option(
+        "remove_output",
+        True,
+        "移除构建文件",
+        tool="nuitka",
+        section="package",
+        save="always",
+        flag="--remove-output",
+        widget="remove-output-switch",
+        label="移除构建文件 (节省空间)",
+    ),
+    _option(
+        "show_progress",
+        True,
+        "显示编译进度",
+        tool="nuitka",
+        section="package",
+        save="always",
+    ),
+    _option(
+        "lto",
+        "no",
+        "链接时优化",
+        kind="choice",
+        choices={
+            "no": "关闭 LTO（链接时优化）",
+            "yes": "启用 LTO（链接时优化）",
+            "auto": "自动 LTO（链接时优化）",
+        },
+        tool="nuitka",
+        section="package",
+        save="always",
+        note="yes/no/auto",
+        widget="lto-select",
+    ),
+    _option(
+        "pgo",
+        False,
+        "三阶段 PGO：插桩构建 -> 训练运行 -> 使用 profile 重新构建",
+        tool="nuitka",
+        section="package",
+        save="always",
+        widget="pgo-switch",
+        label="PGO 优化 (插桩-训练-重建)",
+    ),
+    _option(
+        "pgo_training_command",
+        "",
+        "PGO 训练命令，{exe} 替换为插桩程序路径，留空则直接运行程序",
+        tool="nuitka",
+        section="package",
+        quote="always",
+        widget="pgo-training-input",
+        label="PGO 训练命令 ({exe} 为插桩程序，留空直接运行):",
+        placeholder="例如: python bench.py {exe}",
+    ),
+    _option(
+        "jobs",
+        0,
+        "编译线程数，0或负数表示自动分配，auto-mem 表示按可用内存计算",
+        kind="jobs",
+        tool="nuitka",
+        section="package",
+        save="always",
+        note="0或负数=自动分配, auto-mem=按可用内存计算",
+        widget="jobs-input",
+        label="编译线程:",
+        placeholder="0 / auto-mem",
+    ),
+    # 可选值: "-O", "no_asserts", "no_docstrings"
+    _option(
+        "python_flag",
+        "",
+        "Python 优化",
+        tool="nuitka",
+        section="package",
+        flag="--python-flag={}",
+        widget="python-flag-switch",
+        label="Python优化 (移除断言和文档)",
+        on_value="-O",
+    ),
+    _option(
+        "compiler", "msvc", "C 编译器", tool="nuitka", section="package", save="always"
+    ),
+    _option(
+        "compiler_cache",
+        False,
+        "使用 ccache/sccache 缓存 C 编译结果",
+        tool="nuitka",
+        section="package",
+        save="always",
+        widget="compiler-cache-switch",
+        label="编译器缓存 (ccache/sccache)",
+    ),
+    _option(
+        "compiler_cache_dir",
+        "",
+        "编译器缓存目录，空字符串表示使用 Nuitka 默认缓存目录",
+        tool="nuitka",
+        section="package",
+    ),
+    _option(
+        "no_pyi_file",
+        False,
+        "不生成 .pyi 文件（仅 module 和 package 模式）",
+        tool="nuitka",
+        section="package",
+        save="always",
+        widget="no-pyi-switch",
+        label="不生成 .pyi 文件 (仅module模式)",
+    ),
+    _option(
+        "follow_imports",
+        True,
+        "跟随所有导入的模块",
+        tool="nuitka",
+        section="package",
+        save="always",
+        flag="--follow-imports",
+        widget="follow-imports-switch",
+        label="跟随导入 (自动包含模块)",
+    ),
+    _option(
+        "compilation_report",
+        False,
+        "生成 --report 编译报告并输出热点模块排名",
+        tool="nuitka",
+        section="package",
+        save="always",
+        widget="compilation-report-switch",
+        label="编译报告 (热点模块排名)",
+    ),
+    _option(
+        "assume_yes_for_downloads",
+        False,
+        "自动下载依赖工具",
+        tool="nuitka",
+        section="package",
+        save="always",
+        flag="--assume-yes-for-downloads",
+        widget="assume-yes-switch",
+        label="自动下载依赖 (CI环境必需)",
+    ),
+    # Nuitka 数据导入选项
+    _option(
+        "include_packages",
+        "",
+        "包含的包",
+        kind="items",
+        tool="nuitka",
+        section="package",
+        flag="--include-package={}",
+        widget="nuitka-include-package-input",
+        label="包含包" + _ITEMS_LABEL,
+        placeholder="例如: numpy pandas PIL",
+    ),
+    _option(
+        "include_modules",
+        "",
+        "包含的模块",
+        kind="items",
+        tool="nuitka",
+        section="package",
+        flag="--include-module={}",
+        widget="nuitka-include-module-input",
+        label="包含模块" + _ITEMS_LABEL,
+        placeholder="例如: requests.adapters os.path",
+    ),
+    _option(
+        "nofollow_imports",
+        "",
+        "不跟随的导入",
+        kind="items",
+        tool="nuitka",
+        section="package",
+        widget="nuitka-nofollow-import-input",
+        label="排除导入" + _ITEMS_LABEL,
+        placeholder="例如: tkinter test unittest",
+    ),
+    _option(
+        "include_data_files",
+        "",
+        "数据文件",
+        tool="nuitka",
+        section="package",
+        quote="auto",
+        widget="nuitka-include-data-files-input",
+        label="数据文件" + _ITEMS_LABEL,
+        placeholder=_DATA_PLACEHOLDER,
+    ),
+    _option(
+        "include_data_dirs",
+        "",
+        "数据目录",
+        tool="nuitka",
+        section="package",
+        quote="auto",
+        widget="nuitka-include-data-dir-input",
+        label="数据目录" + _ITEMS_LABEL,
+        placeholder=_DATA_PLACEHOLDER,
+    ),
+    # PyInstaller 特有
+    _option(
+        "clean",
+        True,
+        "清理临时文件",
+        tool="pyinstaller",
+        section="package",
+        save="always",
+        widget="clean-switch",
+        label="清理临时文件",
+    ),
+    _option(
+        "noconfirm",
+        False,
+        "自动确认",
+        tool="pyinstaller",
+        section="package",
+        save="always",
+        widget="noconfirm-switch",
+        label="自动确认 (跳过删除提示)",
+    ),
+    _option(
+        "incremental",
+        False,
+        "增量构建：固定工作目录并保留 Analysis 缓存",
+        tool="pyinstaller",
+        section="package",
+        save="always",
+        widget="incremental-switch",
+        label="增量构建 (保留 Analysis 缓存)",
+    ),
+    _option(
+        "use_spec_file",
+        False,
+        "生成可复用的 .spec 文件并以其驱动构建",
+        tool="pyinstaller",
+        section="package",
+        save="always",
+        widget="use-spec-file-switch",
+        label="使用 .spec 文件 (可复用, 支持多入口)",
+    ),
+    _option(
+        "extra_entry_files",
+        "",
+        "附加入口文件（需 .spec 模式），共用主程序的 Analysis",
+        tool="pyinstaller",
+        section="package",
+        widget="extra-entry-files-input",
+        label="附加入口文件 (需 .spec 模式):",
+        placeholder="例如: cli.py tools/worker.py",
+    ),
+    _option(
+        "debug",
+        False,
+        "调试模式",
+        tool="pyinstaller",
+        section="package",
+        save="always",
+        flag="--debug=all",
+        widget="debug-switch",
+        label="调试模式 (输出详细信息)",
+    ),
+    _option(
+        "show_progressbar",
+        True,
+        "显示进度条",
+        tool="pyinstaller",
+        section="package",
+        save="always",
+    ),
+    _option(
+        "contents_directory",
+        ".",
+        "内部目录名称（仅非单文件模式）",
+        tool="pyinstaller",
+        section="package",
+        save="always",
+        widget="contents-dir-input",
+        label="内部目录名称:",
+        placeholder="_internal (默认为 .)",
+    ),
+    _option(
+        "uac_admin",
+        False,
+        "UAC管理员权限",
+        tool="pyinstaller",
+        section="package",
+        save="always",
+        flag="--uac-admin",
+        platform="windows",
+        widget="uac-admin-switch",
+        label="管理员权限 (Windows UAC)",
+    ),
+    _option(
+        "hidden_imports",
+        "",
+        "隐藏导入",
+        kind="items",
+        tool="pyinstaller",
+        section="package",
+        flag="--hidden-import={}",
+        widget="hidden-imports-input",
+        label="隐藏导入" + _ITEMS_LABEL,
+        placeholder="例如: PIL numpy.core pandas",
+    ),
+    _option(
+        "exclude_modules",
+        "",
+        "排除模块",
+        kind="items",
+        tool="pyinstaller",
+        section="package",
+        widget="exclude-modules-input",
+        label="排除模块" + _ITEMS_LABEL,
+        placeholder="例如: tkinter test unittest",
+    ),
+    _option(
+        "collect_submodules",
+        "",
+        "收集子模块",
+        kind="items",
+        tool="pyinstaller",
+        section="package",
+        flag="--collect-submodules={}",
+        widget="collect-submodules-input",
+        label="收集子模块" + _ITEMS_LABEL,
+        placeholder="例如: textual pyfiglet",
+    ),
+    _option(
+        "collect_data",
+        "",
+        "收集数据文件",
+        kind="items",
+        tool="pyinstaller",
+        section="package",
+        flag="--collect-data={}",
+        widget="collect-data-input",
+        label="收集数据文件" + _ITEMS_LABEL,
+        placeholder="例如: textual pyfiglet",
+    ),
+    _option(
+        "collect_binaries",
+        "",
+        "收集二进制文件",
+        kind="items",
+        tool="pyinstaller",
+        section="package",
+        flag="--collect-binaries={}",
+        widget="collect-binaries-input",
+        label="收集二进制文件" + _ITEMS_LABEL,
+        placeholder="例如: numpy PIL",
+    ),
+    _option(
+        "collect_all",
+        "",
+        "收集所有",
+        kind="items",
+        tool="pyinstaller",
+        section="package",
+        flag="--collect-all={}",
+        widget="collect-all-input",
+        label="收集所有" + _ITEMS_LABEL,
+        placeholder="例如: cv2 scipy",
+    ),
+    _option(
+        "add_data",
+        "",
+        "数据文件",
+        tool="pyinstaller",
+        section="package",
+        quote="auto",
+        widget="add-data-input",
+        label="数据文件" + _ITEMS_LABEL,
+        placeholder=_DATA_PLACEHOLDER,
+    ),
+    _option(
+        "add_binary",
+        "",
+        "二进制文件",
+        tool="pyinstaller",
+        section="package",
+        quote="auto",
+        widget="add-binary-input",
+        label="二进制文件" + _ITEMS_LABEL,
+        placeholder=_DATA_PLACEHOLDER,
+    ),
+    _option(
+        "splash_image",
+        "",
+        "启动画面（仅单文件模式）",
+        tool="pyinstaller",
+        section="package",
+        widget="splash-image-input",
+        label="启动画面图片 (仅单文件模式):",
+        placeholder="例如: splash.png",
+    ),
+    _option(
+        "runtime_tmpdir",
+        "",
+        "运行时临时目录（仅单文件模式）",
+        tool="pyinstaller",
+        section="package",
+        widget="runtime-tmpdir-input",
+        label="运行时临时目录 (仅单文件模式):",
+        placeholder="例如: /tmp/myapp",
+    ),
+    # 系统特性
+    _option(
+        "target_architecture",
+        "",
+        "macOS架构",
+        tool="pyinstaller",
+        section="package",
+        flag="--target-architecture={}",
+        platform="macos",
+        widget="target-arch-input",
+        label="目标架构 (macOS):",
+        placeholder="例如: x86_64, arm64, universal2",
+    ),
+    _option(
+        "win_version_file",
+        "",
+        "Windows版本文件",
+        tool="pyinstaller",
+        section="package",
+        flag="--version-file={}",
+        platform="windows",
+        widget="win-version-file-input",
+        label="Windows 版本信息文件:",
+        placeholder="例如: version_info.txt",
+    ),
+    _option(
+        "win_manifest",
+        "",
+        "Windows Manifest",
+        tool="pyinstaller",
+        section="package",
+        flag="--manifest={}",
+        platform="windows",
+        widget="win-manifest-input",
+        label="Windows Manifest 文件:",
+        placeholder="例如: app.manifest",
+    ),
+    _option(
+        "osx_bundle_identifier",
+        "",
+        "macOS Bundle标识",
+        tool="pyinstaller",
+        section="package",
+        flag="--osx-bundle-identifier={}",
+        platform="macos",
+        widget="osx-bundle-id-input",
+        label="macOS Bundle 标识符:",
+        placeholder="例如: com.company.appname",
+    ),
+    _option(
+        "osx_entitlements_file",
+        "",
+        "macOS权限文件",
+        tool="pyinstaller",
+        section="package",
+        flag="--osx-entitlements-file={}",
+        platform="macos",
+        widget="osx-entitlements-input",
+        label="macOS 权限文件:",
+        placeholder="例如: entitlements.plist",
+    ),
+    _option(
+        "codesign_identity",
+        "",
+        "macOS代码签名",
+        tool="pyinstaller",
+        section="package",
+        flag="--codesign-identity={}",
+        platform="macos",
+        widget="codesign-identity-input",
+        label="代码签名身份 (macOS):",
+        placeholder="例如: Developer ID Application",
+    ),
+    # 以下选项的写出由 save_build_config 单独处理
+    _option("plugins", [], "Nuitka 插件"),
+    _option("exclude_packages", [], "排除的包"),
+    # 多目标构建矩阵：每项为覆盖上面任意字段的字典，必须包含 name
+    _option("targets", [], "构建矩阵"),
+    _option("matrix_workers", 0, "矩阵并行数，0 表示根据 CPU 核数和可用内存自动决定"),
+    # 构建配置对比：格式同 targets，生成 compare_builds.py 对比各变体的体积和性能
+    _option("compare", [], "构建对比"),
+    _option("compare_benchmark", "", "对比基准命令，{exe} 替换为可执行文件路径"),
+    _option("compare_runs", 3, "对比基准运行次数"),
+]
+
+BUILD_OPTIONS_BY_KEY: Dict[str, Dict[str, Any]] = {
+    option["key"]: option for option in BUILD_OPTIONS
+}
+
+
+def default_build_config() -> Dict[str, Any]:
+    """由注册表生成默认构建配置（列表默认值各自复制）"""
+    return {
+        option["key"]: list(option["default"])
+        if isinstance(option["default"], list)
+        else option["default"]
+        for option in BUILD_OPTIONS
+    }
+
+
+def options_for_tool(tool: Optional[str]) -> List[Dict[str, Any]]:
+    """返回适用于指定构建工具的选项（通用选项和该工具特有的选项）"""
+    return [option for option in BUILD_OPTIONS if option["tool"] in (None, tool)]
+
+
+def coerce_option(option: Dict[str, Any], value: Any) -> Any:
+    """将 YAML 或界面中读取的值转换为选项的类型，无法转换时返回默认值"""
+    kind = option["kind"]
+    if kind == "bool":
+        if isinstance(value, bool):
+            return value
+        return str(value).lower() in ["true", "yes", "1"]
+    if kind == "jobs" and str(value).strip().lower() == "auto-mem":
+        return "auto-mem"
+    if kind in ("int", "jobs"):
+        if isinstance(value, int):
+            return value
+        try:
+            return int(value)
+        except (ValueError, TypeError):
+            return option["default"]
+    if kind == "list" and isinstance(value, str):
+        # 字符串转列表（逗号分隔）
+        return [v.strip() for v in value.split(",") if v.strip()]
+    if kind == "choice" and isinstance(value, bool) and "yes" in option["choices"]:
+        # 兼容旧的布尔值
+        return "yes" if value else "no"
+    return value
+
+
+def widget_value(option: Dict[str, Any], value: Any) -> Any:
+    """将界面组件的值转换为配置值"""
+    if "on_value" in option:
+        return option["on_value"] if value else ""
+    if isinstance(value, str):
+        value = value.strip()
+    if value in ("", None) and option["kind"] != "str":
+        return option["default"]
+    return coerce_option(option, value)
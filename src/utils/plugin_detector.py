@@ -0,0 +1,268 @@
+"""
+Nuitka 插件检测
+根据项目源码的导入和目标环境中已安装的包，判断需要启用哪些 Nuitka 插件
+
+新版 Nuitka 中 numpy / torch / matplotlib / multiprocessing 等插件默认启用
+（部分已被 anti-bloat、implicit-imports 取代），只有 tk-inter、Qt 绑定等
+插件必须显式启用，缺少时 Nuitka 会在编译后期报错；启用多余的插件则会带入额外依赖
+"""
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.utils.exclude_recommender import load_environment
+from src.utils.import_scanner import scan_project
+
+
+# 插件目录：auto 为 True 表示新版 Nuitka 默认启用（或已不再需要），无需手动开启；
+# modules 为触发插件的顶层导入名，为空表示无法自动判断（如 upx）
+NUITKA_PLUGINS: List[Dict[str, Any]] = [
+    {
+        "name": "tk-inter",
+        "label": "Tkinter - GUI工具包",
+        "modules": (
+            "tkinter",
+            "_tkinter",
+            "customtkinter",
+            "ttkbootstrap",
+            "tkinterdnd2",
+        ),
+        "auto": False,
+    },
+    {
+        "name": "pyside6",
+        "label": "PySide6 - Qt6 GUI框架",
+        "modules": ("PySide6",),
+        "auto": False,
+    },
+    {
+        "name": "pyqt6",
+        "label": "PyQt6 - Qt6 GUI框架",
+        "modules": ("PyQt6",),
+        "auto": False,
+    },
+    {
+        "name": "pyside2",
+        "label": "PySide2 - Qt5 GUI框架",
+        "modules": ("PySide2",),
+        "auto": False,
+    },
+    {
+        "name": "pyqt5",
+        "label": "PyQt5 - Qt5 GUI框架",
+        "modules": ("PyQt5",),
+        "auto": False,
+    },
+    {
+        "name": "no-qt",
+        "label": "No-Qt - 禁止引入 Qt 绑定",
+        "modules": (),
+        "auto": False,
+    },
+    {
+        "name": "dill-compat",
+        "label": "Dill-compat - dill 序列化兼容",
+        "modules": ("dill",),
+        "auto": False,
+    },
+    {
+        "name": "pmw-freezer",
+        "label": "Pmw-freezer - Pmw 组件库",
+        "modules": ("Pmw",),
+        "auto": False,
+    },
+    {
+        "name": "upx",
+        "label": "UPX - 压缩生成的可执行文件",
+        "modules": (),
+        "auto": False,
+    },
+    {
+        "name": "numpy",
+        "label": "NumPy - 数值计算库",
+        "modules": ("numpy",),
+        "auto": True,
+    },
+    {
+        "name": "torch",
+        "label": "PyTorch - 深度学习框架",
+        "modules": ("torch",),
+        "auto": True,
+    },
+    {
+        "name": "tensorflow",
+        "label": "TensorFlow - 深度学习框架",
+        "modules": ("tensorflow",),
+        "auto": True,
+    },
+    {
+        "name": "matplotlib",
+        "label": "Matplotlib - 数据可视化",
+        "modules": ("matplotlib",),
+        "auto": True,
+    },
+    {
+        "name": "multiprocessing",
+        "label": "Multiprocessing - 多进程支持",
+        "modules": ("multiprocessing",),
+        "auto": True,
+    },
+    {
+        "name": "anti-bloat",
+        "label": "Anti-bloat - 移除不必要依赖",
+        "modules": (),
+        "auto": True,
+    },
+    {
+        "name": "gevent",
+        "label": "Gevent - 协程网络库",
+        "modules": ("gevent",),
+        "auto": True,
+    },
+    {
+        "name": "kivy",
+        "label": "Kivy - 跨平台 GUI 框架",
+        "modules": ("kivy",),
+        "auto": True,
+    },
+    {
+        "name": "pywebview",
+        "label": "Pywebview - Web 界面",
+        "modules": ("webview",),
+        "auto": True,
+    },
+    {
+        "name": "pandas",
+        "label": "Pandas - 数据分析库",
+        "modules": ("pandas",),
+        "auto": True,
+    },
+    {
+        "name": "pillow",
+        "label": "Pillow - 图像处理库",
+        "modules": ("PIL",),
+        "auto": True,
+    },
+    {
+        "name": "scipy",
+        "label": "SciPy - 科学计算库",
+        "modules": ("scipy",),
+        "auto": True,
+    },
+]
+
+# Qt 插件，Nuitka 同一次编译只允许启用其中一个
+QT_PLUGINS = {
+    "PyQt5": "pyqt5",
+    "PyQt6": "pyqt6",
+    "PySide2": "pyside2",
+    "PySide6": "pyside6",
+}
+
+# 通过 qtpy 等兼容层间接使用 Qt 时，按 qtpy 的默认顺序选择已安装的绑定
+_QT_WRAPPERS = ("qtpy", "pyqtgraph", "QtPy")
+_QT_ORDER = ("PyQt5", "PyQt6", "PySide2", "PySide6")
+
+
+def _used_tops(graph: Dict[str, Any]) -> Dict[str, List[str]]:
+    """项目运行时使用的外部顶层包 -> 导入它的模块（排除只在 TYPE_CHECKING 中导入的）"""
+    used = {}
+    for top, info in graph["external"].items():
+        if info["required"] or info["dynamic"] or "optional" in info["guards"]:
+            used[top] = sorted(info["importers"])
+    return used
+
+
+def _importer_text(importers: List[str]) -> str:
+    """导入方的简短描述"""
+    if not importers:
+        return ""
+    text = importers[0]
+    if len(importers) > 1:
+        text += f" 等 {len(importers)} 个模块"
+    return text
+
+
+def detect_plugins(
+    project_dir: Path,
+    config: Dict[str, Any],
+    python: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    检测项目需要的 Nuitka 插件
+
+    Args:
+        project_dir: 项目目录
+        config: 构建配置
+        python: 目标解释器，默认使用项目虚拟环境中的解释器
+
+    Returns:
+        包含 python / cached / plugins 的结果，plugins 为
+        {插件名: {enable, reason}}，enable 为 None 表示无法判断
+    """
+    env = load_environment(project_dir, python)
+    graph = scan_project(project_dir, config)
+    used = _used_tops(graph)
+    installed = set(env["packages"])
+
+    plugins: Dict[str, Dict[str, Any]] = {}
+    for plugin in NUITKA_PLUGINS:
+        if plugin["name"] in QT_PLUGINS.values() or plugin["name"] == "no-qt":
+            continue
+        hits = [top for top in plugin["modules"] if top in used]
+        if not plugin["modules"]:
+            reason = "Nuitka 默认启用" if plugin["auto"] else "无法自动判断，按需启用"
+            plugins[plugin["name"]] = {
+                "enable": False if plugin["auto"] else None,
+                "reason": reason,
+            }
+        elif plugin["auto"]:
+            if hits:
+                reason = f"{hits[0]} 由 {_importer_text(used[hits[0]])} 导入，Nuitka 默认已处理"
+            else:
+                reason = "Nuitka 默认已处理"
+            plugins[plugin["name"]] = {"enable": False, "reason": reason}
+        elif hits:
+            plugins[plugin["name"]] = {
+                "enable": True,
+                "reason": f"{hits[0]} 由 {_importer_text(used[hits[0]])} 导入",
+            }
+        else:
+            plugins[plugin["name"]] = {"enable": False, "reason": "未检测到相关导入"}
+
+    # Qt 绑定：直接导入的绑定优先，其次是 qtpy 等兼容层所用的已安装绑定
+    direct = [binding for binding in QT_PLUGINS if binding in used]
+    wrappers = [top for top in _QT_WRAPPERS if top in used]
+    qt_installed = [binding for binding in _QT_ORDER if binding in installed]
+    for binding, name in QT_PLUGINS.items():
+        if binding in direct:
+            reason = f"{binding} 由 {_importer_text(used[binding])} 导入"
+            if len(direct) > 1:
+                reason += "，Nuitka 只允许启用一个 Qt 插件"
+            if binding not in installed:
+                reason += "（目标环境未安装）"
+            plugins[name] = {"enable": True, "reason": reason}
+        elif not direct and wrappers and qt_installed and binding == qt_installed[0]:
+            plugins[name] = {
+                "enable": True,
+                "reason": f"{wrappers[0]} 由 {_importer_text(used[wrappers[0]])} 导入，"
+                f"将使用已安装的 {binding}",
+            }
+        else:
+            plugins[name] = {"enable": False, "reason": "未检测到相关导入"}
+
+    # 已安装 Qt 绑定但项目不使用 Qt 时，阻止 matplotlib 等依赖间接引入
+    if not direct and not wrappers and qt_installed:
+        plugins["no-qt"] = {
+            "enable": True,
+            "reason": f"已安装 {'/'.join(qt_installed)}，项目未使用 Qt",
+        }
+    else:
+        plugins["no-qt"] = {"enable": False, "reason": "未安装 Qt 绑定或项目使用 Qt"}
+
+    return {
+        "python": env["python"],
+        "cached": env["cached"],
+        "plugins": plugins,
+        "stats": graph["stats"],
+    }
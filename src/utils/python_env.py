@@ -0,0 +1,17 @@
+"""
+项目解释器模块
+查找项目虚拟环境中的 Python 解释器，供导入耗时分析、排除建议和打包工具探测共用
+"""
+
+import sys
+from pathlib import Path
+
+
+def find_project_python(project_dir: Path) -> str:
+    """查找项目虚拟环境中的解释器，找不到时使用当前解释器"""
+    for venv in (".venv", "venv", "env"):
+        for relative in ("bin/python", "Scripts/python.exe"):
+            candidate = project_dir / venv / relative
+            if candidate.is_file():
+                return str(candidate)
+    return sys.executable
@@ -3,10 +3,46 @@
 根据配置生成 Nuitka 或 PyInstaller 构建脚本
 """
 
+import platform
 import re
+import shlex
 from pathlib import Path
 from typing import Dict, Any, List
 
+from src.utils.build_config import resolve_build_targets
+from src.utils.build_graph import (
+    collect_input_paths,
+    generate_build_graph,
+    graph_file_name,
+)
+from src.utils.data_collector import data_specs, uses_data_collector
+from src.utils.file_writer import describe_writes, write_scripts
+from src.utils.option_registry import BUILD_OPTIONS, PLATFORM_GUARDS, options_for_tool
+from src.utils.spec_generator import generate_pyinstaller_spec, spec_file_name
+from src.utils.tool_probe import load_capabilities, parse_flags, unsupported_flags
+from src.utils.script_snippets import (
+    AUTO_JOBS_CODE,
+    BUILD_CACHE_CODE,
+    BUILD_STREAM_CODE,
+    COMPARE_CODE,
+    COMPILATION_REPORT_CODE,
+    COMPILER_CACHE_CODE,
+    DATA_COLLECT_CODE,
+    DATA_COLLECTOR_CODE,
+    DATA_COLLECTOR_IMPORTS,
+    DIST_ANALYZER_CODE,
+    DIST_ANALYZER_IMPORTS,
+    DIST_SIZE_REPORT_CODE,
+    INCREMENTAL_CODE,
+    MATRIX_MAIN_CODE,
+    MATRIX_RUNNER_CODE,
+    MEMORY_INFO_CODE,
+    PGO_CODE,
+    STARTUP_BENCH_CODE,
+    STARTUP_BENCH_IMPORTS,
+    STARTUP_BENCH_MAIN_CODE,
+)
+
 
 # 预编译正则表达式
 _SPLIT_PATTERN = re.compile(r"[,\s，]+")
@@ -17,6 +53,18 @@ def _split_items(text: str) -> List[str]:
     return [s.strip() for s in _SPLIT_PATTERN.split(text) if s.strip()]
 
 
+def _excluded_modules(config: Dict[str, Any], key: str) -> List[str]:
+    """排除列表：工具选项（nofollow_imports / exclude_modules）加上通用的 exclude_packages"""
+    modules = _split_items(config.get(key, ""))
+    packages = config.get("exclude_packages") or []
+    if isinstance(packages, str):
+        packages = _split_items(packages)
+    for package in packages:
+        if package and package not in modules:
+            modules.append(package)
+    return modules
+
+
 # 颜色类定义（用于生成的脚本）
 COLOR_CLASS_CODE = """# ANSI 颜色代码
 class Color:
@@ -30,11 +78,40 @@ class Color:
 """
 
 
-def _generate_script_header(config: Dict[str, Any], tool_name: str) -> List[str]:
+def _embedded_imports(config: Dict[str, Any]) -> List[str]:
+    """按启用的功能返回嵌入的模块函数所需的标准库模块"""
+    imports: List[str] = []
+    if config.get("size_analysis", False):
+        imports.extend(DIST_ANALYZER_IMPORTS)
+    if uses_data_collector(config):
+        imports.extend(DATA_COLLECTOR_IMPORTS)
+    return imports
+
+
+def _parallel_imports(targets: List[Dict[str, Any]]) -> List[str]:
+    """并行构建多个目标时嵌入的模块函数所需的标准库模块"""
+    if any(uses_data_collector(t) for t in targets):
+        return list(DATA_COLLECTOR_IMPORTS)
+    return []
+
+
+def _generate_script_header(
+    config: Dict[str, Any], tool_name: str, extra_imports: List[str] | None = None
+) -> List[str]:
     """生成脚本头部（公共部分）"""
     project_name = config.get("project_name", "MyApp")
     version = config.get("version", "1.0.0")
 
+    imports = ["sys", "os", "subprocess", "shutil", "time", "platform", "json", "re"]
+    if extra_imports:
+        imports.extend(extra_imports)
+    # 按启用的功能追加所需的标准库模块
+    if config.get("build_cache", False) or config.get("incremental", False):
+        imports.append("hashlib")
+    if _uses_pgo(config):
+        imports.append("shlex")
+    imports = list(dict.fromkeys(imports))
+
     lines = [
         "# -*- coding: utf-8 -*-",
         '"""',
@@ -42,17 +119,16 @@ def _generate_script_header(config: Dict[str, Any], tool_name: str) -> List[str]
         f"版本: {version}",
         '"""',
         "",
-        "import sys",
-        "import os",
-        "import subprocess",
-        "import shutil",
-        "import time",
-        "import platform",
-        "",
-        "",
-        COLOR_CLASS_CODE,
-        "",
     ]
+    lines.extend(f"import {module}" for module in imports)
+    lines.extend(
+        [
+            "",
+            "",
+            COLOR_CLASS_CODE,
+            "",
+        ]
+    )
     return lines
 
 
@@ -112,11 +188,15 @@ def _generate_build_execution() -> List[str]:
     ]
 
 
-def _generate_build_result(cleanup_code: List[str] | None = None) -> List[str]:
+def _generate_build_result(
+    cleanup_code: List[str] | None = None,
+    post_build_code: List[str] | None = None,
+    build_call: str = "run_build(cmd)",
+) -> List[str]:
     """生成构建结果处理部分"""
     lines = [
         "    try:",
-        "        subprocess.run(cmd, check=True)",
+        f"        {build_call}",
         "        print(separator)",
         "        elapsed_time = time.time() - start_time",
         "        minutes = int(elapsed_time // 60)",
@@ -125,6 +205,8 @@ def _generate_build_result(cleanup_code: List[str] | None = None) -> List[str]:
     ]
     if cleanup_code:
         lines.extend(cleanup_code)
+    if post_build_code:
+        lines.extend(post_build_code)
     lines.extend(
         [
             "        abs_output = os.path.abspath(OUTPUT_DIR)",
@@ -148,6 +230,32 @@ def _generate_build_result(cleanup_code: List[str] | None = None) -> List[str]:
     return lines
 
 
+# 构建阶段标记：(正则, 阶段名)，按出现顺序排列
+NUITKA_PHASE_MARKERS = [
+    (r"Starting Python compilation", "module analysis"),
+    (r"Generating source code for C backend", "C code generation"),
+    (r"Running C compilation via Scons", "backend C compile"),
+    (r"Backend linking program", "linking"),
+    (r"Creating single file from dist folder|Nuitka-Onefile:", "onefile compression"),
+]
+
+PYINSTALLER_PHASE_MARKERS = [
+    (rf"(?:Building|checking) {name}\b", name)
+    for name in ("Analysis", "PYZ", "PKG", "EXE", "COLLECT", "BUNDLE")
+]
+
+
+def _generate_stream_section(tool_name: str, markers: List[tuple]) -> List[str]:
+    """生成流式输出与阶段计时所需的常量和辅助函数"""
+    lines = [f"TOOL_NAME = '{tool_name}'", "PHASE_MARKERS = ["]
+    for pattern, name in markers:
+        lines.append(f"    ({pattern!r}, {name!r}),")
+    lines.append("]")
+    lines.append(BUILD_STREAM_CODE)
+    lines.append("")
+    return lines
+
+
 def _generate_main_block() -> List[str]:
     """生成主函数入口"""
     return [
@@ -168,35 +276,181 @@ def _generate_path_code(path_str: str) -> str:
     )
 
 
-def generate_nuitka_script(config: Dict[str, Any], project_dir: Path) -> str:
-    """生成 Nuitka 构建脚本"""
-    lines = []
+def _generate_cache_vars(
+    config: Dict[str, Any], tool_distribution: str, ignore: List[str]
+) -> List[str]:
+    """生成构建缓存所需的配置常量"""
+    cache_dir = config.get("build_cache_dir") or ".pybuilder/cache"
+    lines = [
+        f"BUILD_CACHE_DIR = {_generate_path_code(cache_dir)}",
+        f"TOOL_DISTRIBUTION = '{tool_distribution}'",
+        "CACHE_INPUTS = [",
+    ]
+    for path in collect_input_paths(config):
+        lines.append(f"    {_generate_path_code(path)},")
+    lines.append("]")
+    lines.append(f"CACHE_IGNORE = {tuple(ignore)!r}")
+    return lines
 
-    # 使用公共模板生成头部
-    lines.extend(_generate_script_header(config, "Nuitka"))
-    lines.extend(_generate_config_section(config))
-    lines.extend(_generate_build_function_header("Nuitka"))
 
-    # 构建命令
+def _generate_cache_check() -> List[str]:
+    """生成构建前的缓存命中检查"""
+    return [
+        "    # 构建缓存：输入未变化时直接恢复上次的输出",
+        "    cache_key = compute_cache_key(cmd)",
+        "    if restore_build_cache(cache_key):",
+        "        abs_output = os.path.abspath(OUTPUT_DIR)",
+        "        print(f'{Color.GREEN}{Color.BOLD}Build cache hit: {cache_key[:12]}{Color.RESET}')",
+        "        print(f'{Color.GREEN}Output restored: {abs_output}{Color.RESET}')",
+        "        return 0",
+        "    print(f'{Color.GRAY}Build cache miss: {cache_key[:12]}{Color.RESET}')",
+        "",
+    ]
+
+
+def _generate_cache_save() -> List[str]:
+    """生成构建成功后的缓存写入"""
+    return [
+        "        # 保存构建缓存（失败不影响构建结果）",
+        "        try:",
+        "            save_build_cache(cache_key)",
+        "            print(f'{Color.GRAY}Build cache saved: {cache_key[:12]}{Color.RESET}')",
+        "        except Exception as e:",
+        "            print(f'{Color.YELLOW}Build cache not saved: {e}{Color.RESET}')",
+    ]
+
+
+def _generate_data_collect(config: Dict[str, Any]) -> List[str]:
+    """
+    生成构建前收集数据文件的代码：展开 glob / 排除模式并按内容去重，
+    暂存后只把暂存目录交给打包工具（按目标路径第一级拆分为目录或文件参数）
+    """
+    dedupe = bool(config.get("data_dedupe", False))
+    nuitka = config.get("build_tool") == "nuitka"
+    spec_mode = not nuitka and config.get("use_spec_file", False)
+    lines = [
+        "    # 收集数据文件：展开 glob / 排除模式并按内容去重，只把收集到的文件交给打包工具"
+    ]
+    for group, specs in data_specs(config).items():
+        call = f"collect_build_data({group!r}, {specs!r}, {dedupe})"
+        if spec_mode:
+            # .spec 从清单读取暂存目录
+            lines.append(f"    {call}")
+            continue
+        lines.append(f"    for src, dest, kind in {call}:")
+        if nuitka:
+            lines.append(
+                "        flag = '--include-data-dir' if kind == 'dir' else '--include-data-files'"
+            )
+            lines.append("        cmd.append(f'{flag}={src}={dest}')")
+        else:
+            flag = "--add-binary" if group == "binary" else "--add-data"
+            lines.append(
+                "        target = dest if kind == 'dir' else os.path.dirname(dest) or '.'"
+            )
+            lines.append(
+                f"        cmd.append(f'{flag}={{src}}{{data_separator}}{{target}}')"
+            )
+    lines.append("")
+    return lines
+
+
+def _generate_size_analysis_vars(config: Dict[str, Any], tool: str) -> List[str]:
+    """生成产物体积分析所需的常量"""
+    contents_dir = "."
+    if tool == "pyinstaller" and not config.get("onefile", True):
+        contents_dir = config.get("contents_directory", ".") or "."
+    suggest_key = "nofollow_imports" if tool == "nuitka" else "exclude_modules"
+    return [
+        f"CONTENTS_DIRECTORY = '{contents_dir}'",
+        f"SIZE_SUGGEST_KEY = '{suggest_key}'",
+        f"SIZE_TOP_N = {int(config.get('report_top_n', 10) or 10)}",
+    ]
+
+
+def _generate_option_args(config: Dict[str, Any], tool: str, inline: bool) -> List[str]:
+    """
+    按选项注册表生成带参数模板的选项（一次遍历注册表）
+
+    Args:
+        config: 构建配置
+        tool: 构建工具
+        inline: True 时生成命令列表中的元素，否则生成 cmd.append 语句（支持平台限制）
+    """
+    lines: List[str] = []
+    for option in options_for_tool(tool):
+        flag = option["flag"]
+        value = config.get(option["key"], option["default"])
+        if not flag or not value:
+            continue
+        if option["kind"] == "bool":
+            args = [flag]
+        elif option["kind"] == "items":
+            args = [flag.format(item) for item in _split_items(value)]
+        else:
+            args = [flag.format(value)]
+
+        if inline:
+            lines.extend(f"        {arg!r}," for arg in args)
+            continue
+        indent = "    "
+        comment = f"    # {option['doc']}"
+        if option["platform"]:
+            condition, platform_name = PLATFORM_GUARDS[option["platform"]]
+            lines.append(f"{comment}（仅{platform_name}平台）")
+            lines.append(f"    if {condition}:")
+            indent = "        "
+        else:
+            lines.append(comment)
+        lines.extend(f"{indent}cmd.append({arg!r})" for arg in args)
+        lines.append("")
+    return lines
+
+
+def _resolve_nuitka_mode(config: Dict[str, Any]) -> str:
+    """获取 Nuitka 编译模式，未指定 mode 时从 standalone/onefile 推导"""
+    mode = config.get("mode", "").strip().lower()
+    if mode:
+        return mode
+
+    # 向后兼容：从旧配置自动推导 mode
+    standalone = config.get("standalone", True)
+    onefile = config.get("onefile", True)
+    if standalone and onefile:
+        return "onefile"
+    if standalone:
+        return "standalone"
+    return "accelerated"
+
+
+def _uses_pgo(config: Dict[str, Any]) -> bool:
+    """是否启用 PGO（仅 Nuitka 且编译为可执行文件时有效）"""
+    if config.get("build_tool", "nuitka") != "nuitka" or not config.get("pgo", False):
+        return False
+    return _resolve_nuitka_mode(config) not in ("module", "package")
+
+
+def _uses_auto_mem_jobs(config: Dict[str, Any]) -> bool:
+    """是否使用按内存自动计算的编译线程数"""
+    return str(config.get("jobs", "")).strip().lower() == "auto-mem"
+
+
+def _generate_nuitka_command(
+    config: Dict[str, Any], memory_budget: str = ""
+) -> List[str]:
+    """生成 Nuitka 构建命令部分（build 函数体内，以 cmd.append(ENTRY_FILE) 结束）
+
+    memory_budget 为传给 auto_mem_jobs 的内存预算表达式（矩阵构建按并发数分配），为空时使用全部可用内存
+    """
+    lines: List[str] = []
+
     lines.append("    # 构建 Nuitka 命令")
     lines.append("    cmd = [")
     lines.append("        sys.executable,")
     lines.append("        '-m', 'nuitka',")
 
     # 编译模式（使用 Nuitka 官方推荐的 --mode 参数）
-    mode = config.get("mode", "").strip().lower()
-
-    if not mode:
-        # 向后兼容：从旧配置自动推导 mode
-        standalone = config.get("standalone", True)
-        onefile = config.get("onefile", True)
-
-        if standalone and onefile:
-            mode = "onefile"
-        elif standalone:
-            mode = "standalone"
-        else:
-            mode = "accelerated"
+    mode = _resolve_nuitka_mode(config)
 
     # 添加 mode 参数
     lines.append(f"        '--mode={mode}',")
@@ -218,16 +472,11 @@ def generate_nuitka_script(config: Dict[str, Any], project_dir: Path) -> str:
     if lto and lto.lower() != "no":
         lines.append(f"        '--lto={lto.lower()}',")
 
-    # 编译线程数（0或负数表示自动分配，不添加参数）
+    # 编译线程数（0或负数表示自动分配，不添加参数；auto-mem 在运行时计算）
     jobs = config.get("jobs", 0)
-    if jobs > 0:
+    if isinstance(jobs, int) and jobs > 0:
         lines.append(f"        '--jobs={jobs}',")
 
-    # Python 优化
-    python_flag = config.get("python_flag", "")
-    if python_flag:
-        lines.append(f"        '--python-flag={python_flag}',")
-
     # 静默模式和进度显示
     quiet_mode = config.get("quiet_mode", False)
     if quiet_mode:
@@ -238,41 +487,23 @@ def generate_nuitka_script(config: Dict[str, Any], project_dir: Path) -> str:
         if config.get("show_progress", True):
             lines.append("        '--show-progress',")
 
-    # 移除构建文件
-    if config.get("remove_output", True):
-        lines.append("        '--remove-output',")
+    # 编译报告（构建后用于分析热点模块）
+    if config.get("compilation_report", False):
+        lines.append("        f'--report=.pybuilder/{PROJECT_NAME}-report.xml',")
 
     # 不生成 .pyi 文件（仅 module 和 package 模式有效）
     if config.get("no_pyi_file", False) and mode in ("module", "package"):
         lines.append("        '--no-pyi-file',")
 
-    # 跟随导入（自动包含所有导入的模块）
-    if config.get("follow_imports", True):
-        lines.append("        '--follow-imports',")
-
-    # 自动下载依赖工具（CI环境必需）
-    if config.get("assume_yes_for_downloads", False):
-        lines.append("        '--assume-yes-for-downloads',")
-
-    # 包含包
-    include_packages = config.get("include_packages", "")
-    if include_packages:
-        for package in _split_items(include_packages):
-            lines.append(f"        '--include-package={package}',")
-
-    # 包含模块
-    include_modules = config.get("include_modules", "")
-    if include_modules:
-        for module in _split_items(include_modules):
-            lines.append(f"        '--include-module={module}',")
+    # 简单开关和列表参数（移除构建文件、跟随导入、包含包/模块等）
+    lines.extend(_generate_option_args(config, "nuitka", inline=True))
 
     # 排除导入
-    nofollow_imports = config.get("nofollow_imports", "")
-    if nofollow_imports:
-        for module in _split_items(nofollow_imports):
-            lines.append(f"        '--nofollow-import-to={module}',")
+    for module in _excluded_modules(config, "nofollow_imports"):
+        lines.append(f"        '--nofollow-import-to={module}',")
 
-    # 数据文件和数据目录（统一处理）
+    # 数据文件和数据目录（统一处理，使用 glob / 排除模式或去重时改为构建前收集）
+    collect_data = uses_data_collector(config)
     data_params = [
         ("include_data_files", "--include-data-files"),
         ("include_data_dirs", "--include-data-dir"),
@@ -280,7 +511,7 @@ def generate_nuitka_script(config: Dict[str, Any], project_dir: Path) -> str:
 
     for config_key, flag in data_params:
         data_value = config.get(config_key, "")
-        if data_value:
+        if data_value and not collect_data:
             entries = [e.strip() for e in data_value.split() if e.strip()]
             for data_entry in entries:
                 if ";" in data_entry:
@@ -300,6 +531,17 @@ def generate_nuitka_script(config: Dict[str, Any], project_dir: Path) -> str:
     lines.append("    ]")
     lines.append("")
 
+    if collect_data:
+        lines.extend(_generate_data_collect(config))
+
+    if _uses_auto_mem_jobs(config):
+        lines.append("    # 编译线程数：根据可用内存和 CPU 核数自动决定")
+        budget_arg = f", {memory_budget}" if memory_budget else ""
+        lines.append(
+            f"    cmd.append(f'--jobs={{auto_mem_jobs(\"{(lto or 'no').lower()}\"{budget_arg})}}')"
+        )
+        lines.append("")
+
     # 控制台选项（仅Windows平台）
     if not config.get("show_console", False):
         lines.append("    # 禁用控制台窗口（仅Windows平台）")
@@ -361,31 +603,166 @@ def generate_nuitka_script(config: Dict[str, Any], project_dir: Path) -> str:
     lines.append("    cmd.append(ENTRY_FILE)")
     lines.append("")
 
+    return lines
+
+
+def generate_nuitka_script(config: Dict[str, Any], project_dir: Path) -> str:
+    """生成 Nuitka 构建脚本"""
+    lines = []
+
+    build_cache = config.get("build_cache", False)
+    compiler_cache = config.get("compiler_cache", False)
+    compilation_report = config.get("compilation_report", False)
+    size_analysis = config.get("size_analysis", False)
+    pgo = _uses_pgo(config)
+
+    # 使用公共模板生成头部
+    lines.extend(_generate_script_header(config, "Nuitka", _embedded_imports(config)))
+    extra_vars: List[str] = []
+    if build_cache:
+        extra_vars.extend(
+            _generate_cache_vars(config, "nuitka", ["*.build", "*.onefile-build"])
+        )
+    if compiler_cache:
+        cache_dir = config.get("compiler_cache_dir", "")
+        extra_vars.append(
+            f"COMPILER_CACHE_DIR = {_generate_path_code(cache_dir) if cache_dir else repr('')}"
+        )
+        extra_vars.append("COMPILER_CACHE_STATS_DIR = '.pybuilder'")
+    if compilation_report:
+        extra_vars.append(f"REPORT_TOP_N = {int(config.get('report_top_n', 10) or 10)}")
+    if size_analysis:
+        extra_vars.extend(_generate_size_analysis_vars(config, "nuitka"))
+    if pgo:
+        extra_vars.append("PGO_PROFILE_DIR = os.path.join('.pybuilder', 'pgo')")
+        extra_vars.append(
+            f"PGO_TRAINING_COMMAND = {str(config.get('pgo_training_command', '') or '')!r}"
+        )
+    lines.extend(_generate_config_section(config, extra_vars if extra_vars else None))
+    if build_cache:
+        lines.extend([BUILD_CACHE_CODE, ""])
+    if compiler_cache:
+        lines.extend([COMPILER_CACHE_CODE, ""])
+    if compilation_report:
+        lines.extend([COMPILATION_REPORT_CODE, ""])
+    if size_analysis:
+        lines.extend([DIST_ANALYZER_CODE, DIST_SIZE_REPORT_CODE, ""])
+    if uses_data_collector(config):
+        lines.extend([DATA_COLLECTOR_CODE, DATA_COLLECT_CODE, ""])
+    if _uses_auto_mem_jobs(config):
+        lines.extend([MEMORY_INFO_CODE, "", AUTO_JOBS_CODE, ""])
+    lines.extend(_generate_stream_section("nuitka", NUITKA_PHASE_MARKERS))
+    if pgo:
+        lines.extend([PGO_CODE, ""])
+    lines.extend(_generate_build_function_header("Nuitka"))
+
+    lines.extend(_generate_nuitka_command(config))
+
+    if compiler_cache:
+        compiler = config.get("compiler", "")
+        lines.append("    # 编译器缓存（ccache/sccache，MSVC 使用内置 clcache）")
+        lines.append(
+            f"    compiler_cache = setup_compiler_cache('{compiler}', is_windows)"
+        )
+        lines.append("")
+
+    if build_cache:
+        lines.extend(_generate_cache_check())
+
+    post_build_code: List[str] = []
+    if compiler_cache:
+        post_build_code.extend(
+            [
+                "        if compiler_cache:",
+                "            report_compiler_cache(compiler_cache, phases)",
+            ]
+        )
+    if compilation_report:
+        post_build_code.extend(
+            [
+                "        # 编译报告：输出热点模块排名",
+                "        analyze_compilation_report(os.path.join('.pybuilder', f'{PROJECT_NAME}-report.xml'))",
+            ]
+        )
+    if size_analysis:
+        post_build_code.append("        report_dist_size()")
+    if build_cache:
+        post_build_code.extend(_generate_cache_save())
+
+    # PGO：插桩构建 -> 训练运行 -> 使用 profile 重新构建
+    build_call = "run_pgo_build(cmd)" if pgo else "run_build(cmd)"
+    if compiler_cache:
+        # 编译器缓存按 C 编译阶段耗时估算节省时间，需要保留阶段统计
+        build_call = f"phases = {build_call}"
+
     # 使用公共模板生成执行和结果部分
     lines.extend(_generate_build_execution())
-    lines.extend(_generate_build_result())
+    lines.extend(
+        _generate_build_result(
+            post_build_code=post_build_code or None, build_call=build_call
+        )
+    )
     lines.extend(_generate_main_block())
 
     return "\n".join(lines)
 
 
-def generate_pyinstaller_script(config: Dict[str, Any], project_dir: Path) -> str:
-    """生成 PyInstaller 构建脚本"""
-    lines = []
+def _generate_pyinstaller_spec_command(config: Dict[str, Any]) -> List[str]:
+    """生成以 .spec 驱动的 PyInstaller 构建命令（build 函数体内，以 cmd.append(SPEC_FILE) 结束）"""
+    incremental = config.get("incremental", False)
+    lines = [
+        "    # 构建 PyInstaller 命令（打包选项均在 .spec 中，命令行只保留通用选项）",
+        "    cmd = [",
+        "        sys.executable,",
+        "        '-m', 'PyInstaller',",
+        "        f'--distpath={OUTPUT_DIR}',",
+    ]
+    # 非 onefile 模式且输出目录是 build 时，指定工作路径避免冲突
+    if (
+        not incremental
+        and not config.get("onefile", True)
+        and config.get("output_dir", "build") == "build"
+    ):
+        lines.append("        '--workpath=build/temp',")
+    if config.get("clean", True) and not incremental:
+        lines.append("        '--clean',")
+    # 增量构建和构建缓存会在已有输出上重新构建，必须自动确认
+    if (
+        config.get("noconfirm", False)
+        or incremental
+        or config.get("build_cache", False)
+    ):
+        lines.append("        '--noconfirm',")
+    if config.get("quiet_mode", False):
+        lines.append("        '--log-level=WARN',")
+    lines.extend(
+        [
+            "    ]",
+            "",
+        ]
+    )
+    if uses_data_collector(config):
+        lines.extend(_generate_data_collect(config))
+    lines.extend(
+        [
+            "    # spec 文件（最后添加）",
+            "    cmd.append(SPEC_FILE)",
+            "",
+        ]
+    )
+    return lines
 
-    # 使用公共模板生成头部
-    lines.extend(_generate_script_header(config, "PyInstaller"))
 
-    # PyInstaller 特有的额外变量
-    extra_vars: List[str] = []
-    if config.get("splash_image"):
-        extra_vars.append(f"SPLASH_IMAGE = '{config['splash_image']}'")
-    lines.extend(_generate_config_section(config, extra_vars if extra_vars else None))
-    lines.extend(_generate_build_function_header("PyInstaller"))
+def _generate_pyinstaller_command(config: Dict[str, Any]) -> List[str]:
+    """生成 PyInstaller 构建命令部分（build 函数体内，以 cmd.append(ENTRY_FILE) 结束）"""
+    if config.get("use_spec_file", False):
+        return _generate_pyinstaller_spec_command(config)
+
+    lines: List[str] = []
 
     # 添加数据文件分隔符检测（如果需要）
     add_data = config.get("add_data", "")
-    if add_data:
+    if add_data or config.get("add_binary", ""):
         lines.append("    # 添加数据文件（根据操作系统使用不同分隔符）")
         lines.append("    data_separator = ';' if is_windows else ':'")
         lines.append("")
@@ -401,10 +778,17 @@ def generate_pyinstaller_script(config: Dict[str, Any], project_dir: Path) -> st
     if onefile_mode:
         lines.append("        '--onefile',")
 
+    # 增量构建：工作目录在运行时确定，且不清理 Analysis 缓存
+    incremental = config.get("incremental", False)
+
     # 输出选项
     lines.append("        f'--distpath={OUTPUT_DIR}',")
     # 非 onefile 模式且输出目录是 build 时，指定工作路径避免冲突
-    if not onefile_mode and config.get("output_dir", "build") == "build":
+    if (
+        not incremental
+        and not onefile_mode
+        and config.get("output_dir", "build") == "build"
+    ):
         lines.append("        '--workpath=build/temp',")
     lines.append("        f'--name={PROJECT_NAME}',")
 
@@ -418,12 +802,16 @@ def generate_pyinstaller_script(config: Dict[str, Any], project_dir: Path) -> st
     if not config.get("show_console", False):
         lines.append("        '--noconsole',")
 
-    # 清理选项
-    if config.get("clean", True):
+    # 清理选项（增量构建需要保留缓存）
+    if config.get("clean", True) and not incremental:
         lines.append("        '--clean',")
 
-    # 自动确认选项
-    if config.get("noconfirm", False):
+    # 自动确认选项（增量构建和构建缓存会覆盖已有输出，必须自动确认）
+    if (
+        config.get("noconfirm", False)
+        or incremental
+        or config.get("build_cache", False)
+    ):
         lines.append("        '--noconfirm',")
 
     # 静默模式和日志级别
@@ -431,10 +819,6 @@ def generate_pyinstaller_script(config: Dict[str, Any], project_dir: Path) -> st
     if quiet_mode:
         lines.append("        '--log-level=WARN',")
 
-    # 调试模式
-    if config.get("debug", False):
-        lines.append("        '--debug=all',")
-
     # 关闭初始命令列表
     lines.append("    ]")
     lines.append("")
@@ -449,101 +833,34 @@ def generate_pyinstaller_script(config: Dict[str, Any], project_dir: Path) -> st
     # 启动画面（仅单文件模式）
     if config.get("splash_image") and onefile_mode:
         lines.append("    # 启动画面（仅单文件模式）")
-        lines.append("    if onefile_mode:")
-        lines.append("        cmd.append(f'--splash={SPLASH_IMAGE}')")
-        lines.append("")
-
-    # UAC 管理员权限（仅 Windows）
-    if config.get("uac_admin", False):
-        lines.append("    # UAC管理员权限（仅Windows平台）")
-        lines.append("    if is_windows:")
-        lines.append("        cmd.append('--uac-admin')")
+        lines.append("    cmd.append(f'--splash={SPLASH_IMAGE}')")
         lines.append("")
 
     # 运行时临时目录（仅单文件模式）
     runtime_tmpdir = config.get("runtime_tmpdir", "")
     if runtime_tmpdir and onefile_mode:
         lines.append("    # 运行时临时目录（仅单文件模式）")
-        lines.append("    if onefile_mode:")
-        lines.append(f"        cmd.append('--runtime-tmpdir={runtime_tmpdir}')")
+        lines.append(f"    cmd.append('--runtime-tmpdir={runtime_tmpdir}')")
         lines.append("")
 
-    # 平台特定参数（使用字典映射简化重复代码）
-    platform_params = {
-        "windows": [
-            ("win_version_file", "--version-file", "Windows版本文件"),
-            ("win_manifest", "--manifest", "Windows Manifest"),
-        ],
-        "macos": [
-            ("target_architecture", "--target-architecture", "macOS架构"),
-            ("osx_bundle_identifier", "--osx-bundle-identifier", "macOS Bundle标识"),
-            ("osx_entitlements_file", "--osx-entitlements-file", "macOS权限文件"),
-            ("codesign_identity", "--codesign-identity", "macOS代码签名"),
-        ],
-    }
-
-    for platform_type, params in platform_params.items():
-        condition = "is_windows" if platform_type == "windows" else "is_macos"
-        for config_key, flag, comment in params:
-            value = config.get(config_key, "")
-            if value:
-                lines.append(
-                    f"    # {comment}（仅{'Windows' if platform_type == 'windows' else 'macOS'}平台）"
-                )
-                lines.append(f"    if {condition}:")
-                lines.append(f"        cmd.append('{flag}={value}')")
-                lines.append("")
-
-    # 隐藏导入
-    hidden_imports = config.get("hidden_imports", "")
-    if hidden_imports:
-        lines.append("    # 隐藏导入")
-        for module in _split_items(hidden_imports):
-            lines.append(f"    cmd.append('--hidden-import={module}')")
-        lines.append("")
+    # 简单开关和列表参数（调试模式、隐藏导入、收集选项、平台特定参数等）
+    lines.extend(_generate_option_args(config, "pyinstaller", inline=False))
 
     # 排除模块
-    exclude_modules = config.get("exclude_modules", "")
+    exclude_modules = _excluded_modules(config, "exclude_modules")
     if exclude_modules:
         lines.append("    # 排除模块")
-        for module in _split_items(exclude_modules):
+        for module in exclude_modules:
             lines.append(f"    cmd.append('--exclude-module={module}')")
         lines.append("")
 
-    # 收集子模块
-    collect_submodules = config.get("collect_submodules", "")
-    if collect_submodules:
-        lines.append("    # 收集子模块")
-        for package in _split_items(collect_submodules):
-            lines.append(f"    cmd.append('--collect-submodules={package}')")
-        lines.append("")
-
-    # 收集数据文件
-    collect_data = config.get("collect_data", "")
+    # 使用 glob / 排除模式或去重时，数据文件在构建前收集
+    collect_data = uses_data_collector(config)
     if collect_data:
-        lines.append("    # 收集数据文件")
-        for package in _split_items(collect_data):
-            lines.append(f"    cmd.append('--collect-data={package}')")
-        lines.append("")
-
-    # 收集二进制文件
-    collect_binaries = config.get("collect_binaries", "")
-    if collect_binaries:
-        lines.append("    # 收集二进制文件")
-        for package in _split_items(collect_binaries):
-            lines.append(f"    cmd.append('--collect-binaries={package}')")
-        lines.append("")
-
-    # 收集所有（子模块+数据+二进制）
-    collect_all = config.get("collect_all", "")
-    if collect_all:
-        lines.append("    # 收集所有")
-        for package in _split_items(collect_all):
-            lines.append(f"    cmd.append('--collect-all={package}')")
-        lines.append("")
+        lines.extend(_generate_data_collect(config))
 
     # 添加数据文件
-    if add_data:
+    if add_data and not collect_data:
         lines.append("    # 添加数据文件")
         entries = [e.strip() for e in add_data.split() if e.strip()]
         for data_entry in entries:
@@ -560,7 +877,7 @@ def generate_pyinstaller_script(config: Dict[str, Any], project_dir: Path) -> st
 
     # 添加二进制文件
     add_binary = config.get("add_binary", "")
-    if add_binary:
+    if add_binary and not collect_data:
         lines.append("    # 添加二进制文件")
         entries = [e.strip() for e in add_binary.split() if e.strip()]
         for binary_entry in entries:
@@ -580,56 +897,510 @@ def generate_pyinstaller_script(config: Dict[str, Any], project_dir: Path) -> st
     lines.append("    cmd.append(ENTRY_FILE)")
     lines.append("")
 
-    # PyInstaller 特有的清理代码
-    cleanup_code = [
-        "        # 清理 .spec 文件",
-        "        spec_file = f'{PROJECT_NAME}.spec'",
-        "        if os.path.exists(spec_file):",
-        "            os.remove(spec_file)",
-        "            print(f'{Color.GRAY}Cleaned: {spec_file}{Color.RESET}')",
-    ]
+    return lines
+
+
+def generate_pyinstaller_script(config: Dict[str, Any], project_dir: Path) -> str:
+    """生成 PyInstaller 构建脚本"""
+    lines = []
+
+    # 使用公共模板生成头部
+    lines.extend(
+        _generate_script_header(config, "PyInstaller", _embedded_imports(config))
+    )
+
+    build_cache = config.get("build_cache", False)
+    incremental = config.get("incremental", False)
+    size_analysis = config.get("size_analysis", False)
+    use_spec_file = config.get("use_spec_file", False)
+
+    # PyInstaller 特有的额外变量
+    extra_vars: List[str] = []
+    if use_spec_file:
+        extra_vars.append(f"SPEC_FILE = {spec_file_name(config)!r}")
+    elif config.get("splash_image"):
+        extra_vars.append(f"SPLASH_IMAGE = '{config['splash_image']}'")
+    if build_cache:
+        extra_vars.extend(_generate_cache_vars(config, "pyinstaller", ["temp"]))
+    if size_analysis:
+        extra_vars.extend(_generate_size_analysis_vars(config, "pyinstaller"))
+    lines.extend(_generate_config_section(config, extra_vars if extra_vars else None))
+    if build_cache:
+        lines.extend([BUILD_CACHE_CODE, ""])
+    if incremental:
+        lines.extend([INCREMENTAL_CODE, ""])
+    if size_analysis:
+        lines.extend([DIST_ANALYZER_CODE, DIST_SIZE_REPORT_CODE, ""])
+    if uses_data_collector(config):
+        lines.extend([DATA_COLLECTOR_CODE, DATA_COLLECT_CODE, ""])
+    lines.extend(_generate_stream_section("pyinstaller", PYINSTALLER_PHASE_MARKERS))
+    lines.extend(_generate_build_function_header("PyInstaller"))
+
+    lines.extend(_generate_pyinstaller_command(config))
+
+    if incremental:
+        lines.append("    # 增量构建：按命令和依赖集固定工作目录，保留 Analysis 缓存")
+        lines.append(
+            "    workpath, incremental_key, warm_build = prepare_incremental_workpath(cmd)"
+        )
+        lines.append("    cmd.insert(-1, f'--workpath={workpath}')")
+        lines.append("")
+
+    # PyInstaller 特有的清理代码（使用 .spec 文件时保留）
+    cleanup_code: List[str] = []
+    if not use_spec_file:
+        cleanup_code = [
+            "        # 清理 .spec 文件",
+            "        spec_file = f'{PROJECT_NAME}.spec'",
+            "        if os.path.exists(spec_file):",
+            "            os.remove(spec_file)",
+            "            print(f'{Color.GRAY}Cleaned: {spec_file}{Color.RESET}')",
+        ]
+
+    if build_cache:
+        lines.extend(_generate_cache_check())
+
+    post_build_code: List[str] = []
+    if incremental:
+        post_build_code.extend(
+            [
+                "        record_incremental_build(workpath, incremental_key, warm_build, elapsed_time)",
+            ]
+        )
+    if size_analysis:
+        post_build_code.append("        report_dist_size()")
+    if build_cache:
+        post_build_code.extend(_generate_cache_save())
 
     # 使用公共模板生成执行和结果部分
     lines.extend(_generate_build_execution())
-    lines.extend(_generate_build_result(cleanup_code))
+    lines.extend(_generate_build_result(cleanup_code, post_build_code or None))
     lines.extend(_generate_main_block())
 
     return "\n".join(lines)
 
 
-def generate_build_script(
-    config: Dict[str, Any], project_dir: Path
-) -> tuple[bool, str]:
+def _generate_target_function(func_name: str, target: Dict[str, Any]) -> List[str]:
+    """生成返回单个矩阵目标构建命令的函数"""
+    lines = [
+        f"def {func_name}(memory_budget_mb=None):",
+        f'    """构建目标 {target["name"]} 的命令"""',
+        f"    PROJECT_NAME = '{target.get('project_name', 'MyApp')}'",
+        f"    ENTRY_FILE = '{target.get('entry_file', 'main.py')}'",
+        f"    OUTPUT_DIR = {_generate_path_code(target['output_dir'])}",
+    ]
+    if target.get("company_name"):
+        lines.append(f"    COMPANY_NAME = '{target['company_name']}'")
+    if target.get("icon_file"):
+        lines.append(f"    ICON_FILE = '{target['icon_file']}'")
+    if target.get("splash_image"):
+        lines.append(f"    SPLASH_IMAGE = '{target['splash_image']}'")
+    lines.extend(
+        [
+            "    os_type = platform.system()",
+            "    is_windows = os_type == 'Windows'",
+            "    is_macos = os_type == 'Darwin'",
+            "    is_linux = os_type == 'Linux'",
+            "",
+        ]
+    )
+    if target.get("build_tool") == "nuitka":
+        lines.extend(_generate_nuitka_command(target, "memory_budget_mb"))
+        if target.get("compiler_cache", False):
+            compiler = target.get("compiler", "")
+            lines.append("    # 编译器缓存（ccache/sccache，MSVC 使用内置 clcache）")
+            lines.append(f"    setup_compiler_cache('{compiler}', is_windows)")
+            lines.append("")
+    else:
+        # 矩阵目标各自覆盖配置，不共用项目根目录的 .spec，始终使用命令行参数
+        lines.extend(_generate_pyinstaller_command({**target, "use_spec_file": False}))
+        # 并行构建时各目标使用独立的工作目录和 .spec 目录，避免相互覆盖
+        lines.append("    cmd.insert(-1, f'--workpath={OUTPUT_DIR}/.work')")
+        lines.append("    cmd.insert(-1, f'--specpath={OUTPUT_DIR}')")
+        lines.append("")
+    lines.append("    return cmd")
+    lines.append("")
+    lines.append("")
+    return lines
+
+
+def _estimate_target_memory_mb(target: Dict[str, Any]) -> int:
+    """估算单个目标构建时的内存占用（MB），用于限制矩阵并发数"""
+    if target.get("build_tool") != "nuitka":
+        return 512
+    lto = str(target.get("lto", "no")).lower()
+    return 4096 if lto in ("yes", "true") else 2048
+
+
+def _describe_target(target: Dict[str, Any]) -> tuple[str, str, bool]:
+    """返回目标的 (构建工具, 编译模式, 是否单文件)"""
+    tool = target.get("build_tool", "pyinstaller")
+    if tool == "nuitka":
+        mode = _resolve_nuitka_mode(target)
+        return tool, mode, mode not in ("standalone", "app-dist")
+    onefile = bool(target.get("onefile", True))
+    return tool, "onefile" if onefile else "onedir", onefile
+
+
+def _generate_parallel_build_section(
+    targets: List[Dict[str, Any]], list_comment: str
+) -> List[str]:
+    """生成并行构建所需的常量、辅助代码、每个目标的命令函数和 TARGETS 列表"""
+    compiler_cache = any(
+        t.get("build_tool") == "nuitka" and t.get("compiler_cache", False)
+        for t in targets
+    )
+
+    lines: List[str] = []
+    lines.extend([MEMORY_INFO_CODE, ""])
+    if compiler_cache:
+        lines.extend([COMPILER_CACHE_CODE, ""])
+    if any(t.get("build_tool") == "nuitka" and _uses_auto_mem_jobs(t) for t in targets):
+        lines.extend([AUTO_JOBS_CODE, ""])
+    if any(uses_data_collector(t) for t in targets):
+        lines.extend([DATA_COLLECTOR_CODE, DATA_COLLECT_CODE, ""])
+
+    # 每个目标生成一个返回构建命令的函数
+    func_names = []
+    for index, target in enumerate(targets):
+        slug = re.sub(r"\W+", "_", target["name"]).strip("_").lower()
+        func_name = f"command_{index}_{slug}" if slug else f"command_{index}"
+        func_names.append(func_name)
+        lines.extend(_generate_target_function(func_name, target))
+
+    # 目标列表
+    lines.append(f"# {list_comment}")
+    lines.append("TARGETS = [")
+    for func_name, target in zip(func_names, targets):
+        tool, mode, onefile = _describe_target(target)
+        lines.append("    {")
+        lines.append(f"        'name': {target['name']!r},")
+        lines.append(f"        'tool': '{tool}',")
+        lines.append(f"        'mode': '{mode}',")
+        lines.append(f"        'onefile': {onefile},")
+        project_name = target.get("project_name", "MyApp")
+        lines.append(f"        'project_name': {project_name!r},")
+        lines.append(
+            f"        'output_dir': {_generate_path_code(target['output_dir'])},"
+        )
+        lines.append(f"        'memory_mb': {_estimate_target_memory_mb(target)},")
+        lines.append(f"        'command': {func_name},")
+        lines.append("    },")
+    lines.append("]")
+    lines.append("")
+    lines.append("")
+    lines.append(MATRIX_RUNNER_CODE)
+    return lines
+
+
+def _generate_parallel_vars(
+    config: Dict[str, Any], targets: List[Dict[str, Any]], log_dir: str
+) -> List[str]:
+    """生成并行构建的配置常量"""
+    extra_vars = [
+        f"MATRIX_WORKERS = {int(config.get('matrix_workers', 0) or 0)}",
+        "MATRIX_MIN_CORES_PER_TARGET = 2",
+        f"MATRIX_LOG_DIR = os.path.join('.pybuilder', '{log_dir}')",
+    ]
+    if any(
+        t.get("build_tool") == "nuitka" and t.get("compiler_cache", False)
+        for t in targets
+    ):
+        cache_dir = config.get("compiler_cache_dir", "")
+        extra_vars.append(
+            f"COMPILER_CACHE_DIR = {_generate_path_code(cache_dir) if cache_dir else repr('')}"
+        )
+        extra_vars.append("COMPILER_CACHE_STATS_DIR = '.pybuilder'")
+    return extra_vars
+
+
+def generate_matrix_script(config: Dict[str, Any], project_dir: Path) -> str:
+    """生成多目标矩阵构建脚本（使用进程池并行构建 targets 中的所有目标）"""
+    targets = resolve_build_targets(config)
+
+    lines = []
+    extra_imports = ["argparse", "concurrent.futures", *_parallel_imports(targets)]
+    lines.extend(_generate_script_header(config, "Matrix", extra_imports))
+    extra_vars = _generate_parallel_vars(config, targets, "matrix-logs")
+    lines.extend(_generate_config_section(config, extra_vars))
+    lines.extend(_generate_parallel_build_section(targets, "构建目标矩阵"))
+    lines.append("")
+    lines.append(MATRIX_MAIN_CODE)
+    lines.extend(
+        [
+            "",
+            "if __name__ == '__main__':",
+            "    sys.exit(main())",
+            "",
+        ]
+    )
+    return "\n".join(lines)
+
+
+def generate_compare_script(config: Dict[str, Any], project_dir: Path) -> str:
+    """生成构建配置对比脚本（并行构建 compare 中的各变体，对比体积、启动耗时和基准结果）"""
+    variants = resolve_build_targets(config, "compare")
+
+    lines = []
+    extra_imports = ["argparse", "concurrent.futures", "shlex"]
+    extra_imports.extend(STARTUP_BENCH_IMPORTS)
+    extra_imports.extend(_parallel_imports(variants))
+    lines.extend(_generate_script_header(config, "Compare", extra_imports))
+    extra_vars = _generate_parallel_vars(config, variants, "compare-logs")
+    bench_args = shlex.split(str(config.get("bench_args", "") or ""))
+    extra_vars.extend(
+        [
+            f"BENCH_RUNS = {int(config.get('bench_runs', 10) or 10)}",
+            f"BENCH_ARGS = {bench_args!r}",
+            f"COMPARE_BENCHMARK = {str(config.get('compare_benchmark', '') or '')!r}",
+            f"COMPARE_RUNS = {int(config.get('compare_runs', 3) or 3)}",
+        ]
+    )
+    lines.extend(_generate_config_section(config, extra_vars))
+    lines.extend([STARTUP_BENCH_CODE, ""])
+    lines.extend(_generate_parallel_build_section(variants, "对比变体"))
+    lines.append("")
+    lines.append(COMPARE_CODE)
+    lines.extend(
+        [
+            "",
+            "if __name__ == '__main__':",
+            "    sys.exit(main())",
+            "",
+        ]
+    )
+    return "\n".join(lines)
+
+
+def resolve_benchmark_variants(config: Dict[str, Any]) -> List[Dict[str, Any]]:
     """
-    生成构建脚本
-    返回 (是否成功, 消息)
+    获取启动耗时测试的构建变体
+    配置了 targets 时为每个目标一项，否则为基础配置；module/package 模式不可执行，跳过
     """
-    try:
-        build_tool = config.get("build_tool", "nuitka")
-
-        # 生成脚本内容
-        if build_tool == "nuitka":
-            script_content = generate_nuitka_script(config, project_dir)
-            script_name = "build_nuitka.py"
-        elif build_tool == "pyinstaller":
-            script_content = generate_pyinstaller_script(config, project_dir)
-            script_name = "build_pyinstaller.py"
+    targets = resolve_build_targets(config)
+    if not targets:
+        targets = [{**config, "name": config.get("project_name", "MyApp")}]
+
+    variants = []
+    for target in targets:
+        tool, mode, onefile = _describe_target(target)
+        if mode in ("module", "package"):
+            continue
+        runtime_tmpdir = ""
+        if tool == "pyinstaller" and onefile:
+            runtime_tmpdir = target.get("runtime_tmpdir", "") or ""
+        variants.append(
+            {
+                "name": target["name"],
+                "tool": tool,
+                "mode": mode,
+                "onefile": onefile,
+                "output_dir": target.get("output_dir", "dist"),
+                "project_name": target.get("project_name", "MyApp"),
+                "runtime_tmpdir": runtime_tmpdir,
+            }
+        )
+    return variants
+
+
+# 启动测试变体中原样写入脚本的字段（output_dir 需转换为 os.path.join）
+_BENCH_VARIANT_KEYS = (
+    "name",
+    "tool",
+    "mode",
+    "onefile",
+    "project_name",
+    "runtime_tmpdir",
+)
+
+
+def generate_benchmark_script(config: Dict[str, Any], project_dir: Path) -> str:
+    """生成启动耗时基准脚本（冷/热启动 p50/p95/max）"""
+    variants = resolve_benchmark_variants(config)
+
+    lines = []
+    extra_imports = ["argparse", *STARTUP_BENCH_IMPORTS]
+    lines.extend(_generate_script_header(config, "Startup Benchmark", extra_imports))
+
+    bench_args = shlex.split(str(config.get("bench_args", "") or ""))
+    extra_vars = [
+        f"BENCH_RUNS = {int(config.get('bench_runs', 10) or 10)}",
+        f"BENCH_ARGS = {bench_args!r}",
+    ]
+    lines.extend(_generate_config_section(config, extra_vars))
+    lines.extend([STARTUP_BENCH_CODE, ""])
+
+    # 测试变体列表
+    lines.append("# 启动耗时测试变体")
+    lines.append("VARIANTS = [")
+    for variant in variants:
+        lines.append("    {")
+        for key in _BENCH_VARIANT_KEYS:
+            lines.append(f"        '{key}': {variant[key]!r},")
+        lines.append(
+            f"        'output_dir': {_generate_path_code(variant['output_dir'])},"
+        )
+        lines.append("    },")
+    lines.append("]")
+    lines.append("")
+    lines.append("")
+    lines.append(STARTUP_BENCH_MAIN_CODE)
+    lines.extend(
+        [
+            "",
+            "if __name__ == '__main__':",
+            "    sys.exit(main())",
+            "",
+        ]
+    )
+    return "\n".join(lines)
+
+
+def render_build_scripts(config: Dict[str, Any], project_dir: Path) -> Dict[str, str]:
+    """生成所有构建脚本的内容，返回 {文件名: 内容}"""
+    build_tool = config.get("build_tool", "nuitka")
+    if build_tool == "nuitka":
+        scripts = {"build_nuitka.py": generate_nuitka_script(config, project_dir)}
+    elif build_tool == "pyinstaller":
+        scripts = {
+            "build_pyinstaller.py": generate_pyinstaller_script(config, project_dir)
+        }
+        # 使用 .spec 文件时一并生成
+        if config.get("use_spec_file", False):
+            scripts[spec_file_name(config)] = generate_pyinstaller_spec(config)
+    else:
+        raise ValueError(f"不支持的构建工具: {build_tool}")
+
+    # 配置了 targets 矩阵时额外生成矩阵构建脚本
+    if config.get("targets"):
+        scripts["build_matrix.py"] = generate_matrix_script(config, project_dir)
+    # 启用启动耗时测试时额外生成基准脚本
+    if config.get("startup_benchmark", False):
+        scripts["bench_startup.py"] = generate_benchmark_script(config, project_dir)
+    # 配置了 compare 变体时额外生成构建对比脚本
+    if config.get("compare"):
+        scripts["compare_builds.py"] = generate_compare_script(config, project_dir)
+    # 启用构建图时生成 ninja/make 文件
+    graph_file = graph_file_name(config)
+    if graph_file:
+        scripts[graph_file] = generate_build_graph(config, project_dir, list(scripts))
+    return scripts
+
+
+# 版本相关参数 -> 对应的配置项，用于提示用户调整哪个选项
+FLAG_CONFIG_KEYS = {
+    "--mode": "mode / standalone / onefile",
+    "--output-folder-name": "mode / standalone",
+    "--python-flag": "python_flag",
+    "--windows-console-mode": "show_console",
+    "--contents-directory": "contents_directory",
+    "--report": "compilation_report",
+    "--lto": "lto",
+    "--optimize": "python_flag",
+}
+# 注册表中带参数模板的选项
+FLAG_CONFIG_KEYS.update(
+    {
+        option["flag"].split("=", 1)[0]: option["key"]
+        for option in BUILD_OPTIONS
+        if option["flag"]
+    }
+)
+
+
+# 各平台上编译器选项对应的 Nuitka 参数（与 _generate_nuitka_command 中的平台分支一致）
+COMPILER_FLAGS = {
+    "Windows": {"clang": "--clang", "mingw64": "--mingw64", "clang-cl": "--clang-cl"},
+    "Linux": {"clang": "--clang"},
+}
+
+
+def _emitted_flags(config: Dict[str, Any]) -> Dict[str, set]:
+    """收集主配置、矩阵目标和对比变体的构建命令中使用的参数，返回 {构建工具: 参数集合}"""
+    configs = [config]
+    configs.extend(resolve_build_targets(config) if config.get("targets") else [])
+    configs.extend(
+        resolve_build_targets(config, "compare") if config.get("compare") else []
+    )
+    flags: Dict[str, set] = {}
+    for index, item in enumerate(configs):
+        tool = item.get("build_tool", "nuitka")
+        if tool == "nuitka":
+            lines = _generate_nuitka_command(item)
+            # 编译器分支在运行时按平台选择，只检查当前平台实际使用的参数
+            if "    # 根据平台选择编译器" in lines:
+                start = lines.index("    # 根据平台选择编译器")
+                end = lines.index("    # 添加入口文件", start)
+                lines = lines[:start] + lines[end:]
+            compiler_flag = COMPILER_FLAGS.get(platform.system(), {}).get(
+                item.get("compiler", "")
+            )
+            if compiler_flag:
+                lines.append(repr(compiler_flag))
+        elif index == 0:
+            lines = _generate_pyinstaller_command(item)
         else:
-            return False, f"不支持的构建工具: {build_tool}"
+            # 矩阵目标始终使用命令行参数，不使用 .spec
+            lines = _generate_pyinstaller_command({**item, "use_spec_file": False})
+        flags.setdefault(tool, set()).update(parse_flags("\n".join(lines)))
+    return flags
 
-        # 保存脚本
-        script_path = project_dir / script_name
-        script_path.write_text(script_content, encoding="utf-8")
 
-        # 设置可执行权限（Unix系统）
-        import platform
+def check_tool_flags(config: Dict[str, Any], project_dir: Path) -> tuple[bool, str]:
+    """
+    检查生成的构建命令中的参数是否被已安装的打包工具支持
+    工具的参数列表按解释器和版本缓存；工具未安装时跳过检查
+    返回 (是否通过, 错误信息)
+    """
+    if not config.get("tool_probe", True):
+        return True, ""
+    errors = []
+    for tool, flags in _emitted_flags(config).items():
+        capabilities = load_capabilities(project_dir, tool)
+        if capabilities is None:
+            continue
+        missing = unsupported_flags(tool, flags, capabilities)
+        if not missing:
+            continue
+        keys = sorted({FLAG_CONFIG_KEYS[f] for f in missing if f in FLAG_CONFIG_KEYS})
+        message = (
+            f"{capabilities['name']} {capabilities['version']} "
+            f"({capabilities['python']}) 不支持参数: {', '.join(missing)}"
+        )
+        if keys:
+            message += (
+                f"\n请升级 {capabilities['name']}，或调整相关选项: {', '.join(keys)}"
+            )
+        else:
+            message += f"\n请升级 {capabilities['name']}"
+        errors.append(message)
+    if errors:
+        return False, "\n".join(
+            errors
+        ) + "\n（可在 build_config.yaml 中设置 tool_probe: false 跳过检查）"
+    return True, ""
 
-        if platform.system() != "Windows":
-            import stat
 
-            script_path.chmod(script_path.stat().st_mode | stat.S_IEXEC)
+def generate_build_script(
+    config: Dict[str, Any], project_dir: Path, dry_run: bool = False
+) -> tuple[bool, str]:
+    """
+    生成构建脚本，内容未变化的脚本不重新写入
+    dry_run 为 True 时不写入文件，消息中附带 unified diff
+    返回 (是否成功, 消息)
+    """
+    build_tool = config.get("build_tool", "nuitka")
+    if build_tool not in ("nuitka", "pyinstaller"):
+        return False, f"不支持的构建工具: {build_tool}"
 
-        return True, f"脚本已生成: {script_name}"
+    try:
+        # 先检查打包工具是否支持将要使用的参数，避免长时间构建后才失败
+        supported, error = check_tool_flags(config, project_dir)
+        if not supported:
+            return False, error
+        scripts = render_build_scripts(config, project_dir)
+        results = write_scripts(scripts, project_dir, executable=True, dry_run=dry_run)
+        return True, describe_writes(results, dry_run)
 
     except Exception as e:
         return False, f"生成脚本失败: {e}"
@@ -0,0 +1,1203 @@
+"""
+构建脚本代码片段模块
+存放按需嵌入到生成脚本中的辅助函数（仅依赖标准库）
+"""
+
+import ast
+import re
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+_DEF_NAME = re.compile(r"(?:async\s+)?(?:def|class)\s+")
+
+
+class _References(ast.NodeVisitor):
+    """收集代码中引用的名称（跳过类型注解，嵌入时注解会被删除）"""
+
+    def __init__(self) -> None:
+        self.names: Set[str] = set()
+
+    def visit_Name(self, node: ast.Name) -> None:
+        self.names.add(node.id)
+
+    def visit_arg(self, node: ast.arg) -> None:
+        pass
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        self.visit(node.args)
+        for statement in node.body:
+            self.visit(statement)
+
+    def visit_AnnAssign(self, node: ast.AnnAssign) -> None:
+        self.visit(node.target)
+        if node.value is not None:
+            self.visit(node.value)
+
+
+def _defined_name(node: ast.stmt) -> str:
+    """顶层语句定义的名称，不是函数、类或单名赋值时返回空字符串"""
+    if isinstance(node, (ast.FunctionDef, ast.ClassDef)):
+        return node.name
+    if isinstance(node, ast.Assign) and len(node.targets) == 1:
+        target = node.targets[0]
+    elif isinstance(node, ast.AnnAssign) and node.value is not None:
+        target = node.target
+    else:
+        return ""
+    return target.id if isinstance(target, ast.Name) else ""
+
+
+def _embedded_name(name: str, prefix: str) -> str:
+    """嵌入后的内部名称：_helper -> _<prefix>_helper，CONST -> <PREFIX>_CONST"""
+    if name.startswith("_"):
+        return f"_{prefix}{name}"
+    if name.isupper():
+        return f"{prefix.upper()}_{name}"
+    return f"_{prefix}_{name}"
+
+
+def _annotation_edits(
+    function: ast.FunctionDef, source: str, offset
+) -> List[Tuple[int, int, str]]:
+    """删除函数参数和返回值的类型注解（有默认值的参数改为 name=default）"""
+    edits = []
+    args = function.args
+    positional = args.posonlyargs + args.args
+    defaults = [None] * (len(positional) - len(args.defaults)) + args.defaults
+    pairs = list(zip(positional, defaults)) + list(
+        zip(args.kwonlyargs, args.kw_defaults)
+    )
+    pairs += [(arg, None) for arg in (args.vararg, args.kwarg) if arg]
+    for arg, default in pairs:
+        if arg.annotation is None:
+            continue
+        start = offset(arg.lineno, arg.col_offset) + len(arg.arg)
+        if default is None:
+            end = offset(arg.annotation.end_lineno, arg.annotation.end_col_offset)
+            edits.append((start, end, ""))
+        else:
+            edits.append((start, offset(default.lineno, default.col_offset), "="))
+    if function.returns is not None:
+        arrow = source.rindex(
+            "->", 0, offset(function.returns.lineno, function.returns.col_offset)
+        )
+        start = len(source[:arrow].rstrip())
+        end = offset(function.returns.end_lineno, function.returns.end_col_offset)
+        edits.append((start, end, ""))
+    return edits
+
+
+def embed_functions(
+    module_file: str, names: List[str], prefix: str
+) -> Tuple[str, List[str]]:
+    """
+    从 src/utils 下的模块中提取生成脚本需要的顶层函数和常量，供生成脚本嵌入
+
+    只输出 names 及其依赖的定义（不含模块文档和导入语句），并删除类型注解；
+    names 以外的内部名称加上 prefix 前缀，避免与生成脚本中的其他函数重名。
+
+    Returns:
+        (代码, 代码用到的标准库模块列表)
+    """
+    source = (Path(__file__).parent / module_file).read_text(encoding="utf-8")
+    tree = ast.parse(source)
+    lines = source.splitlines(keepends=True)
+    line_starts = [0]
+    for line in lines:
+        line_starts.append(line_starts[-1] + len(line))
+
+    def offset(lineno: int, col: int) -> int:
+        """ast 位置（行号, UTF-8 字节列）转换为字符偏移"""
+        line = lines[lineno - 1]
+        return line_starts[lineno - 1] + len(line.encode("utf-8")[:col].decode("utf-8"))
+
+    definitions: Dict[str, ast.stmt] = {}
+    imports: Dict[str, str] = {}
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                imports[alias.asname or alias.name] = alias.name
+        elif _defined_name(node):
+            definitions[_defined_name(node)] = node
+
+    # 从入口名称出发收集依赖的定义和导入
+    included: Set[str] = set()
+    modules: Set[str] = set()
+    pending = list(names)
+    while pending:
+        name = pending.pop()
+        if name in included:
+            continue
+        included.add(name)
+        visitor = _References()
+        visitor.visit(definitions[name])
+        for ref in visitor.names:
+            if ref in definitions and ref not in included:
+                pending.append(ref)
+            elif ref in imports:
+                modules.add(imports[ref])
+
+    rename = {
+        name: _embedded_name(name, prefix) for name in included if name not in names
+    }
+    blocks = []
+    for node in tree.body:
+        name = _defined_name(node)
+        if name not in included:
+            continue
+        # 连同紧邻的注释行一起提取
+        first = node.lineno
+        while first > 1 and lines[first - 2].lstrip().startswith("#"):
+            first -= 1
+        start = line_starts[first - 1]
+        end = offset(node.end_lineno, node.end_col_offset)
+
+        edits: List[Tuple[int, int, str]] = []
+        for child in ast.walk(node):
+            if isinstance(child, ast.Name) and child.id in rename:
+                position = offset(child.lineno, child.col_offset)
+                edits.append((position, position + len(child.id), rename[child.id]))
+            elif isinstance(child, (ast.FunctionDef, ast.ClassDef)):
+                if child.name in rename:
+                    match = _DEF_NAME.match(
+                        source, offset(child.lineno, child.col_offset)
+                    )
+                    edits.append(
+                        (match.end(), match.end() + len(child.name), rename[child.name])
+                    )
+                if isinstance(child, ast.FunctionDef):
+                    edits.extend(_annotation_edits(child, source, offset))
+            elif isinstance(child, ast.AnnAssign):
+                target_end = offset(
+                    child.target.end_lineno, child.target.end_col_offset
+                )
+                annotation_end = offset(
+                    child.annotation.end_lineno, child.annotation.end_col_offset
+                )
+                edits.append((target_end, annotation_end, ""))
+
+        text = source[start:end]
+        for edit_start, edit_end, replacement in sorted(edits, reverse=True):
+            text = text[: edit_start - start] + replacement + text[edit_end - start :]
+        blocks.append((isinstance(node, (ast.FunctionDef, ast.ClassDef)), text))
+
+    code = ""
+    previous_def = None
+    for is_def, text in blocks:
+        if previous_def is not None:
+            code += "\n\n\n" if is_def or previous_def else "\n"
+        code += text
+        previous_def = is_def
+    return code + "\n", sorted(modules)
+
+
+# 内容寻址构建缓存（依赖 hashlib、json）
+BUILD_CACHE_CODE = """# 构建缓存：参与缓存键计算时跳过的目录
+CACHE_SKIP_DIRS = {
+    '.git', '.hg', '.svn', '__pycache__', '.venv', 'venv', 'env',
+    '.tox', '.nox', '.mypy_cache', '.pytest_cache', 'node_modules',
+    'build', 'dist', '.pybuilder',
+}
+CACHE_KEEP_ENTRIES = 5
+
+
+def _hash_file(path, digest):
+    \"\"\"将文件路径和内容写入摘要\"\"\"
+    digest.update(path.replace(os.sep, '/').encode('utf-8'))
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+
+
+def _iter_cache_sources():
+    \"\"\"遍历项目内所有 Python 源文件\"\"\"
+    skip = CACHE_SKIP_DIRS | {os.path.normpath(OUTPUT_DIR).split(os.sep)[0]}
+    for root, dirs, files in os.walk('.'):
+        dirs[:] = sorted(
+            d for d in dirs
+            if d not in skip and not d.endswith(('.build', '.dist', '.onefile-build'))
+        )
+        for name in sorted(files):
+            if name.endswith(('.py', '.pyw', '.pyx', '.pxd')):
+                yield os.path.normpath(os.path.join(root, name))
+
+
+def _iter_cache_inputs():
+    \"\"\"遍历数据文件、数据目录等额外输入\"\"\"
+    for path in CACHE_INPUTS:
+        if os.path.isfile(path):
+            yield os.path.normpath(path)
+        elif os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    yield os.path.normpath(os.path.join(root, name))
+
+
+def compute_cache_key(cmd):
+    \"\"\"根据源码、数据文件、构建命令和工具版本计算缓存键\"\"\"
+    digest = hashlib.sha256()
+    # 编译线程数不影响输出，auto-mem 还会随可用内存变化，不计入缓存键
+    hashed = [arg for arg in cmd if not arg.startswith('--jobs=')]
+    digest.update(json.dumps(hashed).encode('utf-8'))
+    digest.update(sys.version.encode('utf-8'))
+    digest.update(platform.platform().encode('utf-8'))
+    try:
+        from importlib.metadata import version
+        digest.update(version(TOOL_DISTRIBUTION).encode('utf-8'))
+    except Exception:
+        digest.update(b'unknown-tool-version')
+    for path in sorted(set(_iter_cache_sources()) | set(_iter_cache_inputs())):
+        _hash_file(path, digest)
+    return digest.hexdigest()
+
+
+def _clear_output_dir():
+    \"\"\"清空 OUTPUT_DIR，避免上次构建的旧文件残留；输出目录是项目目录本身或其上级时不清理\"\"\"
+    output = os.path.abspath(OUTPUT_DIR)
+    if os.path.commonpath([output, os.getcwd()]) == output:
+        return
+    if os.path.isdir(output):
+        shutil.rmtree(output)
+
+
+def restore_build_cache(key):
+    \"\"\"缓存命中时将输出恢复到 OUTPUT_DIR，返回是否命中\"\"\"
+    entry = os.path.join(BUILD_CACHE_DIR, key)
+    if not os.path.exists(os.path.join(entry, '.complete')):
+        return False
+    _clear_output_dir()
+    shutil.copytree(os.path.join(entry, 'output'), OUTPUT_DIR, symlinks=True, dirs_exist_ok=True)
+    # 刷新时间戳，便于按最近使用清理
+    os.utime(entry)
+    return True
+
+
+def save_build_cache(key):
+    \"\"\"构建成功后将 OUTPUT_DIR 保存到缓存目录\"\"\"
+    entry = os.path.join(BUILD_CACHE_DIR, key)
+    staging = entry + '.tmp'
+    shutil.rmtree(staging, ignore_errors=True)
+    shutil.copytree(
+        OUTPUT_DIR,
+        os.path.join(staging, 'output'),
+        symlinks=True,
+        ignore=shutil.ignore_patterns(*CACHE_IGNORE),
+    )
+    open(os.path.join(staging, '.complete'), 'w').close()
+    shutil.rmtree(entry, ignore_errors=True)
+    os.replace(staging, entry)
+
+    # 只保留最近使用的缓存条目
+    entries = [
+        os.path.join(BUILD_CACHE_DIR, name)
+        for name in os.listdir(BUILD_CACHE_DIR)
+        if not name.endswith('.tmp')
+    ]
+    entries.sort(key=os.path.getmtime, reverse=True)
+    for stale in entries[CACHE_KEEP_ENTRIES:]:
+        shutil.rmtree(stale, ignore_errors=True)
+"""
+
+# 编译器缓存 ccache/sccache（依赖 json、re）
+COMPILER_CACHE_CODE = """def setup_compiler_cache(compiler, is_windows):
+    \"\"\"检测 ccache/sccache 并设置 Nuitka 使用的环境变量，返回 (工具名, 路径) 或 None\"\"\"
+    cache_dir = os.path.abspath(COMPILER_CACHE_DIR) if COMPILER_CACHE_DIR else ''
+    if is_windows and compiler in ('', 'msvc'):
+        # MSVC 使用 Nuitka 内置的 clcache，只需指定缓存目录
+        if cache_dir:
+            os.environ['NUITKA_CACHE_DIR_CLCACHE'] = os.path.join(cache_dir, 'clcache')
+        print(f'{Color.GRAY}Compiler cache: built-in clcache (MSVC){Color.RESET}')
+        return None
+
+    for tool in ('ccache', 'sccache'):
+        path = shutil.which(tool)
+        if path:
+            break
+    else:
+        print(f'{Color.YELLOW}Compiler cache: ccache/sccache not found, compiling without cache{Color.RESET}')
+        return None
+
+    os.environ['NUITKA_CCACHE_BINARY'] = path
+    if cache_dir:
+        os.environ['NUITKA_CACHE_DIR_CCACHE'] = cache_dir
+        os.environ['CCACHE_DIR'] = cache_dir
+        os.environ['SCCACHE_DIR'] = cache_dir
+    # 清零统计，构建结束后的数据只反映本次构建
+    zero_args = ['-z'] if tool == 'ccache' else ['--zero-stats']
+    subprocess.run([path] + zero_args, capture_output=True, check=False)
+    print(f'{Color.GRAY}Compiler cache: {tool} ({path}){Color.RESET}')
+    return tool, path
+
+
+def _parse_cache_stats(output):
+    \"\"\"解析 ccache/sccache 统计输出，返回 (命中数, 未命中数)\"\"\"
+    # ccache 4.x
+    hits = re.search(r'^\\s*Hits:\\s+(\\d+)', output, re.M)
+    misses = re.search(r'^\\s*Misses:\\s+(\\d+)', output, re.M)
+    if hits and misses:
+        return int(hits.group(1)), int(misses.group(1))
+    # sccache
+    hits = re.search(r'^Cache hits\\s+(\\d+)', output, re.M)
+    misses = re.search(r'^Cache misses\\s+(\\d+)', output, re.M)
+    if hits and misses:
+        return int(hits.group(1)), int(misses.group(1))
+    # ccache 3.x
+    hit_count = sum(int(n) for n in re.findall(r'^cache hit \\([^)]*\\)\\s+(\\d+)', output, re.M))
+    miss_count = sum(int(n) for n in re.findall(r'^cache miss\\s+(\\d+)', output, re.M))
+    return hit_count, miss_count
+
+
+def report_compiler_cache(cache_tool, phases):
+    \"\"\"输出本次构建的缓存命中率和节省时间估算（phases 为 run_build 返回的阶段耗时）\"\"\"
+    tool, path = cache_tool
+    stats_args = ['-s'] if tool == 'ccache' else ['--show-stats']
+    result = subprocess.run([path] + stats_args, capture_output=True, text=True, check=False)
+    hits, misses = _parse_cache_stats(result.stdout)
+    total = hits + misses
+    if total == 0:
+        print(f'{Color.GRAY}Compiler cache: no cacheable compilations{Color.RESET}')
+        return
+
+    # 冷构建（全部未命中）按 C 编译阶段的耗时记录单个编译单元的平均耗时，作为估算基准；
+    # 不使用整个构建的耗时，链接和 Python 层面的阶段与缓存无关
+    compile_seconds = sum(seconds for name, seconds in phases or [] if name == 'backend C compile')
+    stats_file = os.path.join(COMPILER_CACHE_STATS_DIR, 'compiler_cache.json')
+    try:
+        with open(stats_file, 'r', encoding='utf-8') as f:
+            stats = json.load(f)
+    except (OSError, ValueError):
+        stats = {}
+    if hits == 0 and compile_seconds > 0:
+        stats['seconds_per_compile'] = compile_seconds / misses
+        os.makedirs(COMPILER_CACHE_STATS_DIR, exist_ok=True)
+        with open(stats_file, 'w', encoding='utf-8') as f:
+            json.dump(stats, f)
+
+    ratio = hits * 100.0 / total
+    print(f'{Color.CYAN}Compiler cache ({tool}): {hits} hits / {misses} misses ({ratio:.1f}% hit rate){Color.RESET}')
+    per_object = stats.get('seconds_per_compile')
+    if per_object and hits:
+        print(f'{Color.CYAN}Compiler cache saved: ~{hits * per_object:.0f}s (baseline {per_object:.2f}s/object in C compile){Color.RESET}')
+    elif hits:
+        print(f'{Color.GRAY}Compiler cache saved: unknown (no cold build baseline yet){Color.RESET}')
+"""
+
+# 可用物理内存检测（Linux 读取 /proc/meminfo，Windows 调用 GlobalMemoryStatusEx）
+MEMORY_INFO_CODE = """def available_memory_mb():
+    \"\"\"返回可用物理内存（MB），无法获取时返回 None\"\"\"
+    try:
+        with open('/proc/meminfo', 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) // 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    if platform.system() == 'Windows':
+        try:
+            import ctypes
+
+            class MemoryStatus(ctypes.Structure):
+                _fields_ = [
+                    ('dwLength', ctypes.c_ulong),
+                    ('dwMemoryLoad', ctypes.c_ulong),
+                    ('ullTotalPhys', ctypes.c_ulonglong),
+                    ('ullAvailPhys', ctypes.c_ulonglong),
+                    ('ullTotalPageFile', ctypes.c_ulonglong),
+                    ('ullAvailPageFile', ctypes.c_ulonglong),
+                    ('ullTotalVirtual', ctypes.c_ulonglong),
+                    ('ullAvailVirtual', ctypes.c_ulonglong),
+                    ('ullAvailExtendedVirtual', ctypes.c_ulonglong),
+                ]
+
+            status = MemoryStatus()
+            status.dwLength = ctypes.sizeof(MemoryStatus)
+            if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+                return status.ullAvailPhys // (1024 * 1024)
+        except Exception:
+            pass
+    return None
+"""
+
+# 多目标并行构建执行器（依赖 concurrent.futures）
+MATRIX_RUNNER_CODE = """def run_target(target):
+    \"\"\"在工作进程中构建单个目标，输出写入独立日志，返回 (退出码, 耗时, 日志路径)\"\"\"
+    cmd = target['command'](target.get('memory_budget_mb'))
+    # 多个 Nuitka 目标并行时平分 CPU，避免每个目标都占满所有核心
+    if target['tool'] == 'nuitka' and not any(arg.startswith('--jobs=') for arg in cmd):
+        cmd.insert(-1, f"--jobs={target['jobs']}")
+    os.makedirs(MATRIX_LOG_DIR, exist_ok=True)
+    log_path = os.path.join(MATRIX_LOG_DIR, f"{target['name']}.log")
+    start = time.time()
+    with open(log_path, 'w', encoding='utf-8', errors='replace') as log:
+        log.write(' '.join(cmd) + '\\n\\n')
+        log.flush()
+        result = subprocess.run(cmd, stdout=log, stderr=subprocess.STDOUT, check=False)
+    return result.returncode, time.time() - start, log_path
+
+
+def matrix_workers(targets):
+    \"\"\"根据 CPU 核数和可用内存计算并发数，返回 (并发数, 原因)\"\"\"
+    if MATRIX_WORKERS > 0:
+        workers = min(MATRIX_WORKERS, len(targets))
+        return workers, f'matrix_workers = {MATRIX_WORKERS}'
+    cpus = os.cpu_count() or 1
+    by_cpu = max(1, cpus // MATRIX_MIN_CORES_PER_TARGET)
+    per_target = max(t['memory_mb'] for t in targets)
+    available = available_memory_mb()
+    by_memory = max(1, available // per_target) if available else len(targets)
+    workers = max(1, min(len(targets), by_cpu, by_memory))
+    memory_text = f'{available} MB available' if available else 'memory unknown'
+    reason = (
+        f'{cpus} cores / {MATRIX_MIN_CORES_PER_TARGET} per target = {by_cpu}, '
+        f'{memory_text} / {per_target} MB per target = {by_memory}'
+    )
+    return workers, reason
+
+
+def _format_duration(seconds):
+    \"\"\"格式化耗时\"\"\"
+    minutes, seconds = divmod(int(seconds), 60)
+    return f'{minutes}m {seconds}s' if minutes else f'{seconds}s'
+
+
+def build_targets(targets):
+    \"\"\"使用进程池并行构建目标，返回 ({名称: (退出码, 耗时, 日志路径)}, 总耗时)\"\"\"
+    workers, reason = matrix_workers(targets)
+    jobs = max(1, (os.cpu_count() or 1) // workers)
+    # auto-mem 目标按并发数平分可用内存，避免每个目标都按整机内存计算线程数
+    available = available_memory_mb()
+    memory_budget_mb = available // workers if available else None
+    print(f'{Color.CYAN}{Color.BOLD}Building {len(targets)} targets of {PROJECT_NAME} v{VERSION}{Color.RESET}')
+    print(f'{Color.GRAY}Workers: {workers} ({reason}), C jobs per Nuitka target: {jobs}{Color.RESET}')
+    print('-' * shutil.get_terminal_size().columns)
+
+    start_time = time.time()
+    results = {}
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(run_target, dict(target, jobs=jobs, memory_budget_mb=memory_budget_mb)): target
+            for target in targets
+        }
+        for future in concurrent.futures.as_completed(futures):
+            target = futures[future]
+            try:
+                returncode, duration, log_path = future.result()
+            except Exception as e:
+                returncode, duration, log_path = -1, 0.0, str(e)
+            results[target['name']] = (returncode, duration, log_path)
+            if returncode == 0:
+                print(f"{Color.GREEN}[done]{Color.RESET} {target['name']} ({_format_duration(duration)})")
+            else:
+                print(f"{Color.RED}[fail]{Color.RESET} {target['name']} ({_format_duration(duration)}), log: {log_path}")
+    return results, time.time() - start_time
+
+
+def build_matrix(targets):
+    \"\"\"并行构建所有目标并输出汇总表\"\"\"
+    separator = '-' * shutil.get_terminal_size().columns
+    results, wall_time = build_targets(targets)
+
+    # 汇总表
+    print(separator)
+    name_width = max(len('Target'), max(len(t['name']) for t in targets))
+    print(f"{'Target':<{name_width}}  {'Tool':<12} {'Mode':<12} {'Status':<7} {'Time':>8}")
+    for target in targets:
+        returncode, duration, _ = results[target['name']]
+        status = f'{Color.GREEN}ok     {Color.RESET}' if returncode == 0 else f'{Color.RED}failed {Color.RESET}'
+        print(
+            f"{target['name']:<{name_width}}  {target['tool']:<12} {target['mode']:<12} "
+            f"{status} {_format_duration(duration):>8}"
+        )
+    total = sum(duration for _, duration, _ in results.values())
+    print(separator)
+    print(f'{Color.CYAN}Wall time: {_format_duration(wall_time)}, sum of target times: {_format_duration(total)}{Color.RESET}')
+    failed = [name for name, (returncode, _, _) in results.items() if returncode != 0]
+    if failed:
+        print(f"{Color.RED}{Color.BOLD}Failed targets: {', '.join(failed)}{Color.RESET}")
+        return 1
+    print(f'{Color.GREEN}{Color.BOLD}All targets built successfully!{Color.RESET}')
+    return 0
+"""
+
+# 多目标矩阵构建命令行入口（依赖 MATRIX_RUNNER_CODE、argparse）
+MATRIX_MAIN_CODE = """def main():
+    \"\"\"命令行入口\"\"\"
+    parser = argparse.ArgumentParser(description=f'{PROJECT_NAME} 多目标构建')
+    parser.add_argument('-t', '--target', action='append', help='只构建指定目标（可重复）')
+    parser.add_argument('-l', '--list', action='store_true', help='列出所有目标')
+    args = parser.parse_args()
+
+    if args.list:
+        for target in TARGETS:
+            print(f"{target['name']}: {target['tool']} {target['mode']} -> {target['output_dir']}")
+        return 0
+
+    selected = TARGETS
+    if args.target:
+        unknown = set(args.target) - {t['name'] for t in TARGETS}
+        if unknown:
+            print(f"{Color.RED}Unknown targets: {', '.join(sorted(unknown))}{Color.RESET}")
+            return 2
+        selected = [t for t in TARGETS if t['name'] in args.target]
+    return build_matrix(selected)
+"""
+
+# 流式构建输出与阶段耗时统计（依赖 json、re，需要 PHASE_MARKERS 常量）
+BUILD_STREAM_CODE = """PHASE_REPORT_FILE = os.path.join('.pybuilder', 'build_phases.json')
+
+
+def _format_seconds(seconds):
+    \"\"\"格式化耗时\"\"\"
+    minutes, seconds = divmod(seconds, 60)
+    return f'{int(minutes)}m {seconds:.1f}s' if minutes >= 1 else f'{seconds:.1f}s'
+
+
+def report_phases(phases, total, returncode):
+    \"\"\"输出各阶段耗时并保存为 JSON\"\"\"
+    print(f'{Color.CYAN}Phase breakdown:{Color.RESET}')
+    name_width = max(len(name) for name, _ in phases)
+    for name, seconds in phases:
+        percent = seconds * 100.0 / total if total else 0.0
+        bar = '#' * int(percent / 5)
+        print(f'  {name:<{name_width}}  {_format_seconds(seconds):>9}  {percent:5.1f}%  {bar}')
+
+    report = {
+        'project': PROJECT_NAME,
+        'version': VERSION,
+        'tool': TOOL_NAME,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'returncode': returncode,
+        'total_seconds': round(total, 3),
+        'phases': [
+            {
+                'name': name,
+                'seconds': round(seconds, 3),
+                'percent': round(seconds * 100.0 / total, 1) if total else 0.0,
+            }
+            for name, seconds in phases
+        ],
+    }
+    try:
+        os.makedirs(os.path.dirname(PHASE_REPORT_FILE), exist_ok=True)
+        with open(PHASE_REPORT_FILE, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f'{Color.GRAY}Phase report: {os.path.abspath(PHASE_REPORT_FILE)}{Color.RESET}')
+    except OSError as e:
+        print(f'{Color.YELLOW}Phase report not saved: {e}{Color.RESET}')
+
+
+def run_build(cmd, env=None):
+    \"\"\"流式执行构建命令，实时转发输出并按阶段标记统计耗时，失败时抛出 CalledProcessError\"\"\"
+    markers = [(re.compile(pattern), name) for pattern, name in PHASE_MARKERS]
+    start = time.time()
+    # 阶段只向前推进，避免后续相同输出（如 onefile 引导程序编译）回退阶段
+    current = {'index': -1, 'name': 'startup', 'start': start}
+    phases = []
+
+    def match_line(line):
+        for index, (pattern, name) in enumerate(markers):
+            if index > current['index'] and pattern.search(line):
+                now = time.time()
+                if name != current['name']:
+                    phases.append((current['name'], now - current['start']))
+                    current.update(name=name, start=now)
+                current['index'] = index
+                return
+
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, env=env)
+    output = getattr(sys.stdout, 'buffer', None)
+    pending = b''
+    # 按块读取并原样转发，保留工具自身的进度条（\\r 刷新）
+    for chunk in iter(lambda: process.stdout.read1(65536), b''):
+        if output is not None:
+            output.write(chunk)
+            output.flush()
+        else:
+            print(chunk.decode('utf-8', errors='replace'), end='', flush=True)
+        pending += chunk
+        *lines, pending = re.split(rb'[\\r\\n]', pending)
+        for line in lines:
+            if line:
+                match_line(line.decode('utf-8', errors='replace'))
+    if pending:
+        match_line(pending.decode('utf-8', errors='replace'))
+    returncode = process.wait()
+
+    end = time.time()
+    phases.append((current['name'], end - current['start']))
+    report_phases(phases, end - start, returncode)
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, cmd)
+    return phases
+"""
+
+# 按可用内存自动决定 Nuitka 编译线程数（依赖 MEMORY_INFO_CODE）
+AUTO_JOBS_CODE = """AUTO_JOBS_SKIP_DIRS = {
+    '.git', '.hg', '.svn', '__pycache__', '.venv', 'venv', 'env',
+    '.tox', '.nox', 'node_modules', 'build', 'dist', '.pybuilder',
+}
+# 单个 C 编译任务的内存估算参数（MB）
+AUTO_JOBS_BASE_MB = 600
+AUTO_JOBS_MB_PER_MODULE = 0.5
+AUTO_JOBS_RESERVE_MB = 1024
+AUTO_JOBS_LTO_FACTOR = {'yes': 2.5, 'auto': 1.5}
+
+
+def count_project_modules():
+    \"\"\"统计项目内的 Python 模块数量\"\"\"
+    count = 0
+    for root, dirs, files in os.walk('.'):
+        dirs[:] = [
+            d for d in dirs
+            if d not in AUTO_JOBS_SKIP_DIRS and not d.endswith(('.build', '.dist', '.onefile-build'))
+        ]
+        count += sum(1 for name in files if name.endswith('.py'))
+    return count
+
+
+def auto_mem_jobs(lto, memory_budget_mb=None):
+    \"\"\"根据可用内存、CPU 核数、模块数量和 LTO 设置计算安全的并行编译数
+
+    memory_budget_mb 为多目标并行构建时分给本目标的内存（MB），为 None 时使用全部可用内存
+    \"\"\"
+    cpus = os.cpu_count() or 1
+    modules = count_project_modules()
+    factor = AUTO_JOBS_LTO_FACTOR.get(lto, 1.0)
+    per_job = int((AUTO_JOBS_BASE_MB + modules * AUTO_JOBS_MB_PER_MODULE) * factor)
+    available = available_memory_mb() if memory_budget_mb is None else memory_budget_mb
+    if available is None:
+        print(f'{Color.YELLOW}Jobs: {cpus} (auto-mem: available memory unknown, using CPU count){Color.RESET}')
+        return cpus
+
+    # Nuitka 主进程本身也随模块数增长占用内存
+    reserve = AUTO_JOBS_RESERVE_MB + modules * 2
+    by_memory = max(1, (available - reserve) // per_job)
+    jobs = max(1, min(cpus, by_memory))
+    limit = 'memory' if by_memory < cpus else 'CPU count'
+    print(
+        f'{Color.CYAN}Jobs: {jobs} (auto-mem, limited by {limit}){Color.RESET}\\n'
+        f'{Color.GRAY}  {available} MB {"budget" if memory_budget_mb is not None else "available"} - {reserve} MB reserved, '
+        f'~{per_job} MB per job ({modules} project modules, LTO={lto}, x{factor}); '
+        f'memory allows {by_memory}, CPU allows {cpus}{Color.RESET}'
+    )
+    return jobs
+"""
+
+# PyInstaller 增量构建（依赖 hashlib、json）
+INCREMENTAL_CODE = """INCREMENTAL_WORK_DIR = os.path.join('.pybuilder', 'pyi-work')
+INCREMENTAL_STATS_FILE = os.path.join('.pybuilder', 'incremental.json')
+
+
+def _dependency_fingerprint():
+    \"\"\"当前环境已安装分发包的名称和版本集合\"\"\"
+    from importlib.metadata import distributions
+
+    packages = sorted(
+        f"{(dist.metadata['Name'] or '').lower()}=={dist.version}"
+        for dist in distributions()
+    )
+    return '\\n'.join(packages)
+
+
+def prepare_incremental_workpath(cmd):
+    \"\"\"根据构建命令和依赖集确定固定的工作目录，返回 (工作目录, 缓存键, 是否为热构建)\"\"\"
+    digest = hashlib.sha256()
+    # 编译线程数不影响输出，auto-mem 还会随可用内存变化，不计入缓存键
+    hashed = [arg for arg in cmd if not arg.startswith('--jobs=')]
+    digest.update(json.dumps(hashed).encode('utf-8'))
+    digest.update(sys.version.encode('utf-8'))
+    digest.update(_dependency_fingerprint().encode('utf-8'))
+    key = digest.hexdigest()[:16]
+    workpath = os.path.join(INCREMENTAL_WORK_DIR, f'{PROJECT_NAME}-{key}')
+
+    # 命令或依赖变化后旧的工作目录不再可用，直接清理
+    if os.path.isdir(INCREMENTAL_WORK_DIR):
+        for name in os.listdir(INCREMENTAL_WORK_DIR):
+            path = os.path.join(INCREMENTAL_WORK_DIR, name)
+            if name.startswith(f'{PROJECT_NAME}-') and path != workpath:
+                shutil.rmtree(path, ignore_errors=True)
+                print(f'{Color.GRAY}Invalidated work dir: {path}{Color.RESET}')
+
+    warm = os.path.exists(os.path.join(workpath, '.complete'))
+    state = 'warm' if warm else 'cold'
+    print(f'{Color.GRAY}Incremental build ({state}): {workpath}{Color.RESET}')
+    return workpath, key, warm
+
+
+def record_incremental_build(workpath, key, warm, elapsed_time):
+    \"\"\"记录冷构建耗时，热构建时输出相对上次冷构建节省的时间\"\"\"
+    try:
+        with open(INCREMENTAL_STATS_FILE, 'r', encoding='utf-8') as f:
+            stats = json.load(f)
+    except (OSError, ValueError):
+        stats = {}
+
+    entry = stats.setdefault(PROJECT_NAME, {})
+    if not warm or entry.get('key') != key:
+        entry.update(key=key, cold_seconds=round(elapsed_time, 3))
+        os.makedirs(workpath, exist_ok=True)
+        open(os.path.join(workpath, '.complete'), 'w').close()
+    else:
+        cold = entry.get('cold_seconds', 0.0)
+        saved = cold - elapsed_time
+        percent = saved * 100.0 / cold if cold else 0.0
+        print(f'{Color.CYAN}Warm build saved {saved:.1f}s vs last cold build ({cold:.1f}s, {percent:.0f}%){Color.RESET}')
+    entry['last_seconds'] = round(elapsed_time, 3)
+
+    os.makedirs(os.path.dirname(INCREMENTAL_STATS_FILE), exist_ok=True)
+    with open(INCREMENTAL_STATS_FILE, 'w', encoding='utf-8') as f:
+        json.dump(stats, f, indent=2)
+"""
+
+# Nuitka 编译报告解析与热点模块排名
+COMPILATION_REPORT_CODE = """def _module_category(source_path):
+    \"\"\"根据源码路径判断模块归属：project / third-party / stdlib\"\"\"
+    normalized = source_path.replace('\\\\', '/')
+    if 'site-packages/' in normalized or 'dist-packages/' in normalized:
+        return 'third-party'
+    if normalized.startswith('${cwd}'):
+        return 'project'
+    return 'stdlib'
+
+
+def _print_ranking(title, modules, key, formatter):
+    \"\"\"按分类输出前 N 名\"\"\"
+    print(f'{Color.CYAN}Top {REPORT_TOP_N} modules by {title}:{Color.RESET}')
+    for category in ('project', 'third-party', 'stdlib'):
+        ranked = sorted(
+            (m for m in modules if m['category'] == category and m[key]),
+            key=lambda m: m[key],
+            reverse=True,
+        )[:REPORT_TOP_N]
+        if not ranked:
+            continue
+        print(f'  [{category}]')
+        for module in ranked:
+            print(f"    {formatter(module[key]):>10}  {module['name']}")
+
+
+def analyze_compilation_report(report_file):
+    \"\"\"解析 Nuitka 编译报告，输出编译耗时和代码体积排名\"\"\"
+    import xml.etree.ElementTree as ElementTree
+
+    try:
+        root = ElementTree.parse(report_file).getroot()
+    except (OSError, ElementTree.ParseError) as e:
+        print(f'{Color.YELLOW}Compilation report not available: {e}{Color.RESET}')
+        return
+
+    build_dir = os.path.join(OUTPUT_DIR, os.path.splitext(os.path.basename(ENTRY_FILE))[0] + '.build')
+    modules = []
+    for element in root.iter('module'):
+        name = element.get('name', '')
+        source_path = element.get('source_path', '')
+        # 所有 *-time 子节点（优化各轮次、代码生成）的耗时之和
+        seconds = sum(
+            float(child.get('time', 0) or 0)
+            for child in element.iter()
+            if child.tag.endswith('-time')
+        )
+        c_file = os.path.join(build_dir, f'module.{name}.c')
+        source_file = source_path.replace('${cwd}', os.getcwd())
+        modules.append({
+            'name': name,
+            'category': _module_category(source_path) if source_path else 'stdlib',
+            'seconds': seconds,
+            'code_bytes': os.path.getsize(c_file) if os.path.isfile(c_file) else 0,
+            'source_bytes': os.path.getsize(source_file) if os.path.isfile(source_file) else 0,
+        })
+
+    print(f'{Color.CYAN}{Color.BOLD}Compilation report: {report_file} ({len(modules)} modules){Color.RESET}')
+    _print_ranking('compile time', modules, 'seconds', lambda v: f'{v:.2f}s')
+    if any(m['code_bytes'] for m in modules):
+        _print_ranking('generated C code size', modules, 'code_bytes', lambda v: f'{v / 1024:.1f} KB')
+    else:
+        # --remove-output 会删除 .build 目录，此时改用源码体积
+        print(f'{Color.GRAY}Generated C files not found (remove_output enabled), ranking by source size{Color.RESET}')
+        _print_ranking('source size', modules, 'source_bytes', lambda v: f'{v / 1024:.1f} KB')
+
+    # 按顶层包汇总第三方模块，作为 nofollow_imports / include_packages 的调整依据
+    packages = {}
+    for module in modules:
+        if module['category'] == 'third-party':
+            top = module['name'].split('.')[0]
+            count, seconds = packages.get(top, (0, 0.0))
+            packages[top] = (count + 1, seconds + module['seconds'])
+    heaviest = sorted(packages.items(), key=lambda item: item[1][1], reverse=True)[:REPORT_TOP_N]
+    if heaviest:
+        print(f'{Color.CYAN}Third-party packages by compile time (candidates for nofollow_imports):{Color.RESET}')
+        for top, (count, seconds) in heaviest:
+            print(f'    {seconds:>8.2f}s  {top} ({count} modules)')
+"""
+
+# 产物体积分析：从 dist_analyzer 模块提取报告所需的函数，与 TUI 分析界面共用同一实现
+DIST_ANALYZER_CODE, DIST_ANALYZER_IMPORTS = embed_functions(
+    "dist_analyzer.py",
+    ["format_size", "find_dist_dir", "collect_project_imports", "analyze_dist"],
+    "dist",
+)
+
+# 数据文件收集：从 data_collector 模块提取收集所需的函数，与生成脚本时的依赖计算共用同一实现
+DATA_COLLECTOR_CODE, DATA_COLLECTOR_IMPORTS = embed_functions(
+    "data_collector.py", ["collect_data_files", "format_data_summary"], "data"
+)
+
+# 构建前收集数据文件并输出清单摘要（依赖 DATA_COLLECTOR_CODE）
+DATA_COLLECT_CODE = """def collect_build_data(group, specs, dedupe):
+    \"\"\"收集一组数据文件，输出清单摘要，返回暂存目录条目 [(暂存路径, 目标路径, dir/file)]\"\"\"
+    # 不收集构建输出和 PyInstaller 工作目录中的文件
+    output_root = '/' + os.path.normpath(OUTPUT_DIR).replace(os.sep, '/')
+    result = collect_data_files(group, specs, dedupe, (output_root, '/build'))
+    print(f"{Color.GRAY}Data files ({group}): {format_data_summary(result)}, manifest: {result['manifest']}{Color.RESET}")
+    for src in result['missing']:
+        print(f'{Color.YELLOW}Warning: no data files matched {src}{Color.RESET}')
+    return result['toc']
+"""
+
+# 构建后输出体积分析报告（依赖 DIST_ANALYZER_CODE）
+DIST_SIZE_REPORT_CODE = """def report_dist_size():
+    \"\"\"分析构建输出目录体积，输出包体积、重复文件、共享库排名、排除建议和未直接导入的大体积包\"\"\"
+    dist_dir, package_root = find_dist_dir(OUTPUT_DIR, PROJECT_NAME, ENTRY_FILE, TOOL_NAME, CONTENTS_DIRECTORY)
+    if not dist_dir:
+        print(f'{Color.GRAY}Size analysis skipped: no dist folder found (onefile build){Color.RESET}')
+        return
+
+    report = analyze_dist(dist_dir, package_root, collect_project_imports('.'), SIZE_TOP_N)
+    print(f"{Color.CYAN}{Color.BOLD}Dist size: {format_size(report['total_size'])} in {report['file_count']} files ({dist_dir}){Color.RESET}")
+
+    print(f'{Color.CYAN}Largest packages:{Color.RESET}')
+    for name, size, count in report['packages']:
+        percent = size * 100.0 / report['total_size'] if report['total_size'] else 0.0
+        print(f'    {format_size(size):>10}  {percent:5.1f}%  {name} ({count} files)')
+
+    if report['shared_libs']:
+        print(f'{Color.CYAN}Largest shared libraries:{Color.RESET}')
+        for path, size in report['shared_libs']:
+            print(f'    {format_size(size):>10}  {path}')
+
+    if report['duplicates']:
+        wasted = sum(item['wasted'] for item in report['duplicates'])
+        print(f'{Color.YELLOW}Duplicate files ({format_size(wasted)} wasted):{Color.RESET}')
+        for item in report['duplicates']:
+            print(f"    {format_size(item['size']):>10}  x{len(item['paths'])}  {', '.join(item['paths'])}")
+
+    if report['suggestions']:
+        saved = sum(item['size'] for item in report['suggestions'])
+        print(f'{Color.YELLOW}Suggested {SIZE_SUGGEST_KEY} (up to {format_size(saved)} smaller):{Color.RESET}')
+        for item in report['suggestions']:
+            print(f"    {format_size(item['size']):>10}  {item['module']}  - {item['reason']}")
+        modules = ','.join(item['module'] for item in report['suggestions'])
+        print(f'{Color.GRAY}    {SIZE_SUGGEST_KEY}: {modules}{Color.RESET}')
+
+    if report['indirect']:
+        # 可能被其他依赖导入，仅供参考，不作为排除建议
+        print(f'{Color.GRAY}Large packages not imported by the project (may be required by dependencies, check before excluding):{Color.RESET}')
+        for item in report['indirect']:
+            print(f"{Color.GRAY}    {format_size(item['size']):>10}  {item['module']}{Color.RESET}")
+"""
+
+# 启动耗时基准：从 startup_bench 模块提取基准和对比脚本所需的函数，与 TUI 分析界面共用同一实现
+STARTUP_BENCH_CODE, STARTUP_BENCH_IMPORTS = embed_functions(
+    "startup_bench.py",
+    [
+        "LAUNCH_TIMEOUT",
+        "executable_path",
+        "percentile",
+        "run_benchmark",
+        "benchmark_variants",
+    ],
+    "bench",
+)
+
+# 启动耗时基准命令行入口（依赖 STARTUP_BENCH_CODE、argparse）
+STARTUP_BENCH_MAIN_CODE = """def _format_ms(seconds):
+    \"\"\"格式化耗时为毫秒\"\"\"
+    return f'{seconds * 1000:.0f}ms'
+
+
+def print_result(result):
+    \"\"\"输出单个变体的测试结果\"\"\"
+    label = f"{result['name']} ({result['tool']} {result['mode']})"
+    if result.get('runtime_tmpdir'):
+        label += f" runtime_tmpdir={result['runtime_tmpdir']}"
+    if result.get('missing'):
+        print(f"{Color.YELLOW}{label}: executable not found, build it first ({result['exe']}){Color.RESET}")
+        return
+    cold, warm = result['cold'], result['warm']
+    print(f'{Color.CYAN}{label}{Color.RESET}')
+    print(f"    cold  p50 {_format_ms(cold['p50']):>8}  p95 {_format_ms(cold['p95']):>8}  max {_format_ms(cold['max']):>8}")
+    print(f"    warm  p50 {_format_ms(warm['p50']):>8}  p95 {_format_ms(warm['p95']):>8}  max {_format_ms(warm['max']):>8}")
+    if result['failures']:
+        print(f"{Color.RED}    {result['failures']} launches failed or timed out{Color.RESET}")
+
+
+def print_summary(results):
+    \"\"\"输出所有变体的汇总表\"\"\"
+    measured = [r for r in results if not r.get('missing')]
+    if len(measured) < 2:
+        return
+    width = max(len(r['name']) for r in measured) + 2
+    print(f"{Color.BOLD}{'Variant':<{width}}{'Mode':<12}{'Cold p50':>10}{'Cold p95':>10}{'Warm p50':>10}{'Warm p95':>10}{Color.RESET}")
+    fastest = min(measured, key=lambda r: r['cold']['p50'])
+    for r in measured:
+        marker = f'{Color.GREEN} *{Color.RESET}' if r is fastest else ''
+        print(f"{r['name']:<{width}}{r['mode']:<12}{_format_ms(r['cold']['p50']):>10}{_format_ms(r['cold']['p95']):>10}{_format_ms(r['warm']['p50']):>10}{_format_ms(r['warm']['p95']):>10}{marker}")
+
+
+def main():
+    \"\"\"命令行入口\"\"\"
+    parser = argparse.ArgumentParser(description=f'{PROJECT_NAME} startup benchmark')
+    parser.add_argument('-n', '--runs', type=int, default=BENCH_RUNS, help='每种启动方式的测试次数')
+    parser.add_argument('-t', '--target', action='append', default=[], help='只测试指定变体（可重复）')
+    parser.add_argument('--timeout', type=float, default=LAUNCH_TIMEOUT, help='单次启动超时（秒）')
+    parser.add_argument('--list', action='store_true', help='列出所有变体')
+    parser.add_argument('args', nargs=argparse.REMAINDER, help='传给可执行文件的冒烟参数')
+    options = parser.parse_args()
+
+    if options.list:
+        for variant in VARIANTS:
+            print(f"{variant['name']:<24} {variant['tool']:<12} {variant['mode']}")
+        return 0
+
+    variants = [v for v in VARIANTS if not options.target or v['name'] in options.target]
+    if not variants:
+        print(f'{Color.RED}No matching variants: {", ".join(options.target)}{Color.RESET}')
+        return 1
+    args = options.args or BENCH_ARGS
+    print(f"{Color.CYAN}{Color.BOLD}Startup benchmark: {options.runs} runs each, args: {' '.join(args) or '(none)'}{Color.RESET}")
+    results = benchmark_variants(variants, args, options.runs, options.timeout, print_result)
+    print_summary(results)
+    measured = [r for r in results if not r.get('missing')]
+    return 0 if measured and not any(r['failures'] for r in measured) else 1
+"""
+
+# Nuitka 三阶段 PGO 构建（依赖 BUILD_STREAM_CODE、shlex）
+PGO_CODE = """def _pgo_compiler_family(cmd):
+    \"\"\"根据命令和平台判断 C 编译器类型：gcc / clang / msvc\"\"\"
+    if '--clang' in cmd or platform.system() == 'Darwin':
+        return 'clang'
+    if platform.system() == 'Windows' and '--mingw64' not in cmd:
+        return 'msvc'
+    return 'gcc'
+
+
+def _pgo_env(flags):
+    \"\"\"在现有环境变量基础上追加编译和链接参数（Nuitka 的 Scons 后端会读取 CCFLAGS/LDFLAGS）\"\"\"
+    env = dict(os.environ)
+    for name in ('CCFLAGS', 'LDFLAGS'):
+        env[name] = ' '.join(filter(None, [env.get(name, ''), flags]))
+    return env
+
+
+def _instrumented_command(cmd):
+    \"\"\"插桩构建改用 standalone 模式，省去 onefile 压缩并便于直接运行\"\"\"
+    instrumented = []
+    for arg in cmd:
+        if arg in ('--mode=onefile', '--mode=app'):
+            instrumented.extend(['--mode=standalone', f'--output-folder-name={PROJECT_NAME}.dist'])
+        elif not arg.startswith('--onefile'):
+            instrumented.append(arg)
+    return instrumented
+
+
+def _training_executable(cmd):
+    \"\"\"插桩构建产物的可执行文件路径\"\"\"
+    exe_name = PROJECT_NAME + ('.exe' if platform.system() == 'Windows' else '')
+    if '--mode=accelerated' in cmd:
+        return os.path.abspath(os.path.join(OUTPUT_DIR, exe_name))
+    return os.path.abspath(os.path.join(OUTPUT_DIR, f'{PROJECT_NAME}.dist', exe_name))
+
+
+def _run_training(exe):
+    \"\"\"执行训练命令，{exe} 会替换为插桩程序路径，未配置时直接运行插桩程序\"\"\"
+    if PGO_TRAINING_COMMAND:
+        command = shlex.split(PGO_TRAINING_COMMAND.replace('{exe}', exe), posix=platform.system() != 'Windows')
+    else:
+        command = [exe]
+    print(f"{Color.GRAY}Training command: {' '.join(command)}{Color.RESET}")
+    env = dict(os.environ)
+    env['PGO_EXECUTABLE'] = exe
+    subprocess.run(command, env=env, check=True)
+
+
+def _collect_profile(family, profile_dir):
+    \"\"\"检查训练生成的 profile 数据，clang 需要先合并为 .profdata\"\"\"
+    suffix = '.profraw' if family == 'clang' else '.gcda'
+    files = [
+        os.path.join(root, name)
+        for root, _, names in os.walk(profile_dir)
+        for name in names
+        if name.endswith(suffix)
+    ]
+    if not files:
+        raise RuntimeError(f'No profile data ({suffix}) found in {profile_dir}, did the training run exercise the program?')
+    if family == 'clang':
+        profdata = shutil.which('llvm-profdata')
+        tool = [profdata] if profdata else ['xcrun', 'llvm-profdata']
+        subprocess.run([*tool, 'merge', f'-output={os.path.join(profile_dir, "default.profdata")}', *files], check=True)
+    print(f'{Color.GRAY}Collected {len(files)} profile files in {profile_dir}{Color.RESET}')
+
+
+def run_pgo_build(cmd):
+    \"\"\"三阶段 PGO 构建：插桩构建 -> 训练运行 -> 使用 profile 重新构建\"\"\"
+    family = _pgo_compiler_family(cmd)
+    if family == 'msvc':
+        print(f'{Color.YELLOW}PGO requires gcc or clang (use mingw64 on Windows), building without PGO{Color.RESET}')
+        return run_build(cmd)
+
+    profile_dir = os.path.abspath(PGO_PROFILE_DIR)
+    shutil.rmtree(profile_dir, ignore_errors=True)
+    os.makedirs(profile_dir, exist_ok=True)
+    if family == 'clang':
+        generate_flags = f'-fprofile-generate={profile_dir}'
+        use_flags = f'-fprofile-use={os.path.join(profile_dir, "default.profdata")} -Wno-profile-instr-unprofiled -Wno-profile-instr-out-of-date'
+    else:
+        generate_flags = f'-fprofile-generate={profile_dir}'
+        use_flags = f'-fprofile-use={profile_dir} -fprofile-correction -Wno-missing-profile'
+
+    steps = []
+    step_start = time.time()
+    print(f'{Color.CYAN}{Color.BOLD}[PGO 1/3] Instrumented build ({family}){Color.RESET}')
+    instrumented = _instrumented_command(cmd)
+    run_build(instrumented, env=_pgo_env(generate_flags))
+    steps.append(('instrumented build', time.time() - step_start))
+
+    step_start = time.time()
+    print(f'{Color.CYAN}{Color.BOLD}[PGO 2/3] Training run{Color.RESET}')
+    _run_training(_training_executable(instrumented))
+    _collect_profile(family, profile_dir)
+    steps.append(('training run', time.time() - step_start))
+
+    step_start = time.time()
+    print(f'{Color.CYAN}{Color.BOLD}[PGO 3/3] Optimized build{Color.RESET}')
+    phases = run_build(cmd, env=_pgo_env(use_flags))
+    steps.append(('optimized build', time.time() - step_start))
+
+    total = sum(seconds for _, seconds in steps)
+    print(f'{Color.CYAN}PGO steps:{Color.RESET}')
+    for name, seconds in steps:
+        percent = seconds * 100.0 / total if total else 0.0
+        print(f'  {name:<18}  {_format_seconds(seconds):>9}  {percent:5.1f}%')
+    return phases
+"""
+
+# 构建配置 A/B 对比（依赖 MATRIX_RUNNER_CODE、STARTUP_BENCH_CODE、argparse、shlex）
+COMPARE_CODE = """COMPARE_REPORT_FILE = os.path.join('.pybuilder', 'compare.json')
+
+
+def _artifact_size(target, exe):
+    \"\"\"产物体积：单文件为可执行文件大小，目录模式为整个输出目录大小\"\"\"
+    if target['onefile']:
+        return os.path.getsize(exe)
+    total = 0
+    for root, _, names in os.walk(os.path.dirname(exe)):
+        for name in names:
+            path = os.path.join(root, name)
+            if not os.path.islink(path):
+                total += os.path.getsize(path)
+    return total
+
+
+def run_compare_benchmark(exe, runs):
+    \"\"\"执行基准命令，返回 (中位耗时, 中位吞吐量)；命令最后一行输出数字时视为吞吐量\"\"\"
+    command = shlex.split(COMPARE_BENCHMARK.replace('{exe}', exe), posix=platform.system() != 'Windows')
+    env = dict(os.environ)
+    env['BENCH_EXECUTABLE'] = exe
+    durations, throughputs = [], []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(command, env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        if result.returncode != 0:
+            return None, None
+        durations.append(time.perf_counter() - start)
+        lines = result.stdout.strip().splitlines()
+        try:
+            throughputs.append(float(lines[-1].split()[-1]))
+        except (IndexError, ValueError):
+            pass
+    return percentile(durations, 50), percentile(throughputs, 50) if throughputs else None
+
+
+def _format_size(size):
+    \"\"\"格式化字节数\"\"\"
+    return f'{size / 1024 / 1024:.1f} MB' if size >= 1024 * 1024 else f'{size / 1024:.0f} KB'
+
+
+def _format_delta(value, baseline):
+    \"\"\"相对第一个变体的变化百分比\"\"\"
+    if value is None or not baseline:
+        return ''
+    return f' ({(value - baseline) * 100.0 / baseline:+.0f}%)'
+
+
+def compare_builds(targets, runs, startup_runs, skip_build=False):
+    \"\"\"构建并测量所有变体，输出对比表并保存 JSON\"\"\"
+    if skip_build:
+        build_results = {t['name']: (0, None, '') for t in targets}
+    else:
+        build_results, _ = build_targets(targets)
+
+    rows = []
+    for target in targets:
+        returncode, build_seconds, log_path = build_results[target['name']]
+        row = {'name': target['name'], 'mode': target['mode'], 'build_seconds': build_seconds}
+        exe = os.path.abspath(executable_path(target['output_dir'], target['project_name'], target['tool'], target['onefile']))
+        if returncode != 0 or not os.path.isfile(exe):
+            row['error'] = f'build failed, log: {log_path}' if returncode != 0 else f'executable not found: {exe}'
+            rows.append(row)
+            continue
+        print(f"{Color.GRAY}Measuring {target['name']}...{Color.RESET}")
+        row['size'] = _artifact_size(target, exe)
+        startup = run_benchmark(exe, BENCH_ARGS, startup_runs)
+        row['cold_p50'] = startup['cold']['p50'] if startup['samples']['cold'] else None
+        row['warm_p50'] = startup['warm']['p50'] if startup['samples']['warm'] else None
+        if COMPARE_BENCHMARK:
+            row['bench_seconds'], row['throughput'] = run_compare_benchmark(exe, runs)
+        rows.append(row)
+
+    # 对比表（百分比相对第一个变体）
+    print('-' * shutil.get_terminal_size().columns)
+    width = max(len('Variant'), max(len(r['name']) for r in rows)) + 2
+    print(f"{Color.BOLD}{'Variant':<{width}}{'Build':>9}{'Size':>20}{'Cold p50':>18}{'Warm p50':>18}{'Benchmark':>22}{Color.RESET}")
+    baseline = next((r for r in rows if 'error' not in r), {})
+    for row in rows:
+        if 'error' in row:
+            print(f"{row['name']:<{width}}{Color.RED}{row['error']}{Color.RESET}")
+            continue
+        build = _format_duration(row['build_seconds']) if row['build_seconds'] is not None else '-'
+        size = _format_size(row['size']) + _format_delta(row['size'], baseline.get('size'))
+        cold = f"{row['cold_p50'] * 1000:.0f}ms" + _format_delta(row['cold_p50'], baseline.get('cold_p50')) if row['cold_p50'] is not None else 'failed'
+        warm = f"{row['warm_p50'] * 1000:.0f}ms" + _format_delta(row['warm_p50'], baseline.get('warm_p50')) if row['warm_p50'] is not None else 'failed'
+        if not COMPARE_BENCHMARK:
+            bench = '-'
+        elif row.get('throughput') is not None:
+            bench = f"{row['throughput']:.1f}/s" + _format_delta(row['throughput'], baseline.get('throughput'))
+        elif row.get('bench_seconds') is not None:
+            bench = f"{row['bench_seconds']:.2f}s" + _format_delta(row['bench_seconds'], baseline.get('bench_seconds'))
+        else:
+            bench = 'failed'
+        print(f"{row['name']:<{width}}{build:>9}{size:>20}{cold:>18}{warm:>18}{bench:>22}")
+
+    os.makedirs(os.path.dirname(COMPARE_REPORT_FILE), exist_ok=True)
+    with open(COMPARE_REPORT_FILE, 'w', encoding='utf-8') as f:
+        json.dump({'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'), 'variants': rows}, f, indent=2)
+    print(f'{Color.GRAY}Compare report: {os.path.abspath(COMPARE_REPORT_FILE)}{Color.RESET}')
+    return 1 if any('error' in row for row in rows) else 0
+
+
+def main():
+    \"\"\"命令行入口\"\"\"
+    parser = argparse.ArgumentParser(description=f'{PROJECT_NAME} 构建配置对比')
+    parser.add_argument('-t', '--target', action='append', help='只对比指定变体（可重复）')
+    parser.add_argument('-n', '--runs', type=int, default=COMPARE_RUNS, help='基准命令执行次数')
+    parser.add_argument('--startup-runs', type=int, default=BENCH_RUNS, help='冷/热启动各测试次数')
+    parser.add_argument('--skip-build', action='store_true', help='跳过构建，直接测量已有产物')
+    args = parser.parse_args()
+
+    selected = [t for t in TARGETS if not args.target or t['name'] in args.target]
+    if not selected:
+        print(f'{Color.RED}No matching variants{Color.RESET}')
+        return 2
+    return compare_builds(selected, args.runs, args.startup_runs, args.skip_build)
+"""
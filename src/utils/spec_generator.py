@@ -0,0 +1,335 @@
+"""
+PyInstaller .spec 生成器模块
+根据构建配置生成可复用的 .spec 文件，构建脚本直接以 spec 驱动 PyInstaller，
+多个入口文件共用一次 Analysis，onedir 模式下合并到同一个 COLLECT
+"""
+
+import os
+import re
+from typing import Any, Dict, List, Tuple
+
+from src.utils.data_collector import (
+    DATA_STAGE_DIR,
+    data_specs,
+    stage_name,
+    uses_data_collector,
+)
+
+# 预编译正则表达式
+_SPLIT_PATTERN = re.compile(r"[,\s，]+")
+_DRIVE_PATTERN = re.compile(r"^[A-Za-z]:[\\/]")
+
+
+def _split_items(text: str) -> List[str]:
+    """分割字符串，支持空格、英文逗号、中文逗号"""
+    return [s.strip() for s in _SPLIT_PATTERN.split(text) if s.strip()]
+
+
+def spec_file_name(config: Dict[str, Any]) -> str:
+    """spec 文件名（与 PyInstaller 默认生成的文件名一致）"""
+    return f"{config.get('project_name', 'MyApp')}.spec"
+
+
+def _entry_name(entry_file: str) -> str:
+    """入口文件对应的可执行文件名（文件名去掉扩展名）"""
+    return os.path.splitext(os.path.basename(entry_file.replace("\\", "/")))[0]
+
+
+def resolve_spec_entries(config: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """
+    返回 spec 中的所有入口 (可执行文件名, 入口文件)
+    主入口使用项目名称，附加入口使用各自的文件名
+    """
+    entries = [
+        (config.get("project_name", "MyApp"), config.get("entry_file", "main.py"))
+    ]
+    for entry_file in _split_items(config.get("extra_entry_files", "")):
+        entries.append((_entry_name(entry_file), entry_file.replace("\\", "/")))
+    return entries
+
+
+def _parse_data_entries(text: str) -> List[Tuple[str, str]]:
+    """解析 add_data / add_binary 条目（src;dest 或 src:dest，多个用空格分隔）"""
+    entries = []
+    for entry in text.split():
+        # Windows 盘符中的冒号不是分隔符
+        has_drive = bool(_DRIVE_PATTERN.match(entry))
+        if ";" in entry:
+            src, dest = entry.split(";", 1)
+        elif ":" in (entry[2:] if has_drive else entry):
+            src, dest = entry.rsplit(":", 1)
+        else:
+            src, dest = entry, "."
+        entries.append((src.replace("\\", "/"), dest.replace("\\", "/") or "."))
+    return entries
+
+
+def _collected_data_lines(config: Dict[str, Any]) -> List[str]:
+    """数据文件由构建脚本收集（glob / 排除模式、去重），spec 从清单读取暂存目录"""
+    dedupe = bool(config.get("data_dedupe", False))
+    groups = data_specs(config)
+    lines = [
+        "# 数据文件由构建脚本收集（glob / 排除模式、按内容去重），从清单读取暂存目录",
+        "def collected_data(manifest):",
+        "    path = os.path.join(SPECPATH, manifest)",
+        "    if not os.path.exists(path):",
+        "        sys.exit(f'{manifest} not found, run the build script first to collect data files')",
+        "    with open(path, encoding='utf-8') as file:",
+        "        toc = json.load(file)['toc']",
+        "    return [",
+        "        (src, dest if kind == 'dir' else os.path.dirname(dest) or '.')",
+        "        for src, dest, kind in toc",
+        "    ]",
+        "",
+        "",
+    ]
+    for group, name in (("data", "datas"), ("binary", "binaries")):
+        if group in groups:
+            stage = f"{DATA_STAGE_DIR}/{stage_name(group, groups[group], dedupe)}"
+            manifest = stage.replace("\\", "/") + ".json"
+            lines.append(f"{name} = collected_data({manifest!r})")
+        else:
+            lines.append(f"{name} = []")
+    return lines
+
+
+def _exe_options(config: Dict[str, Any], name: str, main: bool) -> List[str]:
+    """生成 EXE() 的关键字参数"""
+    onefile = config.get("onefile", True)
+    options = [
+        f"    name={name!r},",
+        f"    debug={bool(config.get('debug', False))},",
+        "    bootloader_ignore_signals=False,",
+        "    strip=False,",
+        "    upx=True,",
+        "    upx_exclude=[],",
+        f"    console={bool(config.get('show_console', False))},",
+        "    disable_windowed_traceback=False,",
+        "    argv_emulation=False,",
+    ]
+    if onefile:
+        runtime_tmpdir = config.get("runtime_tmpdir", "") or None
+        options.append(f"    runtime_tmpdir={runtime_tmpdir!r},")
+    else:
+        options.append("    exclude_binaries=True,")
+        contents_dir = config.get("contents_directory", ".")
+        if contents_dir and contents_dir != ".":
+            options.append(f"    contents_directory={contents_dir!r},")
+    if config.get("icon_file"):
+        options.append(
+            f"    icon={config['icon_file']!r} if IS_WINDOWS or IS_MACOS else None,"
+        )
+    if config.get("uac_admin", False):
+        options.append("    uac_admin=IS_WINDOWS,")
+    # 版本信息只属于主程序
+    if main and config.get("win_version_file"):
+        options.append(
+            f"    version={config['win_version_file']!r} if IS_WINDOWS else None,"
+        )
+    if config.get("win_manifest"):
+        options.append(
+            f"    manifest={config['win_manifest']!r} if IS_WINDOWS else None,"
+        )
+    for key, arg in (
+        ("target_architecture", "target_arch"),
+        ("codesign_identity", "codesign_identity"),
+        ("osx_entitlements_file", "entitlements_file"),
+    ):
+        if config.get(key):
+            options.append(f"    {arg}={config[key]!r} if IS_MACOS else None,")
+    return options
+
+
+def generate_pyinstaller_spec(config: Dict[str, Any]) -> str:
+    """生成 PyInstaller .spec 文件内容"""
+    # 延迟导入，避免与 script_generator 循环导入
+    from src.utils.script_generator import _excluded_modules
+
+    onefile = config.get("onefile", True)
+    entries = resolve_spec_entries(config)
+    multi_entry = len(entries) > 1
+    splash = bool(config.get("splash_image")) and onefile
+
+    collect_keys = [
+        ("collect_submodules", "collect_submodules", "hiddenimports"),
+        ("collect_data", "collect_data_files", "datas"),
+        ("collect_binaries", "collect_dynamic_libs", "binaries"),
+    ]
+    hook_imports = [func for key, func, _ in collect_keys if config.get(key)]
+    if config.get("collect_all"):
+        hook_imports.append("collect_all")
+
+    lines = [
+        "# -*- mode: python ; coding: utf-8 -*-",
+        "# 由 PyBuilder-Generate 根据 build_config.yaml 生成，重新生成脚本时会被覆盖",
+        f"# 单独使用: pyinstaller {spec_file_name(config)}",
+        "import sys",
+    ]
+    collect_data = uses_data_collector(config)
+    if multi_entry or collect_data:
+        lines.append("import os")
+    if collect_data:
+        lines.append("import json")
+    if hook_imports:
+        lines.append("")
+        hooks = ", ".join(sorted(hook_imports))
+        lines.append(f"from PyInstaller.utils.hooks import {hooks}")
+    lines.extend(
+        [
+            "",
+            "IS_WINDOWS = sys.platform == 'win32'",
+            "IS_MACOS = sys.platform == 'darwin'",
+            "",
+            "# 入口文件（相对 spec 所在目录）",
+            "ENTRY_FILES = [",
+        ]
+    )
+    for _name, entry_file in entries:
+        lines.append(f"    {entry_file!r},")
+    lines.append("]")
+    lines.append("")
+
+    # 数据、二进制、导入
+    if collect_data:
+        lines.extend(_collected_data_lines(config))
+    else:
+        datas = _parse_data_entries(config.get("add_data", ""))
+        binaries = _parse_data_entries(config.get("add_binary", ""))
+        lines.append(f"datas = {datas!r}")
+        lines.append(f"binaries = {binaries!r}")
+    lines.append(f"hiddenimports = {_split_items(config.get('hidden_imports', ''))!r}")
+    lines.append(f"excludes = {_excluded_modules(config, 'exclude_modules')!r}")
+    lines.append("")
+
+    # 收集选项
+    for key, func, target in collect_keys:
+        packages = _split_items(config.get(key, ""))
+        if packages:
+            lines.append(f"for package in {packages!r}:")
+            lines.append(f"    {target} += {func}(package)")
+    collect_all_packages = _split_items(config.get("collect_all", ""))
+    if collect_all_packages:
+        lines.extend(
+            [
+                f"for package in {collect_all_packages!r}:",
+                "    package_datas, package_binaries, package_imports = collect_all(package)",
+                "    datas += package_datas",
+                "    binaries += package_binaries",
+                "    hiddenimports += package_imports",
+            ]
+        )
+    if hook_imports:
+        lines.append("")
+
+    debug = bool(config.get("debug", False))
+    lines.extend(
+        [
+            "# 所有入口共用一次 Analysis",
+            "a = Analysis(",
+            "    ENTRY_FILES,",
+            "    pathex=[],",
+            "    binaries=binaries,",
+            "    datas=datas,",
+            "    hiddenimports=hiddenimports,",
+            "    hookspath=[],",
+            "    hooksconfig={},",
+            "    runtime_hooks=[],",
+            "    excludes=excludes,",
+            f"    noarchive={debug},",
+            ")",
+            "pyz = PYZ(a.pure)",
+            "",
+        ]
+    )
+
+    if multi_entry:
+        lines.extend(
+            [
+                "# a.scripts 包含共用的运行时钩子和每个入口脚本，每个 EXE 只取自己的入口",
+                "ENTRY_NAMES = [",
+                "    os.path.splitext(os.path.basename(f))[0] for f in ENTRY_FILES",
+                "]",
+                "shared_scripts = [s for s in a.scripts if s[0] not in ENTRY_NAMES]",
+                "",
+                "",
+                "def entry_scripts(index):",
+                "    own = [s for s in a.scripts if s[0] == ENTRY_NAMES[index]]",
+                "    return shared_scripts + own",
+                "",
+                "",
+            ]
+        )
+
+    if splash:
+        lines.extend(
+            [
+                "splash = Splash(",
+                f"    {config['splash_image']!r},",
+                "    binaries=a.binaries,",
+                "    datas=a.datas,",
+                "    text_pos=None,",
+                "    text_size=12,",
+                "    minify_script=True,",
+                "    always_on_top=True,",
+                ")",
+                "",
+            ]
+        )
+
+    exe_vars = []
+    for index, (name, _entry_file) in enumerate(entries):
+        exe_var = "exe" if index == 0 else f"exe_{index}"
+        exe_vars.append(exe_var)
+        scripts = f"entry_scripts({index})" if multi_entry else "a.scripts"
+        lines.append(f"{exe_var} = EXE(")
+        lines.append("    pyz,")
+        lines.append(f"    {scripts},")
+        if index == 0 and splash:
+            lines.append("    splash,")
+            lines.append("    splash.binaries,")
+        if onefile:
+            lines.append("    a.binaries,")
+            lines.append("    a.datas,")
+        lines.append("    [('v', None, 'OPTION')]," if debug else "    [],")
+        lines.extend(_exe_options(config, name, index == 0))
+        lines.append(")")
+        lines.append("")
+
+    project_name = config.get("project_name", "MyApp")
+    bundle_target = "exe"
+    if not onefile:
+        bundle_target = "coll"
+        lines.append("# 所有可执行文件放在同一个目录，共享依赖")
+        lines.append("coll = COLLECT(")
+        for exe_var in exe_vars:
+            lines.append(f"    {exe_var},")
+        lines.extend(
+            [
+                "    a.binaries,",
+                "    a.datas,",
+                "    strip=False,",
+                "    upx=True,",
+                "    upx_exclude=[],",
+                f"    name={project_name!r},",
+                ")",
+                "",
+            ]
+        )
+
+    # 与命令行模式一致：macOS 窗口程序额外生成 .app
+    if not config.get("show_console", False):
+        icon = config.get("icon_file") or None
+        lines.extend(
+            [
+                "if IS_MACOS:",
+                "    app = BUNDLE(",
+                f"        {bundle_target},",
+                f"        name={project_name + '.app'!r},",
+                f"        icon={icon!r},",
+                f"        bundle_identifier={config.get('osx_bundle_identifier') or None!r},",
+                "    )",
+                "",
+            ]
+        )
+
+    return "\n".join(lines)
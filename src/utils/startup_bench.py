@@ -0,0 +1,152 @@
+"""
+启动耗时基准模块
+多次启动构建产物，统计冷启动和热启动耗时的 p50/p95/max
+
+本模块仅依赖标准库：生成的 bench_startup.py 会嵌入本模块中基准所需的函数，
+TUI 中的分析界面也调用同一套函数。
+冷启动：每次使用全新的临时目录（TMPDIR/TEMP/TMP），onefile 必须重新解压；
+热启动：共享同一临时目录，并先执行一次不计时的预热启动。
+"""
+
+import math
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# 单次启动的超时时间（秒）
+LAUNCH_TIMEOUT = 60
+
+
+def executable_path(
+    output_dir: str, project_name: str, tool: str, onefile: bool
+) -> str:
+    """根据构建工具和模式推断可执行文件路径"""
+    exe_name = project_name + (".exe" if sys.platform == "win32" else "")
+    if onefile:
+        return os.path.join(output_dir, exe_name)
+    if tool == "nuitka":
+        return os.path.join(output_dir, f"{project_name}.dist", exe_name)
+    return os.path.join(output_dir, project_name, exe_name)
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """最近秩法计算百分位数"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """计算 p50/p95/max"""
+    return {
+        "p50": percentile(samples, 50),
+        "p95": percentile(samples, 95),
+        "max": max(samples) if samples else 0.0,
+    }
+
+
+def _temp_env(temp_dir: str) -> Dict[str, str]:
+    """将临时目录相关环境变量指向 temp_dir"""
+    env = dict(os.environ)
+    for name in ("TMPDIR", "TEMP", "TMP"):
+        env[name] = temp_dir
+    return env
+
+
+def time_launch(
+    exe: str, args: List[str], env: Dict[str, str], timeout: float = LAUNCH_TIMEOUT
+) -> Optional[float]:
+    """启动一次可执行文件并返回耗时（秒），失败或超时返回 None"""
+    start = time.perf_counter()
+    try:
+        result = subprocess.run(
+            [exe, *args],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            env=env,
+            timeout=timeout,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0:
+        return None
+    return time.perf_counter() - start
+
+
+def run_benchmark(
+    exe: str, args: List[str], runs: int, timeout: float = LAUNCH_TIMEOUT
+) -> Dict[str, Any]:
+    """对单个可执行文件执行冷/热启动测试
+
+    Returns:
+        包含 cold / warm（各自的 p50/p95/max）、samples 和 failures 的结果
+    """
+    cold: List[float] = []
+    warm: List[float] = []
+    failures = 0
+
+    for _ in range(runs):
+        temp_dir = tempfile.mkdtemp(prefix="pybuilder-bench-")
+        try:
+            elapsed = time_launch(exe, args, _temp_env(temp_dir), timeout)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+        if elapsed is None:
+            failures += 1
+        else:
+            cold.append(elapsed)
+
+    shared_dir = tempfile.mkdtemp(prefix="pybuilder-bench-")
+    try:
+        env = _temp_env(shared_dir)
+        # 预热：让 onefile 解压、系统文件缓存就绪
+        time_launch(exe, args, env, timeout)
+        for _ in range(runs):
+            elapsed = time_launch(exe, args, env, timeout)
+            if elapsed is None:
+                failures += 1
+            else:
+                warm.append(elapsed)
+    finally:
+        shutil.rmtree(shared_dir, ignore_errors=True)
+
+    return {
+        "cold": summarize(cold),
+        "warm": summarize(warm),
+        "samples": {"cold": cold, "warm": warm},
+        "failures": failures,
+    }
+
+
+def benchmark_variants(
+    variants: List[Dict[str, Any]],
+    args: List[str],
+    runs: int,
+    timeout: float = LAUNCH_TIMEOUT,
+    on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> List[Dict[str, Any]]:
+    """依次测试多个构建变体，未找到可执行文件的变体标记为 missing"""
+    results = []
+    for variant in variants:
+        exe = executable_path(
+            variant["output_dir"],
+            variant["project_name"],
+            variant["tool"],
+            variant["onefile"],
+        )
+        result = {**variant, "exe": exe}
+        if not os.path.isfile(exe):
+            result["missing"] = True
+        else:
+            result.update(run_benchmark(exe, args, runs, timeout))
+        results.append(result)
+        if on_progress:
+            on_progress(result)
+    return results
@@ -0,0 +1,193 @@
+"""
+打包工具能力探测模块
+在目标解释器中查询 Nuitka / PyInstaller 的版本，运行 --help 解析支持的命令行参数，
+结果按解释器路径和工具版本缓存在用户级缓存目录中，多个项目共用同一解释器时只探测一次；
+生成脚本前据此检查将要使用的参数，避免长时间构建后才因参数不支持而失败
+"""
+
+import hashlib
+import json
+import os
+import platform
+import re
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from src.utils.config import get_cache_dir
+from src.utils.file_writer import atomic_write_text
+from src.utils.python_env import find_project_python
+
+# 探测结果缓存目录（位于用户级缓存目录下，每个 (解释器, 工具, 版本) 一个文件）
+TOOL_CACHE_DIR = "tool_capabilities"
+# 运行 --help 的超时（秒），Nuitka 首次启动较慢
+PROBE_TIMEOUT = 120
+# 构建工具 -> (模块名, 发行包名, 显示名)
+TOOL_MODULES = {
+    "nuitka": ("nuitka", "Nuitka", "Nuitka"),
+    "pyinstaller": ("PyInstaller", "pyinstaller", "PyInstaller"),
+}
+# Nuitka 只在对应平台的 --help 中列出的参数前缀
+PLATFORM_FLAG_PREFIXES = {
+    "Windows": "--windows-",
+    "Darwin": "--macos-",
+    "Linux": "--linux-",
+}
+
+_FLAG_PATTERN = re.compile(r"(?<![\w-])(--[A-Za-z][\w-]*)")
+
+# 在目标解释器中查询工具版本（不导入工具本身，启动很快）
+_VERSION_CODE = """
+import json, sys
+try:
+    from importlib import metadata
+except ImportError:
+    metadata = None
+versions = {}
+for name in sys.argv[1:]:
+    try:
+        versions[name] = metadata.version(name) if metadata else None
+    except Exception:
+        versions[name] = None
+print(json.dumps(versions))
+"""
+
+
+def parse_flags(text: str) -> List[str]:
+    """从帮助文本中提取长参数名（去掉 =值 部分）"""
+    return sorted(set(_FLAG_PATTERN.findall(text)))
+
+
+# 进程内缓存的工具版本 {解释器: {工具: 版本}}，批量生成时同一解释器只查询一次
+_VERSION_CACHE: Dict[str, Dict[str, Optional[str]]] = {}
+
+
+def tool_versions(python: str, refresh: bool = False) -> Dict[str, Optional[str]]:
+    """
+    查询目标解释器中已安装的打包工具版本，未安装为 None
+    结果在进程内按解释器缓存，refresh 为 True 时重新查询
+    """
+    if not refresh and python in _VERSION_CACHE:
+        return dict(_VERSION_CACHE[python])
+    dists = [dist for _module, dist, _name in TOOL_MODULES.values()]
+    try:
+        result = subprocess.run(
+            [python, "-c", _VERSION_CODE, *dists],
+            capture_output=True,
+            text=True,
+            timeout=PROBE_TIMEOUT,
+            check=True,
+        )
+        versions = json.loads(result.stdout)
+    except (OSError, ValueError, subprocess.SubprocessError):
+        return {tool: None for tool in TOOL_MODULES}
+    result = {tool: versions.get(dist) for tool, (_m, dist, _n) in TOOL_MODULES.items()}
+    _VERSION_CACHE[python] = result
+    return dict(result)
+
+
+def _probe_help(python: str, tool: str) -> List[str]:
+    """运行 python -m <工具> --help 并解析参数列表"""
+    module = TOOL_MODULES[tool][0]
+    result = subprocess.run(
+        [python, "-m", module, "--help"],
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+        timeout=PROBE_TIMEOUT,
+    )
+    flags = parse_flags(result.stdout)
+    if result.returncode != 0 or not flags:
+        raise RuntimeError(
+            f"{module} --help 运行失败: {(result.stderr or result.stdout).strip()[-300:]}"
+        )
+    return flags
+
+
+def _cache_path(python: str, tool: str, version: str) -> Path:
+    """探测结果的缓存文件，文件名由 (解释器, 工具, 版本) 的哈希确定"""
+    key = f"{python}|{tool}|{version}".encode("utf-8")
+    return (
+        get_cache_dir()
+        / TOOL_CACHE_DIR
+        / f"{tool}-{hashlib.sha256(key).hexdigest()[:16]}.json"
+    )
+
+
+def load_capabilities(
+    project_dir: Path, tool: str, python: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    获取打包工具支持的参数，按 (解释器, 工具, 版本) 缓存在用户级缓存目录
+
+    Args:
+        project_dir: 项目目录（用于查找项目虚拟环境中的解释器）
+        tool: nuitka 或 pyinstaller
+        python: 目标解释器，默认使用项目虚拟环境中的解释器
+
+    Returns:
+        包含 python / tool / name / version / flags / cached 的结果，
+        工具未安装时返回 None
+    """
+    python = os.path.abspath(python or find_project_python(project_dir))
+    version = tool_versions(python).get(tool)
+    if not version:
+        # 可能是本进程查询之后才安装的，重新查询一次
+        version = tool_versions(python, refresh=True).get(tool)
+    if not version:
+        return None
+
+    cache_path = _cache_path(python, tool, version)
+    try:
+        entry = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        entry = None
+    cached = (
+        isinstance(entry, dict)
+        and entry.get("python") == python
+        and entry.get("tool") == tool
+        and entry.get("version") == version
+        and isinstance(entry.get("flags"), list)
+    )
+    if not cached:
+        entry = {
+            "python": python,
+            "tool": tool,
+            "version": version,
+            "flags": _probe_help(python, tool),
+        }
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_text(
+                cache_path, json.dumps(entry, ensure_ascii=False, indent=2)
+            )
+        except OSError:
+            pass
+    return {
+        "python": python,
+        "tool": tool,
+        "name": TOOL_MODULES[tool][2],
+        "version": version,
+        "flags": entry["flags"],
+        "cached": cached,
+    }
+
+
+def unsupported_flags(
+    tool: str, flags: Iterable[str], capabilities: Dict[str, Any]
+) -> List[str]:
+    """返回工具不支持的参数，其他平台专用的 Nuitka 参数不检查"""
+    supported = set(capabilities["flags"])
+    system = platform.system()
+    foreign = tuple(
+        prefix for name, prefix in PLATFORM_FLAG_PREFIXES.items() if name != system
+    )
+    missing = []
+    for flag in sorted(set(flags)):
+        if flag in supported:
+            continue
+        if tool == "nuitka" and flag.startswith(foreign):
+            continue
+        missing.append(flag)
+    return missing
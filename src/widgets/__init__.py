@@ -9,6 +9,9 @@ from src.widgets.option_builders import (
     create_button_row,
     create_switch_row,
     create_inputs_row,
+    option_switch,
+    option_input,
+    option_select,
     build_nuitka_options,
     build_pyinstaller_options,
 )
@@ -21,6 +24,9 @@ __all__ = [
     "create_button_row",
     "create_switch_row",
     "create_inputs_row",
+    "option_switch",
+    "option_input",
+    "option_select",
     "build_nuitka_options",
     "build_pyinstaller_options",
 ]
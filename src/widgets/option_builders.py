@@ -15,6 +15,8 @@ from textual.widgets import (
     Select,
 )
 
+from src.utils.option_registry import BUILD_OPTIONS_BY_KEY
+
 
 def create_switch_widget(
     switch_id: str,
@@ -58,6 +60,40 @@ def create_input_widget(
     )
 
 
+def option_switch(config: Dict[str, Any], key: str) -> Vertical:
+    """按选项注册表创建开关组件"""
+    option = BUILD_OPTIONS_BY_KEY[key]
+    # on_value 选项（如 python_flag）以字符串保存，开关只反映是否有值
+    value = bool(config.get(key, option["default"]))
+    return create_switch_widget(option["widget"], option["label"], value, {}, key)
+
+
+def option_input(config: Dict[str, Any], key: str) -> Vertical:
+    """按选项注册表创建输入框组件"""
+    option = BUILD_OPTIONS_BY_KEY[key]
+    return create_input_widget(
+        option["widget"], option["label"], config, key, option["placeholder"]
+    )
+
+
+def option_select(config: Dict[str, Any], key: str) -> Select:
+    """按选项注册表创建下拉选择组件（choice 类型）"""
+    option = BUILD_OPTIONS_BY_KEY[key]
+    value = config.get(key, option["default"])
+    # 兼容旧的布尔值
+    if isinstance(value, bool):
+        value = "yes" if value else "no"
+    if value not in option["choices"]:
+        value = option["default"]
+    return Select(
+        [(label, choice) for choice, label in option["choices"].items()],
+        value=value,
+        id=option["widget"],
+        classes="field-select field-group",
+        allow_blank=False,
+    )
+
+
 def create_button_row(label1: str, id1: str, label2: str, id2: str) -> Horizontal:
     """创建按钮行"""
     return Horizontal(
@@ -102,43 +138,17 @@ def build_nuitka_options(config: Dict[str, Any]) -> TabbedContent:
 
     # 基本选项 - 开关行1
     switches_row1 = create_switch_row(
-        create_switch_widget(
-            "standalone-switch", "独立打包 (Standalone)", True, config, "standalone"
-        ),
-        create_switch_widget(
-            "onefile-switch", "单文件模式 (One File)", True, config, "onefile"
-        ),
+        option_switch(config, "standalone"),
+        option_switch(config, "onefile"),
     )
 
     # 基本选项 - 开关行2
-    switch3 = create_switch_widget(
-        "console-switch", "显示终端窗口 (Windows)", False, config, "show_console"
-    )
-    python_flag_value = bool(config.get("python_flag", ""))
-    switch4 = Vertical(
-        Horizontal(
-            Switch(
-                value=python_flag_value,
-                id="python-flag-switch",
-                classes="field-switch",
-            ),
-            Label("Python优化 (移除断言和文档)", classes="field-switch-label"),
-            classes="field-switch-container",
-        ),
-        classes="field-group",
-    )
+    switch3 = option_switch(config, "show_console")
+    switch4 = option_switch(config, "python_flag")
 
     # 基本选项 - 开关行3：跟随导入 + 不生成 .pyi 文件
-    follow_imports_switch = create_switch_widget(
-        "follow-imports-switch",
-        "跟随导入 (自动包含模块)",
-        True,
-        config,
-        "follow_imports",
-    )
-    no_pyi_switch = create_switch_widget(
-        "no-pyi-switch", "不生成 .pyi 文件 (仅module模式)", False, config, "no_pyi_file"
-    )
+    follow_imports_switch = option_switch(config, "follow_imports")
+    no_pyi_switch = option_switch(config, "no_pyi_file")
 
     switches_row2 = create_switch_row(switch3, switch4)
     switches_row3_basic = create_switch_row(follow_imports_switch, no_pyi_switch)
@@ -152,44 +162,36 @@ def build_nuitka_options(config: Dict[str, Any]) -> TabbedContent:
         classes="basic-options-content",
     )
 
-    # 高级选项 - 第1行：LTO 下拉选择 + 静默输出开关
-    lto_value = config.get("lto", "no")
-    if isinstance(lto_value, bool):
-        lto_value = "yes" if lto_value else "no"
+    # 高级选项 - 第1行：LTO 下拉选择 + PGO 开关
+    lto_select = option_select(config, "lto")
 
-    lto_select = Select(
-        [
-            ("关闭 LTO（链接时优化）", "no"),
-            ("启用 LTO（链接时优化）", "yes"),
-            ("自动 LTO（链接时优化）", "auto"),
-        ],
-        value=lto_value,
-        id="lto-select",
-        classes="field-select field-group",
-        allow_blank=False,
-    )
+    quiet_switch = option_switch(config, "quiet_mode")
 
-    quiet_switch = create_switch_widget(
-        "quiet-switch", "静默输出 (仅进度条)", False, config, "quiet_mode"
-    )
+    # PGO 与 LTO 同属编译器优化，放在同一行
+    pgo_switch = option_switch(config, "pgo")
 
-    switches_row3 = create_switch_row(lto_select, quiet_switch)
+    switches_row3 = create_switch_row(lto_select, pgo_switch)
+
+    # 高级选项 - PGO 训练命令 + 静默输出开关
+    pgo_row = create_inputs_row(
+        option_input(config, "pgo_training_command"),
+        Vertical(
+            Label("", classes="field-label"),  # 占位
+            quiet_switch,
+            classes="field-group",
+        ),
+    )
 
     # 高级选项 - 第2行
+    jobs_option = BUILD_OPTIONS_BY_KEY["jobs"]
     switches_row4 = create_switch_row(
-        create_switch_widget(
-            "remove-output-switch",
-            "移除构建文件 (节省空间)",
-            True,
-            config,
-            "remove_output",
-        ),
+        option_switch(config, "remove_output"),
         Horizontal(
-            Label("编译线程:", classes="field-label-inline"),
+            Label(jobs_option["label"], classes="field-label-inline"),
             Input(
-                placeholder="0",
-                value=str(config.get("jobs", 0)),
-                id="jobs-input",
+                placeholder=jobs_option["placeholder"],
+                value=str(config.get("jobs", jobs_option["default"])),
+                id=jobs_option["widget"],
                 classes="field-input",
             ),
             Button("-", id="jobs-decrease-btn", variant="default", flat=True),
@@ -200,71 +202,47 @@ def build_nuitka_options(config: Dict[str, Any]) -> TabbedContent:
 
     # 高级选项 - 第3行：自动下载依赖工具
     switches_row5 = create_switch_row(
-        create_switch_widget(
-            "assume-yes-switch",
-            "自动下载依赖 (CI环境必需)",
-            False,
-            config,
-            "assume_yes_for_downloads",
-        ),
-        Vertical(classes="field-group"),  # 占位元素
+        option_switch(config, "assume_yes_for_downloads"),
+        option_switch(config, "build_cache"),
+    )
+
+    # 高级选项 - 第4行：编译器缓存
+    switches_row6 = create_switch_row(
+        option_switch(config, "compiler_cache"),
+        option_switch(config, "compilation_report"),
+    )
+
+    # 高级选项 - 第5行：产物体积分析和启动测速
+    switches_row7 = create_switch_row(
+        option_switch(config, "size_analysis"),
+        option_switch(config, "startup_benchmark"),
     )
 
     # 高级选项标签页内容
     advanced_content = Vertical(
         switches_row3,
+        pgo_row,
         switches_row4,
         switches_row5,
+        switches_row6,
+        switches_row7,
         classes="basic-options-content",
     )
 
     # 数据导入标签页
     nuitka_import_row1 = create_inputs_row(
-        create_input_widget(
-            "nuitka-include-package-input",
-            "包含包 (支持空格、中英文逗号分隔):",
-            config,
-            "include_packages",
-            "例如: numpy pandas PIL",
-        ),
-        create_input_widget(
-            "nuitka-include-module-input",
-            "包含模块 (支持空格、中英文逗号分隔):",
-            config,
-            "include_modules",
-            "例如: requests.adapters os.path",
-        ),
+        option_input(config, "include_packages"),
+        option_input(config, "include_modules"),
     )
 
     nuitka_import_row2 = create_inputs_row(
-        create_input_widget(
-            "nuitka-nofollow-import-input",
-            "排除导入 (支持空格、中英文逗号分隔):",
-            config,
-            "nofollow_imports",
-            "例如: tkinter test unittest",
-        ),
-        create_input_widget(
-            "nuitka-include-data-files-input",
-            "数据文件 (支持空格、中英文逗号分隔):",
-            config,
-            "include_data_files",
-            "格式: src;dest 多个用空格",
-        ),
+        option_input(config, "nofollow_imports"),
+        option_input(config, "include_data_files"),
     )
 
     nuitka_import_row3 = create_inputs_row(
-        create_input_widget(
-            "nuitka-include-data-dir-input",
-            "数据目录 (支持空格、中英文逗号分隔):",
-            config,
-            "include_data_dirs",
-            "格式: src;dest 多个用空格",
-        ),
-        Vertical(
-            Label("", classes="field-label"),  # 占位
-            classes="field-group",
-        ),
+        option_input(config, "include_data_dirs"),
+        option_switch(config, "data_dedupe"),
     )
 
     nuitka_import_content = Vertical(
@@ -297,43 +275,20 @@ def build_pyinstaller_options(config: Dict[str, Any]) -> TabbedContent:
     """
     # 基本选项 - 2个开关横向排列
     switches_row = create_switch_row(
-        create_switch_widget("onefile-switch", "单文件模式", True, config, "onefile"),
-        create_switch_widget(
-            "uac-admin-switch", "管理员权限 (Windows UAC)", False, config, "uac_admin"
-        ),
+        option_switch(config, "onefile"),
+        option_switch(config, "uac_admin"),
     )
 
     # 基本选项 - 第1行输入框
     inputs_row1 = create_inputs_row(
-        create_input_widget(
-            "contents-dir-input",
-            "内部目录名称:",
-            config,
-            "contents_directory",
-            "_internal (默认为 .)",
-        ),
-        create_input_widget(
-            "splash-image-input",
-            "启动画面图片 (仅单文件模式):",
-            config,
-            "splash_image",
-            "例如: splash.png",
-        ),
+        option_input(config, "contents_directory"),
+        option_input(config, "splash_image"),
     )
 
     # 基本选项 - 第2行输入框
     inputs_row2 = create_inputs_row(
-        create_input_widget(
-            "runtime-tmpdir-input",
-            "运行时临时目录 (仅单文件模式):",
-            config,
-            "runtime_tmpdir",
-            "例如: /tmp/myapp",
-        ),
-        Vertical(
-            Label("", classes="field-label"),  # 占位
-            classes="field-group",
-        ),
+        option_input(config, "runtime_tmpdir"),
+        option_input(config, "extra_entry_files"),
     )
 
     basic_content = Vertical(
@@ -342,95 +297,66 @@ def build_pyinstaller_options(config: Dict[str, Any]) -> TabbedContent:
 
     # 高级选项 - 第1行开关
     switches_row1 = create_switch_row(
-        create_switch_widget("clean-switch", "清理临时文件", True, config, "clean"),
-        create_switch_widget(
-            "noconfirm-switch", "自动确认 (跳过删除提示)", False, config, "noconfirm"
-        ),
+        option_switch(config, "clean"),
+        option_switch(config, "noconfirm"),
     )
 
     # 高级选项 - 第2行开关
     switches_row2 = create_switch_row(
-        create_switch_widget(
-            "quiet-switch", "静默输出 (仅进度条)", False, config, "quiet_mode"
-        ),
-        create_switch_widget(
-            "debug-switch", "调试模式 (输出详细信息)", False, config, "debug"
-        ),
+        option_switch(config, "quiet_mode"),
+        option_switch(config, "debug"),
+    )
+
+    # 高级选项 - 第3行开关
+    switches_row3 = create_switch_row(
+        option_switch(config, "build_cache"),
+        option_switch(config, "incremental"),
+    )
+
+    # 高级选项 - 第4行开关
+    switches_row4 = create_switch_row(
+        option_switch(config, "size_analysis"),
+        option_switch(config, "startup_benchmark"),
+    )
+
+    # 高级选项 - 第5行开关
+    switches_row5 = create_switch_row(
+        option_switch(config, "use_spec_file"),
+        Vertical(classes="field-group"),  # 占位
     )
 
     advanced_content = Vertical(
         switches_row1,
         switches_row2,
+        switches_row3,
+        switches_row4,
+        switches_row5,
         classes="basic-options-content",
     )
 
     # 数据导入标签页
     import_row1 = create_inputs_row(
-        create_input_widget(
-            "hidden-imports-input",
-            "隐藏导入 (支持空格、中英文逗号分隔):",
-            config,
-            "hidden_imports",
-            "例如: PIL numpy.core pandas",
-        ),
-        create_input_widget(
-            "exclude-modules-input",
-            "排除模块 (支持空格、中英文逗号分隔):",
-            config,
-            "exclude_modules",
-            "例如: tkinter test unittest",
-        ),
+        option_input(config, "hidden_imports"),
+        option_input(config, "exclude_modules"),
     )
 
     import_row2 = create_inputs_row(
-        create_input_widget(
-            "collect-submodules-input",
-            "收集子模块 (支持空格、中英文逗号分隔):",
-            config,
-            "collect_submodules",
-            "例如: textual pyfiglet",
-        ),
-        create_input_widget(
-            "collect-data-input",
-            "收集数据文件 (支持空格、中英文逗号分隔):",
-            config,
-            "collect_data",
-            "例如: textual pyfiglet",
-        ),
+        option_input(config, "collect_submodules"),
+        option_input(config, "collect_data"),
     )
 
     import_row3 = create_inputs_row(
-        create_input_widget(
-            "collect-binaries-input",
-            "收集二进制文件 (支持空格、中英文逗号分隔):",
-            config,
-            "collect_binaries",
-            "例如: numpy PIL",
-        ),
-        create_input_widget(
-            "collect-all-input",
-            "收集所有 (支持空格、中英文逗号分隔):",
-            config,
-            "collect_all",
-            "例如: cv2 scipy",
-        ),
+        option_input(config, "collect_binaries"),
+        option_input(config, "collect_all"),
     )
 
     import_row4 = create_inputs_row(
-        create_input_widget(
-            "add-data-input",
-            "数据文件 (支持空格、中英文逗号分隔):",
-            config,
-            "add_data",
-            "格式: src;dest 多个用空格",
-        ),
-        create_input_widget(
-            "add-binary-input",
-            "二进制文件 (支持空格、中英文逗号分隔):",
-            config,
-            "add_binary",
-            "格式: src;dest 多个用空格",
-        ),
+        option_input(config, "add_data"),
+        option_input(config, "add_binary"),
+    )
+
+    import_row5 = create_switch_row(
+        option_switch(config, "data_dedupe"),
     )
 
     import_content = Vertical(
@@ -438,60 +364,25 @@ def build_pyinstaller_options(config: Dict[str, Any]) -> TabbedContent:
         import_row2,
         import_row3,
         import_row4,
+        import_row5,
         classes="basic-options-content",
     )
 
     # 系统特性标签页 - Windows 特性
     platform_row1 = create_inputs_row(
-        create_input_widget(
-            "win-version-file-input",
-            "Windows 版本信息文件:",
-            config,
-            "win_version_file",
-            "例如: version_info.txt",
-        ),
-        create_input_widget(
-            "win-manifest-input",
-            "Windows Manifest 文件:",
-            config,
-            "win_manifest",
-            "例如: app.manifest",
-        ),
+        option_input(config, "win_version_file"),
+        option_input(config, "win_manifest"),
     )
 
     # 系统特性标签页 - macOS 特性
     platform_row2 = create_inputs_row(
-        create_input_widget(
-            "target-arch-input",
-            "目标架构 (macOS):",
-            config,
-            "target_architecture",
-            "例如: x86_64, arm64, universal2",
-        ),
-        create_input_widget(
-            "osx-bundle-id-input",
-            "macOS Bundle 标识符:",
-            config,
-            "osx_bundle_identifier",
-            "例如: com.company.appname",
-        ),
+        option_input(config, "target_architecture"),
+        option_input(config, "osx_bundle_identifier"),
     )
 
     platform_row3 = create_inputs_row(
-        create_input_widget(
-            "osx-entitlements-input",
-            "macOS 权限文件:",
-            config,
-            "osx_entitlements_file",
-            "例如: entitlements.plist",
-        ),
-        create_input_widget(
-            "codesign-identity-input",
-            "代码签名身份 (macOS):",
-            config,
-            "codesign_identity",
-            "例如: Developer ID Application",
-        ),
+        option_input(config, "osx_entitlements_file"),
+        option_input(config, "codesign_identity"),
     )
 
     platform_content = Vertical(
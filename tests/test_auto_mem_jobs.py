@@ -0,0 +1,90 @@
+"""auto-mem 编译线程数与构建缓存、矩阵构建的配合"""
+
+import concurrent.futures
+import os
+from pathlib import Path
+from typing import Any, Dict, List
+
+from src.utils.build_config import default_build_config
+from src.utils.script_generator import render_build_scripts
+
+
+def _script_namespace(tmp_path: Path, name: str, **options) -> Dict[str, Any]:
+    config = default_build_config()
+    config.update(options)
+    code = render_build_scripts(config, tmp_path)[name]
+    namespace: Dict[str, Any] = {"__name__": "build_script"}
+    exec(compile(code, name, "exec"), namespace)
+    return namespace
+
+
+def test_cache_key_ignores_auto_mem_jobs(tmp_path: Path, monkeypatch, capsys) -> None:
+    (tmp_path / "main.py").write_text("print('hi')\n", encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(os, "cpu_count", lambda: 16)
+    namespace = _script_namespace(
+        tmp_path,
+        "build_nuitka.py",
+        build_tool="nuitka",
+        jobs="auto-mem",
+        build_cache=True,
+    )
+
+    keys: List[str] = []
+
+    def restore_build_cache(key: str) -> bool:
+        keys.append(key)
+        return True
+
+    namespace["restore_build_cache"] = restore_build_cache
+    for available in (2048, 65536):
+        namespace["available_memory_mb"] = lambda available=available: available
+        assert namespace["build"]() == 0
+
+    # 两次可用内存算出的线程数不同，但缓存键相同
+    jobs = [line for line in capsys.readouterr().out.splitlines() if "auto-mem" in line]
+    assert len(jobs) == 2 and jobs[0] != jobs[1]
+    assert len(keys) == 2
+    assert keys[0] == keys[1]
+
+
+def test_matrix_splits_memory_between_auto_mem_targets(
+    tmp_path: Path, monkeypatch
+) -> None:
+    (tmp_path / "main.py").write_text("print('hi')\n", encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(os, "cpu_count", lambda: 16)
+    # 线程池代替进程池，便于在测试进程内替换 run_target
+    monkeypatch.setattr(
+        concurrent.futures, "ProcessPoolExecutor", concurrent.futures.ThreadPoolExecutor
+    )
+    namespace = _script_namespace(
+        tmp_path,
+        "build_matrix.py",
+        build_tool="nuitka",
+        jobs="auto-mem",
+        targets=[{"name": "a"}, {"name": "b"}, {"name": "c"}, {"name": "d"}],
+    )
+    namespace["available_memory_mb"] = lambda: 16384
+
+    jobs: List[int] = []
+
+    def run_target(target: Dict[str, Any]) -> tuple:
+        cmd = target["command"](target.get("memory_budget_mb"))
+        jobs.extend(
+            int(arg.split("=", 1)[1]) for arg in cmd if arg.startswith("--jobs=")
+        )
+        return 0, 0.0, ""
+
+    namespace["run_target"] = run_target
+    results, _ = namespace["build_targets"](namespace["TARGETS"])
+    assert len(results) == 4
+
+    # 单个目标独占全部内存时的线程数
+    alone = namespace["auto_mem_jobs"]("no")
+    per_job = namespace["AUTO_JOBS_BASE_MB"] + namespace["AUTO_JOBS_MB_PER_MODULE"]
+    workers, _ = namespace["matrix_workers"](namespace["TARGETS"])
+    assert workers > 1
+    assert len(jobs) == 4
+    assert sum(sorted(jobs, reverse=True)[:workers]) * per_job <= 16384
+    assert max(jobs) < alone
@@ -0,0 +1,86 @@
+"""批量生成"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.utils.batch_generator import (
+    generate_project,
+    generate_projects,
+    read_manifest,
+)
+from src.utils.build_config import (
+    default_build_config,
+    load_build_config,
+    save_build_config,
+)
+
+
+def _make_project(path: Path, **options) -> Path:
+    path.mkdir()
+    (path / "main.py").write_text("print('hi')\n", encoding="utf-8")
+    config = default_build_config()
+    config.update(build_tool="pyinstaller", tool_probe=False, **options)
+    save_build_config(path, config)
+    return path
+
+
+def test_installer_only_change_is_reported(tmp_path: Path) -> None:
+    project = _make_project(
+        tmp_path / "app", installer_app_name="App", installer_publisher="Me"
+    )
+    first = generate_project(project, installer=True)
+    assert first["ok"], first["message"]
+    assert first["changed"]
+    assert first["files"]["App_setup.iss"] == "created"
+
+    second = generate_project(project, installer=True)
+    assert second["ok"] and not second["changed"]
+
+    # 只修改安装包配置：构建脚本不变，安装包脚本变化
+    config = load_build_config(project)
+    config["installer_publisher"] = "Someone Else"
+    save_build_config(project, config)
+    third = generate_project(project, installer=True)
+    assert third["ok"], third["message"]
+    assert third["files"]["build_pyinstaller.py"] == "unchanged"
+    assert third["files"]["App_setup.iss"] == "updated"
+    assert third["changed"]
+
+
+def test_negative_jobs_rejected(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        generate_projects([tmp_path], jobs=-1)
+
+    result = subprocess.run(
+        [sys.executable, "-m", "src", "generate", "--jobs", "-1", str(tmp_path)],
+        capture_output=True,
+        text=True,
+        cwd=Path(__file__).resolve().parent.parent,
+    )
+    assert result.returncode == 2
+    assert "--jobs" in result.stderr
+
+
+def test_malformed_config_fails_load(tmp_path: Path) -> None:
+    good = _make_project(tmp_path / "good")
+    bad = _make_project(tmp_path / "bad")
+    (bad / "build_config.yaml").write_text(
+        "project_name: [unclosed\n", encoding="utf-8"
+    )
+    (bad / "build_pyinstaller.py").write_text("# 手工维护\n", encoding="utf-8")
+    listed = _make_project(tmp_path / "listed")
+    (listed / "build_config.yaml").write_text("- not\n- a mapping\n", encoding="utf-8")
+    manifest = tmp_path / "projects.txt"
+    manifest.write_text("good\nbad\nlisted\n", encoding="utf-8")
+
+    results = generate_projects(read_manifest(manifest), jobs=1)
+    by_name = {Path(r["project"]).name: r for r in results}
+    assert by_name["good"]["ok"]
+    for name in ("bad", "listed"):
+        assert not by_name[name]["ok"]
+        assert by_name[name]["stage"] == "load"
+    # 损坏项目的构建脚本保持原样
+    assert (bad / "build_pyinstaller.py").read_text(encoding="utf-8") == "# 手工维护\n"
@@ -0,0 +1,61 @@
+"""构建缓存命中后再次构建（PyInstaller 实际构建）"""
+
+import importlib.util
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.utils.build_config import default_build_config
+from src.utils.script_generator import render_build_scripts
+
+pytestmark = pytest.mark.skipif(
+    importlib.util.find_spec("PyInstaller") is None, reason="需要安装 PyInstaller"
+)
+
+
+def _run_build(project: Path) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "build_pyinstaller.py"],
+        cwd=project,
+        capture_output=True,
+        text=True,
+        timeout=600,
+    )
+
+
+def test_rebuild_after_cache_hit_and_source_change(tmp_path: Path) -> None:
+    (tmp_path / "helper.py").write_text("VALUE = 1\n", encoding="utf-8")
+    (tmp_path / "main.py").write_text(
+        "from helper import VALUE\nprint(VALUE)\n", encoding="utf-8"
+    )
+    config = default_build_config()
+    config.update(
+        build_tool="pyinstaller",
+        project_name="MyApp",
+        entry_file="main.py",
+        output_dir="dist",
+        onefile=False,
+        build_cache=True,
+        show_console=True,
+    )
+    for name, content in render_build_scripts(config, tmp_path).items():
+        (tmp_path / name).write_text(content, encoding="utf-8")
+
+    first = _run_build(tmp_path)
+    assert first.returncode == 0, first.stdout + first.stderr
+
+    # 缓存命中：恢复前清空输出目录，不残留旧文件
+    stale = tmp_path / "dist" / "MyApp" / "stale.txt"
+    stale.write_text("stale", encoding="utf-8")
+    hit = _run_build(tmp_path)
+    assert hit.returncode == 0, hit.stdout + hit.stderr
+    assert "Build cache hit" in hit.stdout
+    assert not stale.exists()
+
+    # 源码变化：缓存未命中，在已有输出上重新构建
+    (tmp_path / "helper.py").write_text("VALUE = 2\n", encoding="utf-8")
+    rebuild = _run_build(tmp_path)
+    assert rebuild.returncode == 0, rebuild.stdout + rebuild.stderr
+    assert "Build cache miss" in rebuild.stdout
@@ -0,0 +1,123 @@
+"""构建配置读写"""
+
+import os
+from pathlib import Path
+
+from src.utils.build_config import (
+    BuildConfigStore,
+    default_build_config,
+    get_build_config_path,
+    load_build_config,
+    merge_build_config,
+    render_build_config,
+    resolve_build_targets,
+    save_build_config,
+)
+
+
+def _config(**options):
+    config = default_build_config()
+    config.update(options)
+    return config
+
+
+def test_merge_unchanged_config_is_identity() -> None:
+    rendered = render_build_config(_config(exclude_packages=["numpy"]))
+    assert merge_build_config(rendered, rendered) == rendered
+
+
+def test_merge_keeps_user_comments_and_unknown_keys() -> None:
+    existing = render_build_config(_config(version="1.0.0")).replace(
+        "version: 1.0.0\n", "version: 1.0.0  # 发布前修改\n"
+    )
+    existing += "\n# 团队约定\ncustom_key: keep me\n"
+    rendered = render_build_config(_config(version="1.1.0"))
+
+    merged = merge_build_config(existing, rendered)
+    assert "version: 1.1.0  # 发布前修改\n" in merged
+    assert "# 团队约定\ncustom_key: keep me\n" in merged
+    # 再次合并相同内容不再变化
+    assert merge_build_config(merged, rendered) == merged
+
+
+def test_merge_drops_emptied_sections() -> None:
+    existing = render_build_config(_config(exclude_packages=["numpy"]))
+    rendered = render_build_config(_config())
+    merged = merge_build_config(existing, rendered)
+    assert "exclude_packages" not in merged
+    assert "# 排除的包" not in merged
+    assert merged == rendered
+
+
+def test_merge_invalid_yaml_falls_back_to_rendered() -> None:
+    rendered = render_build_config(_config())
+    assert merge_build_config("key: [unclosed\n", rendered) == rendered
+
+
+def test_save_and_load_round_trip(tmp_path: Path) -> None:
+    config = _config(
+        build_tool="nuitka",
+        project_name="Demo",
+        onefile=False,
+        jobs=4,
+        exclude_packages=["numpy"],
+    )
+    assert save_build_config(tmp_path, config)
+    loaded = load_build_config(tmp_path)
+    for key in ("project_name", "onefile", "jobs", "exclude_packages"):
+        assert loaded[key] == config[key]
+
+    # 内容未变化时不重写文件
+    path = get_build_config_path(tmp_path)
+    mtime = path.stat().st_mtime_ns
+    os.utime(path, ns=(mtime - 10**9, mtime - 10**9))
+    save_build_config(tmp_path, loaded)
+    assert path.stat().st_mtime_ns == mtime - 10**9
+
+
+def test_resolve_build_targets() -> None:
+    config = _config(
+        output_dir="dist",
+        onefile=True,
+        targets=[
+            {"name": "fast", "onefile": False},
+            {"name": "custom", "output_dir": "out/custom"},
+            {"onefile": False},
+            "invalid",
+        ],
+        compare=[{"name": 2}],
+    )
+    targets = resolve_build_targets(config)
+    assert [t["name"] for t in targets] == ["fast", "custom"]
+    assert targets[0]["output_dir"] == "dist/fast"
+    assert targets[0]["onefile"] is False
+    assert targets[1]["output_dir"] == "out/custom"
+    assert targets[1]["onefile"] is True
+    assert all("targets" not in t and "compare" not in t for t in targets)
+
+    variants = resolve_build_targets(config, "compare")
+    assert [(v["name"], v["output_dir"]) for v in variants] == [("2", "dist/compare/2")]
+
+
+def test_store_reloads_after_external_change(tmp_path: Path) -> None:
+    store = BuildConfigStore()
+    save_build_config(tmp_path, _config(version="1.0.0"))
+    first = store.load(tmp_path)
+    first["version"] = "mutated"
+    assert store.load(tmp_path)["version"] == "1.0.0"
+
+    path = get_build_config_path(tmp_path)
+    path.write_text(
+        path.read_text(encoding="utf-8").replace("1.0.0", "2.0.0"), encoding="utf-8"
+    )
+    assert store.load(tmp_path)["version"] == "2.0.0"
+
+
+def test_store_flushes_dirty_updates(tmp_path: Path) -> None:
+    store = BuildConfigStore()
+    store.update(tmp_path, _config(version="3.0.0"))
+    assert store.is_dirty(tmp_path)
+    assert not get_build_config_path(tmp_path).exists()
+    store.flush()
+    assert not store.is_dirty(tmp_path)
+    assert load_build_config(tmp_path)["version"] == "3.0.0"
@@ -0,0 +1,61 @@
+"""编译器缓存命中统计与节省时间估算"""
+
+import json
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict
+
+from src.utils.build_config import default_build_config
+from src.utils.script_generator import render_build_scripts
+
+PHASES = [("module analysis", 100.0), ("backend C compile", 20.0), ("linking", 50.0)]
+
+
+def _script(tmp_path: Path, **options) -> str:
+    config = default_build_config()
+    config.update(build_tool="nuitka", compiler_cache=True, **options)
+    return render_build_scripts(config, tmp_path)["build_nuitka.py"]
+
+
+def _namespace(tmp_path: Path) -> Dict[str, Any]:
+    namespace: Dict[str, Any] = {"__name__": "build_script"}
+    exec(compile(_script(tmp_path), "build_nuitka.py", "exec"), namespace)
+    namespace["COMPILER_CACHE_STATS_DIR"] = str(tmp_path / ".pybuilder")
+    # 不调用真实的 ccache，直接返回统计结果
+    namespace["subprocess"] = SimpleNamespace(
+        run=lambda *args, **kwargs: SimpleNamespace(stdout="")
+    )
+    return namespace
+
+
+def test_build_keeps_phases_for_cache_report(tmp_path: Path) -> None:
+    assert "        phases = run_build(cmd)" in _script(tmp_path)
+    assert "report_compiler_cache(compiler_cache, phases)" in _script(tmp_path)
+    assert "        phases = run_pgo_build(cmd)" in _script(tmp_path, pgo=True)
+
+
+def test_saved_time_uses_c_compile_phase_only(tmp_path: Path, capsys) -> None:
+    namespace = _namespace(tmp_path)
+
+    namespace["_parse_cache_stats"] = lambda output: (0, 10)
+    namespace["report_compiler_cache"](("ccache", "ccache"), PHASES)
+    stats = json.loads((tmp_path / ".pybuilder" / "compiler_cache.json").read_text())
+    # 20 秒 C 编译 / 10 个编译单元，不计入分析和链接阶段
+    assert stats["seconds_per_compile"] == 2.0
+
+    namespace["_parse_cache_stats"] = lambda output: (10, 0)
+    namespace["report_compiler_cache"](("ccache", "ccache"), PHASES)
+    assert "Compiler cache saved: ~20s" in capsys.readouterr().out
+
+
+def test_no_baseline_without_c_compile_phase(tmp_path: Path, capsys) -> None:
+    namespace = _namespace(tmp_path)
+    namespace["_parse_cache_stats"] = lambda output: (0, 10)
+    namespace["report_compiler_cache"](("ccache", "ccache"), [("startup", 30.0)])
+    assert not (tmp_path / ".pybuilder" / "compiler_cache.json").exists()
+
+    namespace["_parse_cache_stats"] = lambda output: (5, 5)
+    namespace["report_compiler_cache"](("ccache", "ccache"), [("startup", 30.0)])
+    output = capsys.readouterr().out
+    assert "5 hits / 5 misses" in output
+    assert "no cold build baseline" in output
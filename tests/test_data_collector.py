@@ -0,0 +1,39 @@
+"""数据文件收集与去重暂存"""
+
+import os
+from pathlib import Path
+
+from src.utils.data_collector import collect_data_files
+
+
+def _staged_paths(stage: Path) -> set:
+    return {
+        path.relative_to(stage).as_posix()
+        for path in stage.rglob("*")
+        if path.is_file()
+    }
+
+
+def test_dedupe_keeps_every_destination(tmp_path: Path, monkeypatch) -> None:
+    for name in ("a", "b", "c"):
+        (tmp_path / "resources" / name).mkdir(parents=True)
+    (tmp_path / "resources" / "a" / "icon.png").write_bytes(b"same icon")
+    (tmp_path / "resources" / "b" / "icon.png").write_bytes(b"same icon")
+    (tmp_path / "resources" / "c" / "icon.png").write_bytes(b"other one")
+    monkeypatch.chdir(tmp_path)
+    specs = [("resources/**/*.png;resources", False)]
+
+    plain = collect_data_files("data", specs, False)
+    deduped = collect_data_files("data", specs, True)
+
+    expected = {"resources/a/icon.png", "resources/b/icon.png", "resources/c/icon.png"}
+    assert {target for _src, target, _size in plain["files"]} == expected
+    assert {target for _src, target, _size in deduped["files"]} == expected
+    assert _staged_paths(Path(deduped["stage"])) == expected
+    assert [item[1] for item in deduped["duplicates"]] == ["resources/b/icon.png"]
+
+    # 重复文件在暂存目录中共用保留文件的内容
+    stage = Path(deduped["stage"]) / "resources"
+    assert (stage / "b" / "icon.png").read_bytes() == b"same icon"
+    if os.stat(stage / "a" / "icon.png").st_nlink > 1:
+        assert os.path.samefile(stage / "a" / "icon.png", stage / "b" / "icon.png")
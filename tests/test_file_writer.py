@@ -0,0 +1,185 @@
+"""脚本与配置写入"""
+
+import os
+import stat
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from src.utils import file_writer
+from src.utils.file_writer import (
+    CREATED,
+    UNCHANGED,
+    UPDATED,
+    WriteBehind,
+    atomic_write_text,
+    file_lock,
+    write_if_changed,
+)
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path: Path, monkeypatch) -> Path:
+    """锁文件写到临时缓存目录"""
+    path = tmp_path / "cache"
+    monkeypatch.setenv("XDG_CACHE_HOME", str(path))
+    return path
+
+
+def test_write_if_changed_statuses(tmp_path: Path) -> None:
+    path = tmp_path / "build.py"
+    assert write_if_changed(path, "a\n")["status"] == CREATED
+    mtime = path.stat().st_mtime_ns
+    assert write_if_changed(path, "a\n")["status"] == UNCHANGED
+    assert path.stat().st_mtime_ns == mtime
+    assert write_if_changed(path, "b\n")["status"] == UPDATED
+    assert path.read_text() == "b\n"
+
+
+def test_write_if_changed_dry_run_returns_diff(tmp_path: Path) -> None:
+    path = tmp_path / "build.py"
+    path.write_text("a\n")
+    result = write_if_changed(path, "b\n", dry_run=True)
+    assert result["status"] == UPDATED
+    assert "-a" in result["diff"] and "+b" in result["diff"]
+    assert path.read_text() == "a\n"
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIX 权限")
+def test_executable_bit(tmp_path: Path) -> None:
+    path = tmp_path / "build.py"
+    write_if_changed(path, "print()\n", executable=True)
+    assert path.stat().st_mode & stat.S_IXUSR
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIX 权限")
+def test_atomic_write_respects_umask_without_changing_it(
+    tmp_path: Path, monkeypatch
+) -> None:
+    old = os.umask(0o027)
+    try:
+        monkeypatch.setattr(os, "umask", lambda *_: pytest.fail("umask changed"))
+        atomic_write_text(tmp_path / "new.yaml", "x")
+    finally:
+        monkeypatch.undo()
+        os.umask(old)
+    assert stat.S_IMODE((tmp_path / "new.yaml").stat().st_mode) == 0o640
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIX 权限")
+def test_atomic_write_keeps_existing_mode(tmp_path: Path) -> None:
+    path = tmp_path / "config.yaml"
+    path.write_text("a")
+    path.chmod(0o600)
+    atomic_write_text(path, "b")
+    assert stat.S_IMODE(path.stat().st_mode) == 0o600
+    assert path.read_text() == "b"
+    assert list(tmp_path.glob(".config.yaml.*.tmp")) == []
+
+
+def test_atomic_write_failure_keeps_original(tmp_path: Path, monkeypatch) -> None:
+    path = tmp_path / "config.yaml"
+    path.write_text("original")
+
+    def fail(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(file_writer.os, "replace", fail)
+    with pytest.raises(OSError):
+        atomic_write_text(path, "new")
+    assert path.read_text() == "original"
+    assert list(tmp_path.glob(".config.yaml.*.tmp")) == []
+
+
+def test_file_lock_is_reentrant(tmp_path: Path) -> None:
+    path = tmp_path / "config.yaml"
+    with file_lock(path):
+        with file_lock(path):
+            atomic_write_text(path, "x")
+    assert path.read_text() == "x"
+
+
+def test_file_lock_serialises_processes(tmp_path: Path) -> None:
+    path = tmp_path / "config.yaml"
+    code = (
+        "import sys, time\n"
+        "from src.utils.file_writer import file_lock\n"
+        "with file_lock(sys.argv[1]):\n"
+        "    print('locked', flush=True)\n"
+        "    time.sleep(0.5)\n"
+    )
+    child = subprocess.Popen(
+        [sys.executable, "-c", code, str(path)],
+        cwd=ROOT,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        assert child.stdout.readline().strip() == "locked"
+        start = time.perf_counter()
+        with file_lock(path):
+            waited = time.perf_counter() - start
+    finally:
+        child.wait(timeout=10)
+    assert waited > 0.2
+
+
+def test_lock_files_removed_after_release(tmp_path: Path, cache_dir: Path) -> None:
+    for index in range(5):
+        write_if_changed(tmp_path / f"build_{index}.py", "x\n")
+    with file_lock(tmp_path / "config.yaml"):
+        assert len(list((cache_dir / "pybuilder-tui" / "locks").iterdir())) == 1
+    assert list((cache_dir / "pybuilder-tui" / "locks").iterdir()) == []
+
+
+def test_file_lock_counter_across_processes(tmp_path: Path) -> None:
+    # 锁文件在释放时删除，等待中的进程必须重新加锁，计数不能丢失
+    path = tmp_path / "counter.txt"
+    path.write_text("0")
+    code = (
+        "import sys\n"
+        "from pathlib import Path\n"
+        "from src.utils.file_writer import atomic_write_text, file_lock\n"
+        "path = Path(sys.argv[1])\n"
+        "for _ in range(50):\n"
+        "    with file_lock(path):\n"
+        "        atomic_write_text(path, str(int(path.read_text()) + 1))\n"
+    )
+    children = [
+        subprocess.Popen([sys.executable, "-c", code, str(path)], cwd=ROOT)
+        for _ in range(4)
+    ]
+    for child in children:
+        assert child.wait(timeout=60) == 0
+    assert path.read_text() == "200"
+
+
+def test_write_behind_coalesces_bursts() -> None:
+    writes = []
+    done = threading.Event()
+    writer = WriteBehind(delay=0.05)
+    for index in range(20):
+        writer.schedule("config", lambda i=index: (writes.append(i), done.set()))
+    assert done.wait(2)
+    time.sleep(0.1)
+    assert writes == [19]
+    assert writer.pending() == []
+
+
+def test_write_behind_flush_runs_pending_writes_immediately() -> None:
+    writes = []
+    writer = WriteBehind(delay=60)
+    writer.schedule("a", lambda: writes.append("a1"))
+    writer.schedule("a", lambda: writes.append("a2"))
+    writer.schedule("b", lambda: writes.append("b"))
+    writer.flush()
+    assert sorted(writes) == ["a2", "b"]
+    assert writer.pending() == []
+    writer.flush()
+    assert sorted(writes) == ["a2", "b"]
@@ -0,0 +1,172 @@
+"""AST 导入扫描"""
+
+import os
+from pathlib import Path
+from typing import Dict
+
+from src.utils.import_scanner import (
+    GUARD_LAZY,
+    GUARD_OPTIONAL,
+    GUARD_TYPING,
+    load_parse_cache,
+    parse_files_cached,
+    scan_file,
+    scan_project,
+    suggest_options,
+)
+
+CONFIG = {"entry_file": "main.py", "output_dir": "build"}
+
+
+def _write_tree(root: Path, files: Dict[str, str]) -> None:
+    for rel, content in files.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+
+
+def test_scan_file_classifies_guards(tmp_path: Path) -> None:
+    path = tmp_path / "main.py"
+    path.write_text(
+        "import json\n"
+        "from typing import TYPE_CHECKING\n"
+        "try:\n"
+        "    import ujson\n"
+        "except ImportError:\n"
+        "    ujson = None\n"
+        "try:\n"
+        "    import yaml\n"
+        "except ValueError:\n"
+        "    pass\n"
+        "if TYPE_CHECKING:\n"
+        "    import pandas\n"
+        "def load():\n"
+        "    import numpy\n"
+        "    return importlib.import_module('plugins.csv')\n",
+        encoding="utf-8",
+    )
+    result = scan_file(str(path))
+    assert result["error"] == ""
+    guards = {r["module"]: (r["guard"], r["dynamic"]) for r in result["records"]}
+    assert guards == {
+        "json": ("", False),
+        "typing": ("", False),
+        "ujson": (GUARD_OPTIONAL, False),
+        # 不捕获 ImportError 的 try 不算可选依赖
+        "yaml": ("", False),
+        "pandas": (GUARD_TYPING, False),
+        "numpy": (GUARD_LAZY, False),
+        "plugins.csv": (GUARD_LAZY, True),
+    }
+
+
+def test_scan_file_reports_syntax_error(tmp_path: Path) -> None:
+    path = tmp_path / "broken.py"
+    path.write_text("def broken(:\n", encoding="utf-8")
+    result = scan_file(str(path))
+    assert result["records"] == []
+    assert result["error"].startswith("SyntaxError")
+
+
+def test_parse_cache_invalidated_by_mtime_and_size(tmp_path: Path) -> None:
+    path = tmp_path / "mod.py"
+    path.write_text("import os\n", encoding="utf-8")
+    files = {"mod.py": str(path)}
+
+    parsed, stale = parse_files_cached(files, {})
+    assert stale == 1
+    parsed, stale = parse_files_cached(files, parsed)
+    assert stale == 0
+
+    # 大小不变、修改时间变化
+    path.write_text("import re\n", encoding="utf-8")
+    mtime = parsed["mod.py"]["mtime"]
+    os.utime(path, ns=(mtime + 10**9, mtime + 10**9))
+    parsed, stale = parse_files_cached(files, parsed)
+    assert stale == 1
+    assert parsed["mod.py"]["records"][0]["module"] == "re"
+
+    # 修改时间不变、大小变化
+    mtime = parsed["mod.py"]["mtime"]
+    path.write_text("import sys, re\n", encoding="utf-8")
+    os.utime(path, ns=(mtime, mtime))
+    parsed, stale = parse_files_cached(files, parsed)
+    assert stale == 1
+    assert [r["module"] for r in parsed["mod.py"]["records"]] == ["sys", "re"]
+
+
+def test_scan_project_reuses_cache(tmp_path: Path) -> None:
+    _write_tree(tmp_path, {"main.py": "import app\n", "app.py": "import json\n"})
+    first = scan_project(tmp_path, CONFIG)
+    assert first["stats"]["parsed"] == 2
+    assert load_parse_cache(tmp_path / ".pybuilder" / "import_cache.json")
+
+    second = scan_project(tmp_path, CONFIG)
+    assert (second["stats"]["parsed"], second["stats"]["cached"]) == (0, 2)
+
+
+def test_relative_imports_resolve_to_project_modules(tmp_path: Path) -> None:
+    _write_tree(
+        tmp_path,
+        {
+            "main.py": "from pkg import a\n",
+            "pkg/__init__.py": "",
+            "pkg/a.py": "from . import b\nfrom .sub import c\n",
+            "pkg/b.py": "",
+            "pkg/sub/__init__.py": "from .c import VALUE\n",
+            "pkg/sub/c.py": "from .. import b\nfrom ... import outside\nVALUE = 1\n",
+        },
+    )
+    graph = scan_project(tmp_path, CONFIG, use_cache=False)
+    modules = graph["modules"]
+    assert modules["main"]["imports"] == ["pkg", "pkg.a"]
+    assert modules["pkg.a"]["imports"] == ["pkg", "pkg.b", "pkg.sub", "pkg.sub.c"]
+    assert modules["pkg.sub"]["imports"] == ["pkg", "pkg.sub.c"]
+    assert "pkg.b" in modules["pkg.sub.c"]["imports"]
+    # 超出顶层包的相对导入无法解析
+    assert graph["unresolved"] == [{"module": "pkg.sub.c", "line": 2}]
+    assert graph["external"] == {}
+
+
+def test_suggest_options_from_guards_and_dynamic_imports(tmp_path: Path) -> None:
+    _write_tree(
+        tmp_path,
+        {
+            "main.py": (
+                "import importlib\n"
+                "from typing import TYPE_CHECKING\n"
+                "if TYPE_CHECKING:\n"
+                "    import pandas\n"
+                "try:\n"
+                "    import ujson\n"
+                "except ImportError:\n"
+                "    ujson = None\n"
+                "importlib.import_module('plugins')\n"
+                "importlib.import_module('requests')\n"
+            ),
+            "plugins/__init__.py": "",
+        },
+    )
+    graph = scan_project(tmp_path, CONFIG, use_cache=False)
+
+    nuitka = {
+        (s["option"], s["module"]): s["recommended"]
+        for s in suggest_options(graph, "nuitka")
+    }
+    assert nuitka == {
+        ("include_packages", "plugins"): True,
+        ("include_modules", "requests"): True,
+        ("nofollow_imports", "pandas"): True,
+        # 可选依赖可能在运行时使用，不默认勾选
+        ("nofollow_imports", "ujson"): False,
+    }
+
+    pyinstaller = {
+        (s["option"], s["module"]) for s in suggest_options(graph, "pyinstaller")
+    }
+    assert pyinstaller == {
+        ("hidden_imports", "plugins"),
+        ("hidden_imports", "requests"),
+        ("exclude_modules", "pandas"),
+        ("exclude_modules", "ujson"),
+    }
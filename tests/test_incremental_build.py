@@ -0,0 +1,82 @@
+"""PyInstaller 增量构建"""
+
+import os
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from src.utils.build_config import default_build_config
+from src.utils.script_generator import render_build_scripts
+
+WORK_DIR = os.path.join(".pybuilder", "pyi-work")
+
+
+def _script(tmp_path: Path, **options) -> str:
+    config = default_build_config()
+    config.update(build_tool="pyinstaller", incremental=True, **options)
+    return render_build_scripts(config, tmp_path)["build_pyinstaller.py"]
+
+
+@pytest.fixture
+def build(tmp_path: Path, monkeypatch):
+    """执行生成的增量构建，返回每次构建的命令，不调用 PyInstaller"""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "main.py").write_text("print('hi')\n", encoding="utf-8")
+    namespace: Dict[str, Any] = {"__name__": "build_script"}
+    exec(compile(_script(tmp_path), "build_pyinstaller.py", "exec"), namespace)
+    commands: List[List[str]] = []
+    namespace["run_build"] = lambda cmd, env=None: commands.append(cmd) or []
+
+    def run(fingerprint: str = "textual==1.0") -> List[str]:
+        namespace["_dependency_fingerprint"] = lambda: fingerprint
+        assert namespace["build"]() == 0
+        return commands[-1]
+
+    return run
+
+
+def _workpath(cmd: List[str]) -> str:
+    [arg] = [arg for arg in cmd if arg.startswith("--workpath=")]
+    return arg.split("=", 1)[1]
+
+
+def test_incremental_generation(tmp_path: Path) -> None:
+    script = _script(tmp_path, onefile=False, output_dir="build", clean=True)
+    # 保留 Analysis 缓存：不清理、不使用固定的 build/temp 工作目录，并自动覆盖输出
+    assert "'--clean'," not in script
+    assert "'--workpath=build/temp'," not in script
+    assert "'--noconfirm'," in script
+    assert "prepare_incremental_workpath(cmd)" in script
+    assert "cmd.insert(-1, f'--workpath={workpath}')" in script
+    assert "record_incremental_build(" in script
+
+    spec_script = _script(tmp_path, use_spec_file=True, clean=True)
+    assert "'--clean'," not in spec_script
+    assert "cmd.insert(-1, f'--workpath={workpath}')" in spec_script
+
+
+def test_warm_build_reuses_workpath(tmp_path: Path, build, capsys) -> None:
+    cold = build()
+    workpath = _workpath(cold)
+    assert os.path.dirname(workpath) == WORK_DIR
+    assert cold[-1] == "main.py"
+    assert cold.index(f"--workpath={workpath}") == len(cold) - 2
+    assert (tmp_path / workpath / ".complete").exists()
+    assert "Incremental build (cold)" in capsys.readouterr().out
+
+    warm = build()
+    assert _workpath(warm) == workpath
+    output = capsys.readouterr().out
+    assert "Incremental build (warm)" in output
+    assert "Warm build saved" in output
+
+
+def test_dependency_change_invalidates_workpath(tmp_path: Path, build) -> None:
+    old = _workpath(build())
+    (tmp_path / old / "Analysis-00.toc").write_text("cached", encoding="utf-8")
+
+    new = _workpath(build("textual==2.0"))
+    assert new != old
+    assert not (tmp_path / old).exists()
+    assert (tmp_path / new / ".complete").exists()
@@ -0,0 +1,55 @@
+"""构建选项注册表"""
+
+import pytest
+
+from src.utils.option_registry import (
+    BUILD_OPTIONS_BY_KEY,
+    coerce_option,
+    default_build_config,
+    widget_value,
+)
+
+
+@pytest.mark.parametrize(
+    ("key", "value", "expected"),
+    [
+        ("onefile", True, True),
+        ("onefile", "yes", True),
+        ("onefile", "True", True),
+        ("onefile", "0", False),
+        ("onefile", None, False),
+        ("jobs", 4, 4),
+        ("jobs", "8", 8),
+        ("jobs", " Auto-Mem ", "auto-mem"),
+        ("jobs", "many", 0),
+        ("bench_runs", None, 10),
+        ("exclude_packages", "numpy, pandas,,", ["numpy", "pandas"]),
+        ("exclude_packages", ["scipy"], ["scipy"]),
+        ("lto", True, "yes"),
+        ("lto", False, "no"),
+        ("lto", "auto", "auto"),
+        ("output_dir", "build", "build"),
+    ],
+)
+def test_coerce_option(key, value, expected) -> None:
+    assert coerce_option(BUILD_OPTIONS_BY_KEY[key], value) == expected
+
+
+def test_widget_value_uses_default_for_empty_input() -> None:
+    assert widget_value(BUILD_OPTIONS_BY_KEY["jobs"], "  ") == 0
+    assert widget_value(BUILD_OPTIONS_BY_KEY["jobs"], " 6 ") == 6
+    # 字符串选项的空值保留为空字符串
+    assert widget_value(BUILD_OPTIONS_BY_KEY["output_dir"], " ") == ""
+
+
+def test_widget_value_switch_with_on_value() -> None:
+    option = BUILD_OPTIONS_BY_KEY["python_flag"]
+    assert widget_value(option, True) == "-O"
+    assert widget_value(option, False) == ""
+
+
+def test_default_build_config_returns_fresh_copies() -> None:
+    first = default_build_config()
+    first["exclude_packages"].append("numpy")
+    assert default_build_config()["exclude_packages"] == []
+    assert set(first) >= set(BUILD_OPTIONS_BY_KEY)
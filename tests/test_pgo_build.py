@@ -0,0 +1,122 @@
+"""Nuitka PGO 三阶段构建"""
+
+import os
+import platform
+import shutil
+import subprocess
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+import pytest
+
+from src.utils.build_config import default_build_config
+from src.utils.script_generator import render_build_scripts
+
+
+def _script(tmp_path: Path, **options) -> str:
+    config = default_build_config()
+    config.update(build_tool="nuitka", pgo=True, **options)
+    return render_build_scripts(config, tmp_path)["build_nuitka.py"]
+
+
+@pytest.fixture
+def pgo_run(tmp_path: Path, monkeypatch):
+    """执行生成的 PGO 构建，记录各次构建命令、环境变量和外部命令，不调用 Nuitka"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(platform, "system", lambda: "Linux")
+    monkeypatch.setattr(shutil, "which", lambda name: f"/usr/bin/{name}")
+    monkeypatch.setenv("CCFLAGS", "-O2")
+    monkeypatch.delenv("LDFLAGS", raising=False)
+    (tmp_path / "main.py").write_text("print('hi')\n", encoding="utf-8")
+
+    def run(**options) -> Dict[str, Any]:
+        namespace: Dict[str, Any] = {"__name__": "build_script"}
+        exec(
+            compile(_script(tmp_path, **options), "build_nuitka.py", "exec"), namespace
+        )
+        builds: List[tuple] = []
+        commands: List[tuple] = []
+        suffix = ".profraw" if options.get("compiler") == "clang" else ".gcda"
+
+        def run_build(cmd: List[str], env: Any = None) -> list:
+            builds.append((cmd, env))
+            return []
+
+        def run_command(command: List[str], env: Any = None, check: bool = False):
+            commands.append((command, env))
+            # 训练运行生成 profile 数据
+            if len(commands) == 1:
+                profile_dir = tmp_path / ".pybuilder" / "pgo"
+                (profile_dir / f"main{suffix}").write_bytes(b"profile")
+            return SimpleNamespace(returncode=0)
+
+        namespace["run_build"] = run_build
+        namespace["subprocess"] = SimpleNamespace(
+            run=run_command, CalledProcessError=subprocess.CalledProcessError
+        )
+        assert namespace["build"]() == 0
+        return {"builds": builds, "commands": commands}
+
+    return run
+
+
+def test_pgo_generation(tmp_path: Path) -> None:
+    script = _script(tmp_path, pgo_training_command="{exe} --selftest")
+    assert "PGO_PROFILE_DIR = os.path.join('.pybuilder', 'pgo')" in script
+    assert "PGO_TRAINING_COMMAND = '{exe} --selftest'" in script
+    assert "run_pgo_build(cmd)" in script
+    # 模块模式和 PyInstaller 不生成 PGO
+    assert "run_pgo_build" not in _script(tmp_path, mode="module")
+    config = default_build_config()
+    config.update(build_tool="pyinstaller", pgo=True)
+    assert (
+        "run_pgo_build"
+        not in render_build_scripts(config, tmp_path)["build_pyinstaller.py"]
+    )
+
+
+def test_gcc_two_pass_flags(tmp_path: Path, pgo_run) -> None:
+    result = pgo_run(compiler="gcc", onefile=True)
+    profile_dir = str(tmp_path / ".pybuilder" / "pgo")
+    (instrumented, generate_env), (optimized, use_env) = result["builds"]
+
+    # 插桩构建改为 standalone，最终构建保持原来的 onefile 命令
+    assert "--mode=onefile" in optimized
+    assert "--mode=onefile" not in instrumented
+    assert "--mode=standalone" in instrumented
+    assert "--output-folder-name=MyApp.dist" in instrumented
+    assert instrumented[-1] == optimized[-1] == "main.py"
+
+    assert generate_env["CCFLAGS"] == f"-O2 -fprofile-generate={profile_dir}"
+    assert generate_env["LDFLAGS"] == f"-fprofile-generate={profile_dir}"
+    use_flags = f"-fprofile-use={profile_dir} -fprofile-correction -Wno-missing-profile"
+    assert use_env["CCFLAGS"] == f"-O2 {use_flags}"
+    assert use_env["LDFLAGS"] == use_flags
+
+    # 未配置训练命令时直接运行插桩程序，gcc 不需要合并 profile
+    exe = os.path.abspath(os.path.join("dist", "MyApp.dist", "MyApp"))
+    [(command, env)] = result["commands"]
+    assert command == [exe]
+    assert env["PGO_EXECUTABLE"] == exe
+
+
+def test_clang_merges_profiles(tmp_path: Path, pgo_run) -> None:
+    result = pgo_run(compiler="clang", pgo_training_command="{exe} --selftest")
+    profile_dir = str(tmp_path / ".pybuilder" / "pgo")
+    (instrumented, generate_env), (optimized, use_env) = result["builds"]
+    assert "--clang" in instrumented and "--clang" in optimized
+    assert generate_env["LDFLAGS"] == f"-fprofile-generate={profile_dir}"
+    assert use_env["LDFLAGS"].startswith(
+        f"-fprofile-use={os.path.join(profile_dir, 'default.profdata')} "
+    )
+
+    (training, _), (merge, _) = result["commands"]
+    exe = os.path.abspath(os.path.join("dist", "MyApp.dist", "MyApp"))
+    assert training == [exe, "--selftest"]
+    assert merge == [
+        "/usr/bin/llvm-profdata",
+        "merge",
+        f"-output={os.path.join(profile_dir, 'default.profdata')}",
+        os.path.join(profile_dir, "main.profraw"),
+    ]
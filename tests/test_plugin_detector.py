@@ -0,0 +1,82 @@
+"""Nuitka 插件检测"""
+
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from src.utils import plugin_detector
+from src.utils.plugin_detector import detect_plugins
+
+CONFIG = {"entry_file": "main.py", "output_dir": "build"}
+
+
+@pytest.fixture
+def installed(monkeypatch) -> List[str]:
+    """替换目标环境查询，packages 中为已安装的顶层包"""
+    packages: List[str] = []
+
+    def load_environment(project_dir: Path, python: Any = None) -> Dict[str, Any]:
+        return {
+            "python": "python",
+            "cached": False,
+            "packages": {
+                name: {"dist": name, "size": 0, "path": ""} for name in packages
+            },
+        }
+
+    monkeypatch.setattr(plugin_detector, "load_environment", load_environment)
+    return packages
+
+
+def _detect(tmp_path: Path, source: str) -> Dict[str, Dict[str, Any]]:
+    (tmp_path / "main.py").write_text(source, encoding="utf-8")
+    return detect_plugins(tmp_path, CONFIG)["plugins"]
+
+
+def test_tkinter_import_enables_plugin(tmp_path: Path, installed: List[str]) -> None:
+    plugins = _detect(tmp_path, "import tkinter\nimport numpy\n")
+    assert plugins["tk-inter"]["enable"] is True
+    assert "main" in plugins["tk-inter"]["reason"]
+    # 新版 Nuitka 默认处理的插件不勾选
+    assert plugins["numpy"]["enable"] is False
+    assert plugins["upx"]["enable"] is None
+    assert plugins["no-qt"]["enable"] is False
+
+
+def test_type_checking_import_does_not_enable_plugin(
+    tmp_path: Path, installed: List[str]
+) -> None:
+    plugins = _detect(
+        tmp_path,
+        "from typing import TYPE_CHECKING\nif TYPE_CHECKING:\n    import tkinter\n",
+    )
+    assert plugins["tk-inter"]["enable"] is False
+
+
+def test_direct_qt_binding(tmp_path: Path, installed: List[str]) -> None:
+    installed.extend(["PySide6", "PyQt5"])
+    plugins = _detect(tmp_path, "from PySide6 import QtWidgets\n")
+    assert plugins["pyside6"]["enable"] is True
+    assert plugins["pyqt5"]["enable"] is False
+    assert plugins["no-qt"]["enable"] is False
+
+
+def test_qt_wrapper_uses_installed_binding(
+    tmp_path: Path, installed: List[str]
+) -> None:
+    installed.extend(["PySide6", "PyQt5"])
+    plugins = _detect(tmp_path, "from qtpy import QtWidgets\n")
+    # 按 qtpy 的默认顺序选择已安装的绑定
+    assert plugins["pyqt5"]["enable"] is True
+    assert "qtpy" in plugins["pyqt5"]["reason"]
+    assert plugins["pyside6"]["enable"] is False
+
+
+def test_installed_qt_without_usage_enables_no_qt(
+    tmp_path: Path, installed: List[str]
+) -> None:
+    installed.append("PyQt6")
+    plugins = _detect(tmp_path, "import matplotlib\n")
+    assert plugins["no-qt"]["enable"] is True
+    assert all(not plugins[name]["enable"] for name in ("pyqt5", "pyqt6", "pyside6"))
@@ -0,0 +1,125 @@
+"""生成脚本中嵌入的模块函数"""
+
+import ast
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List
+
+from src.utils import data_collector, dist_analyzer, startup_bench
+from src.utils.build_config import default_build_config
+from src.utils.script_generator import render_build_scripts
+from src.utils.script_snippets import (
+    DATA_COLLECTOR_CODE,
+    DATA_COLLECTOR_IMPORTS,
+    DIST_ANALYZER_CODE,
+    DIST_ANALYZER_IMPORTS,
+    STARTUP_BENCH_CODE,
+    STARTUP_BENCH_IMPORTS,
+)
+
+
+def _top_level_names(code: str) -> List[str]:
+    """脚本顶层定义或导入的名称（允许重复出现的 if/try 分支内定义不计）"""
+    names = []
+    for node in ast.parse(code).body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            names.extend(alias.asname or alias.name for alias in node.names)
+        elif isinstance(node, (ast.FunctionDef, ast.ClassDef)):
+            names.append(node.name)
+        elif isinstance(node, ast.Assign):
+            names.extend(t.id for t in node.targets if isinstance(t, ast.Name))
+    return names
+
+
+def _render(tmp_path: Path, **options) -> Dict[str, str]:
+    config = default_build_config()
+    config.update(options)
+    return render_build_scripts(config, tmp_path)
+
+
+def _embedded_namespace(code: str, imports: List[str]) -> dict:
+    namespace: dict = {}
+    exec("\n".join(f"import {module}" for module in imports), namespace)
+    exec(code, namespace)
+    return namespace
+
+
+def test_generated_scripts_define_each_name_once(tmp_path: Path) -> None:
+    for tool in ("nuitka", "pyinstaller"):
+        scripts = _render(
+            tmp_path,
+            build_tool=tool,
+            build_cache=True,
+            size_analysis=True,
+            startup_benchmark=True,
+            compare=[{"name": "fast"}],
+            add_data="assets/**/*.png;assets",
+        )
+        for name, code in scripts.items():
+            if not name.endswith(".py"):
+                continue
+            repeated = [n for n, c in Counter(_top_level_names(code)).items() if c > 1]
+            assert repeated == [], f"{tool} {name}: {repeated}"
+
+
+def test_dist_analyzer_code_has_no_module_header() -> None:
+    assert not DIST_ANALYZER_CODE.lstrip().startswith('"""')
+    tree = ast.parse(DIST_ANALYZER_CODE)
+    assert not any(isinstance(n, (ast.Import, ast.ImportFrom)) for n in tree.body)
+    assert "_dist_file_digest" in DIST_ANALYZER_CODE
+    assert "def _file_digest" not in DIST_ANALYZER_CODE
+    assert "_data_file_digest" in DATA_COLLECTOR_CODE
+    assert "def _file_digest" not in DATA_COLLECTOR_CODE
+
+
+def test_embedded_dist_analyzer_matches_module(tmp_path: Path) -> None:
+    dist = tmp_path / "MyApp"
+    (dist / "_internal" / "pkg").mkdir(parents=True)
+    (dist / "_internal" / "pkg" / "a.py").write_bytes(b"x" * 8192)
+    (dist / "_internal" / "pkg" / "b.py").write_bytes(b"x" * 8192)
+    (dist / "MyApp").write_bytes(b"exe")
+
+    namespace = _embedded_namespace(DIST_ANALYZER_CODE, DIST_ANALYZER_IMPORTS)
+    found = namespace["find_dist_dir"](str(tmp_path), "MyApp", "main.py", "pyinstaller")
+    assert found == dist_analyzer.find_dist_dir(
+        str(tmp_path), "MyApp", "main.py", "pyinstaller"
+    )
+    embedded = namespace["analyze_dist"](found[0], found[1], set(), 5)
+    assert embedded == dist_analyzer.analyze_dist(found[0], found[1], set(), 5)
+    assert embedded["duplicates"]
+
+
+def test_embedded_startup_bench_matches_module() -> None:
+    namespace = _embedded_namespace(STARTUP_BENCH_CODE, STARTUP_BENCH_IMPORTS)
+    samples = [0.3, 0.1, 0.2, 0.5]
+    assert namespace["percentile"](samples, 95) == startup_bench.percentile(samples, 95)
+    assert namespace["LAUNCH_TIMEOUT"] == startup_bench.LAUNCH_TIMEOUT
+    assert "_bench_temp_env" in STARTUP_BENCH_CODE
+
+
+def test_embedded_data_collector_matches_module(tmp_path: Path, monkeypatch) -> None:
+    (tmp_path / "assets" / "icons").mkdir(parents=True)
+    (tmp_path / "assets" / "icons" / "a.png").write_bytes(b"png")
+    (tmp_path / "assets" / "icons" / "b.png").write_bytes(b"png")
+    (tmp_path / "assets" / "icons" / "c.psd").write_bytes(b"psd")
+    monkeypatch.chdir(tmp_path)
+    specs = [("assets/**/*.png;assets", False)]
+
+    namespace = _embedded_namespace(DATA_COLLECTOR_CODE, DATA_COLLECTOR_IMPORTS)
+    embedded = namespace["collect_data_files"]("data", specs, True)
+    expected = data_collector.collect_data_files("data", specs, True)
+    assert embedded == expected
+    assert namespace["format_data_summary"](embedded) == (
+        data_collector.format_data_summary(expected)
+    )
+
+
+def test_indirect_packages_are_not_exclude_suggestions(tmp_path: Path) -> None:
+    root = tmp_path / "MyApp"
+    for name, size in (("numpy", 600 * 1024), ("tkinter", 10), ("requests", 10)):
+        (root / name).mkdir(parents=True)
+        (root / name / "__init__.py").write_bytes(b"x" * size)
+
+    report = dist_analyzer.analyze_dist(str(root), project_imports={"requests"})
+    assert [item["module"] for item in report["suggestions"]] == ["tkinter"]
+    assert [item["module"] for item in report["indirect"]] == ["numpy"]
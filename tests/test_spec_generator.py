@@ -0,0 +1,31 @@
+"""PyInstaller .spec 生成"""
+
+import ast
+
+from src.utils.build_config import default_build_config
+from src.utils.spec_generator import generate_pyinstaller_spec
+
+
+def _spec_value(spec: str, name: str):
+    for node in ast.parse(spec).body:
+        if isinstance(node, ast.Assign) and getattr(node.targets[0], "id", "") == name:
+            return ast.literal_eval(node.value)
+    raise KeyError(name)
+
+
+def test_spec_excludes_merge_exclude_packages() -> None:
+    config = default_build_config()
+    config.update(
+        build_tool="pyinstaller",
+        exclude_modules="tkinter, unittest，pydoc",
+        exclude_packages=["numpy", "tkinter"],
+    )
+    spec = generate_pyinstaller_spec(config)
+    assert _spec_value(spec, "excludes") == ["tkinter", "unittest", "pydoc", "numpy"]
+
+
+def test_spec_excludes_accept_string_exclude_packages() -> None:
+    config = default_build_config()
+    config.update(build_tool="pyinstaller", exclude_packages="pandas scipy")
+    spec = generate_pyinstaller_spec(config)
+    assert _spec_value(spec, "excludes") == ["pandas", "scipy"]
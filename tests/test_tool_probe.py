@@ -0,0 +1,93 @@
+"""打包工具能力探测"""
+
+import json
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from src.utils import tool_probe
+
+HELP_TEXT = """
+Usage: python -m nuitka [--mode=compilation_mode] [--run] program.py
+
+  --standalone          Enable standalone mode for output.
+  --onefile             On top of standalone mutually, enable onefile mode.
+  --jobs=N              Specify the allowed number of parallel C compiler jobs.
+  --include-data-files=DESC
+                        Include data files by filenames.
+  --windows-icon-from-ico=ICON_PATH
+  -o FILENAME, --output-filename=FILENAME
+  Use non-flag text like this-is-not-a-flag or a--b.
+"""
+
+
+def test_parse_flags_strips_values_and_sorts() -> None:
+    assert tool_probe.parse_flags(HELP_TEXT) == [
+        "--include-data-files",
+        "--jobs",
+        "--mode",
+        "--onefile",
+        "--output-filename",
+        "--run",
+        "--standalone",
+        "--windows-icon-from-ico",
+    ]
+
+
+def test_unsupported_flags_ignores_other_platform_nuitka_flags(monkeypatch) -> None:
+    monkeypatch.setattr(tool_probe.platform, "system", lambda: "Linux")
+    capabilities = {"flags": ["--standalone", "--onefile"]}
+    flags = ["--standalone", "--windows-icon-from-ico", "--lto", "--linux-icon"]
+    assert tool_probe.unsupported_flags("nuitka", flags, capabilities) == [
+        "--linux-icon",
+        "--lto",
+    ]
+    assert tool_probe.unsupported_flags("pyinstaller", flags, capabilities) == [
+        "--linux-icon",
+        "--lto",
+        "--windows-icon-from-ico",
+    ]
+
+
+@pytest.fixture
+def fake_tools(tmp_path: Path, monkeypatch):
+    """用假的子进程代替目标解释器，记录每次调用"""
+    calls = []
+
+    def run(cmd, **kwargs):
+        calls.append(cmd)
+        if cmd[1] == "-c":
+            stdout = json.dumps({"Nuitka": "2.8.10", "pyinstaller": None})
+        else:
+            stdout = HELP_TEXT
+        return subprocess.CompletedProcess(cmd, 0, stdout, "")
+
+    monkeypatch.setattr(tool_probe.subprocess, "run", run)
+    monkeypatch.setattr(tool_probe, "get_cache_dir", lambda: tmp_path / "cache")
+    monkeypatch.setattr(tool_probe, "_VERSION_CACHE", {})
+    return calls
+
+
+def test_capabilities_are_shared_between_projects(tmp_path: Path, fake_tools) -> None:
+    python = str(tmp_path / "python")
+    first = tool_probe.load_capabilities(tmp_path / "a", "nuitka", python)
+    second = tool_probe.load_capabilities(tmp_path / "b", "nuitka", python)
+
+    assert first["cached"] is False
+    assert second["cached"] is True
+    assert second["flags"] == first["flags"] == tool_probe.parse_flags(HELP_TEXT)
+    # 一次版本查询 + 一次 --help，第二个项目不再启动子进程
+    assert len(fake_tools) == 2
+    assert not (tmp_path / "a" / ".pybuilder").exists()
+
+    # 新进程（内存缓存为空）只查询版本，--help 结果来自磁盘缓存
+    tool_probe._VERSION_CACHE.clear()
+    third = tool_probe.load_capabilities(tmp_path / "c", "nuitka", python)
+    assert third["cached"] is True
+    assert len(fake_tools) == 3
+
+
+def test_missing_tool_returns_none(tmp_path: Path, fake_tools) -> None:
+    python = str(tmp_path / "python")
+    assert tool_probe.load_capabilities(tmp_path, "pyinstaller", python) is None